@@ -1,7 +1,11 @@
 import numpy as np
 import time
 import math
+from concurrent.futures import ProcessPoolExecutor
 from scipy.sparse import coo_matrix
+from triangle_edge_table import build_triangle_edge_table
+from segment_intersections import find_segment_intersections
+from vertex_snapping import snap_vertices
 try:
     from matplotlib.tri import Triangulation
 except ModuleNotFoundError:  # pragma: no cover - optional dependency for plotting helpers
@@ -259,6 +263,9 @@ class MARE2DEMPolyParser():
             edge = tuple(sorted([seg[0], seg[1]]))
             self.original_segment_edges.add(edge)
 
+        # The edge table is derived lazily from this triangulation by get_edge_table()
+        self.edge_table = None
+
         # Get triangles
         triangles = tri_output['triangles'].tolist()
         
@@ -473,6 +480,28 @@ class MARE2DEMPolyParser():
             print("✅ All MARE2DEM requirements satisfied")
             return True
 
+    def get_edge_table(self):
+        """Get the shared edge table of the last constrained triangulation.
+
+        The table is built once from sorted endpoint pairs and cached until the
+        next call to create_constrained_delaunay(). Edges that match an original
+        input segment are flagged as constrained.
+
+        Returns:
+            TriangleEdgeTable: Unique edges, their two incident triangles (-1 when
+            missing) and the constrained flag for each edge.
+        """
+        if not hasattr(self, 'tri_output'):
+            raise RuntimeError("create_constrained_delaunay() must be called before get_edge_table()")
+
+        if getattr(self, 'edge_table', None) is None:
+            self.edge_table = build_triangle_edge_table(
+                self.tri_output['triangles'],
+                constrained_edges=getattr(self, 'original_segment_edges', None),
+                vertex_count=len(self.tri_output['vertices']),
+            )
+        return self.edge_table
+
     def get_segment_triangle_neighbors(self):
         """Get pairs of triangles that share a segment/edge.
         
@@ -490,54 +519,28 @@ class MARE2DEMPolyParser():
         if not hasattr(self, 'original_segment_edges'):
             raise RuntimeError("create_constrained_delaunay() must be called with recent code to track original segments")
         
-        # Get the triangle neighbors from tri_output
-        # tri_output['neighbors'] contains for each triangle, the 3 neighboring triangles
-        # -1 indicates no neighbor (boundary)
-        # neighbors = self.tri_output['neighbors']  # Not used in this implementation
-        
-        # Get the edge information
-        # tri_output['edges'] contains all edges (segments) as pairs of vertex indices
-        edges = self.tri_output['edges']
-        
-        # Get the triangle information
-        triangles = self.tri_output['triangles']
-        
-        # Create mapping of edges to the triangles they belong to
-        edge_to_triangles = {}
-        
-        # For each triangle
-        for i, tri in enumerate(triangles):
-            # For each edge in the triangle
-            for j in range(3):
-                # Get the vertices of this edge (sorted to ensure consistent representation)
-                v1, v2 = sorted([tri[j], tri[(j+1)%3]])
-                edge = (v1, v2)
-                
-                # Add this triangle to the edge's list
-                if edge in edge_to_triangles:
-                    edge_to_triangles[edge].append(i)
-                else:
-                    edge_to_triangles[edge] = [i]
-        
-        # Identify pairs of triangles that share an edge
-        segment_neighbors = []
-        for edge, tris in edge_to_triangles.items():
-            if len(tris) == 2:  # This edge is shared by exactly 2 triangles
-                segment_neighbors.append(tuple(tris))
-        
-        # Identify constrained edges based on original segments
-        constrained_edges = []
-        edges_list = edges.tolist()
-        for i, (v1, v2) in enumerate(edges_list):
-            edge = (min(v1, v2), max(v1, v2))
-            if edge in self.original_segment_edges:
-                constrained_edges.append(i)
+        edge_table = self.get_edge_table()
+
+        # Identify pairs of triangles that share an edge (edges with exactly 2 triangles)
+        segment_neighbors = [tuple(pair) for pair in edge_table.neighbor_pairs().tolist()]
+
+        # tri_output['edges'] is only present when triangulating with the 'e' switch
+        edges = self.tri_output.get('edges')
+        if edges is None:
+            edges = edge_table.edges
+
+        # Identify constrained edges by looking each output edge up in the edge table
+        edge_indices = edge_table.lookup(edges)
+        is_constrained = np.zeros(len(edge_indices), dtype=bool)
+        found = edge_indices >= 0
+        is_constrained[found] = edge_table.constrained[edge_indices[found]]
+        constrained_edges = np.flatnonzero(is_constrained).tolist()
                 
-        print(f"Found {len(constrained_edges)} constrained edges out of {len(edges_list)} total edges")
+        print(f"Found {len(constrained_edges)} constrained edges out of {len(edges)} total edges")
             
         return {
             'segment_neighbors': segment_neighbors,
-            'segments': edges.tolist(),
+            'segments': np.asarray(edges).tolist(),
             'constrained_segments': constrained_edges
         }
 
@@ -696,6 +699,7 @@ class MARE2DEMPolyManager():
     def __init__(self):
         self.parser = MARE2DEMPolyParser()
         self.tolerance = 1e-10  # Tolerance for floating point comparisons
+        self.last_snap_stats = None  # VertexSnapStats of the last vertex merge
         self.min_angle_degrees = 27.0  # Minimum angle between segments in degrees
     
     def _calculate_angle_between_segments(self, p1, p2, p3):
@@ -921,6 +925,99 @@ class MARE2DEMPolyManager():
 
         return merged_vertices, merged_segments, merged_holes, merged_regions
     
+    def mosaic_poly(self, poly_files, unit_scale_factor=1, output_file=None, max_workers=None):
+        """
+        Merge any number of poly files into one model (e.g. a regional model from line models).
+        
+        Models are reduced pairwise in a balanced tree, so each vertex takes part in
+        about log2(N) merge steps instead of up to N for a one-by-one fold. The merges of
+        one tree level run in parallel on a process pool. Intermediate steps only merge
+        geometry; regions are determined once, from the final geometry, using the region
+        seeds of all input files in input order. Where models overlap, the region of the
+        earliest file wins.
+        
+        Args:
+            poly_files (list): Paths of the .poly files to merge, in priority order
+            unit_scale_factor (float, optional): Unit scale factor for the coordinates in the poly files
+            output_file (str, optional): Path for output merged .poly file
+            max_workers (int, optional): Process pool size. 1 merges in the current process.
+        
+        Returns:
+            tuple: (merged_vertices, merged_segments, merged_holes, merged_regions, region_sources)
+                where region_sources[i] is the `(file_index, source_region_attribute)` the
+                i-th merged region was seeded from, or None for regions created by the merge.
+        """
+        if not poly_files:
+            raise ValueError("At least one poly file is required")
+        
+        start_time = time.time()
+        print(f"====Poly mosaic of {len(poly_files)} files starting...====")
+        
+        pieces = []
+        seeds = []
+        region_keys = []
+        for file_index, poly_file in enumerate(poly_files):
+            vertices, segments, holes, regions = self.parser.read_poly_file(poly_file, unit_scale_factor=unit_scale_factor)
+            print(f"File {file_index + 1}: {len(vertices):,} vertices, {len(segments):,} segments")
+            pieces.append(_renumber_poly_piece(vertices, segments, holes))
+            for region in regions or []:
+                # Negative attributes mark seeds so the final region pass can report which seed it used
+                seeds.append({
+                    'id': len(seeds) + 1,
+                    'hCoor': region['hCoor'],
+                    'vCoor': region['vCoor'],
+                    'attribute': -(len(seeds) + 1),
+                    'max_area': region.get('max_area', -1),
+                })
+                region_keys.append((file_index, int(region.get('attribute') or region['id'])))
+        
+        level = 0
+        pool = None
+        try:
+            while len(pieces) > 1:
+                level += 1
+                tasks = [
+                    (self.tolerance, self.min_angle_degrees, pieces[i], pieces[i + 1])
+                    for i in range(0, len(pieces) - 1, 2)
+                ]
+                print(f"🔧 Mosaic level {level}: {len(tasks)} pair merge(s)")
+                if max_workers == 1 or len(tasks) == 1:
+                    merged = [_merge_mosaic_pair(task) for task in tasks]
+                else:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=max_workers)
+                    merged = list(pool.map(_merge_mosaic_pair, tasks))
+                if len(pieces) % 2:
+                    merged.append(pieces[-1])
+                pieces = merged
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        merged_vertices, merged_segments, merged_holes = pieces[0]
+        merged_regions = self._determine_regions_from_geometry(merged_vertices, merged_segments, seeds, None)
+        
+        region_sources = []
+        for region in merged_regions:
+            attribute = region['attribute']
+            if attribute < 0:
+                region_sources.append(region_keys[int(-attribute) - 1])
+            else:
+                region_sources.append(None)
+            # The merged resistivity table is numbered by merged region
+            region['attribute'] = region['id']
+        
+        elapsed = time.time() - start_time
+        print(f"✅ Mosaic completed in {elapsed:.2f} seconds ({level} tree levels)")
+        print(f"Result: {len(merged_vertices):,} vertices, {len(merged_segments):,} segments, {len(merged_regions):,} regions")
+        
+        if output_file:
+            print(f"Writing mosaic file to {output_file}...")
+            self.parser.write_poly_file(output_file, merged_vertices, merged_segments, merged_holes, merged_regions)
+            print("✅ File written successfully")
+        
+        return merged_vertices, merged_segments, merged_holes, merged_regions, region_sources
+    
     def _correct_merge(self, vertices1, segments1, holes1, regions1, vertices2, segments2, holes2, regions2, output_file_without_regions=None):
         """
         Geometrically correct merge implementation with optimized intersection handling.
@@ -941,6 +1038,32 @@ class MARE2DEMPolyManager():
         """
         print("🔧 Geometrically correct merge processing...")
         
+        merged_vertices, merged_segments, merged_holes = self._merge_geometry(
+            vertices1, segments1, holes1, vertices2, segments2, holes2
+        )
+        
+        if output_file_without_regions: # if output file without regions is specified, write the file
+            print(f'write poly file without regions to {output_file_without_regions}')
+            self.parser.write_poly_file(output_file_without_regions, merged_vertices, merged_segments, merged_holes, None)
+        
+        # merged_regions = self._merge_regions_correct(regions1, regions2)
+        merged_regions = self._determine_regions_from_geometry(
+            merged_vertices, merged_segments, regions1, regions2
+        )
+        
+        return merged_vertices, merged_segments, merged_holes, merged_regions
+    
+    def _merge_geometry(self, vertices1, segments1, holes1, vertices2, segments2, holes2):
+        """
+        Merge vertices, segments and holes of two models, splitting crossing segments.
+        
+        Region seeds are not touched, so intermediate mosaic steps can skip the
+        triangulation that `_determine_regions_from_geometry` needs.
+        
+        Returns:
+            tuple: (merged_vertices, merged_segments, merged_holes) with vertex IDs
+                numbered contiguously from 1
+        """
         # Step 1: Merge vertices with duplicate detection
         merged_vertices, vertex_mapping1, vertex_mapping2 = self._merge_vertices_correct(vertices1, vertices2)
         
@@ -970,23 +1093,21 @@ class MARE2DEMPolyManager():
             # No intersections, use normal segment merge
             merged_segments = self._merge_segments_correct(segments1, segments2, vertex_mapping1, vertex_mapping2, merged_vertices)
         
-        # Step 3: Merge holes and regions
+        # Step 3: Merge holes
         merged_holes = self._merge_holes_correct(holes1, holes2)
         
-        if output_file_without_regions: # if output file without regions is specified, write the file
-            print(f'write poly file without regions to {output_file_without_regions}')
-            self.parser.write_poly_file(output_file_without_regions, merged_vertices, merged_segments, merged_holes, None)
-        
-        # merged_regions = self._merge_regions_correct(regions1, regions2)
-        merged_regions = self._determine_regions_from_geometry(
-            merged_vertices, merged_segments, regions1, regions2
-        )
-        
-        return merged_vertices, merged_segments, merged_holes, merged_regions
+        return merged_vertices, merged_segments, merged_holes
     
     def _merge_vertices_correct(self, vertices1, vertices2):
         """
-        High-performance vertex merging using spatial hashing.
+        Vertex merging with KD-tree snapping.
+        
+        All vertices of both files are indexed in one KD-tree and every pair closer
+        than `self.tolerance` on both axes is found in a single query. Pairs are
+        joined transitively, so chains of near-coincident points collapse into one
+        vertex. Vertices of file 1 are all kept; a vertex of file 2 maps to the
+        lowest-ordered vertex of its group (see `vertex_snapping.snap_vertices`).
+        The snap statistics are stored in `self.last_snap_stats`.
         
         Returns:
             tuple: (merged_vertices, vertex_mapping1, vertex_mapping2)
@@ -994,76 +1115,41 @@ class MARE2DEMPolyManager():
                 - vertex_mapping1: Maps old vertex IDs from file1 to new IDs
                 - vertex_mapping2: Maps old vertex IDs from file2 to new IDs
         """
-        merged_vertices = {}
-        vertex_mapping1 = {}  # old_id -> new_id for file 1
-        vertex_mapping2 = {}  # old_id -> new_id for file 2
-        next_id = 1
+        old_ids = list(vertices1.keys()) + list(vertices2.keys())
+        all_vertices = list(vertices1.values()) + list(vertices2.values())
+        points = np.array(
+            [(vertex['hCoor'], vertex['vCoor']) for vertex in all_vertices], dtype=float
+        ).reshape(-1, 2)
         
-        # Spatial hash for fast duplicate detection (grid-based)
-        grid_size = max(self.tolerance * 10, 1e-8)  # Grid size based on tolerance
-        spatial_hash = {}  # hash_key -> list of vertex_ids
-        
-        def get_hash_key(x, y):
-            return (int(x / grid_size), int(y / grid_size))
-        
-        def find_duplicate_in_grid(vertex):
-            """Find duplicate vertex by checking grid cell and neighbors."""
-            x, y = vertex['hCoor'], vertex['vCoor']
-            # Check the grid cell and its 8 neighbors
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    grid_key = (int(x / grid_size) + dx, int(y / grid_size) + dy)
-                    if grid_key in spatial_hash:
-                        for existing_id in spatial_hash[grid_key]:
-                            existing_vertex = merged_vertices[existing_id]
-                            if (abs(vertex['hCoor'] - existing_vertex['hCoor']) < self.tolerance and
-                                abs(vertex['vCoor'] - existing_vertex['vCoor']) < self.tolerance):
-                                return existing_id
-            return None
+        representatives, snap_stats = snap_vertices(points, self.tolerance, fixed_count=len(vertices1))
+        self.last_snap_stats = snap_stats
         
-        # Add all vertices from file 1
-        for old_id, vertex in vertices1.items():
-            merged_vertices[next_id] = {
-                'hCoor': vertex['hCoor'],
-                'vCoor': vertex['vCoor']
-            }
-            vertex_mapping1[old_id] = next_id
-            hash_key = get_hash_key(vertex['hCoor'], vertex['vCoor'])
-            if hash_key not in spatial_hash:
-                spatial_hash[hash_key] = []
-            spatial_hash[hash_key].append(next_id)
-            next_id += 1
+        # Kept vertices are numbered in file order: file 1 first, then new file 2 vertices
+        kept = representatives == np.arange(len(points))
+        new_ids = np.cumsum(kept)
+        merged_ids = new_ids[representatives].tolist()
         
-        # Add vertices from file 2, checking for duplicates using spatial hash
-        duplicates_found = 0
-        for old_id, vertex in vertices2.items():
-            duplicate_id = find_duplicate_in_grid(vertex)
-            
-            if duplicate_id is not None:
-                # This is a duplicate - map to existing vertex
-                vertex_mapping2[old_id] = duplicate_id
-                duplicates_found += 1
-                continue
-            
-            # New unique vertex
-            merged_vertices[next_id] = {
+        merged_vertices = {}
+        for index in np.flatnonzero(kept).tolist():
+            vertex = all_vertices[index]
+            merged_vertices[merged_ids[index]] = {
                 'hCoor': vertex['hCoor'],
                 'vCoor': vertex['vCoor']
             }
-            vertex_mapping2[old_id] = next_id
-            hash_key = get_hash_key(vertex['hCoor'], vertex['vCoor'])
-            if hash_key not in spatial_hash:
-                spatial_hash[hash_key] = []
-            spatial_hash[hash_key].append(next_id)
-            next_id += 1
+        vertex_mapping1 = dict(zip(old_ids[:len(vertices1)], merged_ids[:len(vertices1)]))
+        vertex_mapping2 = dict(zip(old_ids[len(vertices1):], merged_ids[len(vertices1):]))
         
-        if duplicates_found > 0:
-            print(f"  ✓ Removed {duplicates_found:,} duplicate vertices")
+        if snap_stats.snapped_vertices > 0:
+            print(f"  ✓ Removed {snap_stats.snapped_vertices:,} duplicate vertices")
+        if snap_stats.chained_groups > 0:
+            print(f"  ⚠️ {snap_stats.chained_groups:,} snap groups were joined through chains of near-coincident points")
         
         print(f"  📊 Vertex merge summary:")
         print(f"     File 1: {len(vertices1):,} vertices -> {len(vertex_mapping1):,} mapped")
         print(f"     File 2: {len(vertices2):,} vertices -> {len(vertex_mapping2):,} mapped")
         print(f"     Merged: {len(merged_vertices):,} unique vertices")
+        print(f"     Snapping: {snap_stats.close_pairs:,} close pairs, "
+              f"{snap_stats.snap_groups:,} groups, max snap distance {snap_stats.max_snap_distance:.2e}")
         
         return merged_vertices, vertex_mapping1, vertex_mapping2
     
@@ -1308,7 +1394,7 @@ class MARE2DEMPolyManager():
                 if tri_idx != -1:
                     if tri_idx not in tri_to_orig_regions:
                         tri_to_orig_regions[tri_idx] = []
-                    tri_to_orig_regions[tri_idx].append(all_original_regions[i])
+                    tri_to_orig_regions[tri_idx].append(i)
 
         for region_id in range(current_region_id):
             # Find all triangles belonging to this new region
@@ -1330,8 +1416,9 @@ class MARE2DEMPolyManager():
 
             if contained_original_regions:
                 # An original point lies in this new region. Use its properties.
-                # If multiple original points end up in the same new region, we use the first one.
-                first_orig_region = contained_original_regions[0]
+                # If multiple original points end up in the same new region, the one listed
+                # first in the input wins, so earlier files take priority where models overlap.
+                first_orig_region = all_original_regions[min(contained_original_regions)]
                 # print(f"  ✓ Mapping new region {new_region_id} to original region {first_orig_region['id']}.")
                 hCoor = first_orig_region['hCoor']
                 vCoor = first_orig_region['vCoor']
@@ -1407,13 +1494,23 @@ class MARE2DEMPolyManager():
         
         return merged_regions
     
+    def _segment_coordinate_array(self, segments, vertex_mapping, merged_vertices):
+        """Return an `(n, 4)` array of mapped `x1, y1, x2, y2` segment coordinates."""
+        coordinates = np.empty((len(segments), 4), dtype=float)
+        for i, segment in enumerate(segments):
+            p1 = merged_vertices[vertex_mapping[segment['endpoint_1']]]
+            p2 = merged_vertices[vertex_mapping[segment['endpoint_2']]]
+            coordinates[i] = (p1['hCoor'], p1['vCoor'], p2['hCoor'], p2['vCoor'])
+        return coordinates
+    
     def _find_intersections_optimized(self, segments1, segments2, merged_vertices, vertex_mapping1, vertex_mapping2):
         """
-        Optimized intersection detection using pyqtree spatial indexing for better performance.
+        Vectorized intersection detection between the segments of both files.
         
-        Uses pyqtree (quadtree) to reduce the number of segment pairs that need to be checked,
-        reducing complexity from O(n²) to approximately O(n log n) in practice.
-        This should help avoid triangulation hanging issues.
+        Segments are binned into a uniform grid with array operations, candidate
+        pairs are generated in bulk and all orientation tests are evaluated at once
+        (see `segment_intersections.find_segment_intersections`). Each crossing is
+        the same point `_calculate_line_intersection` returns for that pair.
         
         Args:
             segments1, segments2: Segment lists from both files
@@ -1421,252 +1518,37 @@ class MARE2DEMPolyManager():
             vertex_mapping1, vertex_mapping2: Vertex ID mappings
             
         Returns:
-            tuple: (intersection_vertices, intersection_info)
+            tuple: (intersection_vertices, intersection_info), ordered by file 2
+                segment index and then file 1 segment index
         """
-        try:
-            import pyqtree
-        except ImportError:
-            print("⚠️ Warning: pyqtree not available, falling back to basic spatial grid")
-            return self._find_intersections_basic_grid(segments1, segments2, merged_vertices, vertex_mapping1, vertex_mapping2)
-        
         intersection_vertices = {}
         intersection_info = []
-        next_vertex_id = max(merged_vertices.keys()) + 1
-        
-        # Calculate bounding box for quadtree
-        all_x = []
-        all_y = []
-        for vertex in merged_vertices.values():
-            all_x.append(vertex['hCoor'])
-            all_y.append(vertex['vCoor'])
-        
-        if not all_x:
+        if not merged_vertices:
             return intersection_vertices, intersection_info
-        
-        min_x, max_x = min(all_x), max(all_x)
-        min_y, max_y = min(all_y), max(all_y)
-        
-        # Add small padding to avoid edge issues
-        padding = max((max_x - min_x), (max_y - min_y)) * 0.01
-        min_x -= padding
-        max_x += padding
-        min_y -= padding
-        max_y += padding
-        
-        print(f"  Using pyqtree with bounds: ({min_x:.2e}, {min_y:.2e}) to ({max_x:.2e}, {max_y:.2e})")
-        
-        # Create quadtree for segments from file 1
-        # Use max_depth to prevent excessive subdivision
-        max_depth = min(10, max(4, int(len(segments1) ** 0.25)))
-        quadtree = pyqtree.Index(bbox=[min_x, min_y, max_x, max_y], max_depth=max_depth)
-        
-        # Insert segments from file 1 into quadtree
-        segment_objects = []
-        for i, seg1 in enumerate(segments1):
-            v1_id = vertex_mapping1[seg1['endpoint_1']]
-            v2_id = vertex_mapping1[seg1['endpoint_2']]
-            p1 = merged_vertices[v1_id]
-            p2 = merged_vertices[v2_id]
-            
-            # Get bounding box of segment
-            seg_min_x = min(p1['hCoor'], p2['hCoor'])
-            seg_max_x = max(p1['hCoor'], p2['hCoor'])
-            seg_min_y = min(p1['vCoor'], p2['vCoor'])
-            seg_max_y = max(p1['vCoor'], p2['vCoor'])
-            
-            # Create segment object with metadata
-            seg_obj = {
-                'index': i,
-                'segment': seg1,
-                'p1': p1,
-                'p2': p2,
-                'bbox': [seg_min_x, seg_min_y, seg_max_x, seg_max_y]
-            }
-            segment_objects.append(seg_obj)
-            
-            # Insert into quadtree
-            quadtree.insert(seg_obj, seg_obj['bbox'])
-        
-        print(f"  Inserted {len(segment_objects)} segments into quadtree (max_depth={max_depth})")
-        
-        # Check segments from file 2 against quadtree
-        checked_pairs = set()
-        intersections_found = 0
-        
-        for j, seg2 in enumerate(segments2):
-            v3_id = vertex_mapping2[seg2['endpoint_1']]
-            v4_id = vertex_mapping2[seg2['endpoint_2']]
-            p3 = merged_vertices[v3_id]
-            p4 = merged_vertices[v4_id]
-            
-            # Get bounding box of segment
-            seg_min_x = min(p3['hCoor'], p4['hCoor'])
-            seg_max_x = max(p3['hCoor'], p4['hCoor'])
-            seg_min_y = min(p3['vCoor'], p4['vCoor'])
-            seg_max_y = max(p3['vCoor'], p4['vCoor'])
-            
-            # Query quadtree for potential intersections
-            query_bbox = [seg_min_x, seg_min_y, seg_max_x, seg_max_y]
-            potential_segments = quadtree.intersect(query_bbox)
-            
-            # Check actual intersections only with potential candidates
-            for seg_obj in potential_segments:
-                i = seg_obj['index']
-                pair_key = (min(i, j), max(i, j))
-                if pair_key in checked_pairs:
-                    continue
-                checked_pairs.add(pair_key)
-                
-                # Calculate intersection
-                intersection_point = self._calculate_line_intersection(seg_obj['p1'], seg_obj['p2'], p3, p4)
-                
-                if intersection_point is not None:
-                    # Create intersection vertex
-                    intersection_vertices[next_vertex_id] = {
-                        'hCoor': intersection_point[0],
-                        'vCoor': intersection_point[1]
-                    }
-                    
-                    intersection_info.append({
-                        'intersection_vertex_id': next_vertex_id,
-                        'intersection_point': intersection_point,
-                        'seg1_idx': i,
-                        'seg2_idx': j,
-                        'file1_segment': seg_obj['segment'],
-                        'file2_segment': seg2
-                    })
-                    
-                    next_vertex_id += 1
-                    intersections_found += 1
-        
-        print(f"  Checked {len(checked_pairs)} segment pairs (reduced from {len(segments1) * len(segments2)})")
-        print(f"  Found {intersections_found} intersections using pyqtree")
-        
-        return intersection_vertices, intersection_info
-    
-    def _find_intersections_basic_grid(self, segments1, segments2, merged_vertices, vertex_mapping1, vertex_mapping2):
-        """
-        Fallback intersection detection using basic spatial grid when pyqtree is not available.
-        """
-        from collections import defaultdict
-        
-        intersection_vertices = {}
-        intersection_info = []
         next_vertex_id = max(merged_vertices.keys()) + 1
         
-        # Calculate bounding box for spatial grid
-        all_x = []
-        all_y = []
-        for vertex in merged_vertices.values():
-            all_x.append(vertex['hCoor'])
-            all_y.append(vertex['vCoor'])
-        
-        if not all_x:
-            return intersection_vertices, intersection_info
-        
-        min_x, max_x = min(all_x), max(all_x)
-        min_y, max_y = min(all_y), max(all_y)
-        
-        # Auto-calculate grid size based on data extent
-        extent_x = max_x - min_x
-        extent_y = max_y - min_y
-        avg_extent = (extent_x + extent_y) / 2
-        grid_size = max(avg_extent / 100, 1e-6)  # Adaptive grid size
-        
-        print(f"  Using fallback spatial grid with size: {grid_size:.2e}")
-        
-        # Create spatial grid for segments from file 1
-        spatial_grid = defaultdict(list)
+        coordinates1 = self._segment_coordinate_array(segments1, vertex_mapping1, merged_vertices)
+        coordinates2 = self._segment_coordinate_array(segments2, vertex_mapping2, merged_vertices)
+        seg1_indices, seg2_indices, points = find_segment_intersections(
+            coordinates1, coordinates2, self.tolerance
+        )
         
-        for i, seg1 in enumerate(segments1):
-            v1_id = vertex_mapping1[seg1['endpoint_1']]
-            v2_id = vertex_mapping1[seg1['endpoint_2']]
-            p1 = merged_vertices[v1_id]
-            p2 = merged_vertices[v2_id]
-            
-            # Get bounding box of segment
-            seg_min_x = min(p1['hCoor'], p2['hCoor'])
-            seg_max_x = max(p1['hCoor'], p2['hCoor'])
-            seg_min_y = min(p1['vCoor'], p2['vCoor'])
-            seg_max_y = max(p1['vCoor'], p2['vCoor'])
-            
-            # Add segment to all grid cells it overlaps
-            min_cell_x = int(seg_min_x / grid_size)
-            max_cell_x = int(seg_max_x / grid_size)
-            min_cell_y = int(seg_min_y / grid_size)
-            max_cell_y = int(seg_max_y / grid_size)
-            
-            for cell_x in range(min_cell_x, max_cell_x + 1):
-                for cell_y in range(min_cell_y, max_cell_y + 1):
-                    spatial_grid[(cell_x, cell_y)].append(i)
-        
-        # Check segments from file 2 against spatial index
-        checked_pairs = set()
-        intersections_found = 0
-        
-        for j, seg2 in enumerate(segments2):
-            v3_id = vertex_mapping2[seg2['endpoint_1']]
-            v4_id = vertex_mapping2[seg2['endpoint_2']]
-            p3 = merged_vertices[v3_id]
-            p4 = merged_vertices[v4_id]
-            
-            # Get bounding box of segment
-            seg_min_x = min(p3['hCoor'], p4['hCoor'])
-            seg_max_x = max(p3['hCoor'], p4['hCoor'])
-            seg_min_y = min(p3['vCoor'], p4['vCoor'])
-            seg_max_y = max(p3['vCoor'], p4['vCoor'])
-            
-            # Find grid cells this segment overlaps
-            min_cell_x = int(seg_min_x / grid_size)
-            max_cell_x = int(seg_max_x / grid_size)
-            min_cell_y = int(seg_min_y / grid_size)
-            max_cell_y = int(seg_max_y / grid_size)
-            
-            # Collect potential intersecting segments
-            potential_segments = set()
-            for cell_x in range(min_cell_x, max_cell_x + 1):
-                for cell_y in range(min_cell_y, max_cell_y + 1):
-                    if (cell_x, cell_y) in spatial_grid:
-                        for seg1_idx in spatial_grid[(cell_x, cell_y)]:
-                            potential_segments.add(seg1_idx)
-            
-            # Check actual intersections only with potential candidates
-            for i in potential_segments:
-                pair_key = (min(i, j), max(i, j))
-                if pair_key in checked_pairs:
-                    continue
-                checked_pairs.add(pair_key)
-                
-                seg1 = segments1[i]
-                v1_id = vertex_mapping1[seg1['endpoint_1']]
-                v2_id = vertex_mapping1[seg1['endpoint_2']]
-                p1 = merged_vertices[v1_id]
-                p2 = merged_vertices[v2_id]
-                
-                # Calculate intersection
-                intersection_point = self._calculate_line_intersection(p1, p2, p3, p4)
-                
-                if intersection_point is not None:
-                    # Create intersection vertex
-                    intersection_vertices[next_vertex_id] = {
-                        'hCoor': intersection_point[0],
-                        'vCoor': intersection_point[1]
-                    }
-                    
-                    intersection_info.append({
-                        'intersection_vertex_id': next_vertex_id,
-                        'intersection_point': intersection_point,
-                        'seg1_idx': i,
-                        'seg2_idx': j,
-                        'file1_segment': seg1,
-                        'file2_segment': seg2
-                    })
-                    
-                    next_vertex_id += 1
-                    intersections_found += 1
+        for i, j, (x, y) in zip(seg1_indices.tolist(), seg2_indices.tolist(), points.tolist()):
+            intersection_vertices[next_vertex_id] = {
+                'hCoor': x,
+                'vCoor': y
+            }
+            intersection_info.append({
+                'intersection_vertex_id': next_vertex_id,
+                'intersection_point': (x, y),
+                'seg1_idx': i,
+                'seg2_idx': j,
+                'file1_segment': segments1[i],
+                'file2_segment': segments2[j]
+            })
+            next_vertex_id += 1
         
-        print(f"  Checked {len(checked_pairs)} segment pairs (reduced from {len(segments1) * len(segments2)})")
-        print(f"  Found {intersections_found} intersections using fallback grid")
+        print(f"  Found {len(intersection_info)} intersections using vectorized grid")
         
         return intersection_vertices, intersection_info
     
@@ -1725,13 +1607,15 @@ class MARE2DEMPolyManager():
         segments_with_intersections = 0
         total_intersections = 0
         
+        # Group intersections by segment once instead of scanning per segment
+        index_key = 'seg1_idx' if file_name == 'file1' else 'seg2_idx'
+        intersections_by_segment = {}
+        for info in intersection_info:
+            intersections_by_segment.setdefault(info[index_key], []).append(info)
+        
         for i, segment in enumerate(segments):
             # Find intersections for this segment
-            segment_intersections = [
-                info for info in intersection_info
-                if (file_name == 'file1' and info['seg1_idx'] == i) or
-                   (file_name == 'file2' and info['seg2_idx'] == i)
-            ]
+            segment_intersections = intersections_by_segment.get(i, [])
             
             if not segment_intersections:
                 # No intersections, keep original segment with mapped vertex IDs
@@ -1922,3 +1806,27 @@ class MARE2DEMPolyManager():
         else:
             print("✅ Validation passed - poly file is valid")
             return True
+
+
+def _renumber_poly_piece(vertices, segments, holes):
+    """Renumber vertices from 1 in file order, as merge steps produce, and remap segments."""
+    vertex_ids = {old_id: new_id for new_id, old_id in enumerate(vertices, start=1)}
+    renumbered_vertices = {vertex_ids[old_id]: vertex for old_id, vertex in vertices.items()}
+    renumbered_segments = []
+    for segment in segments:
+        new_segment = segment.copy()
+        new_segment['endpoint_1'] = vertex_ids[segment['endpoint_1']]
+        new_segment['endpoint_2'] = vertex_ids[segment['endpoint_2']]
+        renumbered_segments.append(new_segment)
+    return renumbered_vertices, renumbered_segments, list(holes)
+
+
+def _merge_mosaic_pair(task):
+    """Process pool worker: merge the geometry of two mosaic pieces."""
+    tolerance, min_angle_degrees, piece1, piece2 = task
+    manager = MARE2DEMPolyManager()
+    manager.tolerance = tolerance
+    manager.min_angle_degrees = min_angle_degrees
+    vertices1, segments1, holes1 = piece1
+    vertices2, segments2, holes2 = piece2
+    return manager._merge_geometry(vertices1, segments1, holes1, vertices2, segments2, holes2)
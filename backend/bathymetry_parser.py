@@ -1,77 +1,41 @@
+import heapq
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from bathymetry_reader import BathymetryArrayCache, read_bathymetry_columns
+from profile_downsampling import build_min_max_pyramid
 
 class BathymetryParser:
     """Parser for bathymetry text files containing inline distance and depth data."""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[BathymetryArrayCache] = None):
         self.data = None
         self.inline_distance = None
         self.depth = None
+        self.pyramid = None
+        # Parsed columns of previously loaded files, keyed by content hash
+        self.cache = cache
     
     def parse_file(self, file_path: str) -> Dict:
         """
         Parse bathymetry text file.
-        Expected format: two columns (inline_distance, depth) separated by whitespace or comma
+        Expected format: two columns (inline_distance, depth) separated by whitespace, comma or semicolon.
+        The delimiter and any header lines are detected from the head of the file.
         """
         try:
-            # Try to read the file with different separators
-            # First, try to read with automatic whitespace detection (handles scientific notation better)
-            try:
-                # Try whitespace-separated (most common for scientific data)
-                self.data = pd.read_csv(file_path, sep=r'\s+', header=None, usecols=[0, 1], names=['inline_distance', 'depth'])
-                print(f"Successfully read with whitespace separator. Shape: {self.data.shape}")
-            except Exception as e1:
-                print(f"Whitespace separation failed: {e1}")
-                try:
-                    # Try comma-separated
-                    self.data = pd.read_csv(file_path, sep=',', header=None, usecols=[0, 1], names=['inline_distance', 'depth'])
-                    print(f"Successfully read with comma separator. Shape: {self.data.shape}")
-                except Exception as e2:
-                    print(f"Comma separation failed: {e2}")
-                    # Try tab-separated
-                    self.data = pd.read_csv(file_path, sep='\t', header=None, usecols=[0, 1], names=['inline_distance', 'depth'])
-                    print(f"Successfully read with tab separator. Shape: {self.data.shape}")
-            
-            print(f"Raw data columns: {list(self.data.columns)}")
-            print(f"Raw data shape: {self.data.shape}")
-            print("First few rows of raw data:")
-            print(self.data.head())
-            
-            # Clean the data
-            self.data = self.data.dropna()
-            
-            # Convert to numeric, coercing errors to NaN (handles scientific notation automatically)
-            print("Converting to numeric...")
-            self.data['inline_distance'] = pd.to_numeric(self.data['inline_distance'], errors='coerce')
-            self.data['depth'] = pd.to_numeric(self.data['depth'], errors='coerce')
-            
-            # Check for conversion issues
-            nan_distance = self.data['inline_distance'].isna().sum()
-            nan_depth = self.data['depth'].isna().sum()
-            if nan_distance > 0:
-                print(f"Warning: {nan_distance} inline_distance values could not be converted to numbers")
-            if nan_depth > 0:
-                print(f"Warning: {nan_depth} depth values could not be converted to numbers")
-            
-            # Drop any rows with NaN values
-            original_count = len(self.data)
-            self.data = self.data.dropna()
-            final_count = len(self.data)
+            if self.cache is not None:
+                self.inline_distance, self.depth = self.cache.read(file_path)
+            else:
+                self.inline_distance, self.depth = read_bathymetry_columns(file_path)
             
-            if final_count < original_count:
-                print(f"Dropped {original_count - final_count} rows with invalid data")
-                
-            if final_count == 0:
+            if len(self.inline_distance) == 0:
                 raise ValueError("No valid data points found after parsing and cleaning")
             
-            # Sort by inline distance
-            self.data = self.data.sort_values('inline_distance')
+            self.data = pd.DataFrame({'inline_distance': self.inline_distance, 'depth': self.depth}, copy=False)
             
-            # Extract arrays and ensure they're numpy arrays
-            self.inline_distance = np.array(self.data['inline_distance'].values)
-            self.depth = np.array(self.data['depth'].values)
+            # Min/max pyramid for drawing zoomed views without sending every point
+            self.pyramid = build_min_max_pyramid(self.inline_distance, self.depth)
             
             print(f"Final data shape: {len(self.inline_distance)} points")
             print(f"Distance range: {self.inline_distance.min()} to {self.inline_distance.max()}")
@@ -81,7 +45,7 @@ class BathymetryParser:
                 'success': True,
                 'inline_distance': self.inline_distance.tolist(),
                 'depth': self.depth.tolist(),
-                'num_points': len(self.data),
+                'num_points': len(self.inline_distance),
                 'distance_range': [float(self.inline_distance.min()), float(self.inline_distance.max())],
                 'depth_range': [float(self.depth.min()), float(self.depth.max())]
             }
@@ -110,7 +74,8 @@ class BathymetryParser:
         
         Args:
             method: Simplification method ('uniform', 'douglas_peucker', 'adaptive')
-            target_points: Target number of points for uniform sampling
+            target_points: Target number of points. For Douglas-Peucker this is a budget:
+                the smallest tolerance that keeps at most this many points is used
             tolerance: Tolerance for Douglas-Peucker algorithm (in depth units)
             distance_range: Tuple of (start_distance, end_distance) to simplify only a specific range
             save_path: Path to save the simplified data
@@ -176,10 +141,9 @@ class BathymetryParser:
                 simplified_range_depths = range_depths[indices]
                 
             elif method == 'douglas_peucker':
-                if tolerance is None:
-                    depth_range = np.max(range_depths) - np.min(range_depths)
-                    tolerance = depth_range * 0.01
-                simplified_indices = self._douglas_peucker_2d(range_distances, range_depths, tolerance)
+                tolerance = self._douglas_peucker_tolerance(range_depths, target_points, tolerance)
+                simplified_indices, effective_tolerance = self._douglas_peucker_2d(
+                    range_distances, range_depths, tolerance, max_points=target_points)
                 simplified_range_distances = range_distances[simplified_indices]
                 simplified_range_depths = range_depths[simplified_indices]
                 
@@ -234,10 +198,9 @@ class BathymetryParser:
                 simplified_depths = filtered_depths[indices]
                 
             elif method == 'douglas_peucker':
-                if tolerance is None:
-                    depth_range = np.max(filtered_depths) - np.min(filtered_depths)
-                    tolerance = depth_range * 0.01
-                simplified_indices = self._douglas_peucker_2d(filtered_distances, filtered_depths, tolerance)
+                tolerance = self._douglas_peucker_tolerance(filtered_depths, target_points, tolerance)
+                simplified_indices, effective_tolerance = self._douglas_peucker_2d(
+                    filtered_distances, filtered_depths, tolerance, max_points=target_points)
                 simplified_distances = filtered_distances[simplified_indices]
                 simplified_depths = filtered_depths[simplified_indices]
                 
@@ -281,6 +244,9 @@ class BathymetryParser:
             'depth_range': [float(simplified_depths.min()), float(simplified_depths.max())]
         }
         
+        if method == 'douglas_peucker':
+            result['tolerance'] = effective_tolerance
+        
         # Add range-specific information if distance_range was used
         if distance_range is not None:
             result.update({
@@ -295,53 +261,85 @@ class BathymetryParser:
             
         return result
     
-    def _douglas_peucker_2d(self, x: np.ndarray, y: np.ndarray, tolerance: float) -> np.ndarray:
+    @staticmethod
+    def _douglas_peucker_tolerance(depths: np.ndarray, target_points: int | None,
+                                   tolerance: float | None) -> float:
+        """
+        Tolerance for Douglas-Peucker: the given one, none when only a point budget
+        is given (the budget then decides), else 1% of the depth range.
+        """
+        if tolerance is not None:
+            return tolerance
+        if target_points is not None:
+            return 0.0
+        return float(np.max(depths) - np.min(depths)) * 0.01
+    
+    def _douglas_peucker_2d(self, x: np.ndarray, y: np.ndarray, tolerance: float,
+                            max_points: int | None = None) -> Tuple[np.ndarray, float]:
         """
         Douglas-Peucker algorithm for 2D line simplification.
+        
+        Spans wait on an explicit heap instead of the call stack, and the
+        distances of a whole span are computed in one vectorized call. A span
+        is ranked by the smallest farthest-point distance along its chain of
+        parent spans, which is the largest tolerance at which it would still
+        be split. Spans are split in that order while their rank exceeds
+        `tolerance`. With `max_points`, splitting also stops once that many
+        points are kept. This lowers the tolerance one split at a time, so the
+        budget is met by the smallest tolerance that fits it (spans of equal
+        rank at the cut-off may be split only in part).
+        
+        Returns:
+            (indices, tolerance): Sorted kept indices and the effective tolerance,
+            i.e. the highest rank of any span that was not split.
         """
-        def perpendicular_distance(point, line_start, line_end):
-            """Calculate perpendicular distance from point to line."""
-            if np.array_equal(line_start, line_end):
-                return np.linalg.norm(point - line_start)
-            
-            line_vec = line_end - line_start
-            point_vec = point - line_start
-            line_len = np.linalg.norm(line_vec)
-            
-            if line_len == 0:
-                return np.linalg.norm(point_vec)
-            
-            t = np.dot(point_vec, line_vec) / (line_len * line_len)
-            t = np.clip(t, 0, 1)
-            projection = line_start + t * line_vec
-            return np.linalg.norm(point - projection)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        count = len(x)
+        keep = np.zeros(count, dtype=bool)
+        if count == 0:
+            return np.flatnonzero(keep), 0.0
+        keep[[0, count - 1]] = True
         
-        def douglas_peucker_recursive(points, start_idx, end_idx, tolerance):
-            """Recursive Douglas-Peucker implementation."""
-            if end_idx - start_idx <= 1:
-                return [start_idx, end_idx]
-            
-            # Find point with maximum distance from line
-            max_dist = 0
-            max_idx = start_idx
-            
-            for i in range(start_idx + 1, end_idx):
-                dist = perpendicular_distance(points[i], points[start_idx], points[end_idx])
-                if dist > max_dist:
-                    max_dist = dist
-                    max_idx = i
-            
-            # If max distance is greater than tolerance, recursively simplify
-            if max_dist > tolerance:
-                left_result = douglas_peucker_recursive(points, start_idx, max_idx, tolerance)
-                right_result = douglas_peucker_recursive(points, max_idx, end_idx, tolerance)
-                return left_result[:-1] + right_result
+        def farthest_point(start_idx, end_idx):
+            """Return (distance, index) of the point farthest from segment start-end."""
+            start_x, start_y = x[start_idx], y[start_idx]
+            line_x = x[end_idx] - start_x
+            line_y = y[end_idx] - start_y
+            point_x = x[start_idx + 1:end_idx] - start_x
+            point_y = y[start_idx + 1:end_idx] - start_y
+            line_len_sq = line_x * line_x + line_y * line_y
+            if line_len_sq == 0:
+                offset_x, offset_y = point_x, point_y
             else:
-                return [start_idx, end_idx]
+                line_len = np.sqrt(line_len_sq)
+                t = np.clip((point_x * line_x + point_y * line_y) / (line_len * line_len), 0, 1)
+                offset_x = x[start_idx + 1:end_idx] - (start_x + t * line_x)
+                offset_y = y[start_idx + 1:end_idx] - (start_y + t * line_y)
+            distances = np.sqrt(offset_x * offset_x + offset_y * offset_y)
+            max_offset = int(np.argmax(distances))
+            return float(distances[max_offset]), start_idx + 1 + max_offset
+        
+        heap = []
+        if count > 2:
+            max_dist, max_idx = farthest_point(0, count - 1)
+            heap.append((-max_dist, 0, count - 1, max_idx))
+        kept = int(keep.sum())
+        
+        while heap and -heap[0][0] > tolerance:
+            if max_points is not None and kept >= max_points:
+                break
+            priority, start_idx, end_idx, max_idx = heapq.heappop(heap)
+            keep[max_idx] = True
+            kept += 1
+            for span_start, span_end in ((start_idx, max_idx), (max_idx, end_idx)):
+                if span_end - span_start > 1:
+                    max_dist, split_idx = farthest_point(span_start, span_end)
+                    # A span is only split if its parent was, so it never ranks above it
+                    heapq.heappush(heap, (max(-max_dist, priority), span_start, span_end, split_idx))
         
-        points = np.column_stack((x, y))
-        indices = douglas_peucker_recursive(points, 0, len(points) - 1, tolerance)
-        return np.array(indices)
+        effective_tolerance = max(-heap[0][0], 0.0) if heap else 0.0
+        return np.flatnonzero(keep), effective_tolerance
     
     def _adaptive_sampling(self, x: np.ndarray, y: np.ndarray, target_points: int) -> np.ndarray:
         """
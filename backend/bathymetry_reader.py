@@ -0,0 +1,196 @@
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Bytes read from the head of a file to pick the delimiter and skip headers.
+SNIFF_BYTES = 64 * 1024
+# Bump when the parsing rules change so stale cache entries are not reused.
+CACHE_FORMAT_VERSION = 1
+
+_HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def _split_fields(line: str, delimiter: Optional[str]) -> List[str]:
+    if delimiter is None:
+        return line.split()
+    return [field.strip() for field in line.split(delimiter)]
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def sniff_bathymetry_layout(sample: bytes) -> Tuple[Optional[str], int]:
+    """Return `(delimiter, header_lines)` for the head of a bathymetry file.
+
+    The delimiter is `,` or `;` when every data line of the sample contains
+    it and None for whitespace-separated columns. Leading lines whose first
+    two fields are not numbers are counted as header lines.
+    """
+
+    text = sample.decode("utf-8", errors="replace").lstrip("\ufeff")
+    lines = text.splitlines()
+    if len(sample) >= SNIFF_BYTES and lines:
+        # The last line may be cut off mid-number.
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()]
+
+    delimiter = None
+    for candidate in (";", ","):
+        data_lines = [line for line in lines if any(char.isdigit() for char in line)]
+        if data_lines and all(candidate in line for line in data_lines):
+            delimiter = candidate
+            break
+
+    header_lines = 0
+    for line in text.splitlines():
+        if not line.strip():
+            header_lines += 1
+            continue
+        fields = _split_fields(line, delimiter)
+        if len(fields) >= 2 and _is_number(fields[0]) and _is_number(fields[1]):
+            break
+        header_lines += 1
+    return delimiter, header_lines
+
+
+def _read_columns(file_path: str, delimiter: Optional[str], skip_rows: int, **options) -> pd.DataFrame:
+    return pd.read_csv(
+        file_path,
+        sep=delimiter if delimiter is not None else r"\s+",
+        header=None,
+        skiprows=skip_rows,
+        usecols=[0, 1],
+        names=["inline_distance", "depth"],
+        engine="c",
+        encoding="utf-8-sig",
+        **options,
+    )
+
+
+def read_bathymetry_columns(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Read the inline distance and depth columns of a bathymetry text file.
+
+    The file is parsed once by the pandas C engine straight into float64
+    columns. Files with stray non-numeric rows after the header fall back to
+    a tolerant read that drops those rows. Rows with a missing or non-numeric
+    value are dropped and the result is sorted by inline distance, with the
+    sort skipped when the file is already in order.
+
+    Returns:
+        tuple: `(inline_distance, depth)` float64 arrays.
+    """
+
+    with open(file_path, "rb") as handle:
+        sample = handle.read(SNIFF_BYTES)
+    delimiter, header_lines = sniff_bathymetry_layout(sample)
+
+    try:
+        table = _read_columns(file_path, delimiter, header_lines, dtype=np.float64)
+        distance = table["inline_distance"].to_numpy(dtype=np.float64)
+        depth = table["depth"].to_numpy(dtype=np.float64)
+    except ValueError:
+        table = _read_columns(file_path, delimiter, header_lines, dtype=str, na_filter=False)
+        distance = pd.to_numeric(table["inline_distance"], errors="coerce").to_numpy(dtype=np.float64)
+        depth = pd.to_numeric(table["depth"], errors="coerce").to_numpy(dtype=np.float64)
+
+    valid = ~(np.isnan(distance) | np.isnan(depth))
+    if not valid.all():
+        distance, depth = distance[valid], depth[valid]
+    if len(distance) > 1 and not np.all(distance[1:] >= distance[:-1]):
+        order = np.argsort(distance, kind="stable")
+        distance, depth = distance[order], depth[order]
+    return np.ascontiguousarray(distance), np.ascontiguousarray(depth)
+
+
+def hash_file_contents(file_path: str) -> str:
+    """Return a hex digest of the file's bytes."""
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BathymetryArrayCache:
+    """On-disk cache of parsed bathymetry columns keyed by file content hash.
+
+    Entries are `.npy` files holding the sorted `(2, n)` distance/depth array,
+    so reloading a file that was parsed before costs one hash pass and one
+    binary read. The least recently used entries beyond `max_entries` are
+    deleted.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 8):
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), "cseminsight_bathymetry_cache")
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.v{CACHE_FORMAT_VERSION}.npy")
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        path = self._entry_path(key)
+        try:
+            columns = np.load(path, allow_pickle=False)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if columns.ndim != 2 or columns.shape[0] != 2:
+            return None
+        return columns[0], columns[1]
+
+    def put(self, key: str, distance: np.ndarray, depth: np.ndarray) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(key)
+        partial_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(partial_path, "wb") as handle:
+            np.save(handle, np.stack((distance, depth)), allow_pickle=False)
+        os.replace(partial_path, path)
+        with self._lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npy"):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, path in entries[: max(len(entries) - self.max_entries, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def read(self, file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the columns of `file_path`, parsing it only on a cache miss."""
+
+        key = hash_file_contents(file_path)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        distance, depth = read_bathymetry_columns(file_path)
+        try:
+            self.put(key, distance, depth)
+        except OSError:
+            # A read-only or full temp directory only costs the cache.
+            pass
+        return distance, depth
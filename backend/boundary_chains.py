@@ -0,0 +1,187 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def _rank_walks(successors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Follow `successors` from every element by pointer jumping.
+
+    Returns:
+        tuple: `(last, steps, cyclic)` where `last[i]` is the final element of
+            the walk from `i`, `steps[i]` the number of hops to reach it and
+            `cyclic[i]` marks walks that never end.
+    """
+
+    count = len(successors)
+    has_next = successors >= 0
+    safe_next = np.where(has_next, successors, 0)
+    last = np.where(has_next, successors, np.arange(count))
+    steps = has_next.astype(np.int64)
+    pointer = np.where(has_next & has_next[safe_next], successors, -1)
+
+    for _ in range(max(count, 1).bit_length() + 1):
+        active = np.flatnonzero(pointer >= 0)
+        if not len(active):
+            break
+        hop = pointer[active]
+        next_steps = steps[active] + steps[hop]
+        next_last = last[hop]
+        next_pointer = pointer[hop]
+        steps[active] = next_steps
+        last[active] = next_last
+        pointer[active] = next_pointer
+    return last, steps, pointer >= 0
+
+
+def trace_boundary_chains(
+    edges: np.ndarray,
+    groups: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split boundary edges into open chains between non-degree-2 vertices.
+
+    Edges are only connected to edges of the same group. An open chain runs
+    through degree-2 vertices between two distinct end vertices and is
+    ordered from the lower end vertex, which is the direction a walk over
+    sorted start vertices produces. Closed loops are not returned as chains.
+
+    Args:
+        edges: `(k, 2)` vertex index pairs.
+        groups: `(k,)` group id of every edge.
+
+    Returns:
+        tuple: `(path, offsets, chain_groups, open_edges)` where chain `c` is
+            `path[offsets[c]:offsets[c + 1]]` in group `chain_groups[c]` and
+            `open_edges` marks the edges that belong to an open chain.
+    """
+
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    groups = np.asarray(groups, dtype=np.int64).reshape(-1)
+    edge_count = len(edges)
+    empty = np.zeros(0, dtype=np.int64)
+    if not edge_count:
+        return empty, np.zeros(1, dtype=np.int64), empty, np.zeros(0, dtype=bool)
+
+    vertex_span = np.int64(edges.max() + 1)
+    group_keys = groups * vertex_span
+    node_keys, nodes = np.unique(
+        np.concatenate((group_keys + edges[:, 0], group_keys + edges[:, 1])),
+        return_inverse=True,
+    )
+    node_vertices = node_keys % vertex_span
+    degree = np.bincount(nodes, minlength=len(node_keys))
+
+    # Directed edge d < k runs first -> second; d + k runs back.
+    tails = nodes
+    heads = np.concatenate((nodes[edge_count:], nodes[:edge_count]))
+    directed = np.arange(2 * edge_count, dtype=np.int64)
+    reverse = (directed + edge_count) % (2 * edge_count)
+    outgoing = np.argsort(tails, kind="stable")
+    outgoing_start = np.searchsorted(tails[outgoing], np.arange(len(node_keys)))
+    first_out = outgoing[np.minimum(outgoing_start, len(outgoing) - 1)]
+    second_out = outgoing[np.minimum(outgoing_start + 1, len(outgoing) - 1)]
+
+    passes_through = degree[heads] == 2
+    successors = np.where(
+        first_out[heads] == reverse, second_out[heads], first_out[heads]
+    )
+    successors = np.where(passes_through, successors, -1)
+    predecessors = np.where(
+        successors[reverse] >= 0, reverse[np.maximum(successors[reverse], 0)], -1
+    )
+
+    terminal, _, cyclic = _rank_walks(successors)
+    start, position, _ = _rank_walks(predecessors)
+    start_vertex = node_vertices[tails[start]]
+    end_vertex = node_vertices[heads[terminal]]
+    chosen = np.flatnonzero(~cyclic & (start_vertex < end_vertex))
+
+    open_edges = np.zeros(edge_count, dtype=bool)
+    open_edges[chosen % edge_count] = True
+    if not len(chosen):
+        return empty, np.zeros(1, dtype=np.int64), empty, open_edges
+
+    chosen = chosen[np.lexsort((position[chosen], start[chosen]))]
+    is_first = position[chosen] == 0
+    chain_ordinal = np.cumsum(is_first) - 1
+    path = np.empty(len(chosen) + int(is_first.sum()), dtype=np.int64)
+    path[np.arange(len(chosen)) + chain_ordinal + 1] = node_vertices[heads[chosen]]
+    first_slots = np.flatnonzero(is_first) + np.arange(int(is_first.sum()))
+    path[first_slots] = node_vertices[tails[chosen[is_first]]]
+    offsets = np.append(first_slots, len(path))
+    return path, offsets, groups[chosen[is_first] % edge_count], open_edges
+
+
+def simplify_chains(
+    path_points: np.ndarray,
+    offsets: np.ndarray,
+    tolerance: float,
+) -> np.ndarray:
+    """Douglas-Peucker simplification of every chain, iteratively and in bulk.
+
+    All chains are processed together: each round evaluates the point-to-line
+    distances of every open span in one vectorized pass and splits the spans
+    whose farthest point exceeds `tolerance` (ties keep the first point).
+    Distances use the same arithmetic as the scalar recursive version.
+
+    Args:
+        path_points: `(n, 2)` coordinates of the concatenated chains.
+        offsets: Chain `c` spans `path_points[offsets[c]:offsets[c + 1]]`.
+        tolerance: Maximum distance of a dropped point from its span.
+
+    Returns:
+        np.ndarray: Boolean mask over `path_points` of the kept points.
+    """
+
+    path_points = np.asarray(path_points, dtype=np.float64).reshape(-1, 2)
+    keep = np.zeros(len(path_points), dtype=bool)
+    if not len(path_points):
+        return keep
+    keep[offsets[:-1]] = True
+    keep[offsets[1:] - 1] = True
+    if tolerance <= 0:
+        keep[:] = True
+        return keep
+
+    low = offsets[:-1].copy()
+    high = offsets[1:] - 1
+    x = path_points[:, 0]
+    y = path_points[:, 1]
+    while True:
+        spans = high - low >= 2
+        low, high = low[spans], high[spans]
+        if not len(low):
+            return keep
+
+        counts = high - low - 1
+        span_of = np.repeat(np.arange(len(low)), counts)
+        span_first = np.cumsum(counts) - counts
+        inner = low[span_of] + 1 + np.arange(int(counts.sum())) - span_first[span_of]
+
+        start_x, start_y = x[low], y[low]
+        end_x, end_y = x[high], y[high]
+        dx = end_x - start_x
+        dy = end_y - start_y
+        denominator = np.hypot(dx, dy)
+        numerator = np.abs(
+            dy[span_of] * x[inner]
+            - dx[span_of] * y[inner]
+            + end_x[span_of] * start_y[span_of]
+            - end_y[span_of] * start_x[span_of]
+        )
+        degenerate = ((dx == 0) & (dy == 0))[span_of]
+        distance = numerator / np.where(degenerate, 1.0, denominator[span_of])
+        if degenerate.any():
+            distance[degenerate] = np.hypot(
+                x[inner[degenerate]] - start_x[span_of[degenerate]],
+                y[inner[degenerate]] - start_y[span_of[degenerate]],
+            )
+
+        farthest = np.maximum.reduceat(distance, span_first)
+        at_max = np.flatnonzero(distance == farthest[span_of])
+        _, first_at_max = np.unique(span_of[at_max], return_index=True)
+        split = inner[at_max[first_at_max]]
+        divide = farthest > tolerance
+
+        keep[split[divide]] = True
+        low = np.concatenate((low[divide], split[divide]))
+        high = np.concatenate((split[divide], high[divide]))
@@ -522,6 +522,56 @@ class CSEMDataFileReader():
         # result = pivoted_df.to_json(orient='records', index=True)
         return result
 
+def _unique_positions(data_df: pd.DataFrame, tx_or_rx: str):
+    """Return the distinct inline positions of Tx or Rx rows and each row's index into them.
+
+    Rows are grouped by `Tx_id`/`Rx_id` when every row of an id has the same
+    `Y_tx`/`Y_rx`; otherwise the positions themselves are deduplicated.
+    """
+    positions = data_df[f'Y_{tx_or_rx}'].to_numpy(dtype=float)
+    id_column = f'{tx_or_rx.capitalize()}_id'
+    if id_column in data_df.columns:
+        codes, _ = pd.factorize(data_df[id_column], use_na_sentinel=False)
+        _, first_rows = np.unique(codes, return_index=True)
+        unique_positions = positions[first_rows]
+        if np.array_equal(unique_positions[codes], positions, equal_nan=True):
+            return unique_positions, codes
+    codes, unique_positions = pd.factorize(positions, use_na_sentinel=False)
+    return np.asarray(unique_positions, dtype=float), codes
+
+
+class BathymetryInterpolator():
+    """Seafloor depth and slope of a bathymetry profile, evaluated at many positions.
+
+    The slope (`np.gradient` of depth over inline distance) is computed once,
+    so one interpolator can serve every Tx/Rx correction on the same profile.
+    """
+
+    def __init__(self, inline_distance, depth):
+        self.inline_distance = np.asarray(inline_distance, dtype=float)
+        self.depth = np.asarray(depth, dtype=float)
+        self.gradient = np.gradient(self.depth, self.inline_distance)
+
+    @classmethod
+    def from_bathymetry(cls, bathymetry_data):
+        """Return `bathymetry_data` if it is already an interpolator, else build one from its columns."""
+        if isinstance(bathymetry_data, cls):
+            return bathymetry_data
+        return cls(bathymetry_data['inline_distance'], bathymetry_data['depth'])
+
+    def depth_at(self, positions):
+        return np.interp(positions, self.inline_distance, self.depth)
+
+    def seafloor_depth_at(self, positions):
+        """Interpolated depth shifted by -0.1 and rounded to two decimals, as set on Z_tx/Z_rx."""
+        return np.round(self.depth_at(positions) - 0.1, 2)
+
+    def dip_at(self, positions):
+        """Seafloor dip in degrees."""
+        gradient = np.interp(positions, self.inline_distance, self.gradient)
+        return np.rad2deg(np.arctan2(gradient, 1))
+
+
 class CSEMDataFileManager():
     def __init__(self, data_type:str='CSEM'):
         self.data_type = data_type
@@ -1098,34 +1148,44 @@ class CSEMDataFileManager():
         data_df_n.loc[mask, 'StdError'] = data_df_n.loc[mask, 'StdError'].values * np.log(10) * data_df_n.loc[mask, 'Data'].values
         return data_df_n
 
-    def update_depth_bathymetry(self, data_df, bathymetry_data: pd.DataFrame, tx_or_rx: str = 'tx'):
-        """Update the Z depth based on bathymetry data."""
-        data_df_n = data_df.copy()
-        if tx_or_rx == 'tx':
-            data_df_n['Z_tx'] = np.interp(data_df_n['Y_tx'], bathymetry_data['inline_distance'], bathymetry_data['depth'])
-            data_df_n['Z_tx'] = np.round(data_df_n['Z_tx'] - 0.1, 2)
-        elif tx_or_rx == 'rx':
-            data_df_n['Z_rx'] = np.interp(data_df_n['Y_rx'], bathymetry_data['inline_distance'], bathymetry_data['depth'])
-            data_df_n['Z_rx'] = np.round(data_df_n['Z_rx'] - 0.1, 2)
-        else:
+    def update_depth_bathymetry(self, data_df, bathymetry_data, tx_or_rx: str = 'tx'):
+        """Update the Z depth based on bathymetry data (a DataFrame or a BathymetryInterpolator)."""
+        if tx_or_rx not in ('tx', 'rx'):
             raise ValueError(f"Invalid tx_or_rx: {tx_or_rx}")
+        interpolator = BathymetryInterpolator.from_bathymetry(bathymetry_data)
+        positions, inverse = _unique_positions(data_df, tx_or_rx)
+        data_df_n = data_df.copy()
+        data_df_n[f'Z_{tx_or_rx}'] = interpolator.seafloor_depth_at(positions)[inverse]
         return data_df_n
     
-    def calculate_dip(self, data_df, bathymetry_data: pd.DataFrame, tx_or_rx: str = 'tx'):
-        """Calculate the receiver's dip based on bathymetry data."""
-        data_df_n = data_df.copy()
-        # get bathymetry gradient
-        bathymetry_gradient = np.gradient(bathymetry_data['depth'], bathymetry_data['inline_distance'])
-        # get the gradient at the receiver's location
-        if tx_or_rx == 'tx':
-            gradient = np.interp(data_df_n['Y_tx'], bathymetry_data['inline_distance'], bathymetry_gradient)
-            data_df_n['Dip'] = np.rad2deg(np.arctan2(gradient, 1))
-        elif tx_or_rx == 'rx':
-            gradient = np.interp(data_df_n['Y_rx'], bathymetry_data['inline_distance'], bathymetry_gradient)
-            data_df_n['Beta'] = np.rad2deg(np.arctan2(gradient, 1))
-        else:
+    def calculate_dip(self, data_df, bathymetry_data, tx_or_rx: str = 'tx'):
+        """Calculate the receiver's dip based on bathymetry data (a DataFrame or a BathymetryInterpolator)."""
+        if tx_or_rx not in ('tx', 'rx'):
             raise ValueError(f"Invalid tx_or_rx: {tx_or_rx}")
-        return data_df_n, bathymetry_gradient
+        interpolator = BathymetryInterpolator.from_bathymetry(bathymetry_data)
+        positions, inverse = _unique_positions(data_df, tx_or_rx)
+        data_df_n = data_df.copy()
+        data_df_n['Dip' if tx_or_rx == 'tx' else 'Beta'] = interpolator.dip_at(positions)[inverse]
+        return data_df_n, interpolator.gradient
+
+    def drape_on_bathymetry(self, data_df, bathymetry_data):
+        """Set Z_tx, Dip, Z_rx and Beta from bathymetry in one pass.
+
+        The bathymetry (a DataFrame with `inline_distance` and `depth` columns or
+        a prebuilt BathymetryInterpolator) is interpolated once per distinct Tx
+        and Rx position and the results are broadcast back to the data rows.
+        Depths and angles match `update_depth_bathymetry` and `calculate_dip`.
+        Tx columns are skipped for tables without Tx positions (MT data).
+        """
+        interpolator = BathymetryInterpolator.from_bathymetry(bathymetry_data)
+        data_df_n = data_df.copy()
+        for tx_or_rx, angle_column in (('tx', 'Dip'), ('rx', 'Beta')):
+            if f'Y_{tx_or_rx}' not in data_df_n.columns:
+                continue
+            positions, inverse = _unique_positions(data_df_n, tx_or_rx)
+            data_df_n[f'Z_{tx_or_rx}'] = interpolator.seafloor_depth_at(positions)[inverse]
+            data_df_n[angle_column] = interpolator.dip_at(positions)[inverse]
+        return data_df_n
 
     def merge_csem_datafiles(self, file1_path: str, file2_path: str, output_path: Optional[str] = None) -> str:
         """
@@ -0,0 +1,52 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LruStore(Generic[T]):
+    """Small thread-safe LRU store of values keyed by generated ids.
+
+    `get` marks an entry as most recently used; `put` beyond `max_entries`
+    drops the least recently used entries and passes each to `on_evict`
+    outside the lock.
+    """
+
+    def __init__(self, max_entries: int = 8, on_evict: Optional[Callable[[T], None]] = None):
+        self.max_entries = max_entries
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[str, T]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def put(self, value: T, entry_id: Optional[str] = None) -> str:
+        """Store `value` under `entry_id` (a new id by default) and return the id."""
+
+        if entry_id is None:
+            entry_id = self.new_id()
+        evicted = []
+        with self._lock:
+            self._entries[entry_id] = value
+            self._entries.move_to_end(entry_id)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1])
+        if self._on_evict is not None:
+            for old_value in evicted:
+                self._on_evict(old_value)
+        return entry_id
+
+    def get(self, entry_id: str) -> Optional[T]:
+        with self._lock:
+            value = self._entries.get(entry_id)
+            if value is not None:
+                self._entries.move_to_end(entry_id)
+            return value
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
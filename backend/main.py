@@ -1,3 +1,5 @@
+import base64
+import multiprocessing
 import traceback
 import os
 import tempfile
@@ -6,11 +8,17 @@ import json
 from datetime import datetime
 from typing import List
 import numpy as np
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import ClientDisconnected
-from suesi_depth_reader import process_SuesiDepth_mat_file
+from suesi_depth_reader import (
+    DEFAULT_SERIES_POINTS,
+    build_series_pyramid,
+    load_suesi_series,
+    process_SuesiDepth_mat_file,
+    query_series_window,
+)
 from MARE2DEM_poly_parser import MARE2DEMPolyParser
 from resistivity_file_parser import ResistivityFileParser
 from csem_datafile_parser import CSEMDataFileReader
@@ -18,23 +26,68 @@ from csem_datafile_parser import CSEMDataFileManager
 from csem_datafile_parser import AMPLITUDE_TYPE_CODES
 from csem_datafile_parser import PHASE_TYPE_CODES
 from csem_datafile_parser import calculate_misfit_statistics
-from xyz_datafile_parser import XYZDataFileReader
+from xyz_datafile_parser import XYZ_FORMATS, XYZDataFileReader, grid_axes_payload
+from xyz_tile_pyramid import TILE_SIZE, TILE_STATISTICS, XYZTilePyramidCache
 from bathymetry_parser import BathymetryParser
+from bathymetry_reader import BathymetryArrayCache
+from profile_downsampling import ProfilePyramidCache, downsample_profile
+from resistivity_table import read_region_resistivity_columns, table_to_records
 from triangle_resistivity_export import (
     ResistivityExportError,
+    ResistivitySourceCache,
     build_exported_resistivity_text,
+    build_indexed_resistivity_text,
+    index_resistivity_source,
+    iter_resistivity_scenario_zip,
     parse_region_rho_updates,
+    parse_resistivity_scenarios,
 )
 from triangle_model_resegmentation import (
     ResegmentationError,
     build_resegmentation_result,
+    parse_resegmentation_parameter_sets,
     parse_resegmentation_parameters,
+    parse_resegmentation_roi,
+    prepare_resegmentation_source,
+    run_resegmentation_sweep,
+)
+from triangle_resegmentation_session import (
+    ResegmentationPreviewSession,
+    ResegmentationSessionCache,
+)
+from triangle_mesh_transfer import (
+    MESH_BINARY_MIMETYPE,
+    MESH_FORMATS,
+    VERTEX_PRECISIONS,
+    build_triangle_mesh_arrays,
+    encode_binary_mesh_payload,
+    map_triangle_source_region_ids,
+)
+from triangle_mesh_lod import (
+    MeshLodCache,
+    MeshLodError,
+    build_mesh_lod_hierarchy,
+    parse_mesh_viewport,
 )
 
 app = Flask(__name__)
 CORS(app)
 # Disable sorting of keys in JSON responses
 app.config["JSON_SORT_KEYS"] = False
+# Level-of-detail hierarchies of recently uploaded triangle models
+_MESH_LOD_CACHE = MeshLodCache()
+# Incremental resegmentation preview sessions
+_RESEGMENTATION_SESSIONS = ResegmentationSessionCache()
+# Indexed .resistivity uploads, so rho exports only send region updates
+_RESISTIVITY_SOURCES = ResistivitySourceCache()
+# Min/max pyramids of uploaded bathymetry profiles for zoomed views
+_BATHYMETRY_PYRAMIDS = ProfilePyramidCache()
+# Parsed bathymetry columns keyed by file content, for repeated uploads
+_BATHYMETRY_ARRAYS = BathymetryArrayCache()
+# Memory-mapped rho tile pyramids of uploaded XYZ sections
+_XYZ_TILE_PYRAMIDS = XYZTilePyramidCache()
+# Time-sorted min/max pyramids of uploaded SuESI/nav series for window queries
+_MAT_SERIES_PYRAMIDS = ProfilePyramidCache()
 
 
 def _get_debug_flag() -> bool:
@@ -162,10 +215,7 @@ def _serialize_resistivity_model(parsed_resistivity):
     resistivity_table = parsed_resistivity.get("table")
     table = []
     if resistivity_table is not None:
-        table = [
-            {column: _json_safe_value(row[column]) for column in resistivity_table.columns}
-            for _, row in resistivity_table.iterrows()
-        ]
+        table = table_to_records(resistivity_table, _json_safe_value)
 
     return {
         "metadata": metadata,
@@ -175,11 +225,11 @@ def _serialize_resistivity_model(parsed_resistivity):
 
 def _build_region_resistivity_lookup(parsed_resistivity):
     if parsed_resistivity is None:
-        return {}
+        return None
 
     resistivity_table = parsed_resistivity.get("table")
     if resistivity_table is None or len(resistivity_table.columns) == 0:
-        return {}
+        return None
 
     region_column = None
     rho_column = None
@@ -194,84 +244,149 @@ def _build_region_resistivity_lookup(parsed_resistivity):
     if region_column is None:
         region_column = resistivity_table.columns[0]
     if rho_column is None:
-        return {}
+        return None
 
-    lookup = {}
-    for _, row in resistivity_table.iterrows():
-        try:
-            region_id = int(float(row[region_column]))
-            rho_value = float(row[rho_column])
-        except (TypeError, ValueError):
-            continue
-        lookup[region_id] = rho_value
+    return read_region_resistivity_columns(resistivity_table, region_column, rho_column)
 
-    return lookup
 
+def _index_resistivity_upload(resistivity_path, file_name):
+    """Keep an indexed copy of an uploaded .resistivity file for later rho exports."""
+    try:
+        with open(resistivity_path, "r", encoding="utf-8-sig", newline="") as file:
+            source = index_resistivity_source(file.read(), file_name)
+    except (UnicodeDecodeError, ResistivityExportError):
+        return None
+    return _RESISTIVITY_SOURCES.put(source)
+
+
+def _resistivity_upload_error(resistivity_file):
+    if resistivity_file is None:
+        return "No .resistivity file provided"
+    if resistivity_file.filename == "":
+        return "No selected .resistivity file"
+    if not resistivity_file.filename.endswith(".resistivity"):
+        return "Invalid .resistivity file format"
+    return None
+
+
+def _read_form_text(field_name):
+    """Return a form field, or the UTF-8 text of a file part with the same name."""
+    text = request.form.get(field_name)
+    text_file = request.files.get(field_name)
+    if text is None and text_file is not None:
+        text = text_file.read().decode("utf-8-sig")
+    return text
+
+
+def _edited_resistivity_response(exported_text, file_name):
+    original_name = secure_filename(file_name) or "model.resistivity"
+    stem, _ = os.path.splitext(original_name)
+    download_name = f"{stem}.edited.resistivity"
+
+    response = app.response_class(exported_text, mimetype="text/plain")
+    response.headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+    return response
 
-def _serialize_constrained_mesh(poly_parser, vertices, segments, regions, parsed_resistivity):
-    triangles, mesh_vertices, _ = poly_parser.create_constrained_delaunay(vertices, segments)
-    ordered_vertex_ids = sorted(mesh_vertices.keys())
-    vertex_index_by_id = {
-        vertex_id: index for index, vertex_id in enumerate(ordered_vertex_ids)
-    }
-    ordered_vertices = [
-        {
-            "id": index,
-            "x": _json_safe_value(mesh_vertices[vertex_id]["hCoor"]),
-            "y": _json_safe_value(mesh_vertices[vertex_id]["vCoor"]),
-        }
-        for index, vertex_id in enumerate(ordered_vertex_ids)
-    ]
 
-    ordered_triangles = [
-        [vertex_index_by_id[int(vertex_id)] for vertex_id in triangle]
-        for triangle in triangles
+def _build_constrained_mesh_arrays(poly_parser, vertices, segments, regions, parsed_resistivity):
+    triangles, mesh_vertices, _ = poly_parser.create_constrained_delaunay(vertices, segments)
+    ordered_vertex_ids = np.array(sorted(mesh_vertices.keys()), dtype=np.int64)
+    points = [
+        (mesh_vertices[vertex_id]["hCoor"], mesh_vertices[vertex_id]["vCoor"])
+        for vertex_id in ordered_vertex_ids.tolist()
     ]
+    ordered_triangles = np.searchsorted(
+        ordered_vertex_ids, np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    )
 
-    triangle_region_ids = [None] * len(ordered_triangles)
-    triangle_resistivity_values = [None] * len(ordered_triangles)
+    triangle_region_ids = map_triangle_source_region_ids(poly_parser, regions)
+    triangle_resistivity_values = np.full(len(triangle_region_ids), np.nan)
     region_lookup = _build_region_resistivity_lookup(parsed_resistivity)
-    region_resistivity = []
-
-    if regions:
-        triangle_region_numbers, region_index = poly_parser.get_triangle_regions(regions)
-        seen_region_ids = set()
-
-        for triangle_index, region_number in enumerate(triangle_region_numbers):
-            region_number = int(region_number)
-            if region_number <= 0 or region_number - 1 >= len(region_index):
-                continue
-
-            original_region = regions[int(region_index[region_number - 1])]
-            original_region_id = original_region.get("attribute") or original_region["id"]
-            original_region_id = int(original_region_id)
-            triangle_region_ids[triangle_index] = original_region_id
-            rho_value = region_lookup.get(original_region_id)
-            if rho_value is not None:
-                triangle_resistivity_values[triangle_index] = float(rho_value)
-                if original_region_id not in seen_region_ids:
-                    region_resistivity.append(
-                        {
-                            "regionId": original_region_id,
-                            "rho": float(rho_value),
-                        }
-                    )
-                    seen_region_ids.add(original_region_id)
 
+    # Resolve rho once per distinct source region instead of once per triangle
+    unique_region_ids, inverse = np.unique(triangle_region_ids, return_inverse=True)
+    unique_rho = np.full(len(unique_region_ids), np.nan)
+    has_rho = np.zeros(len(unique_region_ids), dtype=bool)
+    if region_lookup is not None:
+        positions = region_lookup.positions(unique_region_ids)
+        has_rho = positions >= 0
+        unique_rho[has_rho] = region_lookup.rho[positions[has_rho]]
+    if len(unique_region_ids):
+        triangle_resistivity_values = unique_rho[inverse.reshape(-1)]
+
+    return build_triangle_mesh_arrays(
+        points,
+        ordered_triangles,
+        triangle_region_ids,
+        triangle_resistivity_values,
+        unique_region_ids[has_rho],
+        unique_rho[has_rho],
+    )
+
+
+def _serialize_constrained_mesh(poly_parser, vertices, segments, regions, parsed_resistivity):
+    return _build_constrained_mesh_arrays(
+        poly_parser, vertices, segments, regions, parsed_resistivity
+    ).to_json_mesh()
+
+
+def _read_mesh_transfer_options():
+    mesh_format = (request.form.get("mesh_format") or "json").strip().lower()
+    if mesh_format not in MESH_FORMATS:
+        raise ValueError(f"Invalid mesh_format: {mesh_format}")
+    vertex_precision = (request.form.get("vertex_precision") or "float64").strip().lower()
+    if vertex_precision not in VERTEX_PRECISIONS:
+        raise ValueError(f"Invalid vertex_precision: {vertex_precision}")
+    return mesh_format, VERTEX_PRECISIONS[vertex_precision]
+
+
+def _read_mesh_viewport():
+    raw_viewport = request.form.get("viewport")
+    if raw_viewport is None or raw_viewport.strip() == "":
+        return None
+    try:
+        return parse_mesh_viewport(json.loads(raw_viewport))
+    except json.JSONDecodeError as exc:
+        raise MeshLodError("Invalid viewport JSON") from exc
+
+
+def _mesh_lod_payload(lod_id, hierarchy, viewport):
+    level, visible_mesh = hierarchy.extract(viewport)
     return {
-        "vertices": ordered_vertices,
-        "triangles": ordered_triangles,
-        "triangleRegionIds": triangle_region_ids,
-        "triangleResistivityValues": triangle_resistivity_values,
-        "regionResistivity": sorted(
-            region_resistivity, key=lambda item: item["regionId"]
-        ),
-    }
+        "id": lod_id,
+        "level": level.level,
+        "cellSize": level.cell_size,
+        "viewport": viewport.to_dict(),
+        **hierarchy.describe(),
+    }, visible_mesh
+
+
+def _mesh_response(payload, mesh_key, mesh_arrays, mesh_format, vertex_dtype):
+    if mesh_format == "binary":
+        body = encode_binary_mesh_payload(
+            _json_safe_value(payload), mesh_key, mesh_arrays, vertex_dtype
+        )
+        return app.response_class(body, mimetype=MESH_BINARY_MIMETYPE)
+
+    return jsonify(
+        {
+            **payload,
+            mesh_key: mesh_arrays.to_json_mesh() if mesh_arrays is not None else None,
+        }
+    )
 
 
 @app.route("/api/upload-xyz", methods=["POST"])
 def upload_xyz_file():
     print("Start processing file...")
+    # "records": one object per cell; "grid": Y/Z axes plus a dense rho array;
+    # "tiles": Y/Z axes plus a tile pyramid served by /api/xyz-tile
+    xyz_format = (request.form.get("format") or "records").strip().lower()
+    if xyz_format not in XYZ_FORMATS:
+        return jsonify({"error": f"Invalid format: {xyz_format}"}), 400
+    statistic = (request.form.get("statistic") or "log_mean").strip().lower()
+    if statistic not in TILE_STATISTICS:
+        return jsonify({"error": f"Invalid statistic: {statistic}"}), 400
 
     for key in request.files.keys():
         print("request file: ", request.files[key])
@@ -288,15 +403,85 @@ def upload_xyz_file():
             path = _save_uploaded_file(file, temp_dir)
             print(path)
             xyz_datafile_reader = XYZDataFileReader(path)
-            xyz_datafile_reader.read_file()
             xyz_datafile_reader.add_distance()
-            # result_df = xyz_datafile_reader.df_for_echart_heatmap(xyz_datafile_reader.data)
+            if xyz_format == "grid":
+                grid = xyz_datafile_reader.df_to_grid(xyz_datafile_reader.data)
+                if grid is not None:
+                    return jsonify(grid)
+            if xyz_format == "tiles":
+                grid = xyz_datafile_reader.df_to_grid_arrays(xyz_datafile_reader.data)
+                if grid is not None:
+                    return jsonify(_xyz_tiles_payload(grid, statistic))
+            if xyz_format != "records":
+                # Irregular cells keep the records layout inside the envelope
+                data_js = xyz_datafile_reader.df_to_json(xyz_datafile_reader.data)
+                return Response(
+                    f'{{"layout":"records","records":{data_js}}}',
+                    mimetype="application/json",
+                )
             data_js = xyz_datafile_reader.df_to_json(xyz_datafile_reader.data)
-            return jsonify(json.loads(data_js))
+            return Response(data_js, mimetype="application/json")
 
     return "Invalid file format"
 
 
+def _xyz_tiles_payload(grid, statistic):
+    pyramid_id, pyramid = _XYZ_TILE_PYRAMIDS.build(grid["rho"], grid["y"], grid["z"], statistic)
+    return {
+        "layout": "tiles",
+        **grid_axes_payload(grid),
+        "pyramid_id": pyramid_id,
+        "statistic": statistic,
+        "tile_size": TILE_SIZE,
+        "levels": [
+            {
+                "level": level,
+                "shape": list(pyramid.level_shapes[level]),
+                "tiles": list(pyramid.tile_counts(level)),
+            }
+            for level in range(pyramid.level_count)
+        ],
+    }
+
+
+@app.route("/api/xyz-tile", methods=["POST"])
+def xyz_tile():
+    pyramid_id = request.form.get("pyramid_id")
+    if not pyramid_id:
+        return jsonify({"error": "No pyramid_id provided"}), 400
+    try:
+        level = int(request.form.get("level", ""))
+        i = int(request.form.get("i", ""))
+        j = int(request.form.get("j", ""))
+    except ValueError:
+        return jsonify({"error": "level, i and j must be integers"}), 400
+
+    pyramid = _XYZ_TILE_PYRAMIDS.get(pyramid_id)
+    if pyramid is None:
+        return jsonify({"error": "Unknown or expired pyramid_id"}), 404
+
+    try:
+        tile = pyramid.tile(level, i, j)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    values = tile["values"]
+    return jsonify(
+        {
+            "level": level,
+            "i": i,
+            "j": j,
+            "y_range": list(tile["y_range"]),
+            "z_range": list(tile["z_range"]),
+            "rho": {
+                "dtype": "float32",
+                "shape": list(values.shape),
+                "encoding": "base64",
+                "data": base64.b64encode(values.tobytes()).decode("ascii"),
+            },
+        }
+    )
+
+
 @app.route("/api/upload-data", methods=["POST"])
 def upload_data_file():
     print("Start processing file...")
@@ -354,6 +539,12 @@ def upload_triangle_model_file():
     ):
         return jsonify({"error": "Invalid .resistivity file format"}), 400
 
+    try:
+        mesh_format, vertex_dtype = _read_mesh_transfer_options()
+        viewport = _read_mesh_viewport()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
     try:
         temp_dir = tempfile.gettempdir()
         poly_path = _save_uploaded_file(poly_file, temp_dir)
@@ -369,6 +560,7 @@ def upload_triangle_model_file():
         parsed_resistivity = None
         resistivity_payload = None
         resistivity_file_name = None
+        resistivity_export_id = None
         if resistivity_file is not None and resistivity_file.filename != "":
             resistivity_path = _save_uploaded_file(resistivity_file, temp_dir)
             resistivity_parser = ResistivityFileParser()
@@ -377,8 +569,11 @@ def upload_triangle_model_file():
             )
             resistivity_payload = _serialize_resistivity_model(parsed_resistivity)
             resistivity_file_name = resistivity_file.filename
+            resistivity_export_id = _index_resistivity_upload(
+                resistivity_path, resistivity_file_name
+            )
 
-        constrained_mesh = _serialize_constrained_mesh(
+        constrained_mesh = _build_constrained_mesh_arrays(
             poly_parser,
             vertices,
             segments,
@@ -386,7 +581,15 @@ def upload_triangle_model_file():
             parsed_resistivity,
         )
 
-        return jsonify(
+        # With a viewport, only the matching level of detail is sent and the
+        # hierarchy is kept for follow-up /api/triangle-mesh-lod requests.
+        mesh_lod = None
+        if viewport is not None:
+            hierarchy = build_mesh_lod_hierarchy(constrained_mesh)
+            lod_id = _MESH_LOD_CACHE.put(hierarchy)
+            mesh_lod, constrained_mesh = _mesh_lod_payload(lod_id, hierarchy, viewport)
+
+        return _mesh_response(
             {
                 "polyFileName": poly_file.filename,
                 "resistivityFileName": resistivity_file_name,
@@ -395,15 +598,52 @@ def upload_triangle_model_file():
                 "holes": ordered_holes,
                 "regions": ordered_regions,
                 "resistivity": resistivity_payload,
-                "constrainedMesh": constrained_mesh,
-            }
+                "resistivityExportId": resistivity_export_id,
+                "meshLod": mesh_lod,
+            },
+            "constrainedMesh",
+            constrained_mesh,
+            mesh_format,
+            vertex_dtype,
+        )
+    except Exception:
+        traceback.print_exc()
+        return jsonify({"error": traceback.format_exc()}), 500
+
+
+@app.route("/api/triangle-mesh-lod", methods=["POST"])
+def triangle_mesh_lod():
+    lod_id = request.form.get("lod_id")
+    if not lod_id:
+        return jsonify({"error": "No lod_id provided"}), 400
+
+    try:
+        mesh_format, vertex_dtype = _read_mesh_transfer_options()
+        viewport = _read_mesh_viewport()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if viewport is None:
+        return jsonify({"error": "No viewport provided"}), 400
+
+    hierarchy = _MESH_LOD_CACHE.get(lod_id)
+    if hierarchy is None:
+        return jsonify({"error": "Unknown or expired lod_id"}), 404
+
+    try:
+        mesh_lod, visible_mesh = _mesh_lod_payload(lod_id, hierarchy, viewport)
+        return _mesh_response(
+            {"meshLod": mesh_lod},
+            "constrainedMesh",
+            visible_mesh,
+            mesh_format,
+            vertex_dtype,
         )
     except Exception:
         traceback.print_exc()
         return jsonify({"error": traceback.format_exc()}), 500
 
 
-def _read_resegmentation_request(include_export_text):
+def _read_resegmentation_uploads():
     poly_file = request.files.get("poly_file")
     if poly_file is None:
         raise ResegmentationError("No .poly file provided")
@@ -420,15 +660,10 @@ def _read_resegmentation_request(include_export_text):
     if not resistivity_file.filename.endswith(".resistivity"):
         raise ResegmentationError("Invalid .resistivity file format")
 
-    raw_parameters = request.form.get("parameters")
-    if raw_parameters is None:
-        raise ResegmentationError("No resegmentation parameters provided")
+    return poly_file, resistivity_file
 
-    try:
-        parameters = parse_resegmentation_parameters(json.loads(raw_parameters))
-    except json.JSONDecodeError as exc:
-        raise ResegmentationError("Invalid resegmentation parameters JSON") from exc
 
+def _load_resegmentation_model(poly_file, resistivity_file):
     temp_dir = tempfile.gettempdir()
     poly_path = _save_uploaded_file(poly_file, temp_dir)
     resistivity_path = _save_uploaded_file(resistivity_file, temp_dir)
@@ -446,6 +681,38 @@ def _read_resegmentation_request(include_export_text):
     original_name = secure_filename(poly_file.filename) or "model.poly"
     stem, _ = os.path.splitext(original_name)
     output_poly_file_name = f"{stem}.resegmented.poly"
+    return (
+        poly_parser,
+        vertices,
+        segments,
+        holes,
+        regions,
+        parsed_resistivity,
+        output_poly_file_name,
+    )
+
+
+def _read_resegmentation_request(include_export_text, mesh_as_arrays=False):
+    poly_file, resistivity_file = _read_resegmentation_uploads()
+
+    raw_parameters = request.form.get("parameters")
+    if raw_parameters is None:
+        raise ResegmentationError("No resegmentation parameters provided")
+
+    try:
+        parameters = parse_resegmentation_parameters(json.loads(raw_parameters))
+    except json.JSONDecodeError as exc:
+        raise ResegmentationError("Invalid resegmentation parameters JSON") from exc
+
+    (
+        poly_parser,
+        vertices,
+        segments,
+        holes,
+        regions,
+        parsed_resistivity,
+        output_poly_file_name,
+    ) = _load_resegmentation_model(poly_file, resistivity_file)
 
     return build_resegmentation_result(
         poly_parser,
@@ -457,13 +724,134 @@ def _read_resegmentation_request(include_export_text):
         parameters,
         output_poly_file_name,
         include_export_text=include_export_text,
+        mesh_as_arrays=mesh_as_arrays,
     )
 
 
 @app.route("/api/preview-triangle-resegmentation", methods=["POST"])
 def preview_triangle_resegmentation():
     try:
-        return jsonify(_read_resegmentation_request(include_export_text=False))
+        try:
+            mesh_format, vertex_dtype = _read_mesh_transfer_options()
+        except ValueError as exc:
+            raise ResegmentationError(str(exc)) from exc
+        result = _read_resegmentation_request(
+            include_export_text=False, mesh_as_arrays=True
+        )
+        preview_mesh = result.pop("previewMesh")
+        return _mesh_response(result, "previewMesh", preview_mesh, mesh_format, vertex_dtype)
+    except ResegmentationError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        traceback.print_exc()
+        return jsonify({"error": traceback.format_exc()}), 500
+
+
+@app.route("/api/start-triangle-resegmentation-session", methods=["POST"])
+def start_triangle_resegmentation_session():
+    try:
+        try:
+            mesh_format, vertex_dtype = _read_mesh_transfer_options()
+        except ValueError as exc:
+            raise ResegmentationError(str(exc)) from exc
+
+        poly_file, resistivity_file = _read_resegmentation_uploads()
+        raw_parameters = request.form.get("parameters")
+        if raw_parameters is None:
+            raise ResegmentationError("No resegmentation parameters provided")
+        try:
+            parameters = parse_resegmentation_parameters(json.loads(raw_parameters))
+        except json.JSONDecodeError as exc:
+            raise ResegmentationError("Invalid resegmentation parameters JSON") from exc
+
+        poly_parser, vertices, segments, holes, regions, parsed_resistivity, _ = (
+            _load_resegmentation_model(poly_file, resistivity_file)
+        )
+        source = prepare_resegmentation_source(
+            poly_parser, vertices, segments, holes, regions, parsed_resistivity
+        )
+        session = ResegmentationPreviewSession(source, parameters)
+        payload = {
+            "sessionId": _RESEGMENTATION_SESSIONS.put(session),
+            "stats": {
+                **session.stats(),
+                "mergedComponentCount": session.merged_component_count,
+            },
+            "warnings": session.warnings,
+        }
+        return _mesh_response(
+            payload, "previewMesh", session.preview_mesh(), mesh_format, vertex_dtype
+        )
+    except ResegmentationError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        traceback.print_exc()
+        return jsonify({"error": traceback.format_exc()}), 500
+
+
+@app.route("/api/update-triangle-resegmentation-session", methods=["POST"])
+def update_triangle_resegmentation_session():
+    session_id = request.form.get("session_id")
+    if not session_id:
+        return jsonify({"error": "No session_id provided"}), 400
+
+    session = _RESEGMENTATION_SESSIONS.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown or expired session_id"}), 404
+
+    try:
+        raw_roi = request.form.get("roi")
+        if raw_roi is None:
+            raise ResegmentationError("No roi provided")
+        try:
+            roi = parse_resegmentation_roi(json.loads(raw_roi))
+        except json.JSONDecodeError as exc:
+            raise ResegmentationError("Invalid roi JSON") from exc
+        return jsonify(session.update_roi(roi))
+    except ResegmentationError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        traceback.print_exc()
+        return jsonify({"error": traceback.format_exc()}), 500
+
+
+@app.route("/api/sweep-triangle-resegmentation", methods=["POST"])
+def sweep_triangle_resegmentation():
+    try:
+        try:
+            mesh_format, vertex_dtype = _read_mesh_transfer_options()
+        except ValueError as exc:
+            raise ResegmentationError(str(exc)) from exc
+
+        poly_file, resistivity_file = _read_resegmentation_uploads()
+        raw_parameter_sets = request.form.get("parameter_sets")
+        if raw_parameter_sets is None:
+            raise ResegmentationError("No resegmentation parameter sets provided")
+        try:
+            parameter_sets = parse_resegmentation_parameter_sets(
+                json.loads(raw_parameter_sets)
+            )
+        except json.JSONDecodeError as exc:
+            raise ResegmentationError("Invalid resegmentation parameter sets JSON") from exc
+
+        raw_preview_index = request.form.get("preview_index", "0")
+        try:
+            preview_index = int(raw_preview_index) if raw_preview_index != "" else None
+        except ValueError as exc:
+            raise ResegmentationError("preview_index must be an integer") from exc
+
+        poly_parser, vertices, segments, holes, regions, parsed_resistivity, _ = (
+            _load_resegmentation_model(poly_file, resistivity_file)
+        )
+        source = prepare_resegmentation_source(
+            poly_parser, vertices, segments, holes, regions, parsed_resistivity
+        )
+        result = run_resegmentation_sweep(source, parameter_sets, preview_index)
+        preview_mesh = result.pop("previewMesh")
+        if preview_mesh is None:
+            result["previewMesh"] = None
+            return jsonify(result)
+        return _mesh_response(result, "previewMesh", preview_mesh, mesh_format, vertex_dtype)
     except ResegmentationError as exc:
         return jsonify({"error": str(exc)}), 400
     except Exception:
@@ -484,35 +872,82 @@ def export_triangle_resegmentation():
 
 @app.route("/api/export-triangle-resistivity", methods=["POST"])
 def export_triangle_resistivity_file():
+    # An `export_id` from /api/upload-triangle-model replaces re-uploading the file.
+    export_id = request.form.get("export_id")
     resistivity_file = request.files.get("resistivity_file")
-    if resistivity_file is None:
-        return jsonify({"error": "No .resistivity file provided"}), 400
-    if resistivity_file.filename == "":
-        return jsonify({"error": "No selected .resistivity file"}), 400
-    if not resistivity_file.filename.endswith(".resistivity"):
-        return jsonify({"error": "Invalid .resistivity file format"}), 400
+    if not export_id:
+        file_error = _resistivity_upload_error(resistivity_file)
+        if file_error:
+            return jsonify({"error": file_error}), 400
 
-    raw_updates = request.form.get("region_rho_updates")
-    updates_file = request.files.get("region_rho_updates")
-    if raw_updates is None and updates_file is not None:
-        try:
-            raw_updates = updates_file.read().decode("utf-8-sig")
-        except UnicodeDecodeError:
-            return jsonify({"error": "Could not decode region rho updates as UTF-8"}), 400
+    try:
+        raw_updates = _read_form_text("region_rho_updates")
+    except UnicodeDecodeError:
+        return jsonify({"error": "Could not decode region rho updates as UTF-8"}), 400
     if raw_updates is None:
         return jsonify({"error": "No region rho updates provided"}), 400
 
     try:
-        source_text = resistivity_file.read().decode("utf-8-sig")
         updates = parse_region_rho_updates(raw_updates)
+        if export_id:
+            source = _RESISTIVITY_SOURCES.get(export_id)
+            if source is None:
+                return jsonify({"error": "Unknown or expired export_id"}), 404
+            exported_text = build_indexed_resistivity_text(source, updates)
+            return _edited_resistivity_response(exported_text, source.file_name)
+
+        source_text = resistivity_file.read().decode("utf-8-sig")
         exported_text = build_exported_resistivity_text(source_text, updates)
-        original_name = secure_filename(resistivity_file.filename) or "model.resistivity"
-        stem, _ = os.path.splitext(original_name)
-        download_name = f"{stem}.edited.resistivity"
+        return _edited_resistivity_response(exported_text, resistivity_file.filename)
+    except UnicodeDecodeError:
+        return jsonify({"error": "Could not decode .resistivity file as UTF-8"}), 400
+    except ResistivityExportError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        traceback.print_exc()
+        return jsonify({"error": traceback.format_exc()}), 500
+
+
+@app.route("/api/export-triangle-resistivity-scenarios", methods=["POST"])
+def export_triangle_resistivity_scenarios():
+    export_id = request.form.get("export_id")
+    resistivity_file = request.files.get("resistivity_file")
+    if not export_id:
+        file_error = _resistivity_upload_error(resistivity_file)
+        if file_error:
+            return jsonify({"error": file_error}), 400
+
+    try:
+        raw_scenarios = _read_form_text("scenarios")
+    except UnicodeDecodeError:
+        return jsonify({"error": "Could not decode scenarios as UTF-8"}), 400
+    if raw_scenarios is None:
+        return jsonify({"error": "No scenarios provided"}), 400
+
+    try:
+        scenarios = parse_resistivity_scenarios(raw_scenarios)
+        if export_id:
+            source = _RESISTIVITY_SOURCES.get(export_id)
+            if source is None:
+                return jsonify({"error": "Unknown or expired export_id"}), 404
+        else:
+            source = index_resistivity_source(
+                resistivity_file.read().decode("utf-8-sig"),
+                secure_filename(resistivity_file.filename) or "model.resistivity",
+            )
 
-        response = app.response_class(exported_text, mimetype="text/plain")
+        # Pull the first chunk here so scenario errors still return JSON.
+        chunks = iter_resistivity_scenario_zip(source, scenarios)
+        first_chunk = next(chunks)
+        stem, _ = os.path.splitext(secure_filename(source.file_name) or "model.resistivity")
+
+        def stream():
+            yield first_chunk
+            yield from chunks
+
+        response = Response(stream_with_context(stream()), mimetype="application/zip")
         response.headers["Content-Disposition"] = (
-            f'attachment; filename="{download_name}"'
+            f'attachment; filename="{stem}.scenarios.zip"'
         )
         return response
     except UnicodeDecodeError:
@@ -646,9 +1081,63 @@ def write_data_file():
             return jsonify({"error": traceback.format_exc()}), 500
 
 
+def _read_time_window():
+    """Read the optional `t0`/`t1` form fields (Unix seconds)."""
+
+    window = []
+    for name in ("t0", "t1"):
+        raw_value = (request.form.get(name) or "").strip()
+        try:
+            window.append(float(raw_value) if raw_value else None)
+        except ValueError:
+            raise ValueError(f"{name} must be numeric") from None
+    return tuple(window)
+
+
+def _read_max_points():
+    raw_value = (request.form.get("max_points") or "").strip()
+    if not raw_value:
+        return DEFAULT_SERIES_POINTS
+    try:
+        return int(raw_value)
+    except ValueError:
+        raise ValueError("max_points must be an integer") from None
+
+
+@app.route("/api/mat-series-window", methods=["POST"])
+def mat_series_window():
+    series_id = request.form.get("series_id")
+    if not series_id:
+        return jsonify({"error": "No series_id provided"}), 400
+    try:
+        t0, t1 = _read_time_window()
+        max_points = _read_max_points()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    pyramid = _MAT_SERIES_PYRAMIDS.get(series_id)
+    if pyramid is None:
+        return jsonify({"error": "Unknown or expired series_id"}), 404
+
+    try:
+        return jsonify(query_series_window(pyramid, t0, t1, max_points))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+
 @app.route("/api/upload-mat", methods=["POST"])
 def upload_mat_file():
     print("Start processing file...")
+    # "records": legacy JSON string of records; "arrays": time/value arrays;
+    # "series": cached series id plus a decimated overview for /api/mat-series-window
+    mat_format = (request.form.get("format") or "records").strip().lower()
+    if mat_format not in ("records", "arrays", "series"):
+        return jsonify({"error": f"Invalid format: {mat_format}"}), 400
+    try:
+        t0, t1 = _read_time_window()
+        max_points = _read_max_points()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
     for key in request.files.keys():
         print("request file: ", request.files[key])
@@ -664,7 +1153,25 @@ def upload_mat_file():
             temp_dir = tempfile.gettempdir()
             path = _save_uploaded_file(file, temp_dir)
             print(path)
-            return process_SuesiDepth_mat_file(path)
+            if mat_format == "records":
+                return process_SuesiDepth_mat_file(path)
+            try:
+                if mat_format == "arrays":
+                    return jsonify(load_suesi_series(path, t0, t1).to_payload())
+                series = load_suesi_series(path)
+                pyramid = build_series_pyramid(series)
+                overview = query_series_window(pyramid, t0, t1, max_points)
+            except ValueError as exc:
+                return jsonify({"error": str(exc)}), 400
+            return jsonify(
+                {
+                    "series_id": _MAT_SERIES_PYRAMIDS.put(pyramid),
+                    "kind": series.kind,
+                    "total_points": len(series),
+                    "time_range": [float(pyramid.x[0]), float(pyramid.x[-1])],
+                    **overview,
+                }
+            )
 
     return "Invalid file format"
 
@@ -689,10 +1196,13 @@ def upload_bathymetry_file():
                 path = _save_uploaded_file(file, temp_dir)
                 print(path)
 
-                bathymetry_parser = BathymetryParser()
+                bathymetry_parser = BathymetryParser(cache=_BATHYMETRY_ARRAYS)
                 result = bathymetry_parser.parse_file(path)
 
                 if result["success"]:
+                    result["bathymetry_id"] = _BATHYMETRY_PYRAMIDS.put(
+                        bathymetry_parser.pyramid
+                    )
                     return jsonify(result)
                 else:
                     return jsonify({"error": result["message"]}), 400
@@ -705,6 +1215,37 @@ def upload_bathymetry_file():
     return jsonify({"error": "Invalid file format. Please upload a .txt file."}), 400
 
 
+@app.route("/api/bathymetry-profile", methods=["POST"])
+def bathymetry_profile():
+    bathymetry_id = request.form.get("bathymetry_id")
+    if not bathymetry_id:
+        return jsonify({"error": "No bathymetry_id provided"}), 400
+    try:
+        x_min = float(request.form.get("x_min", ""))
+        x_max = float(request.form.get("x_max", ""))
+        width = int(request.form.get("width", ""))
+    except ValueError:
+        return jsonify({"error": "x_min, x_max and width must be numeric"}), 400
+
+    pyramid = _BATHYMETRY_PYRAMIDS.get(bathymetry_id)
+    if pyramid is None:
+        return jsonify({"error": "Unknown or expired bathymetry_id"}), 404
+
+    try:
+        profile = downsample_profile(pyramid, x_min, x_max, width)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(
+        {
+            "inline_distance": profile["x"],
+            "depth": profile["y"],
+            "num_points": profile["num_points"],
+            "range_points": profile["range_points"],
+            "downsampled": profile["downsampled"],
+        }
+    )
+
+
 @app.route("/api/misfit_stats", methods=["POST"])
 def calculate_misfit_stats():
     """
@@ -758,4 +1299,6 @@ def calculate_misfit_stats():
 
 
 if __name__ == "__main__":
+    # Frozen (PyInstaller) process-pool workers must run their task, not the server.
+    multiprocessing.freeze_support()
     app.run(debug=_get_debug_flag(), port=3354)
@@ -0,0 +1,211 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from lru_store import LruStore
+
+
+# Finest pyramid block size; finer blocks cost more memory than they save.
+MIN_BLOCK_SIZE = 8
+# Upper bound on the pixel width of one downsampling request.
+MAX_PIXEL_WIDTH = 20000
+
+
+@dataclass(frozen=True, eq=False)
+class MinMaxPyramid:
+    """Sorted profile samples with min/max positions over power-of-two blocks.
+
+    Level `k` covers blocks of `MIN_BLOCK_SIZE * 2**k` consecutive samples and
+    stores, per full block, the index of its first minimum and first maximum.
+    NaN samples are skipped; only an all-NaN block points at a NaN.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    block_sizes: List[int]
+    argmin_levels: List[np.ndarray]
+    argmax_levels: List[np.ndarray]
+
+    def __len__(self) -> int:
+        return int(len(self.x))
+
+
+def _pair_extremes(y: np.ndarray, indices: np.ndarray, take_max: bool) -> np.ndarray:
+    pairs = indices[: len(indices) // 2 * 2].reshape(-1, 2)
+    first, second = y[pairs[:, 0]], y[pairs[:, 1]]
+    second_wins = second > first if take_max else second < first
+    # A NaN never wins against a number
+    second_wins |= np.isnan(first)
+    return np.where(second_wins, pairs[:, 1], pairs[:, 0])
+
+
+def build_min_max_pyramid(x, y) -> MinMaxPyramid:
+    """Build the min/max pyramid of a profile whose `x` is sorted ascending."""
+
+    x = np.ascontiguousarray(x, dtype=np.float64).reshape(-1)
+    y = np.ascontiguousarray(y, dtype=np.float64).reshape(-1)
+    if len(x) != len(y):
+        raise ValueError("x and y must have the same length")
+    index_dtype = np.int32 if len(x) < np.iinfo(np.int32).max else np.int64
+
+    block_sizes: List[int] = []
+    argmin_levels: List[np.ndarray] = []
+    argmax_levels: List[np.ndarray] = []
+    block_count = len(y) // MIN_BLOCK_SIZE
+    if block_count:
+        blocks = y[: block_count * MIN_BLOCK_SIZE].reshape(block_count, MIN_BLOCK_SIZE)
+        offsets = np.arange(block_count, dtype=index_dtype) * MIN_BLOCK_SIZE
+        block_sizes.append(MIN_BLOCK_SIZE)
+        missing = np.isnan(blocks)
+        if missing.any():
+            lowest = np.where(missing, np.inf, blocks).argmin(axis=1)
+            highest = np.where(missing, -np.inf, blocks).argmax(axis=1)
+        else:
+            lowest, highest = blocks.argmin(axis=1), blocks.argmax(axis=1)
+        argmin_levels.append(offsets + lowest.astype(index_dtype))
+        argmax_levels.append(offsets + highest.astype(index_dtype))
+    while block_sizes and len(argmin_levels[-1]) >= 2:
+        block_sizes.append(block_sizes[-1] * 2)
+        argmin_levels.append(_pair_extremes(y, argmin_levels[-1], take_max=False))
+        argmax_levels.append(_pair_extremes(y, argmax_levels[-1], take_max=True))
+
+    return MinMaxPyramid(x, y, block_sizes, argmin_levels, argmax_levels)
+
+
+def finite_or_none(values) -> list:
+    """Return `values` as a list with NaN/inf replaced by None (JSON null)."""
+
+    values = np.asarray(values)
+    finite = np.isfinite(values)
+    if finite.all():
+        return values.tolist()
+    items = values.astype(object)
+    items[~finite] = None
+    return items.tolist()
+
+
+def _concatenated_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Return `arange(start, start + count)` for every pair, concatenated."""
+
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(int(counts.sum())) - offsets + np.repeat(starts, counts)
+
+
+def _bin_extremes(
+    pyramid: MinMaxPyramid,
+    bin_starts: np.ndarray,
+    bin_ends: np.ndarray,
+    take_max: bool,
+) -> np.ndarray:
+    """Return the index of the first min (or max) sample of every bin holding a number.
+
+    Each bin is split into raw samples up to the first block boundary, whole
+    blocks of the chosen pyramid level and raw samples after the last block
+    boundary, and the extreme is taken over those candidates at once.
+    """
+
+    y = pyramid.y
+    widest = int(np.max(bin_ends - bin_starts))
+    # Balance raw edge samples (~2 * block per bin) against blocks (~span / block).
+    level = -1
+    for candidate, block_size in enumerate(pyramid.block_sizes):
+        if block_size * block_size * 2 <= widest:
+            level = candidate
+
+    if level < 0:
+        unit_bins = np.repeat(np.arange(len(bin_starts)), bin_ends - bin_starts)
+        unit_indices = _concatenated_ranges(bin_starts, bin_ends - bin_starts)
+    else:
+        block_size = pyramid.block_sizes[level]
+        extremes = (pyramid.argmax_levels if take_max else pyramid.argmin_levels)[level]
+        first_block = -(-bin_starts // block_size)
+        last_block = bin_ends // block_size
+        has_blocks = first_block < last_block
+        head_end = np.where(has_blocks, first_block * block_size, bin_ends)
+        tail_start = np.where(has_blocks, last_block * block_size, bin_ends)
+        block_counts = np.where(has_blocks, last_block - first_block, 0)
+
+        # Candidates per bin, in sample order: head samples, block extremes, tail samples.
+        counts = np.stack((head_end - bin_starts, block_counts, bin_ends - tail_start), axis=1)
+        starts = np.stack((bin_starts, first_block, tail_start), axis=1)
+        flat_counts = counts.reshape(-1)
+        positions = _concatenated_ranges(starts.reshape(-1), flat_counts)
+        is_block = np.repeat(np.tile([False, True, False], len(bin_starts)), flat_counts)
+        unit_indices = np.where(is_block, extremes[np.where(is_block, positions, 0)], positions)
+        unit_bins = np.repeat(np.arange(len(bin_starts)), counts.sum(axis=1))
+
+    values = y[unit_indices]
+    units_per_bin = np.bincount(unit_bins, minlength=len(bin_starts))
+    bin_first_unit = np.cumsum(units_per_bin) - units_per_bin
+    # fmax/fmin skip NaN, so a bin with some NaN samples keeps its extremes
+    reduce = np.fmax if take_max else np.fmin
+    extreme_values = reduce.reduceat(values, bin_first_unit)
+    at_extreme = np.flatnonzero(values == extreme_values[unit_bins])
+    _, first = np.unique(unit_bins[at_extreme], return_index=True)
+    return unit_indices[at_extreme[first]]
+
+
+def downsample_profile(
+    pyramid: MinMaxPyramid,
+    x_min: float,
+    x_max: float,
+    width: int,
+) -> Dict[str, object]:
+    """Return the samples needed to draw `[x_min, x_max]` exactly at `width` pixels.
+
+    Every pixel column keeps its first, last, minimum and maximum sample
+    (M4 aggregation), so a line drawn through the result covers the same
+    pixels as one drawn through all samples. The nearest samples outside the
+    range are included so the line reaches the viewport edges. Ranges with
+    at most `4 * width` samples are returned unreduced.
+    """
+
+    if width < 1:
+        raise ValueError("width must be a positive integer")
+    width = min(int(width), MAX_PIXEL_WIDTH)
+    if not x_max > x_min:
+        raise ValueError("x_max must be greater than x_min")
+
+    x = pyramid.x
+    start = int(np.searchsorted(x, x_min, side="left"))
+    end = int(np.searchsorted(x, x_max, side="right"))
+    sample_count = end - start
+
+    if sample_count <= 4 * width:
+        indices = np.arange(start, end)
+    else:
+        edges = np.searchsorted(x, np.linspace(x_min, x_max, width + 1), side="left")
+        edges[0], edges[-1] = start, end
+        bin_starts, bin_ends = edges[:-1], edges[1:]
+        filled = bin_ends > bin_starts
+        bin_starts, bin_ends = bin_starts[filled], bin_ends[filled]
+        indices = np.unique(
+            np.concatenate(
+                (
+                    bin_starts,
+                    bin_ends - 1,
+                    _bin_extremes(pyramid, bin_starts, bin_ends, take_max=False),
+                    _bin_extremes(pyramid, bin_starts, bin_ends, take_max=True),
+                )
+            )
+        )
+
+    # Neighbours just outside the range keep the line running to the edges.
+    before = [start - 1] if start > 0 else []
+    after = [end] if end < len(x) else []
+    indices = np.concatenate((before, indices, after)).astype(np.int64)
+    return {
+        "x": x[indices].tolist(),
+        "y": finite_or_none(pyramid.y[indices]),
+        "range_points": sample_count,
+        "num_points": int(len(indices)),
+        "downsampled": sample_count > 4 * width,
+    }
+
+
+class ProfilePyramidCache(LruStore[MinMaxPyramid]):
+    """Small thread-safe LRU store of profile pyramids keyed by generated ids."""
+
+    def __init__(self, max_entries: int = 8):
+        super().__init__(max_entries)
\ No newline at end of file
@@ -1,3 +1,4 @@
+import io
 import re
 from datetime import datetime
 import pandas as pd
@@ -5,63 +6,113 @@ import numpy as np
 import os
 from MARE2DEM_poly_parser import MARE2DEMPolyParser
 
+# First `!#` line of a .resistivity file: the region table header.
+_TABLE_HEADER_PATTERN = re.compile(r'^[ \t]*(!#.*?)[ \t]*$\n?', re.MULTILINE)
+
 class ResistivityFileParser():
     """Class for parsing .resistivity files used in MARE2DEM."""
     def __init__(self):
         pass
 
     def parse_resistivity_file(self, filename, rho_parse=False):
-        """Reads a .resistivity file"""
-        data = {}
-        table_data = []
-        table_header = []
-
+        """Reads a .resistivity file
+        
+        Header lines are parsed one by one into `{key: {"value", "comment", "line"}}`.
+        The region table after the `!#` header line is read in one pass by the
+        pandas C parser; tables it cannot read fall back to row-by-row parsing.
+        """
         with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                line = line.strip()
-
-                # Skip empty lines and special comments
-                if not line:
-                    continue
-
-                # Split line by "!" to separate value and comment
-                if "!" in line:
-                    value_part, comment_part = map(str.strip, line.split("!", 1))
-                else:
-                    value_part, comment_part = line, None
-                
-                # Parse key-value pairs
-                if ":" in value_part:
-                    key, value = map(str.strip, value_part.split(":", 1))
-                    
-                    # Handle special cases like lists or numbers
-                    if ',' in value:
-                        value = [float(x) if '.' in x or 'e' in x.lower() else int(x) for x in value.split(',')]
-                    elif re.match(r'^\d+(\.\d+)?$', value):
-                        value = float(value) if '.' in value else int(value)
-                    elif re.match(r'^\d{2}-[A-Za-z]{3}-\d{4} \d{2}:\d{2}:\d{2}$', value):
-                        value = datetime.strptime(value, "%d-%b-%Y %H:%M:%S")
-                    
-                    # Store value and comment in data dictionary
-                    data[key] = {"value": value, "comment": comment_part, "line": line}
-                
-                # Parse table data
-                # extract table header and data
-                if rho_parse:
-                    if line.startswith("!#"):
-                        table_header = [x.strip() for x in re.split(r'\s{2,}', line[1:])]
-                        print(table_header)
-                    elif re.match(r'^\d+', value_part):  # If the line starts with a number, it belongs to the table
-                        row = [float(x) if re.match(r'^\d+(\.\d+|e[+-]?\d+)?$', x) else x for x in re.split(r'\s+', value_part)]
-                        table_data.append(row)
+            text = file.read()
+        
+        header_match = _TABLE_HEADER_PATTERN.search(text)
+        header_end = header_match.start() if header_match else len(text)
+        data = {}
+        for line in text[:header_end].splitlines():
+            self._parse_key_value_line(line, data)
+        
+        data["table"] = None
+        if rho_parse and header_match:
+            table_header = [x.strip() for x in re.split(r'\s{2,}', header_match.group(1)[1:])]
+            data["table"] = self._read_table(table_header, text[header_match.end():])
+        
+        return data
 
-        # Add table data to the result if exists
-        if table_header and table_data:
-            data["table"] = pd.DataFrame(table_data, columns=table_header)
+    def _parse_key_value_line(self, line, data):
+        """Store a `Key: value ! comment` line in `data`, typing numbers, lists and dates."""
+        line = line.strip()
+        if not line:
+            return
+        
+        # Split line by "!" to separate value and comment
+        if "!" in line:
+            value_part, comment_part = map(str.strip, line.split("!", 1))
         else:
-            data["table"] = None
+            value_part, comment_part = line, None
+        
+        if ":" not in value_part:
+            return
+        key, value = map(str.strip, value_part.split(":", 1))
+        
+        # Handle special cases like lists or numbers
+        if ',' in value:
+            value = [float(x) if '.' in x or 'e' in x.lower() else int(x) for x in value.split(',')]
+        elif re.match(r'^\d+(\.\d+)?$', value):
+            value = float(value) if '.' in value else int(value)
+        elif re.match(r'^\d{2}-[A-Za-z]{3}-\d{4} \d{2}:\d{2}:\d{2}$', value):
+            value = datetime.strptime(value, "%d-%b-%Y %H:%M:%S")
+        
+        data[key] = {"value": value, "comment": comment_part, "line": line}
 
-        return data
+    def _read_table(self, table_header, table_text):
+        """Read the region table rows that follow the `!#` header line.
+        
+        Numeric columns are float, except the free-parameter column, which is
+        int when all of its values are whole numbers.
+        """
+        try:
+            table = pd.read_csv(
+                io.StringIO(table_text),
+                sep=r'\s+',
+                header=None,
+                comment='!',
+                engine='c',
+                skip_blank_lines=True,
+                na_filter=False,
+            )
+        except pd.errors.EmptyDataError:
+            return None
+        except (ValueError, pd.errors.ParserError):
+            return self._parse_table_rows(table_header, table_text)
+        
+        first_column = pd.to_numeric(table.iloc[:, 0], errors='coerce')
+        if len(table.columns) != len(table_header) or first_column.isna().any():
+            return self._parse_table_rows(table_header, table_text)
+        
+        table.columns = table_header
+        for position, column in enumerate(table_header):
+            values = table.iloc[:, position]
+            numeric = pd.to_numeric(values, errors='coerce')
+            if numeric.notna().all():
+                values = numeric.astype(float)
+                if (str(column).strip().lower() in ('param', 'parameter')
+                        and np.all(np.mod(values.to_numpy(), 1) == 0)):
+                    values = values.astype(np.int64)
+            elif values.dtype == object:
+                values = numeric.astype(object).where(numeric.notna(), values)
+            table.isetitem(position, values)
+        return table
+
+    def _parse_table_rows(self, table_header, table_text):
+        """Row-by-row table parse for tables the bulk reader cannot handle."""
+        table_data = []
+        for line in table_text.splitlines():
+            value_part = line.strip().split("!", 1)[0].strip()
+            if re.match(r'^\d+', value_part):  # If the line starts with a number, it belongs to the table
+                row = [float(x) if re.match(r'^\d+(\.\d+|e[+-]?\d+)?$', x) else x for x in re.split(r'\s+', value_part)]
+                table_data.append(row)
+        if not table_data:
+            return None
+        return pd.DataFrame(table_data, columns=table_header)
 
     def merge_resistivity_files(self, resistivity_file1, resistivity_file2, merged_poly_vertices, 
                                merged_poly_segments, output_file, uniform_resistivity=None):
@@ -103,6 +154,116 @@ class ResistivityFileParser():
         print(f"Merged resistivity file written to: {output_file}")
         return merged_data
 
+    def mosaic_resistivity_files(self, resistivity_files, region_sources, output_file,
+                                 poly_filename=None, fill_resistivity=None):
+        """
+        Build the resistivity file of a poly mosaic from the source resistivity files.
+        
+        Every merged region takes the row of the source region it was seeded from, so
+        resistivity, bounds, prejudice and weight stay attached to the same geology.
+        Free parameters are renumbered 1..K across the mosaic; fixed regions keep 0.
+        
+        Args:
+            resistivity_files (list): Resistivity file paths, aligned with the poly files
+            region_sources (list): Per merged region, `(file_index, source_region)` or None,
+                as returned by `MARE2DEMPolyManager.mosaic_poly`
+            output_file (str): Path for output merged resistivity file
+            poly_filename (str, optional): Model file name written to the header
+            fill_resistivity (float, optional): Rho for regions without a source region.
+                Defaults to the median source resistivity.
+        
+        Returns:
+            dict: Merged resistivity data structure
+        """
+        print(f"Reading {len(resistivity_files)} resistivity files...")
+        source_rows = pd.concat(
+            [
+                self._region_parameter_rows(self.parse_resistivity_file(path, rho_parse=True))
+                for path in resistivity_files
+            ],
+            keys=range(len(resistivity_files)),
+        )
+        
+        if fill_resistivity is None:
+            fill_resistivity = float(source_rows['Rho'].median()) if len(source_rows) else 1.0
+        
+        # Regions created by the merge look up a key that no source table has
+        source_keys = [(-1, -1) if source is None else (int(source[0]), int(source[1])) for source in region_sources]
+        table = source_rows.reindex(pd.MultiIndex.from_arrays(
+            [[key[0] for key in source_keys], [key[1] for key in source_keys]]
+        ))
+        unmatched = int(table['Rho'].isna().sum())
+        table = table.fillna({'Rho': fill_resistivity, 'Param': 1, 'Lower': 0.0, 'Upper': 0.0,
+                              'Prej': 0.0, 'Weight': 0.0})
+        
+        free = table['Param'].to_numpy() > 0
+        columns = {
+            'Region': np.arange(1, len(region_sources) + 1),
+            'Rho': table['Rho'].to_numpy(dtype=float),
+            'Param': np.where(free, np.cumsum(free), 0),
+        }
+        for name in ('Lower', 'Upper', 'Prej', 'Weight'):
+            columns[name] = table[name].to_numpy(dtype=float)
+        
+        if unmatched:
+            print(f"  {unmatched} regions without a source region use {fill_resistivity:.4g} ohm-m")
+        
+        num_regions = len(region_sources)
+        merged_data = {
+            'Model File': {'value': poly_filename or 'merged_output.poly', 'comment': 'Mosaic poly file', 'line': ''},
+            'Number of regions': {'value': num_regions, 'comment': 'Mosaic regions count', 'line': ''},
+            'Date/Time': {'value': datetime.now().strftime("%m/%d/%Y %H:%M:%S.%f")[:-3],
+                          'comment': 'Mosaic timestamp', 'line': ''},
+            'resistivity_table': pd.DataFrame({
+                'Region': np.array(columns['Region'], dtype=int),
+                'Rho': np.array(columns['Rho'], dtype=float),
+                'Param': np.array(columns['Param'], dtype=int),
+                'Lower': np.array(columns['Lower'], dtype=float),
+                'Upper': np.array(columns['Upper'], dtype=float),
+                'Prej': np.array(columns['Prej'], dtype=float),
+                'Weight': np.array(columns['Weight'], dtype=float),
+            }),
+        }
+        
+        self._write_resistivity_file(output_file, merged_data, num_regions, mamba2d_format=True)
+        
+        print(f"Mosaic resistivity file written to: {output_file}")
+        return merged_data
+
+    def _region_parameter_rows(self, data):
+        """Return the parsed table as a frame of Rho, Param, Lower, Upper, Prej, Weight indexed by region."""
+        names = ['Rho', 'Param', 'Lower', 'Upper', 'Prej', 'Weight']
+        empty = pd.DataFrame(columns=names, index=pd.Index([], dtype=int), dtype=float)
+        table = data.get('table')
+        if table is None or len(table.columns) == 0:
+            return empty
+        
+        normalized = {str(column).strip().lower(): column for column in table.columns}
+        rho_column = next(
+            (normalized[name] for name in ('rho', 'rho-y', 'rho_y', 'rho-h', 'rho_h') if name in normalized),
+            None,
+        )
+        if rho_column is None:
+            return empty
+        defaults = {'param': 1, 'lower': 0.0, 'upper': 0.0, 'prej': 0.0, 'weight': 0.0}
+        
+        region = pd.to_numeric(table[table.columns[0]], errors='coerce')
+        columns = {'Rho': pd.to_numeric(table[rho_column], errors='coerce')}
+        for name, default in defaults.items():
+            if name in normalized:
+                columns[name.capitalize()] = pd.to_numeric(table[normalized[name]], errors='coerce')
+            else:
+                columns[name.capitalize()] = pd.Series(float(default), index=table.index)
+        rows = pd.DataFrame(columns, dtype=float)
+        
+        # Rows with non-numeric entries are skipped; a repeated region keeps its last row
+        valid = (region.notna() & rows.notna().all(axis=1)).to_numpy()
+        rows = rows[valid]
+        rows.index = region[valid].astype(float).astype(int).to_numpy()
+        rows = rows[~rows.index.duplicated(keep='last')]
+        rows['Param'] = rows['Param'].astype(int)
+        return rows
+
     def _estimate_regions_from_poly(self, vertices, segments):
         """
         Estimate number of triangular regions from poly file structure.
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True, eq=False)
+class RegionResistivityColumns:
+    """Per-region rho/Param columns of a resistivity table, sorted by region id.
+
+    Rows whose region id or rho is not numeric are dropped; when a region id
+    repeats, the last row wins. `param` is None when the table has no Param
+    column and holds NaN for non-numeric Param cells.
+    """
+
+    region_ids: np.ndarray
+    rho: np.ndarray
+    param: Optional[np.ndarray]
+
+    def __len__(self) -> int:
+        return int(len(self.region_ids))
+
+    def positions(self, region_ids: Any) -> np.ndarray:
+        """Return row positions of `region_ids`, or -1 where a region has no row."""
+
+        region_ids = np.asarray(region_ids, dtype=np.int64).reshape(-1)
+        positions = np.searchsorted(self.region_ids, region_ids)
+        positions = np.minimum(positions, max(len(self.region_ids) - 1, 0))
+        result = np.full(len(region_ids), -1, dtype=np.int64)
+        if not len(self.region_ids):
+            return result
+        found = self.region_ids[positions] == region_ids
+        result[found] = positions[found]
+        return result
+
+    def rho_lookup(self) -> Dict[int, float]:
+        return dict(zip(self.region_ids.tolist(), self.rho.tolist()))
+
+
+def _normalize_column_name(name: Any) -> str:
+    return str(name).strip().lower().replace("_", "").replace("-", "")
+
+
+def find_table_column(columns: Iterable[Any], candidates: Sequence[str]) -> Any:
+    """Return the first column whose normalized name is one of `candidates`."""
+
+    normalized_candidates = {_normalize_column_name(candidate) for candidate in candidates}
+    for column in columns:
+        if _normalize_column_name(column) in normalized_candidates:
+            return column
+    return None
+
+
+def numeric_table_column(table: pd.DataFrame, column: Any) -> np.ndarray:
+    """Return `column` as float64, with non-numeric cells as NaN.
+
+    A label shared by several columns has no single value per row and is
+    returned as all NaN.
+    """
+
+    values = table[column]
+    if isinstance(values, pd.DataFrame):
+        return np.full(len(table), np.nan)
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def read_region_resistivity_columns(
+    table: pd.DataFrame,
+    region_column: Any,
+    rho_column: Any,
+    param_column: Any = None,
+) -> RegionResistivityColumns:
+    """Convert the region, rho and optional Param columns to per-region arrays."""
+
+    region_values = numeric_table_column(table, region_column)
+    rho = numeric_table_column(table, rho_column)
+    valid = np.isfinite(region_values) & ~np.isnan(rho)
+    region_ids = np.trunc(region_values[valid]).astype(np.int64)
+
+    # Keep the last row of every region id, matching dict assignment order.
+    reversed_ids = region_ids[::-1]
+    unique_ids, reversed_first = np.unique(reversed_ids, return_index=True)
+    rows = np.flatnonzero(valid)[len(region_ids) - 1 - reversed_first]
+
+    param = None
+    if param_column is not None:
+        param = numeric_table_column(table, param_column)[rows]
+    return RegionResistivityColumns(region_ids=unique_ids, rho=rho[rows], param=param)
+
+
+def table_to_records(
+    table: pd.DataFrame,
+    convert_value: Callable[[Any], Any],
+) -> List[Dict[Any, Any]]:
+    """Return the rows of `table` as dicts, converting one column at a time.
+
+    Values are upcast to the common dtype of the table as `DataFrame.iterrows`
+    would. Numeric columns are converted with a single `tolist`; other values
+    go through `convert_value`. A label shared by several columns maps to the
+    list of its values.
+    """
+
+    values = table.to_numpy()
+    if values.dtype.kind not in "biufO":
+        values = table.astype(object).to_numpy()
+
+    positions_by_label: Dict[Any, List[int]] = {}
+    for position, label in enumerate(table.columns):
+        positions_by_label.setdefault(label, []).append(position)
+
+    def column_values(position: int) -> List[Any]:
+        column = values[:, position]
+        if column.dtype.kind in "biuf":
+            return column.tolist()
+        return [convert_value(value) for value in column.tolist()]
+
+    labels = list(positions_by_label)
+    columns = []
+    for positions in positions_by_label.values():
+        if len(positions) == 1:
+            columns.append(column_values(positions[0]))
+        else:
+            columns.append(
+                [list(row) for row in zip(*(column_values(position) for position in positions))]
+            )
+    return [dict(zip(labels, row)) for row in zip(*columns)]
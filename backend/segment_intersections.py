@@ -0,0 +1,226 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Upper bound on candidate pairs evaluated at once, to keep memory flat on
+# very large models.
+DEFAULT_CANDIDATE_CHUNK = 2_000_000
+# Upper bound on (segment, cell) entries produced when binning one side.
+_MAX_CELL_ENTRIES_PER_SEGMENT = 4
+
+
+def _segment_bounds(segments: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    lower = np.minimum(segments[:, 0:2], segments[:, 2:4])
+    upper = np.maximum(segments[:, 0:2], segments[:, 2:4])
+    return lower, upper
+
+
+def _choose_cell_size(
+    lower: np.ndarray,
+    upper: np.ndarray,
+    origin: np.ndarray,
+    extent: float,
+) -> float:
+    """Return a grid cell size that keeps the average cell entries per segment small."""
+
+    sizes = (upper - lower).max(axis=1)
+    cell_size = max(float(np.mean(sizes)) if len(sizes) else 0.0, extent / 4096.0)
+    if cell_size <= 0:
+        return 1.0
+
+    limit = _MAX_CELL_ENTRIES_PER_SEGMENT * len(lower)
+    while True:
+        first = np.floor((lower - origin) / cell_size)
+        last = np.floor((upper - origin) / cell_size)
+        entries = np.prod(last - first + 1, axis=1).sum()
+        if entries <= limit:
+            return cell_size
+        cell_size *= 2.0
+
+
+def _bin_segments(
+    lower: np.ndarray,
+    upper: np.ndarray,
+    origin: np.ndarray,
+    cell_size: float,
+    columns: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return `(cell_keys, segment_indices)` for every cell each segment bbox covers."""
+
+    first = np.floor((lower - origin) / cell_size).astype(np.int64)
+    last = np.floor((upper - origin) / cell_size).astype(np.int64)
+    spans = last - first + 1
+    counts = spans[:, 0] * spans[:, 1]
+
+    segment_indices = np.repeat(np.arange(len(lower), dtype=np.int64), counts)
+    offsets = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    span_x = spans[segment_indices, 0]
+    cell_x = first[segment_indices, 0] + offsets % span_x
+    cell_y = first[segment_indices, 1] + offsets // span_x
+    return cell_y * columns + cell_x, segment_indices
+
+
+def _candidate_pair_chunks(
+    first_keys: np.ndarray,
+    first_indices: np.ndarray,
+    second_keys: np.ndarray,
+    second_indices: np.ndarray,
+    chunk_size: int,
+):
+    """Yield `(first, second)` index arrays for segments sharing a grid cell."""
+
+    order = np.argsort(first_keys, kind="stable")
+    sorted_keys = first_keys[order]
+    sorted_indices = first_indices[order]
+    starts = np.searchsorted(sorted_keys, second_keys, side="left")
+    stops = np.searchsorted(sorted_keys, second_keys, side="right")
+    counts = stops - starts
+
+    cumulative = np.cumsum(counts)
+    entry = 0
+    while entry < len(second_keys):
+        consumed = int(cumulative[entry - 1]) if entry else 0
+        stop = max(
+            int(np.searchsorted(cumulative, consumed + chunk_size, side="right")),
+            entry + 1,
+        )
+        chunk_counts = counts[entry:stop]
+        total = int(chunk_counts.sum())
+        if total:
+            offsets = np.arange(total, dtype=np.int64) - np.repeat(
+                np.cumsum(chunk_counts) - chunk_counts, chunk_counts
+            )
+            positions = np.repeat(starts[entry:stop], chunk_counts) + offsets
+            yield sorted_indices[positions], np.repeat(
+                second_indices[entry:stop], chunk_counts
+            )
+        entry = stop
+
+
+def _intersect_pairs(
+    first: np.ndarray,
+    second: np.ndarray,
+    tolerance: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized form of the scalar line intersection test.
+
+    Uses the same arithmetic as `MARE2DEMPolyManager._calculate_line_intersection`
+    so the returned points are bit-for-bit identical. Only proper crossings
+    (strictly inside both segments) are reported.
+    """
+
+    x1, y1, x2, y2 = first[:, 0], first[:, 1], first[:, 2], first[:, 3]
+    x3, y3, x4, y4 = second[:, 0], second[:, 1], second[:, 2], second[:, 3]
+
+    denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    valid = np.abs(denom) >= tolerance
+    safe_denom = np.where(valid, denom, 1.0)
+    t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / safe_denom
+    u = -((x1 - x2) * (y1 - y3) - (y1 - y2) * (x1 - x3)) / safe_denom
+    hits = valid & (t > 0) & (t < 1) & (u > 0) & (u < 1)
+
+    points = np.column_stack(
+        (
+            x1[hits] + t[hits] * (x2[hits] - x1[hits]),
+            y1[hits] + t[hits] * (y2[hits] - y1[hits]),
+        )
+    )
+    return hits, points
+
+
+def find_segment_intersections(
+    first_segments: np.ndarray,
+    second_segments: np.ndarray,
+    tolerance: float,
+    cell_size: Optional[float] = None,
+    chunk_size: int = DEFAULT_CANDIDATE_CHUNK,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find proper crossings between two sets of segments.
+
+    Segments of both sets are binned into a uniform grid, candidate pairs are
+    generated from shared cells, filtered by bounding box and evaluated with
+    vectorized orientation math.
+
+    Args:
+        first_segments: `(n, 4)` array of `x1, y1, x2, y2` rows.
+        second_segments: `(m, 4)` array of `x1, y1, x2, y2` rows.
+        tolerance: Denominator threshold below which lines count as parallel.
+        cell_size: Grid cell size. Chosen from the segment sizes when omitted.
+        chunk_size: Maximum candidate pairs evaluated per batch.
+
+    Returns:
+        tuple: `(first_indices, second_indices, points)` for every crossing,
+        ordered by second index and then first index.
+    """
+
+    first_segments = np.asarray(first_segments, dtype=np.float64).reshape(-1, 4)
+    second_segments = np.asarray(second_segments, dtype=np.float64).reshape(-1, 4)
+    empty = (
+        np.zeros(0, dtype=np.int64),
+        np.zeros(0, dtype=np.int64),
+        np.zeros((0, 2), dtype=np.float64),
+    )
+    if not len(first_segments) or not len(second_segments):
+        return empty
+
+    first_lower, first_upper = _segment_bounds(first_segments)
+    second_lower, second_upper = _segment_bounds(second_segments)
+    origin = np.minimum(first_lower.min(axis=0), second_lower.min(axis=0))
+    top = np.maximum(first_upper.max(axis=0), second_upper.max(axis=0))
+    extent = float((top - origin).max())
+    if cell_size is None:
+        cell_size = _choose_cell_size(
+            np.vstack((first_lower, second_lower)),
+            np.vstack((first_upper, second_upper)),
+            origin,
+            extent,
+        )
+    columns = int(np.floor((top[0] - origin[0]) / cell_size)) + 1
+
+    first_keys, first_indices = _bin_segments(
+        first_lower, first_upper, origin, cell_size, columns
+    )
+    second_keys, second_indices = _bin_segments(
+        second_lower, second_upper, origin, cell_size, columns
+    )
+
+    found_first = []
+    found_second = []
+    found_points = []
+    first_count = np.int64(len(first_segments))
+    for first_batch, second_batch in _candidate_pair_chunks(
+        first_keys, first_indices, second_keys, second_indices, chunk_size
+    ):
+        overlaps = (
+            (first_lower[first_batch, 0] <= second_upper[second_batch, 0])
+            & (second_lower[second_batch, 0] <= first_upper[first_batch, 0])
+            & (first_lower[first_batch, 1] <= second_upper[second_batch, 1])
+            & (second_lower[second_batch, 1] <= first_upper[first_batch, 1])
+        )
+        first_batch = first_batch[overlaps]
+        second_batch = second_batch[overlaps]
+        hits, points = _intersect_pairs(
+            first_segments[first_batch], second_segments[second_batch], tolerance
+        )
+        found_first.append(first_batch[hits])
+        found_second.append(second_batch[hits])
+        found_points.append(points)
+
+    if not found_first:
+        return empty
+
+    first_hits = np.concatenate(found_first)
+    second_hits = np.concatenate(found_second)
+    points = np.concatenate(found_points)
+
+    # Pairs sharing several cells are found more than once.
+    _, unique_positions = np.unique(
+        second_hits * first_count + first_hits, return_index=True
+    )
+    return (
+        first_hits[unique_positions],
+        second_hits[unique_positions],
+        points[unique_positions],
+    )
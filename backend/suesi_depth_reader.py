@@ -1,40 +1,159 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
 from flask import jsonify
-from scipy.io import loadmat
+from scipy.io import loadmat, whosmat
+import numpy as np
 import pandas as pd
 
-def process_SuesiDepth_mat_file(filepath):
-    # Load .mat file
-    mat_data = loadmat(filepath)
-    print(mat_data.keys())
-    if all(key in mat_data.keys() for key in ["depth", "time"]):
+from profile_downsampling import MinMaxPyramid, build_min_max_pyramid, downsample_profile, finite_or_none
+
+# MATLAB datenum of 1970-01-01
+MATLAB_EPOCH_DATENUM = 719529
+SECONDS_PER_DAY = 86400
+# Default point budget of a decimated series window
+DEFAULT_SERIES_POINTS = 2000
+
+
+@dataclass(frozen=True, eq=False)
+class SuesiSeries:
+    """Towed-instrument time series read from a SuESI/nav .mat file.
+
+    `kind` is the variable the series came from (`depth`, `nTET` or
+    `nVulcan`), `time` holds Unix seconds rounded to whole seconds and
+    `value` the matching samples, both in file order.
+    """
+
+    kind: str
+    time: np.ndarray
+    value: np.ndarray
+
+    def __len__(self) -> int:
+        return int(len(self.time))
+
+    def sorted_by_time(self) -> 'SuesiSeries':
+        """Return the series in time order (stable), or itself if already sorted."""
+        if len(self.time) < 2 or np.all(self.time[1:] >= self.time[:-1]):
+            return self
+        order = np.argsort(self.time, kind='stable')
+        return SuesiSeries(kind=self.kind, time=self.time[order], value=self.value[order])
+
+    def to_payload(self) -> dict:
+        return {
+            'kind': self.kind,
+            'num_points': len(self),
+            'time': self.time.tolist(),
+            'value': finite_or_none(self.value),
+        }
+
+
+
+def list_mat_variables(filepath) -> List[str]:
+    """Return the variable names of a .mat file without loading their data."""
+    return [name for name, _, _ in whosmat(filepath)]
+
+
+def matlab_datenum_to_unix_seconds(datenum) -> np.ndarray:
+    """Convert finite MATLAB datenums to Unix seconds, rounded to whole seconds."""
+    days = np.asarray(datenum, dtype=np.float64).reshape(-1) - MATLAB_EPOCH_DATENUM
+    # Whole days and the day fraction separately, as pandas converts them
+    whole_days = np.floor(days)
+    seconds = np.round((days - whole_days) * SECONDS_PER_DAY).astype(np.int64)
+    return whole_days.astype(np.int64) * SECONDS_PER_DAY + seconds
+
+
+def load_suesi_series(filepath, t0: Optional[float] = None, t1: Optional[float] = None) -> SuesiSeries:
+    """Load the depth/time, nTET or nVulcan series of a .mat file.
+
+    Only the variables of the series are read (`variable_names=`), so large
+    unrelated arrays in navigation files are skipped. Samples without a
+    finite time are dropped. With `t0`/`t1` (Unix seconds, inclusive) only
+    samples inside that window are returned.
+
+    Raises:
+        ValueError: If the file holds none of the supported series.
+    """
+    names = set(list_mat_variables(filepath))
+    if {'depth', 'time'} <= names:
         print('Process time vs depth data')
-        time = pd.to_datetime(mat_data['time'].flatten()-719529,unit='d').round('s') # ignore decimal of s
-        SuesiDepth = pd.DataFrame({
-                    'value': mat_data['depth'].flatten(),
-                    'time': time
-                    })
-        # Convert DataFrame to JSON
-        result = SuesiDepth.to_json(orient='records', date_format='epoch', date_unit='s')
-        return jsonify(result)
-    elif "nTET" in mat_data.keys():
-        print('Process nTET data')
-        time = pd.to_datetime(mat_data["nTET"][0][0][0][:, 0].flatten()-719529,unit='d').round('s')
-        TETData = pd.DataFrame({
-                    'value': mat_data["nTET"][0][0][0][:, 1].flatten(),
-                    'time': time
-                    })
-        # Convert DataFrame to JSON
-        result = TETData.to_json(orient='records', date_format='epoch', date_unit='s')
-        return jsonify(result)
-    elif "nVulcan" in mat_data.keys():
-        print('Process nVulcan data')
-        time = pd.to_datetime(mat_data["nVulcan"][0][0][0][:, 0].flatten()-719529,unit='d').round('s')
-        VulcanData = pd.DataFrame({
-                    'value': mat_data["nVulcan"][0][0][0][:, 1].flatten(),
-                    'time': time
-                    })
-        # Convert DataFrame to JSON
-        result = VulcanData.to_json(orient='records', date_format='epoch', date_unit='s')
-        return jsonify(result)
+        mat_data = loadmat(filepath, variable_names=['depth', 'time'])
+        kind = 'depth'
+        datenum = mat_data['time'].flatten()
+        value = mat_data['depth'].flatten()
     else:
+        kind = next((name for name in ('nTET', 'nVulcan') if name in names), None)
+        if kind is None:
+            raise ValueError('Invalid .mat file')
+        print(f'Process {kind} data')
+        samples = loadmat(filepath, variable_names=[kind])[kind][0][0][0]
+        datenum = samples[:, 0].flatten()
+        value = samples[:, 1].flatten()
+
+    # NaN datenums would cast to INT64_MIN seconds
+    finite = np.isfinite(datenum)
+    if not finite.all():
+        datenum, value = datenum[finite], value[finite]
+    time = matlab_datenum_to_unix_seconds(datenum)
+
+    if t0 is not None or t1 is not None:
+        inside = np.ones(len(time), dtype=bool)
+        if t0 is not None:
+            inside &= time >= t0
+        if t1 is not None:
+            inside &= time <= t1
+        time, value = time[inside], value[inside]
+    return SuesiSeries(kind=kind, time=time, value=value)
+
+
+def build_series_pyramid(series: SuesiSeries) -> MinMaxPyramid:
+    """Sort a series by time and build its min/max pyramid for window queries."""
+    series = series.sorted_by_time()
+    return build_min_max_pyramid(series.time, series.value)
+
+
+def query_series_window(pyramid: MinMaxPyramid, t0: Optional[float] = None, t1: Optional[float] = None,
+                        max_points: int = DEFAULT_SERIES_POINTS) -> dict:
+    """Return the samples of `[t0, t1]` decimated to at most `max_points`.
+
+    The window is found by binary search on the sorted times. Longer windows
+    keep the first, last, minimum and maximum sample of each of
+    `(max_points - 2) // 4` equal time bins, so spikes survive at any zoom;
+    the samples just outside the window are included so lines reach its
+    edges. Missing bounds default to the ends of the series.
+    """
+    if max_points < 6:
+        raise ValueError('max_points must be at least 6')
+    if not len(pyramid):
+        raise ValueError('The series has no samples')
+    time = pyramid.x
+    t0 = float(time[0]) if t0 is None else float(t0)
+    t1 = float(time[-1]) if t1 is None else float(t1)
+    if t1 < t0:
+        raise ValueError('t1 must not be before t0')
+
+    if t1 == t0:
+        # A single instant has nothing to bin; widen it by the smallest step
+        t1 = float(np.nextafter(t0, np.inf))
+    window = downsample_profile(pyramid, t0, t1, max(1, (max_points - 2) // 4))
+    return {
+        'time': window['x'],
+        'value': window['y'],
+        'num_points': window['num_points'],
+        'window_points': window['range_points'],
+        'downsampled': window['downsampled'],
+    }
+
+
+def process_SuesiDepth_mat_file(filepath):
+    """Return the series of a .mat file as a JSON string of `{value, time}` records."""
+    try:
+        series = load_suesi_series(filepath)
+    except ValueError:
         return 'Invalid .mat file'
+    records = pd.DataFrame({
+                'value': series.value,
+                'time': pd.to_datetime(series.time, unit='s')
+                })
+    # Convert DataFrame to JSON
+    result = records.to_json(orient='records', date_format='epoch', date_unit='s')
+    return jsonify(result)
@@ -11,6 +11,7 @@ import pandas as pd
 import pytest
 
 import main as backend_main
+from triangle_mesh_transfer import decode_binary_mesh_payload
 
 
 @pytest.fixture()
@@ -314,6 +315,117 @@ class TestUploadTriangleModel:
         assert constrained_mesh["triangleResistivityValues"] == [100.0, 100.0]
         assert constrained_mesh["regionResistivity"] == [{"regionId": 1, "rho": 100.0}]
 
+    def test_upload_triangle_model_returns_binary_constrained_mesh(self, app_client):
+        """Binary mesh responses should carry the mesh as packed typed arrays."""
+        data = {
+            "poly_file": (io.BytesIO(self.SIMPLE_POLY), "simple.poly"),
+            "resistivity_file": (
+                io.BytesIO(self.SIMPLE_RESISTIVITY),
+                "simple.resistivity",
+            ),
+            "mesh_format": "binary",
+            "vertex_precision": "float32",
+        }
+
+        response = app_client.post(
+            "/api/upload-triangle-model",
+            data=data,
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/octet-stream"
+        decoded = decode_binary_mesh_payload(response.data)
+        payload = decoded["header"]["payload"]
+        arrays = decoded["arrays"]
+        assert payload["polyFileName"] == "simple.poly"
+        assert payload["constrainedMesh"]["triangleCount"] == 2
+        assert arrays["vertices"].dtype.name == "float32"
+        assert len(arrays["vertices"]) == 8
+        assert len(arrays["triangles"]) == 6
+        assert set(arrays["triangles"].tolist()) == {0, 1, 2, 3}
+        assert arrays["triangleRegionIds"].tolist() == [1, 1]
+        assert arrays["triangleResistivityValues"].tolist() == [100.0, 100.0]
+        assert arrays["regionIds"].tolist() == [1]
+
+    def test_upload_triangle_model_rejects_unknown_mesh_format(self, app_client):
+        """Unknown mesh formats should be rejected before parsing."""
+        data = {
+            "poly_file": (io.BytesIO(self.SIMPLE_POLY), "simple.poly"),
+            "mesh_format": "xml",
+        }
+
+        response = app_client.post(
+            "/api/upload-triangle-model",
+            data=data,
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 400
+        assert "mesh_format" in response.get_json()["error"]
+
+    def test_upload_triangle_model_with_viewport_returns_mesh_lod(self, app_client):
+        """A viewport should return a level of detail and a reusable lod id."""
+        data = {
+            "poly_file": (io.BytesIO(self.SIMPLE_POLY), "simple.poly"),
+            "resistivity_file": (
+                io.BytesIO(self.SIMPLE_RESISTIVITY),
+                "simple.resistivity",
+            ),
+            "viewport": json.dumps({"widthPx": 400, "heightPx": 300}),
+        }
+
+        response = app_client.post(
+            "/api/upload-triangle-model",
+            data=data,
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        mesh_lod = payload["meshLod"]
+        assert mesh_lod["level"] == 0
+        assert mesh_lod["levels"][0]["triangleCount"] == 2
+        assert len(payload["constrainedMesh"]["triangles"]) == 2
+
+        bounds = mesh_lod["bounds"]
+        width = bounds["yMax"] - bounds["yMin"]
+        response = app_client.post(
+            "/api/triangle-mesh-lod",
+            data={
+                "lod_id": mesh_lod["id"],
+                "viewport": json.dumps(
+                    {
+                        "yMin": bounds["yMin"] + 0.6 * width,
+                        "yMax": bounds["yMax"],
+                        "zMin": bounds["zMin"],
+                        "zMax": bounds["zMin"] + 0.2 * width,
+                        "widthPx": 400,
+                        "heightPx": 300,
+                    }
+                ),
+            },
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["meshLod"]["id"] == mesh_lod["id"]
+        assert 1 <= len(payload["constrainedMesh"]["triangles"]) <= 2
+
+    def test_triangle_mesh_lod_rejects_unknown_id(self, app_client):
+        """Expired or unknown lod ids should return 404."""
+        response = app_client.post(
+            "/api/triangle-mesh-lod",
+            data={
+                "lod_id": "missing",
+                "viewport": json.dumps({"widthPx": 400, "heightPx": 300}),
+            },
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 404
+
     def test_upload_triangle_model_handles_large_fixture_pair(
         self, app_client, sample_data_path
     ):
@@ -391,6 +503,48 @@ class TestUploadTriangleModel:
         assert "Invalid .poly file format" in response.get_json()["error"]
 
 
+class TestBathymetryProfile:
+    """Tests for the /api/bathymetry-profile endpoint."""
+
+    def test_profile_returns_min_max_view_of_uploaded_bathymetry(self, app_client):
+        """A narrow view keeps every pixel column's extremes of a dense profile."""
+        rows = "\n".join(
+            f"{index * 0.5} {-1000 - (index % 7) * 3}" for index in range(4000)
+        )
+        upload = app_client.post(
+            "/api/upload-bathymetry",
+            data={"file0": (io.BytesIO(rows.encode("utf-8")), "bathy.txt")},
+            content_type="multipart/form-data",
+        )
+        bathymetry_id = upload.get_json()["bathymetry_id"]
+
+        response = app_client.post(
+            "/api/bathymetry-profile",
+            data={"bathymetry_id": bathymetry_id, "x_min": 100, "x_max": 1100, "width": 50},
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["downsampled"] is True
+        assert payload["range_points"] == 2001
+        assert payload["num_points"] <= 4 * 50 + 2
+        assert payload["inline_distance"][0] == 99.5
+        assert payload["inline_distance"][-1] == 1100.5
+        assert min(payload["depth"]) == -1018
+        assert max(payload["depth"]) == -1000
+
+    def test_profile_rejects_unknown_bathymetry_id(self, app_client):
+        """Expired or unknown ids return 404."""
+        response = app_client.post(
+            "/api/bathymetry-profile",
+            data={"bathymetry_id": "missing", "x_min": 0, "x_max": 1, "width": 10},
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 404
+
+
 class TestMisfitStats:
     """Tests for the /api/misfit_stats endpoint."""
 
@@ -0,0 +1,80 @@
+import numpy as np
+
+from bathymetry_parser import BathymetryParser
+from bathymetry_reader import BathymetryArrayCache, hash_file_contents
+
+
+def _recursive_douglas_peucker(points, start, end, tolerance):
+    if end - start <= 1:
+        return [start, end]
+    distances = []
+    for index in range(start + 1, end):
+        line = points[end] - points[start]
+        t = np.clip(np.dot(points[index] - points[start], line) / np.dot(line, line), 0, 1)
+        distances.append(np.linalg.norm(points[index] - (points[start] + t * line)))
+    split = start + 1 + int(np.argmax(distances))
+    if max(distances) <= tolerance:
+        return [start, end]
+    left = _recursive_douglas_peucker(points, start, split, tolerance)
+    return left[:-1] + _recursive_douglas_peucker(points, split, end, tolerance)
+
+
+def _loaded_parser(distance, depth):
+    parser = BathymetryParser()
+    parser.inline_distance = distance
+    parser.depth = depth
+    return parser
+
+
+def test_douglas_peucker_matches_recursive_reference():
+    rng = np.random.default_rng(7)
+    distance = np.sort(rng.random(300)) * 1000
+    depth = np.cumsum(rng.normal(size=300))
+
+    indices, _ = BathymetryParser()._douglas_peucker_2d(distance, depth, 1.5)
+
+    points = np.column_stack((distance, depth))
+    assert indices.tolist() == _recursive_douglas_peucker(points, 0, len(points) - 1, 1.5)
+
+
+def test_douglas_peucker_meets_target_points_on_long_profile():
+    distance = np.linspace(0, 5000, 20000)
+    depth = 100 * np.sin(distance / 300) + distance * 0.01
+    parser = _loaded_parser(distance, depth)
+
+    result = parser.simplify_bathymetry(method="douglas_peucker", target_points=50)
+    refined = parser.simplify_bathymetry(method="douglas_peucker", target_points=51)
+
+    assert result["total_simplified_points"] == 50
+    assert result["inline_distance"][0] == 0
+    assert result["inline_distance"][-1] == 5000
+    assert 0 < refined["tolerance"] <= result["tolerance"]
+
+
+def test_parse_file_sniffs_delimiter_and_skips_header(tmp_path):
+    path = tmp_path / "profile.txt"
+    path.write_text("distance,depth\n10, -105\n0,-100\nbad,row\n20,-110,3\n")
+
+    result = BathymetryParser().parse_file(str(path))
+
+    assert result["success"] is True
+    assert result["inline_distance"] == [0.0, 10.0, 20.0]
+    assert result["depth"] == [-100.0, -105.0, -110.0]
+
+
+def test_parse_file_reuses_cached_columns_for_identical_content(tmp_path):
+    cache = BathymetryArrayCache(cache_dir=str(tmp_path / "cache"), max_entries=1)
+    first = tmp_path / "first.txt"
+    first.write_text("0 -100\n5 -102\n")
+    second = tmp_path / "second.txt"
+    second.write_text("0 -100\n5 -102\n")
+
+    BathymetryParser(cache=cache).parse_file(str(first))
+    assert cache.get(hash_file_contents(str(second))) is not None
+    result = BathymetryParser(cache=cache).parse_file(str(second))
+
+    assert result["depth"] == [-100.0, -102.0]
+    other = tmp_path / "other.txt"
+    other.write_text("1 -1\n")
+    BathymetryParser(cache=cache).parse_file(str(other))
+    assert len(list((tmp_path / "cache").iterdir())) == 1
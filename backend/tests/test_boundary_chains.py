@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+
+from boundary_chains import simplify_chains, trace_boundary_chains
+
+
+def _recursive_douglas_peucker(points, tolerance):
+    if len(points) <= 2:
+        return list(range(len(points)))
+
+    (start_x, start_y), (end_x, end_y) = points[0], points[-1]
+    dx, dy = end_x - start_x, end_y - start_y
+    distances = [
+        abs(dy * x - dx * y + end_x * start_y - end_y * start_x) / math.hypot(dx, dy)
+        for x, y in points[1:-1]
+    ]
+    split = int(np.argmax(distances)) + 1
+    if distances[split - 1] <= tolerance:
+        return [0, len(points) - 1]
+    left = _recursive_douglas_peucker(points[: split + 1], tolerance)
+    right = _recursive_douglas_peucker(points[split:], tolerance)
+    return left[:-1] + [split + index for index in right]
+
+
+def test_trace_boundary_chains_orders_open_chains_from_lower_end():
+    # Group 0: path 9-4-7-2 plus a closed triangle 20-21-22; group 1: path 4-5.
+    edges = np.array(
+        [[4, 7], [2, 7], [4, 9], [20, 21], [21, 22], [20, 22], [4, 5]]
+    )
+    groups = np.array([0, 0, 0, 0, 0, 0, 1])
+
+    path, offsets, chain_groups, open_edges = trace_boundary_chains(edges, groups)
+
+    chains = [
+        path[offsets[index] : offsets[index + 1]].tolist() for index in range(len(offsets) - 1)
+    ]
+    assert sorted(zip(chains, chain_groups.tolist())) == [([2, 7, 4, 9], 0), ([4, 5], 1)]
+    assert open_edges.tolist() == [True, True, True, False, False, False, True]
+
+
+def test_simplify_chains_matches_recursive_douglas_peucker():
+    rng = np.random.default_rng(3)
+    chains = [
+        np.column_stack((np.arange(length, dtype=float), rng.normal(size=length)))
+        for length in (2, 3, 17, 250)
+    ]
+    offsets = np.cumsum([0] + [len(chain) for chain in chains])
+
+    keep = simplify_chains(np.vstack(chains), offsets, 0.5)
+
+    for chain, start, stop in zip(chains, offsets[:-1], offsets[1:]):
+        expected = _recursive_douglas_peucker(chain.tolist(), 0.5)
+        assert np.flatnonzero(keep[start:stop]).tolist() == expected
@@ -1,6 +1,9 @@
 from pathlib import Path
 
-from csem_datafile_parser import CSEMDataFileReader
+import numpy as np
+import pandas as pd
+
+from csem_datafile_parser import BathymetryInterpolator, CSEMDataFileManager, CSEMDataFileReader
 
 
 EXPECTED_DATA_TYPE_CODES = [
@@ -115,3 +118,34 @@ def test_data_block_init_preserves_documented_mt_datatype_codes(tmp_path):
 
     assert data['Type'].isna().sum() == 0
     assert data['Type'].astype(str).tolist() == ['104', '106', '123', '125']
+
+
+def test_drape_on_bathymetry_matches_per_column_corrections():
+    """Draping Tx and Rx at once should match the individual depth and dip updates."""
+    bathymetry = pd.DataFrame(
+        {'inline_distance': [0.0, 100.0, 250.0, 400.0], 'depth': [-1000.0, -1010.0, -1040.0, -1045.0]}
+    )
+    data = pd.DataFrame(
+        {
+            'Tx_id': [1, 2, 1, 2, 3],
+            'Rx_id': [1, 1, 2, 2, 2],
+            'Y_tx': [50.0, 180.0, 50.0, 180.0, 390.0],
+            'Y_rx': [20.0, 20.0, 300.0, 300.0, 300.0],
+            'Z_tx': 0.0,
+            'Z_rx': 0.0,
+            'Dip': 0.0,
+            'Beta': 0.0,
+        }
+    )
+    manager = CSEMDataFileManager()
+
+    draped = manager.drape_on_bathymetry(data, BathymetryInterpolator.from_bathymetry(bathymetry))
+
+    expected = manager.update_depth_bathymetry(data, bathymetry, 'tx')
+    expected = manager.update_depth_bathymetry(expected, bathymetry, 'rx')
+    expected, _ = manager.calculate_dip(expected, bathymetry, 'tx')
+    expected, _ = manager.calculate_dip(expected, bathymetry, 'rx')
+    pd.testing.assert_frame_equal(draped, expected)
+    assert draped['Z_tx'].tolist() == [-1005.1, -1026.1, -1005.1, -1026.1, -1044.77]
+    assert np.allclose(draped['Dip'].iloc[[0, 2]], np.rad2deg(np.arctan2(-0.12, 1)))
+    assert data['Z_tx'].eq(0.0).all()
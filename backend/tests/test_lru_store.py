@@ -0,0 +1,24 @@
+from lru_store import LruStore
+
+
+def test_lru_store_evicts_least_recently_used_entry():
+    evicted = []
+    store = LruStore(max_entries=2, on_evict=evicted.append)
+    first = store.put("a")
+    second = store.put("b")
+
+    assert store.get(first) == "a"
+    store.put("c")
+
+    assert store.get(second) is None
+    assert store.get(first) == "a"
+    assert evicted == ["b"]
+    assert len(store) == 2
+
+
+def test_lru_store_keeps_given_ids():
+    store = LruStore()
+
+    assert store.put("tiles", "pyramid-1") == "pyramid-1"
+    assert store.get("pyramid-1") == "tiles"
+    assert store.get("missing") is None
@@ -0,0 +1,155 @@
+import pytest
+
+from MARE2DEM_poly_parser import MARE2DEMPolyManager
+from resistivity_file_parser import ResistivityFileParser
+
+
+def _write_rectangle_poly(path, y_min, y_max, seed_y):
+    path.write_text(
+        "\n".join(
+            [
+                "4 2 0 0",
+                f"1 {y_min} 0",
+                f"2 {y_max} 0",
+                f"3 {y_max} 10",
+                f"4 {y_min} 10",
+                "4 1",
+                "1 1 2 0",
+                "2 2 3 0",
+                "3 3 4 0",
+                "4 4 1 0",
+                "0",
+                "1",
+                f"1 {seed_y} 5 1 -1",
+                "",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def _write_resistivity(path, rho, param):
+    path.write_text(
+        "\n".join(
+            [
+                "Format:                         MARE2DEM_1.1",
+                "Number of regions:              1",
+                "!#        Rho           Param      Lower        Upper         Prej         Weight",
+                f"       1   {rho:.4E}        {param}   1.0000E+00   1.0000E+04   0.0000E+00   0.0000E+00",
+                "",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+@pytest.fixture()
+def line_models(tmp_path):
+    poly_files = [
+        _write_rectangle_poly(tmp_path / "a.poly", 0, 10, 2),
+        _write_rectangle_poly(tmp_path / "b.poly", 5, 15, 12),
+        _write_rectangle_poly(tmp_path / "c.poly", 15, 25, 20),
+    ]
+    resistivity_files = [
+        _write_resistivity(tmp_path / "a.resistivity", 10.0, 1),
+        _write_resistivity(tmp_path / "b.resistivity", 100.0, 0),
+        _write_resistivity(tmp_path / "c.resistivity", 1000.0, 1),
+    ]
+    return poly_files, resistivity_files
+
+
+def _region_at(regions, region_sources, y):
+    for region, source in zip(regions, region_sources):
+        if region["hCoor"] == y:
+            return region, source
+    raise AssertionError(f"no region seeded at y={y}")
+
+
+def test_mosaic_poly_merges_all_files_and_tracks_region_sources(line_models, capsys):
+    poly_files, _ = line_models
+
+    vertices, segments, holes, regions, region_sources = (
+        MARE2DEMPolyManager().mosaic_poly(poly_files, max_workers=1)
+    )
+
+    assert sorted(vertices) == list(range(1, len(vertices) + 1))
+    assert {(v["hCoor"], v["vCoor"]) for v in vertices.values()} >= {
+        (0.0, 0.0),
+        (25.0, 10.0),
+    }
+    assert holes == []
+    assert len(regions) == 4
+    assert sorted(map(str, region_sources)) == sorted(
+        map(str, [(0, 1), (1, 1), (2, 1), None])
+    )
+    assert [region["attribute"] for region in regions] == [
+        region["id"] for region in regions
+    ]
+    assert _region_at(regions, region_sources, 12)[1] == (1, 1)
+
+
+def test_mosaic_poly_process_pool_matches_serial_result(line_models, capsys):
+    poly_files, _ = line_models
+
+    serial = MARE2DEMPolyManager().mosaic_poly(
+        poly_files + poly_files[:1], max_workers=1
+    )
+    parallel = MARE2DEMPolyManager().mosaic_poly(
+        poly_files + poly_files[:1], max_workers=2
+    )
+
+    assert parallel == serial
+
+
+def test_mosaic_resistivity_follows_region_sources(line_models, tmp_path, capsys):
+    poly_files, resistivity_files = line_models
+    _, _, _, regions, region_sources = MARE2DEMPolyManager().mosaic_poly(
+        poly_files, max_workers=1
+    )
+
+    merged = ResistivityFileParser().mosaic_resistivity_files(
+        resistivity_files,
+        region_sources,
+        str(tmp_path / "mosaic.resistivity"),
+        fill_resistivity=50.0,
+    )
+
+    table = merged["resistivity_table"]
+    rho_by_source = dict(zip(map(str, region_sources), table["Rho"].tolist()))
+    assert rho_by_source == {
+        "(0, 1)": 10.0,
+        "(1, 1)": 100.0,
+        "(2, 1)": 1000.0,
+        "None": 50.0,
+    }
+    assert table["Region"].tolist() == [1, 2, 3, 4]
+    assert sorted(table["Param"].tolist()) == [0, 1, 2, 3]
+    assert table.loc[table["Rho"] == 100.0, "Param"].tolist() == [0]
+    assert table.loc[table["Rho"] == 10.0, "Upper"].tolist() == [1.0e4]
+
+    reparsed = ResistivityFileParser().parse_resistivity_file(
+        str(tmp_path / "mosaic.resistivity"), rho_parse=True
+    )
+    assert reparsed["Number of regions"]["value"] == 4
+    assert len(reparsed["table"]) == 4
+
+
+@pytest.mark.parametrize("order", [(0, 1), (1, 0)])
+def test_mosaic_poly_overlap_takes_the_region_of_the_earliest_file(tmp_path, order, capsys):
+    models = [
+        _write_rectangle_poly(tmp_path / "a.poly", 0, 10, 9),
+        _write_rectangle_poly(tmp_path / "b.poly", 5, 15, 6),
+    ]
+    poly_files = [models[index] for index in order]
+
+    _, _, _, regions, region_sources = MARE2DEMPolyManager().mosaic_poly(
+        poly_files, max_workers=1
+    )
+
+    # Both seeds fall in the overlap 5 < y < 10; the flanks get new seeds
+    assert len(regions) == 3
+    overlap_seed_y = 9 if order[0] == 0 else 6
+    assert _region_at(regions, region_sources, overlap_seed_y)[1] == (0, 1)
+    assert region_sources.count(None) == 2
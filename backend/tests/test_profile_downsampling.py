@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from profile_downsampling import build_min_max_pyramid, downsample_profile
+
+
+def _m4_reference(x, y, x_min, x_max, width):
+    start = np.searchsorted(x, x_min, side="left")
+    end = np.searchsorted(x, x_max, side="right")
+    edges = np.searchsorted(x, np.linspace(x_min, x_max, width + 1), side="left")
+    edges[0], edges[-1] = start, end
+    indices = {start - 1, end}
+    for bin_start, bin_end in zip(edges[:-1], edges[1:]):
+        if bin_end > bin_start:
+            values = y[bin_start:bin_end]
+            indices.update({bin_start, bin_end - 1})
+            if not np.isnan(values).all():
+                indices.update(
+                    {
+                        bin_start + int(np.nanargmin(values)),
+                        bin_start + int(np.nanargmax(values)),
+                    }
+                )
+    return sorted(index for index in indices if 0 <= index < len(x))
+
+
+def test_downsample_profile_matches_per_pixel_min_max_reference():
+    rng = np.random.default_rng(11)
+    x = np.sort(rng.random(50000)) * 1000
+    y = np.round(np.cumsum(rng.normal(size=len(x))), 1)
+    pyramid = build_min_max_pyramid(x, y)
+
+    profile = downsample_profile(pyramid, 120.0, 870.0, 300)
+
+    expected = _m4_reference(x, y, 120.0, 870.0, 300)
+    assert profile["downsampled"] is True
+    assert profile["x"] == x[expected].tolist()
+    assert profile["y"] == y[expected].tolist()
+
+
+def test_downsample_profile_returns_small_ranges_unreduced():
+    x = np.arange(10, dtype=float)
+    pyramid = build_min_max_pyramid(x, x * 2)
+
+    profile = downsample_profile(pyramid, 2.5, 6.0, 100)
+
+    assert profile["x"] == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    assert profile["downsampled"] is False
+    with pytest.raises(ValueError):
+        downsample_profile(pyramid, 6.0, 2.5, 100)
+
+
+def test_downsample_profile_keeps_extremes_of_bins_with_nan_samples():
+    rng = np.random.default_rng(12)
+    x = np.arange(100000, dtype=float)
+    y = np.cumsum(rng.normal(size=len(x)))
+    y[rng.choice(len(x), 1000, replace=False)] = np.nan
+    y[40000:40100] = np.nan
+    pyramid = build_min_max_pyramid(x, y)
+
+    profile = downsample_profile(pyramid, 0.0, 99999.0, 500)
+
+    expected = _m4_reference(x, y, 0.0, 99999.0, 500)
+    assert profile["x"] == x[expected].tolist()
+    assert profile["y"] == [None if np.isnan(value) else value for value in y[expected].tolist()]
+    assert len(profile["x"]) > 1900
@@ -0,0 +1,43 @@
+from resistivity_file_parser import ResistivityFileParser
+
+
+RESISTIVITY_TEXT = """Format:                         mare2dem_1.1     ! input
+Number of regions:              3
+Date/Time:                      01-Feb-2024 10:20:30
+!#        Rho           Param      Lower        Upper         Prej         Weight
+1         1.0000E+02    1          0            0             0            0
+2         2.5e-1        0          0            0             0            0 ! fixed
+3         30            2          0            1.0E+04       0            0
+"""
+
+
+def test_parse_resistivity_file_reads_header_and_typed_table(tmp_path):
+    path = tmp_path / "model.resistivity"
+    path.write_text(RESISTIVITY_TEXT, encoding="utf-8")
+
+    parsed = ResistivityFileParser().parse_resistivity_file(str(path), rho_parse=True)
+
+    assert parsed["Format"] == {
+        "value": "mare2dem_1.1",
+        "comment": "input",
+        "line": "Format:                         mare2dem_1.1     ! input",
+    }
+    assert parsed["Number of regions"]["value"] == 3
+    assert parsed["Date/Time"]["value"].year == 2024
+    table = parsed["table"]
+    assert list(table.columns) == ["#", "Rho", "Param", "Lower", "Upper", "Prej", "Weight"]
+    assert table["#"].tolist() == [1.0, 2.0, 3.0]
+    assert table["Rho"].tolist() == [100.0, 0.25, 30.0]
+    assert table["Param"].dtype.kind == "i"
+    assert table["Param"].tolist() == [1, 0, 2]
+    assert table["Upper"].tolist() == [0.0, 0.0, 1.0e4]
+
+
+def test_parse_resistivity_file_falls_back_for_irregular_rows(tmp_path):
+    path = tmp_path / "model.resistivity"
+    path.write_text("!#  Rho  Param\n1  10  1\n2  n/a  0\n", encoding="utf-8")
+
+    table = ResistivityFileParser().parse_resistivity_file(str(path), rho_parse=True)["table"]
+
+    assert table["Rho"].tolist() == [10.0, "n/a"]
+    assert ResistivityFileParser().parse_resistivity_file(str(path))["table"] is None
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from resistivity_table import read_region_resistivity_columns, table_to_records
+
+
+def test_read_region_resistivity_columns_skips_bad_rows_and_keeps_last_duplicate():
+    table = pd.DataFrame(
+        [
+            [2.0, 5.0, 1.0],
+            [1.0, "bad", 1.0],
+            [3.7, 30.0, "x"],
+            [2.0, 20.0, 0.0],
+        ],
+        columns=["#", "Rho", "Param"],
+    )
+
+    columns = read_region_resistivity_columns(table, "#", "Rho", "Param")
+
+    assert columns.region_ids.tolist() == [2, 3]
+    assert columns.rho.tolist() == [20.0, 30.0]
+    assert columns.param[0] == 0.0
+    assert np.isnan(columns.param[1])
+    assert columns.positions([3, 1, 2]).tolist() == [1, -1, 0]
+
+
+def test_table_to_records_upcasts_rows_like_iterrows():
+    table = pd.DataFrame({"Region": [1, 2], "Rho": [10.5, 20.0]})
+    mixed = pd.DataFrame({"Region": [1], "Name": ["a"]})
+
+    assert table_to_records(table, lambda value: value) == [
+        {"Region": 1.0, "Rho": 10.5},
+        {"Region": 2.0, "Rho": 20.0},
+    ]
+    assert table_to_records(mixed, str) == [{"Region": "1", "Name": "a"}]
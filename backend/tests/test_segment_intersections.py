@@ -0,0 +1,86 @@
+import numpy as np
+
+from MARE2DEM_poly_parser import MARE2DEMPolyManager
+from segment_intersections import find_segment_intersections
+
+
+def _as_vertex(x, y):
+    return {"hCoor": float(x), "vCoor": float(y)}
+
+
+def test_find_segment_intersections_matches_scalar_test():
+    rng = np.random.default_rng(7)
+    first = np.hstack((rng.random((150, 2)) * 20, np.zeros((150, 2))))
+    first[:, 2:] = first[:, :2] + rng.normal(size=(150, 2)) * 3
+    second = np.hstack((rng.random((170, 2)) * 20, np.zeros((170, 2))))
+    second[:, 2:] = second[:, :2] + rng.normal(size=(170, 2)) * 3
+    manager = MARE2DEMPolyManager()
+
+    expected = {}
+    for j, (x3, y3, x4, y4) in enumerate(second):
+        for i, (x1, y1, x2, y2) in enumerate(first):
+            point = manager._calculate_line_intersection(
+                _as_vertex(x1, y1),
+                _as_vertex(x2, y2),
+                _as_vertex(x3, y3),
+                _as_vertex(x4, y4),
+            )
+            if point is not None:
+                expected[(i, j)] = point
+
+    first_indices, second_indices, points = find_segment_intersections(
+        first, second, manager.tolerance, chunk_size=500
+    )
+
+    found = {
+        (i, j): tuple(point)
+        for i, j, point in zip(
+            first_indices.tolist(), second_indices.tolist(), points.tolist()
+        )
+    }
+    assert expected
+    assert found == expected
+    assert list(zip(second_indices.tolist(), first_indices.tolist())) == sorted(
+        zip(second_indices.tolist(), first_indices.tolist())
+    )
+
+
+def test_find_segment_intersections_ignores_shared_endpoints_and_parallels():
+    first = [(0.0, 0.0, 2.0, 0.0), (0.0, 1.0, 2.0, 1.0)]
+    second = [(2.0, 0.0, 2.0, 2.0), (0.0, 2.0, 2.0, 2.0), (1.0, -1.0, 1.0, 3.0)]
+
+    first_indices, second_indices, points = find_segment_intersections(
+        first, second, 1e-10
+    )
+
+    assert first_indices.tolist() == [0, 1]
+    assert second_indices.tolist() == [2, 2]
+    assert points.tolist() == [[1.0, 0.0], [1.0, 1.0]]
+
+
+def test_manager_reports_crossings_between_files():
+    manager = MARE2DEMPolyManager()
+    merged_vertices = {
+        1: _as_vertex(0, 0),
+        2: _as_vertex(4, 4),
+        3: _as_vertex(0, 4),
+        4: _as_vertex(4, 0),
+    }
+    segments1 = [{"id": 1, "endpoint_1": 1, "endpoint_2": 2, "boundary_marker": 0}]
+    segments2 = [{"id": 1, "endpoint_1": 10, "endpoint_2": 20, "boundary_marker": 0}]
+
+    intersection_vertices, intersection_info = manager._find_intersections_optimized(
+        segments1, segments2, merged_vertices, {1: 1, 2: 2}, {10: 3, 20: 4}
+    )
+
+    assert intersection_vertices == {5: {"hCoor": 2.0, "vCoor": 2.0}}
+    assert intersection_info == [
+        {
+            "intersection_vertex_id": 5,
+            "intersection_point": (2.0, 2.0),
+            "seg1_idx": 0,
+            "seg2_idx": 0,
+            "file1_segment": segments1[0],
+            "file2_segment": segments2[0],
+        }
+    ]
@@ -0,0 +1,158 @@
+import numpy as np
+from scipy.io import savemat
+
+import main as backend_main
+from suesi_depth_reader import (
+    SuesiSeries,
+    build_series_pyramid,
+    load_suesi_series,
+    query_series_window,
+)
+
+# 2020-01-01 00:00:00 as a MATLAB datenum
+DATENUM_2020 = 737791.0
+
+
+def test_load_suesi_series_reads_struct_series_in_time_window(tmp_path):
+    path = tmp_path / "nav.mat"
+    times = DATENUM_2020 + np.arange(5) / 86400
+    savemat(
+        path,
+        {
+            "nVulcan": {"samples": np.column_stack((times, [10.0, 11.0, 12.0, 13.0, 14.0]))},
+            "unrelated": np.zeros((50, 50)),
+        },
+    )
+
+    series = load_suesi_series(str(path), t0=1577836801, t1=1577836803)
+
+    assert series.kind == "nVulcan"
+    assert series.time.tolist() == [1577836801, 1577836802, 1577836803]
+    assert series.value.tolist() == [11.0, 12.0, 13.0]
+
+
+def test_upload_mat_arrays_format_returns_time_and_value_arrays(tmp_path):
+    path = tmp_path / "depth.mat"
+    savemat(path, {"time": DATENUM_2020 + np.array([[0.0], [0.5]]), "depth": np.array([[100.0], [101.5]])})
+    backend_main.app.config["TESTING"] = True
+
+    with backend_main.app.test_client() as client, open(path, "rb") as handle:
+        response = client.post(
+            "/api/upload-mat",
+            data={"file": (handle, "depth.mat"), "format": "arrays"},
+            content_type="multipart/form-data",
+        )
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "kind": "depth",
+        "num_points": 2,
+        "time": [1577836800, 1577880000],
+        "value": [100.0, 101.5],
+    }
+
+
+def test_load_suesi_series_drops_samples_without_a_finite_time(tmp_path):
+    path = tmp_path / "depth.mat"
+    times = DATENUM_2020 + np.array([[2.0], [np.nan], [1.0], [np.inf]]) / 86400
+    savemat(path, {"time": times, "depth": np.array([[100.0], [101.0], [102.0], [103.0]])})
+
+    series = load_suesi_series(str(path))
+
+    assert series.time.tolist() == [1577836802, 1577836801]
+    assert series.value.tolist() == [100.0, 102.0]
+    assert series.sorted_by_time().time.tolist() == [1577836801, 1577836802]
+
+
+def test_upload_mat_arrays_format_sends_nan_depth_as_null(tmp_path):
+    path = tmp_path / "depth.mat"
+    depth = np.array([[100.0], [np.nan], [102.0], [103.0], [104.0]])
+    savemat(path, {"time": DATENUM_2020 + np.arange(5.0)[:, None] / 86400, "depth": depth})
+    backend_main.app.config["TESTING"] = True
+
+    with backend_main.app.test_client() as client, open(path, "rb") as handle:
+        response = client.post(
+            "/api/upload-mat",
+            data={"file": (handle, "depth.mat"), "format": "arrays"},
+            content_type="multipart/form-data",
+        )
+
+    assert response.status_code == 200
+    assert b"NaN" not in response.data
+    assert response.get_json()["value"] == [100.0, None, 102.0, 103.0, 104.0]
+
+
+def test_query_series_window_keeps_extremes_within_point_budget():
+    rng = np.random.default_rng(5)
+    time = rng.permutation(20000)
+    value = np.sin(time / 300.0)
+    value[time == 7777] = 50.0
+    pyramid = build_series_pyramid(SuesiSeries(kind="depth", time=time, value=value))
+
+    window = query_series_window(pyramid, 1000, 15000, max_points=202)
+
+    assert window["downsampled"] is True
+    assert window["window_points"] == 14001
+    assert window["num_points"] <= 202
+    assert window["time"] == sorted(window["time"])
+    assert window["time"][0] == 999 and window["time"][-1] == 15001
+    assert max(window["value"]) == 50.0
+    assert min(window["value"]) == value[(time >= 1000) & (time <= 15000)].min()
+
+
+def test_upload_mat_series_format_serves_decimated_windows(tmp_path):
+    path = tmp_path / "tow.mat"
+    times = DATENUM_2020 + np.arange(3000) / 86400
+    savemat(path, {"time": times[:, None], "depth": np.arange(3000.0)[:, None]})
+    backend_main.app.config["TESTING"] = True
+
+    with backend_main.app.test_client() as client:
+        with open(path, "rb") as handle:
+            upload = client.post(
+                "/api/upload-mat",
+                data={"file": (handle, "tow.mat"), "format": "series", "max_points": "50"},
+                content_type="multipart/form-data",
+            )
+        overview = upload.get_json()
+        window = client.post(
+            "/api/mat-series-window",
+            data={"series_id": overview["series_id"], "t0": 1577836900, "t1": 1577836909},
+            content_type="multipart/form-data",
+        )
+        missing = client.post(
+            "/api/mat-series-window",
+            data={"series_id": "missing"},
+            content_type="multipart/form-data",
+        )
+
+    assert overview["total_points"] == 3000
+    assert overview["num_points"] <= 50
+    assert overview["time_range"] == [1577836800.0, 1577839799.0]
+    assert window.get_json()["value"] == [float(value) for value in range(99, 111)]
+    assert window.get_json()["downsampled"] is False
+    assert missing.status_code == 404
+
+
+def test_upload_mat_series_format_sends_nan_samples_as_null(tmp_path):
+    path = tmp_path / "tow.mat"
+    depth = np.arange(3000.0)
+    depth[[5, 100, 2500]] = np.nan
+    savemat(path, {"time": (DATENUM_2020 + np.arange(3000) / 86400)[:, None], "depth": depth[:, None]})
+    backend_main.app.config["TESTING"] = True
+
+    with backend_main.app.test_client() as client:
+        with open(path, "rb") as handle:
+            upload = client.post(
+                "/api/upload-mat",
+                data={"file": (handle, "tow.mat"), "format": "series", "max_points": "50"},
+                content_type="multipart/form-data",
+            )
+        window = client.post(
+            "/api/mat-series-window",
+            data={"series_id": upload.get_json()["series_id"], "t0": 1577836898, "t1": 1577836902},
+            content_type="multipart/form-data",
+        )
+
+    assert b"NaN" not in upload.data and b"NaN" not in window.data
+    assert max(value for value in upload.get_json()["value"] if value is not None) == 2999.0
+    assert window.get_json()["value"] == [97.0, 98.0, 99.0, None, 101.0, 102.0, 103.0]
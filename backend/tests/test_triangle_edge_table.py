@@ -0,0 +1,49 @@
+import numpy as np
+
+from MARE2DEM_poly_parser import MARE2DEMPolyParser
+from triangle_edge_table import build_triangle_edge_table
+
+
+def test_build_triangle_edge_table_orders_edges_by_first_appearance():
+    triangles = [(0, 1, 2), (1, 3, 2)]
+
+    table = build_triangle_edge_table(triangles, constrained_edges=[(2, 0), (3, 1)])
+
+    assert table.edges.tolist() == [[0, 1], [1, 2], [0, 2], [1, 3], [2, 3]]
+    assert table.triangle_counts.tolist() == [1, 2, 1, 1, 1]
+    assert table.edge_triangles.tolist() == [[0, -1], [0, 1], [0, -1], [1, -1], [1, -1]]
+    assert table.constrained.tolist() == [False, False, True, True, False]
+    assert table.triangle_edge_indices.tolist() == [[0, 1, 2], [3, 4, 1]]
+    assert table.neighbor_pairs().tolist() == [[0, 1]]
+
+
+def test_edge_table_lookup_and_lengths():
+    points = [(0.0, 0.0), (3.0, 0.0), (0.0, 4.0)]
+    table = build_triangle_edge_table([(0, 1, 2)])
+
+    assert table.lookup([(2, 1), (0, 1), (0, 5)]).tolist() == [1, 0, -1]
+    assert np.allclose(table.edge_lengths(points), [3.0, 5.0, 4.0])
+
+
+def test_parser_edge_table_flags_input_segments(capsys):
+    parser = MARE2DEMPolyParser()
+    vertices = {
+        1: {"hCoor": 0.0, "vCoor": 0.0},
+        2: {"hCoor": 10.0, "vCoor": 0.0},
+        3: {"hCoor": 10.0, "vCoor": 10.0},
+        4: {"hCoor": 0.0, "vCoor": 10.0},
+    }
+    segments = [
+        {"id": index, "endpoint_1": first, "endpoint_2": second, "boundary_marker": 1}
+        for index, (first, second) in enumerate([(1, 2), (2, 3), (3, 4), (4, 1)], start=1)
+    ]
+    parser.create_constrained_delaunay(vertices, segments)
+
+    table = parser.get_edge_table()
+    neighbors = parser.get_segment_triangle_neighbors()
+
+    assert parser.get_edge_table() is table
+    assert table.edge_count == 5
+    assert int(table.constrained.sum()) == 4
+    assert neighbors["segment_neighbors"] == [(0, 1)]
+    assert len(neighbors["constrained_segments"]) == 4
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from triangle_mesh_lod import (
+    MeshLodCache,
+    MeshLodError,
+    build_mesh_lod_hierarchy,
+    crop_triangle_mesh,
+    parse_mesh_viewport,
+    simplify_triangle_mesh,
+)
+from triangle_mesh_transfer import build_triangle_mesh_arrays
+
+
+def _two_material_grid(columns=40, rows=20):
+    """Regular grid split at y=20 into a 10 ohm-m and a 100 ohm-m region."""
+
+    ys, zs = np.meshgrid(
+        np.arange(columns + 1, dtype=float), np.arange(rows + 1, dtype=float)
+    )
+    points = np.column_stack((ys.ravel(), zs.ravel()))
+    triangles = []
+    region_ids = []
+    for row in range(rows):
+        for column in range(columns):
+            lower_left = row * (columns + 1) + column
+            lower_right = lower_left + 1
+            upper_left = lower_left + columns + 1
+            upper_right = upper_left + 1
+            region_id = 1 if column < columns // 2 else 2
+            triangles.extend(
+                [
+                    (lower_left, lower_right, upper_right),
+                    (lower_left, upper_right, upper_left),
+                ]
+            )
+            region_ids.extend([region_id, region_id])
+    region_ids = np.array(region_ids)
+    rho = np.where(region_ids == 1, 10.0, 100.0)
+    return build_triangle_mesh_arrays(
+        points, triangles, region_ids, rho, [1, 2], [10.0, 100.0]
+    )
+
+
+def test_simplify_triangle_mesh_keeps_material_interface():
+    mesh = _two_material_grid()
+
+    simplified = simplify_triangle_mesh(mesh, cell_size=4.0)
+
+    assert 0 < simplified.triangle_count < mesh.triangle_count / 4
+    assert set(simplified.triangle_region_ids.tolist()) == {1, 2}
+    corners = simplified.vertices[simplified.triangles]
+    left = corners[simplified.triangle_region_ids == 1]
+    right = corners[simplified.triangle_region_ids == 2]
+    assert left[..., 0].max() == pytest.approx(20.0)
+    assert right[..., 0].min() == pytest.approx(20.0)
+    assert simplified.vertices[:, 0].min() == 0.0
+    assert simplified.vertices[:, 0].max() == 40.0
+
+
+def test_simplify_merges_interfaces_without_contrast():
+    mesh = _two_material_grid()
+    same_rho = build_triangle_mesh_arrays(
+        mesh.vertices,
+        mesh.triangles,
+        mesh.triangle_region_ids,
+        np.full(mesh.triangle_count, 10.0),
+    )
+
+    assert (
+        simplify_triangle_mesh(same_rho, cell_size=4.0).triangle_count
+        < simplify_triangle_mesh(mesh, cell_size=4.0).triangle_count
+    )
+
+
+def test_hierarchy_selects_level_for_viewport_and_triangle_budget():
+    mesh = _two_material_grid()
+    hierarchy = build_mesh_lod_hierarchy(mesh, min_triangle_count=50)
+    counts = [level.mesh.triangle_count for level in hierarchy.levels]
+
+    assert counts[0] == mesh.triangle_count
+    assert counts == sorted(counts, reverse=True)
+    assert len(counts) > 2
+
+    zoomed_out = parse_mesh_viewport({"widthPx": 10, "heightPx": 5})
+    level, _ = hierarchy.extract(zoomed_out)
+    assert level.level > 0
+
+    zoomed_in = parse_mesh_viewport(
+        {"yMin": 18, "yMax": 22, "zMin": 8, "zMax": 12, "widthPx": 800, "heightPx": 800}
+    )
+    level, visible = hierarchy.extract(zoomed_in)
+    assert level.level == 0
+    assert 0 < visible.triangle_count < mesh.triangle_count
+
+    budgeted = parse_mesh_viewport(
+        {"widthPx": 800, "heightPx": 400, "maxTriangles": 200}
+    )
+    level, visible = hierarchy.extract(budgeted)
+    assert level.level > 0
+    assert visible.triangle_count <= 200
+
+
+def test_crop_triangle_mesh_compacts_vertices():
+    mesh = _two_material_grid(columns=4, rows=1)
+
+    cropped = crop_triangle_mesh(mesh, 0.0, 0.5, 0.0, 1.0)
+
+    assert cropped.triangle_count == 2
+    assert cropped.vertex_count == 4
+    assert cropped.triangles.max() == 3
+
+
+def test_parse_mesh_viewport_validates_bounds():
+    with pytest.raises(MeshLodError, match="widthPx"):
+        parse_mesh_viewport({"heightPx": 10})
+    with pytest.raises(MeshLodError, match="yMin"):
+        parse_mesh_viewport(
+            {"widthPx": 10, "heightPx": 10, "yMin": 5, "yMax": 1, "zMin": 0, "zMax": 1}
+        )
+
+
+def test_mesh_lod_cache_evicts_least_recently_used():
+    cache = MeshLodCache(max_entries=2)
+    hierarchy = build_mesh_lod_hierarchy(_two_material_grid(columns=2, rows=1))
+    first = cache.put(hierarchy)
+    second = cache.put(hierarchy)
+    cache.get(first)
+    cache.put(hierarchy)
+
+    assert cache.get(first) is hierarchy
+    assert cache.get(second) is None
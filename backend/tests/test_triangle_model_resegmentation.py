@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -9,6 +10,7 @@ from triangle_model_resegmentation import (
     build_poly_text,
     build_region_metadata_lookup,
     build_triangle_assignments,
+    classify_triangles,
     compute_triangle_area,
     compute_triangle_centroid,
     merge_small_components,
@@ -137,6 +139,45 @@ def test_build_triangle_assignments_uses_roi_param_and_log_rho_levels():
     assert warnings == []
 
 
+def test_classify_triangles_encodes_labels_and_missing_metadata():
+    params = parse_resegmentation_parameters(
+        {
+            "roi": {"yMin": -1, "yMax": 3, "zMin": -1, "zMax": 3},
+            "rhoLevels": [1, 10, 100],
+            "onlyFreeParameters": False,
+        }
+    )
+    points = np.array([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0), (9.0, 9.0)])
+    triangles = np.array([(0, 1, 2), (1, 3, 2), (1, 4, 3), (0, 1, 3), (2, 3, 4)])
+    metadata = {
+        1: type("Meta", (), {"rho": 12.0, "param": None})(),
+        2: type("Meta", (), {"rho": 8.0, "param": None})(),
+        3: type("Meta", (), {"rho": -1.0, "param": None})(),
+    }
+
+    classification, stats, warnings = classify_triangles(
+        points, triangles, np.array([1, 2, 1, -1, 3]), metadata, params
+    )
+
+    assert classification.active.tolist() == [True, True, False, False, False]
+    assert classification.label_codes[0] == classification.label_codes[1]
+    assert [item.label for item in classification.to_assignments()] == [
+        "level:10",
+        "level:10",
+        "source:1",
+        "missing:3",
+        "source:3",
+    ]
+    assert classification.assignment(2).rho == 12.0
+    assert classification.assignment(3).source_region_id is None
+    assert classification.assignment(4).rho is None
+    assert stats == {"sourceTriangleCount": 5, "activeTriangleCount": 2}
+    assert warnings == [
+        "1 triangles had no source region metadata",
+        "1 triangles had invalid source rho",
+    ]
+
+
 def test_build_connected_components_splits_disconnected_same_rho():
     params = parse_resegmentation_parameters(
         {
@@ -171,6 +212,35 @@ def test_build_connected_components_splits_disconnected_same_rho():
     assert [component.rho for component in components] == [10.0, 10.0]
 
 
+def test_build_connected_components_orders_components_by_first_triangle():
+    params = parse_resegmentation_parameters(
+        {
+            "roi": {"yMin": -1, "yMax": 5, "zMin": -1, "zMax": 5},
+            "rhoLevels": [10],
+            "onlyFreeParameters": False,
+        }
+    )
+    points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0), (2.0, 0.0), (2.0, 1.0)]
+    triangles = [(1, 4, 3), (0, 1, 2), (4, 5, 3), (1, 3, 2)]
+    metadata = {
+        1: type("Meta", (), {"rho": 9.0, "param": None})(),
+        2: type("Meta", (), {"rho": 11.0, "param": None})(),
+    }
+    classification, _, _ = classify_triangles(
+        points, triangles, [2, 1, None, 2], metadata, params
+    )
+
+    components, component_by_triangle = build_connected_components(
+        points, triangles, classification
+    )
+
+    assert component_by_triangle == [1, 1, 2, 1]
+    assert [component.triangle_indices for component in components] == [[0, 1, 3], [2]]
+    assert [component.label for component in components] == ["level:10", "missing:2"]
+    assert [component.rho for component in components] == [10.0, 1.0]
+    assert [component.area for component in components] == pytest.approx([1.5, 0.5])
+
+
 def test_merge_small_components_uses_nearest_rho_then_shared_boundary():
     points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)]
     triangles = [(0, 1, 2), (1, 3, 2)]
@@ -189,6 +259,27 @@ def test_merge_small_components_uses_nearest_rho_then_shared_boundary():
     assert component_by_triangle == [2, 2]
 
 
+def test_merge_small_components_requeues_target_that_stays_small():
+    points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0), (2.0, 0.0)]
+    triangles = [(0, 1, 2), (1, 3, 2), (1, 4, 3)]
+    components = [
+        Component(1, "a", 10.0, "resegmented", [0], 0.1),
+        Component(2, "b", 10.0, "resegmented", [1], 0.2),
+        Component(3, "c", 1000.0, "resegmented", [2], 5.0),
+    ]
+
+    merged, component_by_triangle, warnings, merge_count = merge_small_components(
+        points, triangles, components, minimum_area=1.0
+    )
+
+    assert [component.component_id for component in merged] == [3]
+    assert merged[0].triangle_indices == [0, 1, 2]
+    assert merged[0].area == pytest.approx(5.3)
+    assert component_by_triangle == [3, 3, 3]
+    assert warnings == []
+    assert merge_count == 2
+
+
 def test_build_forward_resistivity_text_uses_fixed_forward_columns():
     regions = [
         Component(1, "a", 10.0, "resegmented", [0], 1.0),
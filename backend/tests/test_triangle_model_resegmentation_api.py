@@ -4,6 +4,8 @@ import json
 import pytest
 
 import main as backend_main
+import triangle_model_resegmentation
+from triangle_mesh_transfer import decode_binary_mesh_payload
 
 
 @pytest.fixture()
@@ -118,3 +120,157 @@ def test_preview_triangle_resegmentation_requires_files(app_client):
 
     assert response.status_code == 400
     assert "poly" in response.get_json()["error"].lower()
+
+
+def test_preview_triangle_resegmentation_returns_binary_preview_mesh(app_client):
+    response = app_client.post(
+        "/api/preview-triangle-resegmentation",
+        data={
+            "poly_file": (io.BytesIO(SIMPLE_POLY), "simple.poly"),
+            "resistivity_file": (
+                io.BytesIO(SIMPLE_RESISTIVITY),
+                "simple.resistivity",
+            ),
+            "parameters": json.dumps(valid_parameters()),
+            "mesh_format": "binary",
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200
+    decoded = decode_binary_mesh_payload(response.data)
+    payload = decoded["header"]["payload"]
+    arrays = decoded["arrays"]
+    assert payload["stats"]["activeTriangleCount"] == 2
+    assert payload["previewMesh"]["triangleCount"] == 2
+    assert arrays["vertices"].dtype.name == "float64"
+    assert arrays["triangleResistivityValues"].tolist() == [10.0, 10.0]
+    assert arrays["regionResistivity"].tolist() == [10.0]
+
+
+def test_sweep_triangle_resegmentation_returns_stats_per_parameter_set(app_client):
+    empty_roi = {**valid_parameters(), "roi": {"yMin": 20, "yMax": 30, "zMin": 20, "zMax": 30}}
+    response = app_client.post(
+        "/api/sweep-triangle-resegmentation",
+        data={
+            "poly_file": (io.BytesIO(SIMPLE_POLY), "simple.poly"),
+            "resistivity_file": (
+                io.BytesIO(SIMPLE_RESISTIVITY),
+                "simple.resistivity",
+            ),
+            "parameter_sets": json.dumps(
+                [
+                    valid_parameters(),
+                    {**valid_parameters(), "rhoLevels": [30, 300]},
+                    empty_roi,
+                ]
+            ),
+            "preview_index": "1",
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    results = payload["results"]
+    assert [entry["index"] for entry in results] == [0, 1, 2]
+    assert results[0]["stats"]["activeTriangleCount"] == 2
+    assert results[0]["parameters"]["rhoLevels"] == [10.0, 100.0]
+    assert results[1]["error"] is None
+    assert results[2]["stats"] is None
+    assert "No active triangles" in results[2]["error"]
+    assert payload["previewIndex"] == 1
+    assert payload["previewMesh"]["triangleResistivityValues"] == [30.0, 30.0]
+
+
+def test_sweep_triangle_resegmentation_reuses_one_worker_pool(app_client, monkeypatch):
+    monkeypatch.setattr(triangle_model_resegmentation, "SWEEP_POOL_WORKERS", 2)
+    monkeypatch.setattr(triangle_model_resegmentation, "_SWEEP_POOL", None)
+    parameter_sets = [{**valid_parameters(), "rhoLevels": [level, 10 * level]} for level in (10, 30, 50)]
+
+    def post_sweep():
+        return app_client.post(
+            "/api/sweep-triangle-resegmentation",
+            data={
+                "poly_file": (io.BytesIO(SIMPLE_POLY), "simple.poly"),
+                "resistivity_file": (io.BytesIO(SIMPLE_RESISTIVITY), "simple.resistivity"),
+                "parameter_sets": json.dumps(parameter_sets),
+                "preview_index": "",
+            },
+            content_type="multipart/form-data",
+        )
+
+    try:
+        first = post_sweep()
+        pool = triangle_model_resegmentation._SWEEP_POOL
+        second = post_sweep()
+
+        assert first.status_code == 200 and second.status_code == 200
+        assert pool is not None and pool._max_workers == 2
+        assert triangle_model_resegmentation._SWEEP_POOL is pool
+        assert first.get_json() == second.get_json()
+        assert [entry["index"] for entry in first.get_json()["results"]] == [0, 1, 2]
+        assert [entry["stats"]["activeTriangleCount"] for entry in first.get_json()["results"]] == [2, 2, 2]
+    finally:
+        if triangle_model_resegmentation._SWEEP_POOL is not None:
+            triangle_model_resegmentation._SWEEP_POOL.shutdown()
+
+
+def test_sweep_triangle_resegmentation_rejects_empty_parameter_sets(app_client):
+    response = app_client.post(
+        "/api/sweep-triangle-resegmentation",
+        data={
+            "poly_file": (io.BytesIO(SIMPLE_POLY), "simple.poly"),
+            "resistivity_file": (
+                io.BytesIO(SIMPLE_RESISTIVITY),
+                "simple.resistivity",
+            ),
+            "parameter_sets": json.dumps([]),
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 400
+    assert "parameterSets" in response.get_json()["error"]
+
+
+def test_resegmentation_session_returns_roi_patches(app_client):
+    start = post_resegmentation(
+        app_client,
+        "/api/start-triangle-resegmentation-session",
+        valid_parameters(),
+    )
+
+    assert start.status_code == 200
+    started = start.get_json()
+    assert started["stats"]["activeTriangleCount"] == 2
+    assert started["previewMesh"]["triangleResistivityValues"] == [10.0, 10.0]
+
+    response = app_client.post(
+        "/api/update-triangle-resegmentation-session",
+        data={
+            "session_id": started["sessionId"],
+            "roi": json.dumps({"yMin": -1, "yMax": 11, "zMin": -1, "zMax": 5}),
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200
+    patch = response.get_json()
+    assert patch["stats"]["activeTriangleCount"] == 1
+    assert len(patch["triangleIndices"]) == 1
+    assert patch["triangleResistivityValues"] == [20.0]
+    assert patch["removedRegionIds"] == []
+
+
+def test_resegmentation_session_update_rejects_unknown_session(app_client):
+    response = app_client.post(
+        "/api/update-triangle-resegmentation-session",
+        data={
+            "session_id": "missing",
+            "roi": json.dumps(valid_parameters()["roi"]),
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 404
@@ -0,0 +1,123 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.spatial import Delaunay
+
+from triangle_edge_table import build_triangle_edge_table
+from triangle_model_resegmentation import (
+    RectangularRoi,
+    ResegmentationError,
+    ResegmentationParameters,
+    ResegmentationSource,
+)
+from triangle_resegmentation_session import ResegmentationPreviewSession
+
+
+def make_source(seed=0, point_count=600):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 10, (point_count, 2))
+    triangles = [tuple(int(value) for value in row) for row in Delaunay(points).simplices]
+    table = pd.DataFrame(
+        {
+            "Region": np.arange(6),
+            "Rho": [0.8, 3.0, 12.0, 40.0, 150.0, 900.0],
+            "Param": [1, 1, 0, 1, 1, 1],
+        }
+    )
+    region_ids = rng.integers(0, 6, len(triangles))
+    return ResegmentationSource(
+        points=[tuple(point) for point in points.tolist()],
+        triangles=triangles,
+        edge_table=build_triangle_edge_table(triangles),
+        triangle_region_ids=region_ids,
+        holes=[],
+        parsed_resistivity={"table": table},
+    )
+
+
+def make_parameters(roi, minimum_region_area=0.0):
+    return ResegmentationParameters(
+        roi=roi,
+        rho_levels=[1.0, 10.0, 100.0],
+        only_free_parameters=True,
+        boundary_tolerance=0.0,
+        minimum_region_area=minimum_region_area,
+    )
+
+
+def canonical_partition(component_by_triangle):
+    first_seen = {}
+    return [first_seen.setdefault(value, len(first_seen)) for value in component_by_triangle.tolist()]
+
+
+def test_update_roi_matches_a_fresh_session_and_patch_applies():
+    source = make_source()
+    session = ResegmentationPreviewSession(source, make_parameters(RectangularRoi(2, 6, 2, 6)))
+    mesh = session.preview_mesh()
+    region_ids = mesh.triangle_region_ids.copy()
+    rho = mesh.triangle_resistivity_values.copy()
+
+    for roi in (RectangularRoi(2.5, 6.5, 2, 6), RectangularRoi(1, 9, 4, 8)):
+        patch = session.update_roi(roi)
+        indices = np.array(patch["triangleIndices"], dtype=np.int64)
+        region_ids[indices] = patch["triangleRegionIds"]
+        rho[indices] = patch["triangleResistivityValues"]
+
+        fresh = ResegmentationPreviewSession(source, make_parameters(roi))
+        assert canonical_partition(session.component_by_triangle) == canonical_partition(
+            fresh.component_by_triangle
+        )
+        assert rho.tolist() == fresh.preview_mesh().triangle_resistivity_values.tolist()
+        assert region_ids.tolist() == session.preview_mesh().triangle_region_ids.tolist()
+        assert patch["stats"]["changedTriangleCount"] > 0
+        assert set(patch["removedRegionIds"]).isdisjoint(session.components)
+
+
+def test_update_roi_merges_new_small_components():
+    source = make_source(seed=3)
+    session = ResegmentationPreviewSession(
+        source, make_parameters(RectangularRoi(2, 6, 2, 6), minimum_region_area=0.5)
+    )
+
+    patch = session.update_roi(RectangularRoi(3, 7, 2, 6))
+
+    assert all(component.area >= 0.5 for component in session.components.values())
+    assert {item["regionId"] for item in patch["regionResistivity"]} <= set(session.components)
+    assert session.preview_mesh().triangle_region_ids.tolist() == session.component_by_triangle.tolist()
+
+
+def test_update_roi_without_changes_returns_empty_patch():
+    session = ResegmentationPreviewSession(make_source(), make_parameters(RectangularRoi(2, 6, 2, 6)))
+
+    patch = session.update_roi(RectangularRoi(2, 6, 2, 6))
+
+    assert patch["triangleIndices"] == []
+    assert patch["removedRegionIds"] == []
+
+
+def test_update_roi_rejects_roi_without_active_triangles():
+    session = ResegmentationPreviewSession(make_source(), make_parameters(RectangularRoi(2, 6, 2, 6)))
+
+    with pytest.raises(ResegmentationError):
+        session.update_roi(RectangularRoi(20, 30, 20, 30))
+
+
+def test_update_roi_keeps_ids_of_regions_that_only_shrink_or_grow():
+    source = make_source(seed=5, point_count=3000)
+    centroids = np.asarray(source.points)[np.asarray(source.triangles)].mean(axis=1)
+    layered = replace(source, triangle_region_ids=np.minimum(centroids[:, 1] // 2, 5).astype(np.int64))
+    session = ResegmentationPreviewSession(layered, make_parameters(RectangularRoi(2, 6, 2, 6)))
+    previous_ids = session.component_by_triangle.copy()
+
+    patch = session.update_roi(RectangularRoi(2.2, 6.2, 2, 6))
+
+    indices = np.array(patch["triangleIndices"], dtype=np.int64)
+    unchanged = np.setdiff1d(np.arange(len(previous_ids)), indices)
+    assert 0 < len(indices) < len(previous_ids) // 10
+    assert session.component_by_triangle[unchanged].tolist() == previous_ids[unchanged].tolist()
+    fresh = ResegmentationPreviewSession(layered, make_parameters(RectangularRoi(2.2, 6.2, 2, 6)))
+    assert canonical_partition(session.component_by_triangle) == canonical_partition(
+        fresh.component_by_triangle
+    )
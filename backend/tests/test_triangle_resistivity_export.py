@@ -1,5 +1,6 @@
 import io
 import json
+import zipfile
 
 import pytest
 
@@ -7,6 +8,8 @@ import main as backend_main
 from triangle_resistivity_export import (
     ResistivityExportError,
     build_exported_resistivity_text,
+    build_indexed_resistivity_text,
+    index_resistivity_source,
 )
 
 
@@ -19,6 +22,22 @@ Number of regions:              2
 """
 
 
+SIMPLE_POLY = b"""4 2 0 0
+1 0 0
+2 10 0
+3 10 10
+4 0 10
+4 1
+1 1 2 1
+2 2 3 1
+3 3 4 1
+4 4 1 1
+0
+1
+1 5 5 1 -1
+"""
+
+
 @pytest.fixture()
 def app_client():
     backend_main.app.config["TESTING"] = True
@@ -96,3 +115,98 @@ def test_export_endpoint_accepts_large_updates_as_json_file_part(app_client):
 
     assert response.status_code == 200
     assert b"1 2.5000000000E+02 1" in response.data
+
+
+def test_indexed_export_replaces_only_rho_tokens_of_updated_regions():
+    source = OFFICIAL_STYLE_RESISTIVITY.replace("\n", "\r\n") + "       1   5.0E+00  1 ! repeated\r\n"
+    indexed = index_resistivity_source(source)
+
+    text = build_indexed_resistivity_text(indexed, {1: 250.0, 99: 5.0})
+
+    assert text == source.replace("1.0000E+02", "2.5000000000E+02").replace(
+        "5.0E+00", "2.5000000000E+02"
+    )
+    assert sorted(indexed.rho_spans) == [1, 2]
+    with pytest.raises(ResistivityExportError, match="No matching regions"):
+        build_indexed_resistivity_text(indexed, {99: 5.0})
+
+
+def test_export_endpoint_uses_indexed_upload_by_export_id(app_client):
+    upload = app_client.post(
+        "/api/upload-triangle-model",
+        data={
+            "poly_file": (io.BytesIO(SIMPLE_POLY), "simple.poly"),
+            "resistivity_file": (
+                io.BytesIO(OFFICIAL_STYLE_RESISTIVITY.encode("utf-8")),
+                "simple.resistivity",
+            ),
+        },
+        content_type="multipart/form-data",
+    )
+    export_id = upload.get_json()["resistivityExportId"]
+
+    response = app_client.post(
+        "/api/export-triangle-resistivity",
+        data={"export_id": export_id, "region_rho_updates": json.dumps({"2": 7.5})},
+        content_type="multipart/form-data",
+    )
+    missing = app_client.post(
+        "/api/export-triangle-resistivity",
+        data={"export_id": "missing", "region_rho_updates": json.dumps({"2": 7.5})},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200
+    assert "simple.edited.resistivity" in response.headers["Content-Disposition"]
+    assert response.data.decode("utf-8") == OFFICIAL_STYLE_RESISTIVITY.replace(
+        "1.0000E+12", "7.5000000000E+00"
+    )
+    assert missing.status_code == 404
+
+
+def test_scenario_endpoint_streams_one_edited_file_per_scenario(app_client):
+    response = app_client.post(
+        "/api/export-triangle-resistivity-scenarios",
+        data={
+            "resistivity_file": (
+                io.BytesIO(OFFICIAL_STYLE_RESISTIVITY.encode("utf-8")),
+                "simple.resistivity",
+            ),
+            "scenarios": json.dumps(
+                [
+                    {"name": "low rho", "regionRhoUpdates": {"1": 1.0}},
+                    {"name": "high", "regionRhoUpdates": [{"regionId": 2, "rho": 9.0}]},
+                ]
+            ),
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+    assert "simple.scenarios.zip" in response.headers["Content-Disposition"]
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        assert archive.namelist() == [
+            "simple.low_rho.resistivity",
+            "simple.high.resistivity",
+        ]
+        assert archive.read("simple.high.resistivity").decode("utf-8") == (
+            OFFICIAL_STYLE_RESISTIVITY.replace("1.0000E+12", "9.0000000000E+00")
+        )
+
+
+def test_scenario_endpoint_rejects_scenarios_without_matching_regions(app_client):
+    response = app_client.post(
+        "/api/export-triangle-resistivity-scenarios",
+        data={
+            "resistivity_file": (
+                io.BytesIO(OFFICIAL_STYLE_RESISTIVITY.encode("utf-8")),
+                "simple.resistivity",
+            ),
+            "scenarios": json.dumps({"a": {"1": 2.0}, "b": {"99": 2.0}}),
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 400
+    assert "Scenario b" in response.get_json()["error"]
@@ -1,6 +1,8 @@
+import base64
 import io
 import os
 
+import numpy as np
 import pytest
 
 import main as backend_main
@@ -65,3 +67,69 @@ def test_upload_xyz_returns_records(client):
     assert isinstance(payload, list)
     assert len(payload) == 1
     assert "X" in payload[0]
+
+
+def test_upload_xyz_grid_format_returns_axes_and_dense_rho(client):
+    rows = [f"5 {y} {z} {y * 10 + z} 0 0" for z in (100, 200) for y in (0, 50, 100)]
+    data = {
+        "file": (io.BytesIO("\n".join(rows).encode("utf-8")), "grid.xyz"),
+        "format": "grid",
+    }
+
+    response = client.post("/api/upload-xyz", data=data, content_type="multipart/form-data")
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["layout"] == "grid"
+    assert payload["y"] == [0.0, 50.0, 100.0]
+    assert payload["z"] == [100.0, 200.0]
+    assert payload["y_dist"] == [-100.0, -50.0, 0.0]
+    assert payload["rho"]["shape"] == [2, 3]
+    rho = np.frombuffer(base64.b64decode(payload["rho"]["data"]), dtype="<f4")
+    assert rho.tolist() == [100, 600, 1100, 200, 700, 1200]
+
+
+def test_upload_xyz_grid_format_falls_back_to_records_for_scattered_cells(client):
+    data = {
+        "file": (io.BytesIO(b"0 0 0 1 2 3\n0 10 5 4 5 6\n0 20 9 7 8 9\n"), "scattered.xyz"),
+        "format": "grid",
+    }
+
+    response = client.post("/api/upload-xyz", data=data, content_type="multipart/form-data")
+
+    payload = response.get_json()
+    assert payload["layout"] == "records"
+    assert [record["rho1"] for record in payload["records"]] == [1, 4, 7]
+
+
+def test_upload_xyz_tiles_format_serves_pyramid_tiles(client):
+    rows = [f"0 {y} {z} {10 ** (z / 100)} 0 0" for z in (100, 200, 300) for y in (0, 50)]
+    data = {
+        "file": (io.BytesIO("\n".join(rows).encode("utf-8")), "tiles.xyz"),
+        "format": "tiles",
+    }
+
+    response = client.post("/api/upload-xyz", data=data, content_type="multipart/form-data")
+
+    payload = response.get_json()
+    assert payload["layout"] == "tiles"
+    assert payload["statistic"] == "log_mean"
+    assert payload["levels"] == [{"level": 0, "shape": [3, 2], "tiles": [1, 1]}]
+
+    tile = client.post(
+        "/api/xyz-tile",
+        data={"pyramid_id": payload["pyramid_id"], "level": 0, "i": 0, "j": 0},
+        content_type="multipart/form-data",
+    )
+    assert tile.status_code == 200
+    tile_payload = tile.get_json()
+    assert tile_payload["z_range"] == [100.0, 300.0]
+    rho = np.frombuffer(base64.b64decode(tile_payload["rho"]["data"]), dtype="<f4")
+    np.testing.assert_allclose(rho, [10, 10, 100, 100, 1000, 1000])
+
+    missing = client.post(
+        "/api/xyz-tile",
+        data={"pyramid_id": "missing", "level": 0, "i": 0, "j": 0},
+        content_type="multipart/form-data",
+    )
+    assert missing.status_code == 404
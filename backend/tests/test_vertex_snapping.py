@@ -0,0 +1,54 @@
+import numpy as np
+
+from MARE2DEM_poly_parser import MARE2DEMPolyManager
+from vertex_snapping import find_close_vertex_pairs, snap_vertices
+
+
+def test_find_close_vertex_pairs_uses_strict_per_axis_tolerance():
+    points = [(0.0, 0.0), (0.5, 0.5), (1.0, 0.0), (3.0, 3.0)]
+
+    pairs = find_close_vertex_pairs(points, 1.0)
+
+    assert sorted(map(tuple, pairs.tolist())) == [(0, 1), (1, 2)]
+
+
+def test_snap_vertices_collapses_chains_to_lowest_free_index():
+    points = [(0.0, 0.0), (9.0, 9.0), (0.6, 0.0), (1.2, 0.0), (9.5, 9.0)]
+
+    representatives, stats = snap_vertices(points, 1.0)
+
+    assert representatives.tolist() == [0, 1, 0, 0, 1]
+    assert stats.snapped_vertices == 3
+    assert stats.snap_groups == 2
+    assert stats.chained_groups == 1
+    assert np.isclose(stats.max_snap_distance, 1.2)
+
+
+def test_snap_vertices_keeps_fixed_vertices_distinct():
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 0.0)]
+
+    representatives, stats = snap_vertices(points, 0.75, fixed_count=2)
+
+    assert representatives.tolist() == [0, 1, 0]
+    assert stats.snapped_vertices == 1
+
+
+def test_merge_vertices_maps_duplicates_of_second_file(capsys):
+    manager = MARE2DEMPolyManager()
+    vertices1 = {1: {"hCoor": 0.0, "vCoor": 0.0}, 2: {"hCoor": 1.0, "vCoor": 0.0}}
+    vertices2 = {
+        7: {"hCoor": 1.0 + 1e-12, "vCoor": 0.0},
+        8: {"hCoor": 2.0, "vCoor": 0.0},
+        9: {"hCoor": 2.0, "vCoor": 1e-12},
+    }
+
+    merged, mapping1, mapping2 = manager._merge_vertices_correct(vertices1, vertices2)
+
+    assert merged == {
+        1: {"hCoor": 0.0, "vCoor": 0.0},
+        2: {"hCoor": 1.0, "vCoor": 0.0},
+        3: {"hCoor": 2.0, "vCoor": 0.0},
+    }
+    assert mapping1 == {1: 1, 2: 2}
+    assert mapping2 == {7: 2, 8: 3, 9: 3}
+    assert manager.last_snap_stats.snapped_vertices == 2
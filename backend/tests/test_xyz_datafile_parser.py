@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from xyz_datafile_parser import XYZDataFileReader, inline_distance, iter_xyz_chunks, read_xyz_decimated
+
+
+def test_reader_keeps_projected_columns_and_adds_distance(tmp_path):
+    path = tmp_path / "section.xyz"
+    path.write_text("0 0 10 1.5 2 3\n3 4 10 2.5 2 3\n6 8 10 3.5 2 3\n")
+
+    reader = XYZDataFileReader(str(path), dtype=np.float32)
+    reader.add_distance()
+
+    assert list(reader.data.columns) == ["X", "Y", "Z", "rho1", "Y_dist"]
+    assert reader.data["rho1"].dtype == np.float32
+    assert reader.data["Y_dist"].tolist() == [-10.0, -5.0, 0.0]
+
+
+def test_chunked_reading_matches_full_read(tmp_path):
+    path = tmp_path / "volume.xyz"
+    rows = np.arange(40, dtype=float).reshape(10, 4)
+    np.savetxt(path, rows, fmt="%.1f")
+
+    chunks = list(iter_xyz_chunks(str(path), chunk_rows=4))
+    decimated = read_xyz_decimated(str(path), stride=3, chunk_rows=4)
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert chunks[-1].index.tolist() == [8, 9]
+    assert decimated.to_numpy().tolist() == rows[::3].tolist()
+
+
+def test_inline_distance_matches_the_pandas_column_exactly():
+    rng = np.random.default_rng(11)
+    data = pd.DataFrame({"X": rng.uniform(4e5, 5e5, 5000), "Y": rng.uniform(6e6, 7e6, 5000)})
+
+    expected = -np.sqrt((data["Y"] - data["Y"].iloc[-1]) ** 2 + (data["X"] - data["X"].iloc[-1]) ** 2)
+
+    assert np.array_equal(inline_distance(data["X"].to_numpy(), data["Y"].to_numpy()), expected.to_numpy())
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from xyz_tile_pyramid import TILE_SIZE, XYZTilePyramidCache
+
+
+def test_pyramid_levels_hold_exact_block_statistics(tmp_path):
+    rng = np.random.default_rng(3)
+    rows, columns = 3 * TILE_SIZE + 5, 2 * TILE_SIZE + 1
+    rho = np.exp(rng.normal(size=(rows, columns))).astype(np.float32)
+    rho[:40, :70] = np.nan
+    cache = XYZTilePyramidCache(cache_dir=str(tmp_path))
+
+    _, pyramid = cache.build(rho, np.arange(columns) * 10.0, np.arange(rows) * 5.0)
+
+    assert pyramid.level_shapes == [(773, 513), (387, 257), (194, 129)]
+    level = 2
+    block = 1 << level
+    finite_log = np.log10(rho.astype(np.float64))
+    expected = np.full(pyramid.level_shapes[level], np.nan)
+    for row in range(expected.shape[0]):
+        for column in range(expected.shape[1]):
+            cells = finite_log[row * block : (row + 1) * block, column * block : (column + 1) * block]
+            cells = cells[np.isfinite(cells)]
+            if len(cells):
+                expected[row, column] = 10 ** cells.mean()
+    np.testing.assert_allclose(pyramid.level(level), expected, rtol=1e-6)
+    assert np.isnan(pyramid.level(level)[0, 0])
+
+    tile = pyramid.tile(1, 1, 1)
+    assert tile["values"].shape == (387 - TILE_SIZE, 1)
+    assert tile["y_range"] == (5120.0, 5120.0)
+    assert tile["z_range"] == (2560.0, 3860.0)
+    with pytest.raises(ValueError):
+        pyramid.tile(1, 2, 0)
+
+
+def test_cache_eviction_deletes_pyramid_files(tmp_path):
+    cache = XYZTilePyramidCache(max_entries=1, cache_dir=str(tmp_path))
+    rho = np.ones((4, 3), dtype=np.float32)
+
+    first_id, _ = cache.build(rho, np.arange(3.0), np.arange(4.0), statistic="mean")
+    second_id, _ = cache.build(rho, np.arange(3.0), np.arange(4.0), statistic="mean")
+
+    assert cache.get(first_id) is None
+    assert cache.get(second_id).tile(0, 0, 0)["values"].tolist() == rho.tolist()
+    assert [path.name for path in tmp_path.iterdir()] == [f"{second_id}.tiles"]
+
+
+def test_cache_removes_tile_files_left_by_earlier_runs(tmp_path):
+    (tmp_path / "stale.tiles").write_bytes(b"\0" * 16)
+    (tmp_path / "notes.txt").write_text("keep")
+
+    XYZTilePyramidCache(cache_dir=str(tmp_path))
+
+    assert [path.name for path in tmp_path.iterdir()] == ["notes.txt"]
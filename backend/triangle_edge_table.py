@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+
+# Local triangle edge order: (v0, v1), (v1, v2), (v2, v0).
+_LOCAL_EDGE_STARTS = (0, 1, 2)
+_LOCAL_EDGE_ENDS = (1, 2, 0)
+
+
+@dataclass(frozen=True, eq=False)
+class TriangleEdgeTable:
+    """Unique undirected edges of a triangulation with their incident triangles.
+
+    Edges are stored as sorted endpoint pairs in order of first appearance when
+    walking triangles and their local edges, so iterating the table visits
+    edges in the same order as a dict keyed by sorted endpoint tuples.
+    """
+
+    edges: np.ndarray
+    edge_triangles: np.ndarray
+    triangle_counts: np.ndarray
+    constrained: np.ndarray
+    triangle_edge_indices: np.ndarray
+    vertex_count: int
+    _sorted_keys: np.ndarray
+    _sorted_edge_indices: np.ndarray
+
+    @property
+    def edge_count(self) -> int:
+        return int(len(self.edges))
+
+    @property
+    def interior_mask(self) -> np.ndarray:
+        """Edges shared by exactly two triangles."""
+
+        return self.triangle_counts == 2
+
+    @property
+    def boundary_mask(self) -> np.ndarray:
+        """Edges used by a single triangle (outer boundary or hole rims)."""
+
+        return self.triangle_counts == 1
+
+    def neighbor_pairs(self) -> np.ndarray:
+        """Return `(first, second)` triangle pairs for every interior edge."""
+
+        return self.edge_triangles[self.interior_mask]
+
+    def lookup(self, pairs: Any) -> np.ndarray:
+        """Return edge indices for endpoint pairs, or -1 where the edge is absent."""
+
+        pair_array = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        low = pair_array.min(axis=1)
+        high = pair_array.max(axis=1)
+        in_range = (low >= 0) & (high < self.vertex_count)
+        keys = _edge_keys(low, high, self.vertex_count)
+        positions = np.searchsorted(self._sorted_keys, keys)
+        positions = np.minimum(positions, max(len(self._sorted_keys) - 1, 0))
+
+        result = np.full(len(pair_array), -1, dtype=np.int64)
+        if len(self._sorted_keys) == 0:
+            return result
+        found = in_range & (self._sorted_keys[positions] == keys)
+        result[found] = self._sorted_edge_indices[positions[found]]
+        return result
+
+    def edge_lengths(
+        self,
+        points: Any,
+        edge_indices: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Return Euclidean lengths for all edges or the selected edge indices."""
+
+        point_array = np.asarray(points, dtype=float).reshape(-1, 2)
+        edges = self.edges if edge_indices is None else self.edges[edge_indices]
+        first = point_array[edges[:, 0]]
+        second = point_array[edges[:, 1]]
+        return np.hypot(first[:, 0] - second[:, 0], first[:, 1] - second[:, 1])
+
+
+def _edge_keys(low: np.ndarray, high: np.ndarray, vertex_count: int) -> np.ndarray:
+    return low.astype(np.int64) * np.int64(max(vertex_count, 1)) + high.astype(np.int64)
+
+
+def build_triangle_edge_table(
+    triangles: Sequence[Sequence[int]],
+    constrained_edges: Optional[Iterable[Sequence[int]]] = None,
+    vertex_count: Optional[int] = None,
+) -> TriangleEdgeTable:
+    """Build the shared edge table for a triangulation.
+
+    Args:
+        triangles: `(n, 3)` vertex indices per triangle.
+        constrained_edges: Optional endpoint pairs of the input segments; edges
+            matching one of them are flagged as constrained.
+        vertex_count: Number of mesh vertices. Inferred from the triangles when
+            omitted.
+    """
+
+    triangle_array = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    triangle_count = len(triangle_array)
+    if vertex_count is None:
+        vertex_count = int(triangle_array.max()) + 1 if triangle_array.size else 0
+
+    starts = triangle_array[:, _LOCAL_EDGE_STARTS]
+    ends = triangle_array[:, _LOCAL_EDGE_ENDS]
+    half_edge_low = np.minimum(starts, ends).ravel()
+    half_edge_high = np.maximum(starts, ends).ravel()
+    half_edge_keys = _edge_keys(half_edge_low, half_edge_high, vertex_count)
+
+    sorted_keys, first_half_edge, inverse, counts = np.unique(
+        half_edge_keys,
+        return_index=True,
+        return_inverse=True,
+        return_counts=True,
+    )
+    inverse = inverse.reshape(-1)
+
+    appearance_order = np.argsort(first_half_edge, kind="stable")
+    edge_index_by_sorted_key = np.empty(len(sorted_keys), dtype=np.int64)
+    edge_index_by_sorted_key[appearance_order] = np.arange(len(sorted_keys))
+    half_edge_edge_index = edge_index_by_sorted_key[inverse]
+
+    first_occurrence = first_half_edge[appearance_order]
+    edges = np.column_stack(
+        (half_edge_low[first_occurrence], half_edge_high[first_occurrence])
+    ).astype(np.int64)
+    triangle_counts = counts[appearance_order].astype(np.int64)
+
+    # Group half-edges by edge while keeping triangle order inside each group.
+    half_edge_triangles = np.repeat(np.arange(triangle_count, dtype=np.int64), 3)
+    grouped = np.argsort(half_edge_edge_index, kind="stable")
+    group_starts = np.concatenate(([0], np.cumsum(triangle_counts)[:-1])).astype(np.int64)
+
+    edge_triangles = np.full((len(edges), 2), -1, dtype=np.int64)
+    if len(edges):
+        edge_triangles[:, 0] = half_edge_triangles[grouped[group_starts]]
+        has_second = triangle_counts >= 2
+        edge_triangles[has_second, 1] = half_edge_triangles[
+            grouped[group_starts[has_second] + 1]
+        ]
+
+    constrained = np.zeros(len(edges), dtype=bool)
+    if constrained_edges is not None:
+        constrained_array = np.asarray(list(constrained_edges), dtype=np.int64).reshape(-1, 2)
+        if len(constrained_array):
+            constrained_keys = _edge_keys(
+                constrained_array.min(axis=1),
+                constrained_array.max(axis=1),
+                vertex_count,
+            )
+            constrained = np.isin(sorted_keys[appearance_order], constrained_keys)
+
+    return TriangleEdgeTable(
+        edges=edges,
+        edge_triangles=edge_triangles,
+        triangle_counts=triangle_counts,
+        constrained=constrained,
+        triangle_edge_indices=half_edge_edge_index.reshape(-1, 3),
+        vertex_count=int(vertex_count),
+        _sorted_keys=sorted_keys,
+        _sorted_edge_indices=edge_index_by_sorted_key,
+    )
@@ -0,0 +1,433 @@
+"""Level-of-detail hierarchy for constrained triangle meshes.
+
+Coarser levels are built by clustering vertices on a square grid. Vertices
+only cluster with vertices of the same kind: interior vertices of one
+material, vertices on the interface between the same pair of materials, or
+outer boundary vertices. Interface junctions and segment ends stay pinned,
+so region outlines and resistivity contrasts survive simplification while
+sub-pixel interior detail is collapsed.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lru_store import LruStore
+from triangle_edge_table import build_triangle_edge_table
+from triangle_mesh_transfer import TriangleMeshArrays
+
+DEFAULT_LOD_MAX_LEVELS = 8
+DEFAULT_LOD_MIN_TRIANGLES = 2000
+DEFAULT_LOD_MIN_REDUCTION = 0.2
+DEFAULT_PIXEL_TOLERANCE = 1.0
+
+
+class MeshLodError(ValueError):
+    """Raised when a level-of-detail request cannot be satisfied."""
+
+
+@dataclass(frozen=True)
+class MeshViewport:
+    """Visible model window and its size on screen.
+
+    The bounds are optional; when omitted the whole model is in view.
+    """
+
+    width_px: int
+    height_px: int
+    y_min: Optional[float] = None
+    y_max: Optional[float] = None
+    z_min: Optional[float] = None
+    z_max: Optional[float] = None
+    max_triangles: Optional[int] = None
+
+    @property
+    def has_bounds(self) -> bool:
+        return self.y_min is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "yMin": self.y_min,
+            "yMax": self.y_max,
+            "zMin": self.z_min,
+            "zMax": self.z_max,
+            "widthPx": self.width_px,
+            "heightPx": self.height_px,
+            "maxTriangles": self.max_triangles,
+        }
+
+
+@dataclass(frozen=True, eq=False)
+class MeshLodLevel:
+    """One simplified mesh and the grid cell size used to build it."""
+
+    level: int
+    cell_size: float
+    mesh: TriangleMeshArrays
+
+
+@dataclass(frozen=True, eq=False)
+class MeshLodHierarchy:
+    """Full-detail mesh followed by progressively coarser levels."""
+
+    levels: List[MeshLodLevel]
+    bounds: Tuple[float, float, float, float]
+
+    def describe(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the available levels."""
+
+        y_min, y_max, z_min, z_max = self.bounds
+        return {
+            "bounds": {"yMin": y_min, "yMax": y_max, "zMin": z_min, "zMax": z_max},
+            "levels": [
+                {
+                    "level": level.level,
+                    "cellSize": level.cell_size,
+                    "vertexCount": level.mesh.vertex_count,
+                    "triangleCount": level.mesh.triangle_count,
+                }
+                for level in self.levels
+            ],
+        }
+
+    def extract(
+        self,
+        viewport: MeshViewport,
+        pixel_tolerance: float = DEFAULT_PIXEL_TOLERANCE,
+    ) -> Tuple[MeshLodLevel, TriangleMeshArrays]:
+        """Return the level matching the viewport and its visible triangles.
+
+        The coarsest level whose cell size stays below `pixel_tolerance` screen
+        pixels is chosen, then coarser levels are tried while the visible
+        triangle count exceeds `viewport.max_triangles`.
+        """
+
+        bounds = self._viewport_bounds(viewport)
+        pixel_size = max(
+            (bounds[1] - bounds[0]) / viewport.width_px,
+            (bounds[3] - bounds[2]) / viewport.height_px,
+        )
+        start = 0
+        for index, level in enumerate(self.levels):
+            if level.cell_size <= pixel_size * pixel_tolerance:
+                start = index
+
+        for level in self.levels[start:]:
+            visible = crop_triangle_mesh(level.mesh, *bounds)
+            if (
+                viewport.max_triangles is None
+                or visible.triangle_count <= viewport.max_triangles
+            ):
+                return level, visible
+        return level, visible
+
+    def _viewport_bounds(
+        self, viewport: MeshViewport
+    ) -> Tuple[float, float, float, float]:
+        if not viewport.has_bounds:
+            return self.bounds
+        return (viewport.y_min, viewport.y_max, viewport.z_min, viewport.z_max)
+
+
+def _as_positive_int(value: Any, field_name: str) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError) as exc:
+        raise MeshLodError(f"{field_name} must be an integer") from exc
+    if number <= 0:
+        raise MeshLodError(f"{field_name} must be positive")
+    return number
+
+
+def _as_finite_float(value: Any, field_name: str) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError) as exc:
+        raise MeshLodError(f"{field_name} must be numeric") from exc
+    if not math.isfinite(number):
+        raise MeshLodError(f"{field_name} must be finite")
+    return number
+
+
+def parse_mesh_viewport(payload: Dict[str, Any]) -> MeshViewport:
+    """Parse and validate a viewport from API JSON."""
+
+    if not isinstance(payload, dict):
+        raise MeshLodError("viewport must be an object")
+
+    width_px = _as_positive_int(payload.get("widthPx"), "viewport.widthPx")
+    height_px = _as_positive_int(payload.get("heightPx"), "viewport.heightPx")
+    max_triangles = payload.get("maxTriangles")
+    if max_triangles is not None:
+        max_triangles = _as_positive_int(max_triangles, "viewport.maxTriangles")
+
+    bound_keys = ("yMin", "yMax", "zMin", "zMax")
+    if all(payload.get(key) is None for key in bound_keys):
+        return MeshViewport(width_px, height_px, max_triangles=max_triangles)
+
+    y_min, y_max, z_min, z_max = (
+        _as_finite_float(payload.get(key), f"viewport.{key}") for key in bound_keys
+    )
+    if y_min >= y_max:
+        raise MeshLodError("viewport.yMin must be less than viewport.yMax")
+    if z_min >= z_max:
+        raise MeshLodError("viewport.zMin must be less than viewport.zMax")
+
+    return MeshViewport(
+        width_px=width_px,
+        height_px=height_px,
+        y_min=y_min,
+        y_max=y_max,
+        z_min=z_min,
+        z_max=z_max,
+        max_triangles=max_triangles,
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class _ClusterAttributes:
+    """Per-vertex grouping keys that do not depend on the grid cell size."""
+
+    min_class: np.ndarray
+    max_class: np.ndarray
+    on_boundary: np.ndarray
+    pinned_ids: np.ndarray
+    median_edge_length: float
+
+
+def _group_rows(*columns: np.ndarray) -> np.ndarray:
+    """Return dense ids that are equal exactly where all column values are equal.
+
+    Combining one-dimensional codes column by column is much faster than
+    `np.unique(..., axis=0)` on large meshes.
+    """
+
+    group = np.zeros(len(columns[0]), dtype=np.int64)
+    for column in columns:
+        values, codes = np.unique(column, return_inverse=True)
+        group = group * len(values) + codes.reshape(-1)
+        group = np.unique(group, return_inverse=True)[1].reshape(-1)
+    return group
+
+
+def _triangle_material_classes(mesh: TriangleMeshArrays) -> np.ndarray:
+    """Return a material class per triangle.
+
+    Triangles share a class when they have the same resistivity, so interfaces
+    without a contrast can be simplified away. Triangles without a
+    resistivity fall back to their source region id.
+    """
+
+    rho = mesh.triangle_resistivity_values
+    missing_rho = ~np.isfinite(rho)
+    return _group_rows(
+        missing_rho,
+        np.where(missing_rho, 0.0, rho),
+        np.where(missing_rho, mesh.triangle_region_ids, 0),
+    )
+
+
+def _build_cluster_attributes(mesh: TriangleMeshArrays) -> _ClusterAttributes:
+    vertex_count = mesh.vertex_count
+    triangles = mesh.triangles
+    classes = _triangle_material_classes(mesh)
+    table = build_triangle_edge_table(triangles, vertex_count=vertex_count)
+
+    first = table.edge_triangles[:, 0]
+    second = np.where(
+        table.edge_triangles[:, 1] >= 0, table.edge_triangles[:, 1], first
+    )
+    boundary = table.boundary_mask
+    feature = boundary | (classes[first] != classes[second])
+    feature_degree = np.bincount(table.edges[feature].ravel(), minlength=vertex_count)
+
+    corner_classes = np.repeat(classes, 3)
+    min_class = np.full(vertex_count, -1, dtype=np.int64)
+    max_class = np.full(vertex_count, -1, dtype=np.int64)
+    if len(triangles):
+        min_class[:] = np.iinfo(np.int64).max
+        np.minimum.at(min_class, triangles.ravel(), corner_classes)
+        np.maximum.at(max_class, triangles.ravel(), corner_classes)
+
+    on_boundary = np.zeros(vertex_count, dtype=bool)
+    on_boundary[table.edges[boundary].ravel()] = True
+
+    # Junctions of three or more interfaces and dangling interface ends keep
+    # their exact position at every level.
+    pinned = (feature_degree == 1) | (feature_degree >= 3)
+    pinned_ids = np.where(pinned, np.arange(vertex_count), -1)
+
+    lengths = table.edge_lengths(mesh.vertices)
+    median_edge_length = float(np.median(lengths)) if len(lengths) else 0.0
+
+    return _ClusterAttributes(
+        min_class=min_class,
+        max_class=max_class,
+        on_boundary=on_boundary,
+        pinned_ids=pinned_ids,
+        median_edge_length=median_edge_length,
+    )
+
+
+def _signed_double_areas(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    first = vertices[triangles[:, 0]]
+    second = vertices[triangles[:, 1]]
+    third = vertices[triangles[:, 2]]
+    return (second[:, 0] - first[:, 0]) * (third[:, 1] - first[:, 1]) - (
+        third[:, 0] - first[:, 0]
+    ) * (second[:, 1] - first[:, 1])
+
+
+def _select_triangles(
+    mesh: TriangleMeshArrays,
+    vertices: np.ndarray,
+    triangles: np.ndarray,
+    keep: np.ndarray,
+) -> TriangleMeshArrays:
+    """Keep the selected triangles and drop vertices they no longer use."""
+
+    kept_triangles = triangles[keep]
+    used_vertices, remapped = np.unique(kept_triangles, return_inverse=True)
+    return TriangleMeshArrays(
+        vertices=vertices[used_vertices],
+        triangles=remapped.reshape(-1, 3).astype(np.int64),
+        triangle_region_ids=mesh.triangle_region_ids[keep],
+        triangle_resistivity_values=mesh.triangle_resistivity_values[keep],
+        region_ids=mesh.region_ids,
+        region_resistivity_values=mesh.region_resistivity_values,
+    )
+
+
+def simplify_triangle_mesh(
+    mesh: TriangleMeshArrays,
+    cell_size: float,
+    attributes: Optional[_ClusterAttributes] = None,
+) -> TriangleMeshArrays:
+    """Collapse vertices that share a grid cell and a material signature.
+
+    Triangles that degenerate or flip orientation are dropped, as are
+    duplicates produced by the collapse.
+    """
+
+    if cell_size <= 0 or mesh.triangle_count == 0:
+        return mesh
+    if attributes is None:
+        attributes = _build_cluster_attributes(mesh)
+
+    vertices = mesh.vertices
+    origin = vertices.min(axis=0)
+    cells = np.floor((vertices - origin) / cell_size).astype(np.int64)
+    clusters = _group_rows(
+        cells[:, 0],
+        cells[:, 1],
+        attributes.min_class,
+        attributes.max_class,
+        attributes.on_boundary,
+        attributes.pinned_ids,
+    )
+    cluster_count = int(clusters.max()) + 1
+    members = np.bincount(clusters, minlength=cluster_count).astype(np.float64)
+    cluster_vertices = (
+        np.column_stack(
+            (
+                np.bincount(clusters, weights=vertices[:, 0], minlength=cluster_count),
+                np.bincount(clusters, weights=vertices[:, 1], minlength=cluster_count),
+            )
+        )
+        / members[:, None]
+    )
+
+    collapsed = clusters[mesh.triangles]
+    distinct = (
+        (collapsed[:, 0] != collapsed[:, 1])
+        & (collapsed[:, 1] != collapsed[:, 2])
+        & (collapsed[:, 2] != collapsed[:, 0])
+    )
+    original_area = _signed_double_areas(vertices, mesh.triangles)
+    collapsed_area = _signed_double_areas(cluster_vertices, collapsed)
+    keep = distinct & (np.sign(original_area) == np.sign(collapsed_area))
+
+    # Two source triangles can collapse onto the same output triangle.
+    candidates = np.flatnonzero(keep)
+    corners = np.sort(collapsed[candidates], axis=1)
+    _, first_index = np.unique(
+        _group_rows(corners[:, 0], corners[:, 1], corners[:, 2]), return_index=True
+    )
+    keep = np.zeros(mesh.triangle_count, dtype=bool)
+    keep[candidates[first_index]] = True
+
+    return _select_triangles(mesh, cluster_vertices, collapsed, keep)
+
+
+def crop_triangle_mesh(
+    mesh: TriangleMeshArrays,
+    y_min: float,
+    y_max: float,
+    z_min: float,
+    z_max: float,
+) -> TriangleMeshArrays:
+    """Return the triangles whose bounding box overlaps the window."""
+
+    corners = mesh.vertices[mesh.triangles]
+    lower = corners.min(axis=1)
+    upper = corners.max(axis=1)
+    keep = (
+        (lower[:, 0] <= y_max)
+        & (upper[:, 0] >= y_min)
+        & (lower[:, 1] <= z_max)
+        & (upper[:, 1] >= z_min)
+    )
+    if keep.all():
+        return mesh
+    return _select_triangles(mesh, mesh.vertices, mesh.triangles, keep)
+
+
+def build_mesh_lod_hierarchy(
+    mesh: TriangleMeshArrays,
+    max_levels: int = DEFAULT_LOD_MAX_LEVELS,
+    min_triangle_count: int = DEFAULT_LOD_MIN_TRIANGLES,
+    min_reduction: float = DEFAULT_LOD_MIN_REDUCTION,
+) -> MeshLodHierarchy:
+    """Precompute full detail plus up to `max_levels` coarser meshes.
+
+    Each coarser level doubles the clustering cell size, starting at twice the
+    median edge length. Levels that remove less than `min_reduction` of the
+    previous level's triangles are skipped, and refinement stops once a level
+    has at most `min_triangle_count` triangles.
+    """
+
+    if mesh.vertex_count:
+        lower = mesh.vertices.min(axis=0)
+        upper = mesh.vertices.max(axis=0)
+        bounds = (float(lower[0]), float(upper[0]), float(lower[1]), float(upper[1]))
+    else:
+        bounds = (0.0, 0.0, 0.0, 0.0)
+
+    levels = [MeshLodLevel(level=0, cell_size=0.0, mesh=mesh)]
+    if mesh.triangle_count <= min_triangle_count:
+        return MeshLodHierarchy(levels=levels, bounds=bounds)
+
+    attributes = _build_cluster_attributes(mesh)
+    extent = max(bounds[1] - bounds[0], bounds[3] - bounds[2])
+    cell_size = 2.0 * attributes.median_edge_length
+    while cell_size > 0 and cell_size <= extent and len(levels) <= max_levels:
+        previous_count = levels[-1].mesh.triangle_count
+        simplified = simplify_triangle_mesh(mesh, cell_size, attributes)
+        if simplified.triangle_count <= previous_count * (1.0 - min_reduction):
+            levels.append(
+                MeshLodLevel(level=len(levels), cell_size=cell_size, mesh=simplified)
+            )
+            if simplified.triangle_count <= min_triangle_count:
+                break
+        cell_size *= 2.0
+
+    return MeshLodHierarchy(levels=levels, bounds=bounds)
+
+
+class MeshLodCache(LruStore[MeshLodHierarchy]):
+    """Small thread-safe LRU store of hierarchies keyed by generated ids."""
+
+    def __init__(self, max_entries: int = 8):
+        super().__init__(max_entries)
\ No newline at end of file
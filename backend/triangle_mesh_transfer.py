@@ -0,0 +1,219 @@
+"""Columnar constrained-mesh payloads and their binary transfer encoding.
+
+Binary layout (all integers little-endian)::
+
+    offset 0   b"CSMB" magic
+    offset 4   uint32 byte length H of the JSON header
+    offset 8   UTF-8 JSON header, space padded so that 8 + H is a multiple of 8
+    8 + H      packed typed-array buffers, each starting on an 8-byte boundary
+
+The header is the regular JSON response with the mesh object replaced by a
+descriptor whose ``buffers`` entries give the typed-array ``type``, the
+``byteOffset`` relative to the start of the buffer section and the element
+``length``. Missing per-triangle region ids use ``missingRegionId`` and
+missing resistivity values are NaN.
+
+The web frontend still requests the default JSON format; the binary format
+is for scripted and external clients that opt in with ``mesh_format=binary``.
+"""
+
+import json
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+MESH_BINARY_MAGIC = b"CSMB"
+MESH_BINARY_MIMETYPE = "application/octet-stream"
+MESH_BINARY_VERSION = 1
+MISSING_REGION_ID = -1
+MESH_FORMATS = ("json", "binary")
+VERTEX_PRECISIONS = {"float32": np.float32, "float64": np.float64}
+
+_TYPED_ARRAY_NAMES = {
+    np.dtype("<f4"): "Float32Array",
+    np.dtype("<f8"): "Float64Array",
+    np.dtype("<u4"): "Uint32Array",
+    np.dtype("<i4"): "Int32Array",
+}
+_BUFFER_ALIGNMENT = 8
+
+
+@dataclass(frozen=True, eq=False)
+class TriangleMeshArrays:
+    """Constrained mesh with per-triangle attributes stored as numpy columns."""
+
+    vertices: np.ndarray
+    triangles: np.ndarray
+    triangle_region_ids: np.ndarray
+    triangle_resistivity_values: np.ndarray
+    region_ids: np.ndarray
+    region_resistivity_values: np.ndarray
+
+    @property
+    def vertex_count(self) -> int:
+        return int(len(self.vertices))
+
+    @property
+    def triangle_count(self) -> int:
+        return int(len(self.triangles))
+
+    def to_json_mesh(self) -> Dict[str, Any]:
+        """Return the `{"vertices", "triangles", ...}` JSON mesh shape."""
+
+        region_ids = self.triangle_region_ids.tolist()
+        rho_values = self.triangle_resistivity_values.tolist()
+        return {
+            "vertices": [
+                {"id": index, "x": x, "y": y}
+                for index, (x, y) in enumerate(self.vertices.tolist())
+            ],
+            "triangles": self.triangles.tolist(),
+            "triangleRegionIds": [
+                None if region_id == MISSING_REGION_ID else region_id
+                for region_id in region_ids
+            ],
+            "triangleResistivityValues": [
+                None if rho != rho else rho for rho in rho_values
+            ],
+            "regionResistivity": [
+                {"regionId": region_id, "rho": rho}
+                for region_id, rho in zip(
+                    self.region_ids.tolist(), self.region_resistivity_values.tolist()
+                )
+            ],
+        }
+
+    def to_buffers(self, vertex_dtype: Any = np.float64) -> Dict[str, np.ndarray]:
+        """Return flat little-endian typed-array buffers for binary transfer."""
+
+        vertex_type = np.dtype(vertex_dtype).newbyteorder("<")
+        return {
+            "vertices": self.vertices.astype(vertex_type).reshape(-1),
+            "triangles": self.triangles.astype("<u4").reshape(-1),
+            "triangleRegionIds": self.triangle_region_ids.astype("<i4"),
+            "triangleResistivityValues": self.triangle_resistivity_values.astype("<f4"),
+            "regionIds": self.region_ids.astype("<i4"),
+            "regionResistivity": self.region_resistivity_values.astype("<f8"),
+        }
+
+
+def build_triangle_mesh_arrays(
+    points: Any,
+    triangles: Any,
+    triangle_region_ids: Any,
+    triangle_resistivity_values: Any,
+    region_ids: Optional[Sequence[int]] = None,
+    region_resistivity_values: Optional[Sequence[float]] = None,
+) -> TriangleMeshArrays:
+    """Pack mesh columns, using `MISSING_REGION_ID` and NaN for missing values."""
+
+    return TriangleMeshArrays(
+        vertices=np.asarray(points, dtype=np.float64).reshape(-1, 2),
+        triangles=np.asarray(triangles, dtype=np.int64).reshape(-1, 3),
+        triangle_region_ids=np.asarray(triangle_region_ids, dtype=np.int64).reshape(-1),
+        triangle_resistivity_values=np.asarray(
+            triangle_resistivity_values, dtype=np.float64
+        ).reshape(-1),
+        region_ids=np.asarray(region_ids if region_ids is not None else [], dtype=np.int64),
+        region_resistivity_values=np.asarray(
+            region_resistivity_values if region_resistivity_values is not None else [],
+            dtype=np.float64,
+        ),
+    )
+
+
+def map_triangle_source_region_ids(
+    poly_parser: Any,
+    regions: Optional[List[Dict[str, Any]]],
+) -> np.ndarray:
+    """Return the source `.poly` region id of every triangle of the last triangulation.
+
+    Triangles outside every seeded region get `MISSING_REGION_ID`.
+    """
+
+    triangle_count = len(poly_parser.tri_output["triangles"])
+    if not regions:
+        return np.full(triangle_count, MISSING_REGION_ID, dtype=np.int64)
+
+    triangle_region_numbers, region_index = poly_parser.get_triangle_regions(regions)
+    region_numbers = np.asarray(triangle_region_numbers, dtype=np.int64)
+    source_region_ids = np.array(
+        [MISSING_REGION_ID]
+        + [
+            int(regions[int(index)].get("attribute") or regions[int(index)]["id"])
+            for index in region_index
+        ],
+        dtype=np.int64,
+    )
+    valid = (region_numbers > 0) & (region_numbers - 1 < len(region_index))
+    return np.where(valid, source_region_ids[np.where(valid, region_numbers, 0)], MISSING_REGION_ID)
+
+
+def _padding(length: int) -> int:
+    return (-length) % _BUFFER_ALIGNMENT
+
+
+def encode_binary_mesh_payload(
+    payload: Dict[str, Any],
+    mesh_key: str,
+    mesh: TriangleMeshArrays,
+    vertex_dtype: Any = np.float64,
+) -> bytes:
+    """Encode a JSON payload whose `mesh_key` entry is sent as packed buffers."""
+
+    buffers = mesh.to_buffers(vertex_dtype)
+    descriptors: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, values in buffers.items():
+        descriptors[name] = {
+            "type": _TYPED_ARRAY_NAMES[values.dtype],
+            "byteOffset": offset,
+            "length": int(values.size),
+        }
+        offset += values.nbytes + _padding(values.nbytes)
+
+    header_payload = dict(payload)
+    header_payload[mesh_key] = {
+        "vertexCount": mesh.vertex_count,
+        "triangleCount": mesh.triangle_count,
+        "regionCount": int(len(mesh.region_ids)),
+        "missingRegionId": MISSING_REGION_ID,
+        "buffers": descriptors,
+    }
+    header = json.dumps(
+        {"version": MESH_BINARY_VERSION, "meshKey": mesh_key, "payload": header_payload},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header += b" " * _padding(len(MESH_BINARY_MAGIC) + 4 + len(header))
+
+    chunks = [MESH_BINARY_MAGIC, struct.pack("<I", len(header)), header]
+    for values in buffers.values():
+        chunks.append(values.tobytes())
+        chunks.append(b"\0" * _padding(values.nbytes))
+    return b"".join(chunks)
+
+
+def decode_binary_mesh_payload(body: bytes) -> Dict[str, Any]:
+    """Decode a binary mesh payload back into its header and numpy buffers."""
+
+    if body[: len(MESH_BINARY_MAGIC)] != MESH_BINARY_MAGIC:
+        raise ValueError("Not a binary mesh payload")
+    (header_length,) = struct.unpack_from("<I", body, len(MESH_BINARY_MAGIC))
+    data_start = len(MESH_BINARY_MAGIC) + 4 + header_length
+    header = json.loads(body[len(MESH_BINARY_MAGIC) + 4 : data_start].decode("utf-8"))
+
+    dtype_by_name = {name: dtype for dtype, name in _TYPED_ARRAY_NAMES.items()}
+    mesh_descriptor = header["payload"][header["meshKey"]]
+    arrays = {
+        name: np.frombuffer(
+            body,
+            dtype=dtype_by_name[descriptor["type"]],
+            count=descriptor["length"],
+            offset=data_start + descriptor["byteOffset"],
+        )
+        for name, descriptor in mesh_descriptor["buffers"].items()
+    }
+    return {"header": header, "arrays": arrays}
@@ -1,12 +1,38 @@
+import heapq
 import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
-
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from boundary_chains import simplify_chains, trace_boundary_chains
+from resistivity_table import (
+    RegionResistivityColumns,
+    find_table_column,
+    read_region_resistivity_columns,
+)
+from triangle_edge_table import TriangleEdgeTable, build_triangle_edge_table
+from triangle_mesh_transfer import (
+    MISSING_REGION_ID,
+    TriangleMeshArrays,
+    build_triangle_mesh_arrays,
+    map_triangle_source_region_ids,
+)
 
 Point = Tuple[float, float]
 Triangle = Tuple[int, int, int]
 
+# Upper bound on parameter sets evaluated by one sweep request.
+MAX_SWEEP_PARAMETER_SETS = 64
+
 
 class ResegmentationError(ValueError):
     """Raised when resegmentation input cannot produce a valid model."""
@@ -32,6 +58,20 @@ class ResegmentationParameters:
     boundary_tolerance: float
     minimum_region_area: float
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "roi": {
+                "yMin": self.roi.y_min,
+                "yMax": self.roi.y_max,
+                "zMin": self.roi.z_min,
+                "zMax": self.roi.z_max,
+            },
+            "rhoLevels": list(self.rho_levels),
+            "onlyFreeParameters": self.only_free_parameters,
+            "boundaryTolerance": self.boundary_tolerance,
+            "minimumRegionArea": self.minimum_region_area,
+        }
+
 
 @dataclass(frozen=True)
 class RegionResistivityMetadata:
@@ -53,6 +93,55 @@ class TriangleAssignment:
     source_region_id: Optional[int]
 
 
+@dataclass(frozen=True, eq=False)
+class TriangleClassification:
+    """Columnar triangle classification.
+
+    `label_codes` index into `labels`; equal codes mean equal labels. Missing
+    rho values are NaN and missing source regions are `MISSING_REGION_ID`.
+    """
+
+    active: np.ndarray
+    label_codes: np.ndarray
+    labels: List[str]
+    rho: np.ndarray
+    source_region_ids: np.ndarray
+
+    def __len__(self) -> int:
+        return int(len(self.active))
+
+    def assignment(self, triangle_index: int) -> TriangleAssignment:
+        """Return the classification of one triangle as a `TriangleAssignment`."""
+
+        active = bool(self.active[triangle_index])
+        rho = float(self.rho[triangle_index])
+        region_id = int(self.source_region_ids[triangle_index])
+        return TriangleAssignment(
+            active,
+            self.labels[int(self.label_codes[triangle_index])],
+            None if math.isnan(rho) else rho,
+            "resegmented" if active else "preserved",
+            None if region_id == MISSING_REGION_ID else region_id,
+        )
+
+    def to_assignments(self) -> List[TriangleAssignment]:
+        """Return one `TriangleAssignment` per triangle."""
+
+        return [self.assignment(index) for index in range(len(self))]
+
+
+@dataclass(frozen=True, eq=False)
+class ResegmentationSource:
+    """Triangulated source model shared by every parameter set of a sweep."""
+
+    points: List[Point]
+    triangles: List[Triangle]
+    edge_table: TriangleEdgeTable
+    triangle_region_ids: np.ndarray
+    holes: List[Dict[str, Any]]
+    parsed_resistivity: Dict[str, Any]
+
+
 @dataclass
 class Component:
     """Connected set of triangles that will become one output region."""
@@ -75,14 +164,9 @@ def _as_float(value: Any, field_name: str) -> float:
     return number
 
 
-def _normalize_column_name(name: Any) -> str:
-    return str(name).strip().lower().replace("_", "").replace("-", "")
+def parse_resegmentation_roi(roi_payload: Any) -> RectangularRoi:
+    """Parse and validate a rectangular ROI from API JSON."""
 
-
-def parse_resegmentation_parameters(payload: Dict[str, Any]) -> ResegmentationParameters:
-    """Parse and validate resegmentation parameters from API JSON."""
-
-    roi_payload = payload.get("roi")
     if not isinstance(roi_payload, dict):
         raise ResegmentationError("roi is required")
 
@@ -95,6 +179,13 @@ def parse_resegmentation_parameters(payload: Dict[str, Any]) -> ResegmentationPa
         raise ResegmentationError("roi.yMin must be less than roi.yMax")
     if z_min >= z_max:
         raise ResegmentationError("roi.zMin must be less than roi.zMax")
+    return RectangularRoi(y_min=y_min, y_max=y_max, z_min=z_min, z_max=z_max)
+
+
+def parse_resegmentation_parameters(payload: Dict[str, Any]) -> ResegmentationParameters:
+    """Parse and validate resegmentation parameters from API JSON."""
+
+    roi = parse_resegmentation_roi(payload.get("roi"))
 
     raw_levels = payload.get("rhoLevels")
     if not isinstance(raw_levels, list) or not raw_levels:
@@ -120,7 +211,7 @@ def parse_resegmentation_parameters(payload: Dict[str, Any]) -> ResegmentationPa
         raise ResegmentationError("minimumRegionArea must be non-negative")
 
     return ResegmentationParameters(
-        roi=RectangularRoi(y_min=y_min, y_max=y_max, z_min=z_min, z_max=z_max),
+        roi=roi,
         rho_levels=sorted(rho_levels),
         only_free_parameters=bool(payload.get("onlyFreeParameters", True)),
         boundary_tolerance=boundary_tolerance,
@@ -128,19 +219,14 @@ def parse_resegmentation_parameters(payload: Dict[str, Any]) -> ResegmentationPa
     )
 
 
-def _find_table_column(columns: Iterable[Any], candidates: Sequence[str]) -> Any:
-    normalized_candidates = {_normalize_column_name(candidate) for candidate in candidates}
-    for column in columns:
-        if _normalize_column_name(column) in normalized_candidates:
-            return column
-    return None
-
-
-def build_region_metadata_lookup(
+def build_region_metadata_columns(
     parsed_resistivity: Dict[str, Any],
     require_param: bool,
-) -> Dict[int, RegionResistivityMetadata]:
-    """Build source region rho/Param lookup from a parsed MARE2DEM table."""
+) -> RegionResistivityColumns:
+    """Build source region rho/Param columns from a parsed MARE2DEM table.
+
+    Only regions with a finite rho are kept.
+    """
 
     table = parsed_resistivity.get("table")
     if table is None:
@@ -148,9 +234,9 @@ def build_region_metadata_lookup(
     if len(table.columns) == 0:
         raise ResegmentationError("No resistivity table columns found")
 
-    region_column = _find_table_column(table.columns, ["region", "#", "!#"])
-    rho_column = _find_table_column(table.columns, ["rho", "rho-z", "rho_h", "rho-h"])
-    param_column = _find_table_column(table.columns, ["param", "parameter"])
+    region_column = find_table_column(table.columns, ["region", "#", "!#"])
+    rho_column = find_table_column(table.columns, ["rho", "rho-z", "rho_h", "rho-h"])
+    param_column = find_table_column(table.columns, ["param", "parameter"])
 
     if region_column is None:
         region_column = table.columns[0]
@@ -159,20 +245,51 @@ def build_region_metadata_lookup(
     if require_param and param_column is None:
         raise ResegmentationError("Param column is required for free-parameter masking")
 
-    lookup: Dict[int, RegionResistivityMetadata] = {}
-    for _, row in table.iterrows():
-        try:
-            region_id = int(float(row[region_column]))
-            rho = float(row[rho_column])
-            param = float(row[param_column]) if param_column is not None else None
-        except (TypeError, ValueError):
-            continue
-        if math.isfinite(rho):
-            lookup[region_id] = RegionResistivityMetadata(region_id, rho, param)
-
-    if not lookup:
+    columns = read_region_resistivity_columns(table, region_column, rho_column, param_column)
+    finite = np.isfinite(columns.rho)
+    if not finite.any():
         raise ResegmentationError("No valid region rho rows found")
-    return lookup
+    return RegionResistivityColumns(
+        region_ids=columns.region_ids[finite],
+        rho=columns.rho[finite],
+        param=None if columns.param is None else columns.param[finite],
+    )
+
+
+def build_region_metadata_lookup(
+    parsed_resistivity: Dict[str, Any],
+    require_param: bool,
+) -> Dict[int, RegionResistivityMetadata]:
+    """Build source region rho/Param lookup from a parsed MARE2DEM table."""
+
+    columns = build_region_metadata_columns(parsed_resistivity, require_param)
+    params = [None] * len(columns) if columns.param is None else columns.param.tolist()
+    return {
+        region_id: RegionResistivityMetadata(region_id, rho, param)
+        for region_id, rho, param in zip(columns.region_ids.tolist(), columns.rho.tolist(), params)
+    }
+
+
+def _as_region_metadata_columns(
+    metadata: Union[RegionResistivityColumns, Dict[int, RegionResistivityMetadata]],
+) -> RegionResistivityColumns:
+    if isinstance(metadata, RegionResistivityColumns):
+        return metadata
+    region_ids = np.array(sorted(metadata), dtype=np.int64)
+    return RegionResistivityColumns(
+        region_ids=region_ids,
+        rho=np.array(
+            [float(metadata[region_id].rho) for region_id in region_ids.tolist()],
+            dtype=np.float64,
+        ),
+        param=np.array(
+            [
+                0.0 if metadata[region_id].param is None else float(metadata[region_id].param)
+                for region_id in region_ids.tolist()
+            ],
+            dtype=np.float64,
+        ),
+    )
 
 
 def compute_triangle_centroid(points: Sequence[Point], triangle: Triangle) -> Point:
@@ -214,181 +331,302 @@ def assign_nearest_rho_level(rho: float, rho_levels: Sequence[float]) -> float:
     return min(rho_levels, key=lambda level: abs(log_rho - math.log10(level)))
 
 
-def build_triangle_assignments(
-    points: Sequence[Point],
-    triangles: Sequence[Triangle],
-    triangle_region_ids: Sequence[Optional[int]],
-    metadata_by_region: Dict[int, RegionResistivityMetadata],
-    parameters: ResegmentationParameters,
-) -> Tuple[List[TriangleAssignment], Dict[str, int], List[str]]:
-    """Classify each triangle into an active rho level or preserved region."""
+def assign_nearest_rho_levels(rho: np.ndarray, rho_levels: Sequence[float]) -> np.ndarray:
+    """Vectorized `assign_nearest_rho_level` for finite positive rho values.
 
-    assignments: List[TriangleAssignment] = []
-    warnings: List[str] = []
-    active_count = 0
-    invalid_rho_count = 0
-    missing_metadata_count = 0
-
-    for triangle_index, triangle in enumerate(triangles):
-        region_id = triangle_region_ids[triangle_index]
-        metadata = metadata_by_region.get(region_id) if region_id is not None else None
-        centroid = compute_triangle_centroid(points, triangle)
-        in_roi = is_point_in_roi(centroid, parameters.roi)
-
-        if metadata is None:
-            missing_metadata_count += 1
-            assignments.append(
-                TriangleAssignment(False, f"missing:{triangle_index}", None, "preserved", region_id)
-            )
-            continue
+    Levels are snapped with a sorted search in log10 space; ties go to the
+    lower level.
+    """
 
-        finite_positive_rho = metadata.rho > 0 and math.isfinite(metadata.rho)
-        free_parameter = (
-            not parameters.only_free_parameters
-            or (metadata.param is not None and metadata.param > 0)
-        )
+    levels = np.sort(np.asarray(rho_levels, dtype=np.float64))
+    rho = np.asarray(rho, dtype=np.float64)
+    if len(levels) == 1:
+        return np.full(rho.shape, levels[0])
+    log_levels = np.log10(levels)
+    log_rho = np.log10(rho)
+    upper = np.clip(np.searchsorted(log_levels, log_rho), 1, len(levels) - 1)
+    lower = upper - 1
+    use_lower = np.abs(log_rho - log_levels[lower]) <= np.abs(log_rho - log_levels[upper])
+    return levels[np.where(use_lower, lower, upper)]
 
-        if in_roi and free_parameter and finite_positive_rho:
-            level = assign_nearest_rho_level(metadata.rho, parameters.rho_levels)
-            active_count += 1
-            assignments.append(
-                TriangleAssignment(
-                    True,
-                    f"level:{level:g}",
-                    level,
-                    "resegmented",
-                    region_id,
-                )
-            )
-            continue
 
-        if not finite_positive_rho:
-            invalid_rho_count += 1
-        assignments.append(
-            TriangleAssignment(
-                False,
-                f"source:{region_id}",
-                metadata.rho if finite_positive_rho else None,
-                "preserved",
-                region_id,
-            )
+def _region_id_array(triangle_region_ids: Any) -> np.ndarray:
+    if isinstance(triangle_region_ids, np.ndarray):
+        return triangle_region_ids.astype(np.int64, copy=False)
+    return np.array(
+        [MISSING_REGION_ID if region_id is None else region_id for region_id in triangle_region_ids],
+        dtype=np.int64,
+    )
+
+
+def compute_triangle_areas(points: Any, triangles: Any) -> np.ndarray:
+    """Return absolute areas for all triangles."""
+
+    point_array = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    corners = point_array[np.asarray(triangles, dtype=np.int64).reshape(-1, 3)]
+    first, second, third = corners[:, 0], corners[:, 1], corners[:, 2]
+    return np.abs(
+        (
+            first[:, 0] * (second[:, 1] - third[:, 1])
+            + second[:, 0] * (third[:, 1] - first[:, 1])
+            + third[:, 0] * (first[:, 1] - second[:, 1])
         )
+        / 2
+    )
 
+
+def compute_triangle_centroids(points: Any, triangles: Any) -> np.ndarray:
+    """Return `(n, 2)` centroids for all triangles."""
+
+    point_array = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    corners = point_array[np.asarray(triangles, dtype=np.int64).reshape(-1, 3)]
+    return (corners[:, 0] + corners[:, 1] + corners[:, 2]) / 3
+
+
+def triangle_roi_mask(centroids: np.ndarray, roi: RectangularRoi) -> np.ndarray:
+    """Return whether each centroid is inside or on the rectangular ROI."""
+
+    return (
+        (roi.y_min <= centroids[:, 0])
+        & (centroids[:, 0] <= roi.y_max)
+        & (roi.z_min <= centroids[:, 1])
+        & (centroids[:, 1] <= roi.z_max)
+    )
+
+
+def classify_triangles(
+    points: Any,
+    triangles: Any,
+    triangle_region_ids: Any,
+    metadata_by_region: Union[RegionResistivityColumns, Dict[int, RegionResistivityMetadata]],
+    parameters: ResegmentationParameters,
+    in_roi: Optional[np.ndarray] = None,
+) -> Tuple[TriangleClassification, Dict[str, int], List[str]]:
+    """Classify all triangles at once into active rho levels or preserved regions.
+
+    A triangle is active when its centroid is inside the ROI, its source region
+    is a free parameter (when required) and the region rho is finite and
+    positive. Region metadata is evaluated once per region id and broadcast.
+    A precomputed `in_roi` mask replaces the centroid test of `parameters.roi`.
+    """
+
+    region_ids = _region_id_array(triangle_region_ids)
+    triangle_count = len(region_ids)
+    if in_roi is None:
+        in_roi = triangle_roi_mask(compute_triangle_centroids(points, triangles), parameters.roi)
+
+    # Per-region metadata columns, looked up by sorted region id
+    metadata = _as_region_metadata_columns(metadata_by_region)
+    known_rho = np.append(metadata.rho, np.nan)
+    known_param = np.append(
+        np.zeros(len(metadata)) if metadata.param is None else metadata.param, 0.0
+    )
+    positions = metadata.positions(region_ids)
+    has_metadata = (positions >= 0) & (region_ids != MISSING_REGION_ID)
+    # Triangles without metadata point at the trailing NaN/0 sentinel entries
+    positions[~has_metadata] = len(metadata)
+
+    region_rho = known_rho[positions]
+    finite_positive_rho = np.isfinite(region_rho) & (region_rho > 0)
+    free_parameter = has_metadata
+    if parameters.only_free_parameters:
+        free_parameter = has_metadata & (known_param[positions] > 0)
+    active = in_roi & free_parameter & finite_positive_rho
+
+    rho = np.where(finite_positive_rho, region_rho, np.nan)
+    level_indices = np.zeros(triangle_count, dtype=np.int64)
+    levels = np.sort(np.asarray(parameters.rho_levels, dtype=np.float64))
+    if active.any():
+        rho[active] = assign_nearest_rho_levels(rho[active], levels)
+        level_indices[active] = np.searchsorted(levels, rho[active])
+
+    # Labels: 0 = rho level, 1 = preserved source region, 2 = missing metadata
+    kinds = np.where(active, 0, np.where(has_metadata, 1, 2))
+    keys = np.where(
+        active,
+        level_indices,
+        np.where(has_metadata, region_ids, np.arange(triangle_count, dtype=np.int64)),
+    )
+    key_offset = int(keys.min()) if triangle_count else 0
+    key_span = int(keys.max()) - key_offset + 1 if triangle_count else 1
+    label_keys, label_codes = np.unique(
+        kinds * key_span + (keys - key_offset), return_inverse=True
+    )
+    label_prefixes = ("level", "source", "missing")
+    labels = []
+    for label_key in label_keys.tolist():
+        kind, key = divmod(label_key, key_span)
+        key += key_offset
+        labels.append(f"level:{levels[key]:g}" if kind == 0 else f"{label_prefixes[kind]}:{key}")
+
+    missing_metadata_count = int(triangle_count - has_metadata.sum())
+    invalid_rho_count = int((has_metadata & ~finite_positive_rho).sum())
+    warnings: List[str] = []
     if missing_metadata_count:
         warnings.append(f"{missing_metadata_count} triangles had no source region metadata")
     if invalid_rho_count:
         warnings.append(f"{invalid_rho_count} triangles had invalid source rho")
 
+    classification = TriangleClassification(
+        active=active,
+        label_codes=label_codes.reshape(-1).astype(np.int32),
+        labels=labels,
+        rho=rho,
+        source_region_ids=region_ids,
+    )
     return (
-        assignments,
+        classification,
         {
-            "sourceTriangleCount": len(triangles),
-            "activeTriangleCount": active_count,
+            "sourceTriangleCount": triangle_count,
+            "activeTriangleCount": int(active.sum()),
         },
         warnings,
     )
 
 
-def _triangle_edges(triangle: Triangle) -> List[Tuple[int, int]]:
-    return [
-        tuple(sorted((triangle[0], triangle[1]))),
-        tuple(sorted((triangle[1], triangle[2]))),
-        tuple(sorted((triangle[2], triangle[0]))),
-    ]
-
-
-def _edge_length(points: Sequence[Point], edge: Tuple[int, int]) -> float:
-    first, second = points[edge[0]], points[edge[1]]
-    return math.hypot(first[0] - second[0], first[1] - second[1])
+def build_triangle_assignments(
+    points: Sequence[Point],
+    triangles: Sequence[Triangle],
+    triangle_region_ids: Sequence[Optional[int]],
+    metadata_by_region: Dict[int, RegionResistivityMetadata],
+    parameters: ResegmentationParameters,
+) -> Tuple[List[TriangleAssignment], Dict[str, int], List[str]]:
+    """Classify each triangle into an active rho level or preserved region."""
 
+    classification, stats, warnings = classify_triangles(
+        points, triangles, triangle_region_ids, metadata_by_region, parameters
+    )
+    return classification.to_assignments(), stats, warnings
+
+
+def _as_classification(
+    assignments: Union[TriangleClassification, Sequence[TriangleAssignment]],
+) -> TriangleClassification:
+    if isinstance(assignments, TriangleClassification):
+        return assignments
+
+    codes_by_label: Dict[str, int] = {}
+    label_codes = [codes_by_label.setdefault(item.label, len(codes_by_label)) for item in assignments]
+    return TriangleClassification(
+        active=np.array([item.active for item in assignments], dtype=bool),
+        label_codes=np.array(label_codes, dtype=np.int32),
+        labels=list(codes_by_label),
+        rho=np.array(
+            [np.nan if item.rho is None else item.rho for item in assignments],
+            dtype=np.float64,
+        ),
+        source_region_ids=_region_id_array([item.source_region_id for item in assignments]),
+    )
 
-def _build_triangle_neighbors(triangles: Sequence[Triangle]) -> Dict[int, List[int]]:
-    edge_to_triangles: Dict[Tuple[int, int], List[int]] = {}
-    for triangle_index, triangle in enumerate(triangles):
-        for edge in _triangle_edges(triangle):
-            edge_to_triangles.setdefault(edge, []).append(triangle_index)
 
-    neighbors = {index: [] for index in range(len(triangles))}
-    for adjacent_triangles in edge_to_triangles.values():
-        if len(adjacent_triangles) == 2:
-            first, second = adjacent_triangles
-            neighbors[first].append(second)
-            neighbors[second].append(first)
-    return neighbors
+def _resolve_edge_table(
+    triangles: Sequence[Triangle],
+    edge_table: Optional[TriangleEdgeTable],
+) -> TriangleEdgeTable:
+    if edge_table is not None:
+        return edge_table
+    return build_triangle_edge_table(triangles)
 
 
 def build_connected_components(
     points: Sequence[Point],
     triangles: Sequence[Triangle],
-    assignments: Sequence[TriangleAssignment],
+    assignments: Union[TriangleClassification, Sequence[TriangleAssignment]],
+    edge_table: Optional[TriangleEdgeTable] = None,
 ) -> Tuple[List[Component], List[int]]:
-    """Build same-label connected components from triangle assignments."""
-
-    neighbors = _build_triangle_neighbors(triangles)
-    visited = set()
-    components: List[Component] = []
-    component_by_triangle = [0] * len(triangles)
-    next_component_id = 1
-
-    for triangle_index, assignment in enumerate(assignments):
-        if triangle_index in visited:
-            continue
-
-        stack = [triangle_index]
-        visited.add(triangle_index)
-        triangle_indices: List[int] = []
-
-        while stack:
-            current = stack.pop()
-            triangle_indices.append(current)
-            for neighbor in neighbors[current]:
-                if neighbor in visited:
-                    continue
-                if assignments[neighbor].label != assignment.label:
-                    continue
-                visited.add(neighbor)
-                stack.append(neighbor)
-
-        area = sum(compute_triangle_area(points, triangles[index]) for index in triangle_indices)
-        rho = assignment.rho if assignment.rho is not None else 1.0
-        component = Component(
-            next_component_id,
-            assignment.label,
+    """Build same-label connected components from triangle assignments.
+
+    Accepts either a `TriangleClassification` or a list of assignments.
+    Labels are compared through their integer codes, only same-label
+    neighbors are kept in a sparse graph and components are labeled in one
+    compiled pass. Component ids follow the lowest triangle index of each
+    component, and the label, rho and source kind come from that triangle.
+    """
+
+    classification = _as_classification(assignments)
+    triangle_count = len(classification)
+    if not triangle_count:
+        return [], []
+
+    table = _resolve_edge_table(triangles, edge_table)
+    pairs = table.neighbor_pairs()
+    label_codes = classification.label_codes
+    pairs = pairs[label_codes[pairs[:, 0]] == label_codes[pairs[:, 1]]]
+    graph = coo_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(triangle_count, triangle_count),
+    )
+    _, graph_labels = connected_components(graph, directed=False)
+
+    # Renumber so component ids increase with their first triangle index.
+    _, first_triangles = np.unique(graph_labels, return_index=True)
+    rank = np.empty(len(first_triangles), dtype=np.int64)
+    rank[np.argsort(first_triangles)] = np.arange(len(first_triangles))
+    component_ids = rank[graph_labels] + 1
+    first_triangles = np.sort(first_triangles)
+
+    areas = np.bincount(
+        component_ids,
+        weights=compute_triangle_areas(points, triangles),
+        minlength=len(first_triangles) + 1,
+    )
+    members = np.argsort(component_ids, kind="stable")
+    boundaries = np.cumsum(np.bincount(component_ids, minlength=len(first_triangles) + 1))
+
+    first_rho = classification.rho[first_triangles]
+    components = [
+        Component(
+            component_id,
+            classification.labels[label_code],
             rho,
-            assignment.source_kind,
-            sorted(triangle_indices),
+            "resegmented" if active else "preserved",
+            members[boundaries[component_id - 1] : boundaries[component_id]].tolist(),
             area,
         )
-        components.append(component)
-        for index in triangle_indices:
-            component_by_triangle[index] = next_component_id
-        next_component_id += 1
+        for component_id, label_code, rho, active, area in zip(
+            range(1, len(first_triangles) + 1),
+            label_codes[first_triangles].tolist(),
+            np.where(np.isnan(first_rho), 1.0, first_rho).tolist(),
+            classification.active[first_triangles].tolist(),
+            areas[1:].tolist(),
+        )
+    ]
 
-    return components, component_by_triangle
+    return components, component_ids.tolist()
 
 
 def compute_component_adjacency(
     points: Sequence[Point],
     triangles: Sequence[Triangle],
     component_by_triangle: Sequence[int],
+    edge_table: Optional[TriangleEdgeTable] = None,
+    edge_indices: Optional[np.ndarray] = None,
 ) -> Dict[int, Dict[int, float]]:
-    """Return component adjacency weighted by shared boundary length."""
-
-    edge_to_triangles: Dict[Tuple[int, int], List[int]] = {}
-    for triangle_index, triangle in enumerate(triangles):
-        for edge in _triangle_edges(triangle):
-            edge_to_triangles.setdefault(edge, []).append(triangle_index)
+    """Return component adjacency weighted by shared boundary length.
+
+    With `edge_indices`, only those edges are counted, which is complete for
+    components whose triangles all use one of the given edges.
+    """
+
+    table = _resolve_edge_table(triangles, edge_table)
+    if edge_indices is None:
+        interior_edges = np.flatnonzero(table.interior_mask)
+    else:
+        edge_indices = np.asarray(edge_indices, dtype=np.int64)
+        interior_edges = edge_indices[table.triangle_counts[edge_indices] == 2]
+    triangle_pairs = table.edge_triangles[interior_edges]
+    component_array = np.asarray(component_by_triangle, dtype=np.int64)
+    first_components = component_array[triangle_pairs[:, 0]]
+    second_components = component_array[triangle_pairs[:, 1]]
+    crossing = first_components != second_components
+    lengths = table.edge_lengths(points, interior_edges[crossing])
 
     adjacency: Dict[int, Dict[int, float]] = {}
-    for edge, adjacent_triangles in edge_to_triangles.items():
-        if len(adjacent_triangles) != 2:
-            continue
-        first_triangle, second_triangle = adjacent_triangles
-        first_component = component_by_triangle[first_triangle]
-        second_component = component_by_triangle[second_triangle]
-        if first_component == second_component:
-            continue
-        length = _edge_length(points, edge)
+    for first_component, second_component, length in zip(
+        first_components[crossing].tolist(),
+        second_components[crossing].tolist(),
+        lengths.tolist(),
+    ):
         adjacency.setdefault(first_component, {})
         adjacency.setdefault(second_component, {})
         adjacency[first_component][second_component] = (
@@ -418,15 +656,122 @@ def _choose_merge_target(
     return min(candidates, key=score)
 
 
+def _merge_component_adjacency(
+    adjacency: Dict[int, Dict[int, float]],
+    source_id: int,
+    target_id: int,
+) -> None:
+    """Fold the shared boundaries of `source_id` into `target_id` in place."""
+
+    source_neighbors = adjacency.pop(source_id, {})
+    target_neighbors = adjacency.setdefault(target_id, {})
+    target_neighbors.pop(source_id, None)
+    for neighbor_id, length in source_neighbors.items():
+        if neighbor_id == target_id:
+            continue
+        neighbor = adjacency[neighbor_id]
+        del neighbor[source_id]
+        target_neighbors[neighbor_id] = target_neighbors.get(neighbor_id, 0) + length
+        neighbor[target_id] = neighbor.get(target_id, 0) + length
+    if not target_neighbors:
+        del adjacency[target_id]
+
+
+def _find_merge_root(merged_into: Dict[int, int], component_id: int) -> int:
+    """Follow `merged_into` to the surviving component, halving the path."""
+
+    while component_id in merged_into:
+        parent = merged_into[component_id]
+        grandparent = merged_into.get(parent)
+        if grandparent is not None:
+            merged_into[component_id] = grandparent
+        component_id = parent
+    return component_id
+
+
+def merge_queued_components(
+    components_by_id: Dict[int, Component],
+    component_by_triangle: np.ndarray,
+    adjacency: Dict[int, Dict[int, float]],
+    candidate_ids: Sequence[int],
+    minimum_area: float,
+) -> Tuple[List[str], int]:
+    """Merge undersized candidates, smallest area first, updating state in place.
+
+    Ties keep the order of `candidate_ids`. A target that is still undersized
+    after a merge is queued again when it is itself a candidate. Merges are
+    recorded in a union-find map while the queue drains; triangle lists and
+    `component_by_triangle` are rewritten once per surviving target afterwards.
+
+    Returns:
+        tuple: (warnings, merge_count)
+    """
+
+    warnings: List[str] = []
+    merged_into: Dict[int, int] = {}
+    absorbed: List[Component] = []
+    order_by_id = {component_id: order for order, component_id in enumerate(candidate_ids)}
+    queue = [
+        (components_by_id[component_id].area, order, component_id)
+        for component_id, order in order_by_id.items()
+        if components_by_id[component_id].area < minimum_area
+    ]
+    heapq.heapify(queue)
+
+    while queue:
+        area, _, component_id = heapq.heappop(queue)
+        component = components_by_id.get(component_id)
+        if component is None or component.area != area:
+            continue
+
+        target_id = _choose_merge_target(component, components_by_id, adjacency)
+        if target_id is None:
+            warnings.append(
+                f"Component {component.component_id} is below minimum area but has no adjacent merge target"
+            )
+            break
+
+        target = components_by_id[target_id]
+        target.area += component.area
+        merged_into[component_id] = target_id
+        absorbed.append(component)
+        del components_by_id[component_id]
+        _merge_component_adjacency(adjacency, component_id, target_id)
+        if target.area < minimum_area and target_id in order_by_id:
+            heapq.heappush(queue, (target.area, order_by_id[target_id], target_id))
+
+    absorbed_by_target: Dict[int, List[Component]] = {}
+    for component in absorbed:
+        target_id = _find_merge_root(merged_into, component.component_id)
+        absorbed_by_target.setdefault(target_id, []).append(component)
+    for target_id, sources in absorbed_by_target.items():
+        target = components_by_id[target_id]
+        source_indices = np.concatenate(
+            [np.asarray(component.triangle_indices, dtype=np.int64) for component in sources]
+        )
+        component_by_triangle[source_indices] = target_id
+        target.triangle_indices = np.sort(
+            np.concatenate((np.asarray(target.triangle_indices, dtype=np.int64), source_indices))
+        ).tolist()
+
+    return warnings, len(absorbed)
+
+
 def merge_small_components(
     points: Sequence[Point],
     triangles: Sequence[Triangle],
     components: Sequence[Component],
     minimum_area: float,
+    edge_table: Optional[TriangleEdgeTable] = None,
 ) -> Tuple[List[Component], List[int], List[str], int]:
-    """Merge undersized components into adjacent compatible components."""
+    """Merge undersized components into adjacent compatible components.
 
-    component_by_triangle = [0] * len(triangles)
+    The component adjacency graph is built once; undersized components are
+    taken from a priority queue (smallest area first) and shared boundary
+    lengths are updated locally after each merge (see `merge_queued_components`).
+    """
+
+    component_by_triangle = np.zeros(len(triangles), dtype=np.int64)
     components_by_id = {
         component.component_id: Component(
             component.component_id,
@@ -439,47 +784,25 @@ def merge_small_components(
         for component in components
     }
     for component in components_by_id.values():
-        for triangle_index in component.triangle_indices:
-            component_by_triangle[triangle_index] = component.component_id
+        component_by_triangle[component.triangle_indices] = component.component_id
 
     if minimum_area <= 0:
-        return list(components_by_id.values()), component_by_triangle, [], 0
-
-    warnings: List[str] = []
-    merge_count = 0
-
-    while True:
-        small_components = sorted(
-            [
-                component
-                for component in components_by_id.values()
-                if component.area < minimum_area
-            ],
-            key=lambda component: component.area,
-        )
-        if not small_components:
-            break
+        return list(components_by_id.values()), component_by_triangle.tolist(), [], 0
 
-        component = small_components[0]
-        adjacency = compute_component_adjacency(points, triangles, component_by_triangle)
-        target_id = _choose_merge_target(component, components_by_id, adjacency)
-        if target_id is None:
-            warnings.append(
-                f"Component {component.component_id} is below minimum area but has no adjacent merge target"
-            )
-            break
-
-        target = components_by_id[target_id]
-        target.triangle_indices = sorted(target.triangle_indices + component.triangle_indices)
-        target.area += component.area
-        for triangle_index in component.triangle_indices:
-            component_by_triangle[triangle_index] = target_id
-        del components_by_id[component.component_id]
-        merge_count += 1
+    adjacency = compute_component_adjacency(
+        points, triangles, component_by_triangle, edge_table
+    )
+    warnings, merge_count = merge_queued_components(
+        components_by_id,
+        component_by_triangle,
+        adjacency,
+        list(components_by_id),
+        minimum_area,
+    )
 
     return (
         sorted(components_by_id.values(), key=lambda component: component.component_id),
-        component_by_triangle,
+        component_by_triangle.tolist(),
         warnings,
         merge_count,
     )
@@ -530,140 +853,53 @@ def _component_lookup(components: Sequence[Component]) -> Dict[int, Component]:
     return {component.component_id: component for component in components}
 
 
-def _build_boundary_edges(
+def _boundary_edge_groups(
     triangles: Sequence[Triangle],
     component_by_triangle: Sequence[int],
-) -> List[Tuple[int, int, bool]]:
-    edge_to_triangles: Dict[Tuple[int, int], List[int]] = {}
-    for triangle_index, triangle in enumerate(triangles):
-        for edge in _triangle_edges(triangle):
-            edge_to_triangles.setdefault(edge, []).append(triangle_index)
-
-    outer_edges: List[Tuple[int, int, bool]] = []
-    internal_edges: List[Tuple[int, int, bool]] = []
-
-    for edge, adjacent_triangles in edge_to_triangles.items():
-        if len(adjacent_triangles) == 1:
-            outer_edges.append((edge[0], edge[1], False))
-            continue
-        if len(adjacent_triangles) == 2:
-            first, second = adjacent_triangles
-            if component_by_triangle[first] != component_by_triangle[second]:
-                internal_edges.append((edge[0], edge[1], True))
-
-    return sorted(outer_edges) + sorted(internal_edges)
-
-
-def _point_line_distance(point: Point, start: Point, end: Point) -> float:
-    dx = end[0] - start[0]
-    dy = end[1] - start[1]
-    if dx == 0 and dy == 0:
-        return math.hypot(point[0] - start[0], point[1] - start[1])
-    numerator = abs(dy * point[0] - dx * point[1] + end[0] * start[1] - end[1] * start[0])
-    denominator = math.hypot(dx, dy)
-    return numerator / denominator
-
-
-def _simplify_path_indices(
-    path: Sequence[int],
-    points: Sequence[Point],
-    tolerance: float,
-) -> List[int]:
-    if len(path) <= 2 or tolerance <= 0:
-        return list(path)
-
-    start = points[path[0]]
-    end = points[path[-1]]
-    max_distance = -1.0
-    max_index = 0
-
-    for index in range(1, len(path) - 1):
-        distance = _point_line_distance(points[path[index]], start, end)
-        if distance > max_distance:
-            max_distance = distance
-            max_index = index
-
-    if max_distance > tolerance:
-        left = _simplify_path_indices(path[: max_index + 1], points, tolerance)
-        right = _simplify_path_indices(path[max_index:], points, tolerance)
-        return left[:-1] + right
-
-    return [path[0], path[-1]]
+    edge_table: Optional[TriangleEdgeTable] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return outer and inter-component edges with their boundary group.
+
+    Outer edges are grouped by their component and internal edges by the
+    component pair they separate.
+
+    Returns:
+        tuple: `(edges, groups, internal, group_internal)` with `(k, 2)` sorted
+            vertex pairs, `(k,)` group ids and internal flags in edge table
+            order, and whether each group is keyed by a component pair.
+    """
+
+    table = _resolve_edge_table(triangles, edge_table)
+    component_array = np.asarray(component_by_triangle, dtype=np.int64)
+    first_components = component_array[table.edge_triangles[:, 0]]
+    second_components = np.where(
+        table.edge_triangles[:, 1] >= 0,
+        component_array[np.maximum(table.edge_triangles[:, 1], 0)],
+        0,
+    )
+    is_internal = table.interior_mask & (first_components != second_components)
+    selected = np.flatnonzero(table.boundary_mask | is_internal)
+
+    internal = is_internal[selected]
+    first_components = first_components[selected]
+    second_components = second_components[selected]
+    pair_low = np.where(internal, np.minimum(first_components, second_components), 0)
+    pair_high = np.where(internal, np.maximum(first_components, second_components), first_components)
+    group_pairs, groups = np.unique(
+        np.column_stack((pair_low, pair_high)), axis=0, return_inverse=True
+    )
+    return table.edges[selected], groups.reshape(-1), internal, group_pairs[:, 0] != 0
 
 
-def _boundary_edge_records(
-    triangles: Sequence[Triangle],
-    component_by_triangle: Sequence[int],
-) -> List[Tuple[int, int, Tuple[int, int], bool]]:
-    edge_to_triangles: Dict[Tuple[int, int], List[int]] = {}
-    for triangle_index, triangle in enumerate(triangles):
-        for edge in _triangle_edges(triangle):
-            edge_to_triangles.setdefault(edge, []).append(triangle_index)
-
-    records: List[Tuple[int, int, Tuple[int, int], bool]] = []
-    for edge, adjacent_triangles in edge_to_triangles.items():
-        if len(adjacent_triangles) == 1:
-            component = component_by_triangle[adjacent_triangles[0]]
-            records.append((edge[0], edge[1], (0, component), False))
-            continue
-        if len(adjacent_triangles) == 2:
-            first, second = adjacent_triangles
-            first_component = component_by_triangle[first]
-            second_component = component_by_triangle[second]
-            if first_component != second_component:
-                pair = tuple(sorted((first_component, second_component)))
-                records.append((edge[0], edge[1], pair, True))
-    return records
-
-
-def _trace_boundary_chains(edges: Sequence[Tuple[int, int]]) -> List[List[int]]:
-    adjacency: Dict[int, List[int]] = {}
-    for first, second in edges:
-        adjacency.setdefault(first, []).append(second)
-        adjacency.setdefault(second, []).append(first)
-
-    visited_edges = set()
-    chains: List[List[int]] = []
-    starts = sorted([node for node, neighbors in adjacency.items() if len(neighbors) != 2])
-    if not starts and adjacency:
-        starts = [min(adjacency)]
-
-    def edge_key(first: int, second: int) -> Tuple[int, int]:
-        return tuple(sorted((first, second)))
-
-    def trace(start: int, first_neighbor: int) -> List[int]:
-        path = [start]
-        previous = start
-        current = first_neighbor
-        visited_edges.add(edge_key(start, first_neighbor))
-
-        while True:
-            path.append(current)
-            if current == start:
-                break
-            next_candidates = [
-                neighbor
-                for neighbor in adjacency[current]
-                if neighbor != previous and edge_key(current, neighbor) not in visited_edges
-            ]
-            if len(adjacency[current]) != 2 or not next_candidates:
-                break
-            next_node = next_candidates[0]
-            visited_edges.add(edge_key(current, next_node))
-            previous, current = current, next_node
-        return path
-
-    for start in starts:
-        for neighbor in sorted(adjacency.get(start, [])):
-            if edge_key(start, neighbor) in visited_edges:
-                continue
-            chains.append(trace(start, neighbor))
-
-    for first, second in edges:
-        if edge_key(first, second) not in visited_edges:
-            chains.append(trace(first, second))
-
-    return chains
+def _sorted_boundary_edges(
+    first: np.ndarray,
+    second: np.ndarray,
+    internal: np.ndarray,
+) -> List[Tuple[int, int, bool]]:
+    low = np.minimum(first, second)
+    high = np.maximum(first, second)
+    order = np.lexsort((high, low, internal))
+    return list(zip(low[order].tolist(), high[order].tolist(), internal[order].tolist()))
 
 
 def _simplify_boundary_edges(
@@ -671,34 +907,44 @@ def _simplify_boundary_edges(
     triangles: Sequence[Triangle],
     component_by_triangle: Sequence[int],
     tolerance: float,
+    edge_table: Optional[TriangleEdgeTable] = None,
 ) -> List[Tuple[int, int, bool]]:
-    records = _boundary_edge_records(triangles, component_by_triangle)
-    if tolerance <= 0:
-        return sorted(
-            [(first, second, is_internal) for first, second, _, is_internal in records],
-            key=lambda edge: (edge[2], edge[0], edge[1]),
-        )
+    edges, groups, internal, group_internal = _boundary_edge_groups(
+        triangles, component_by_triangle, edge_table
+    )
+    if tolerance <= 0 or not len(edges):
+        return _sorted_boundary_edges(edges[:, 0], edges[:, 1], internal)
+
+    # Open chains are simplified; closed loops keep all of their edges.
+    path, offsets, chain_groups, open_edges = trace_boundary_chains(edges, groups)
+    if isinstance(points, np.ndarray):
+        path_points = points[path]
+    else:
+        path_points = np.array([points[index] for index in path.tolist()], dtype=np.float64)
+    keep = simplify_chains(path_points, offsets, tolerance)
+    kept = np.flatnonzero(keep)
+    chain_of = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))[kept]
+    consecutive = np.flatnonzero(chain_of[:-1] == chain_of[1:])
+    first = np.concatenate((path[kept[consecutive]], edges[~open_edges, 0]))
+    second = np.concatenate((path[kept[consecutive + 1]], edges[~open_edges, 1]))
+    is_internal = group_internal[
+        np.concatenate((chain_groups[chain_of[consecutive]], groups[~open_edges]))
+    ]
 
-    records_by_pair: Dict[Tuple[int, int], List[Tuple[int, int, bool]]] = {}
-    for first, second, pair, is_internal in records:
-        records_by_pair.setdefault(pair, []).append((first, second, is_internal))
-
-    simplified_edges: List[Tuple[int, int, bool]] = []
-    for pair, pair_records in records_by_pair.items():
-        chains = _trace_boundary_chains([(first, second) for first, second, _ in pair_records])
-        is_internal = pair[0] != 0
-        for chain in chains:
-            is_closed = len(chain) > 2 and chain[0] == chain[-1]
-            simplified_chain = (
-                chain if is_closed else _simplify_path_indices(chain, points, tolerance)
+    distinct = first != second
+    unique_edges = np.unique(
+        np.column_stack(
+            (
+                is_internal[distinct],
+                np.minimum(first, second)[distinct],
+                np.maximum(first, second)[distinct],
             )
-            for index in range(len(simplified_chain) - 1):
-                first = simplified_chain[index]
-                second = simplified_chain[index + 1]
-                if first != second:
-                    simplified_edges.append(tuple(sorted((first, second))) + (is_internal,))
-
-    return sorted(set(simplified_edges), key=lambda edge: (edge[2], edge[0], edge[1]))
+        ),
+        axis=0,
+    )
+    return _sorted_boundary_edges(
+        unique_edges[:, 1], unique_edges[:, 2], unique_edges[:, 0].astype(bool)
+    )
 
 
 def build_poly_text(
@@ -708,12 +954,13 @@ def build_poly_text(
     component_by_triangle: Sequence[int],
     holes: Sequence[Dict[str, Any]],
     boundary_tolerance: float = 0,
+    edge_table: Optional[TriangleEdgeTable] = None,
 ) -> Tuple[str, Dict[str, int], List[str]]:
     """Build a MARE2DEM `.poly` text payload from final region components."""
 
     warnings: List[str] = []
     boundary_edges = _simplify_boundary_edges(
-        points, triangles, component_by_triangle, boundary_tolerance
+        points, triangles, component_by_triangle, boundary_tolerance, edge_table
     )
     if not boundary_edges:
         warnings.append("Boundary extraction produced no segments")
@@ -761,46 +1008,46 @@ def build_poly_text(
     return "\n".join(lines) + "\n", stats, warnings
 
 
-def serialize_preview_mesh(
+def build_preview_mesh_arrays(
     points: Sequence[Point],
     triangles: Sequence[Triangle],
     components: Sequence[Component],
     component_by_triangle: Sequence[int],
-) -> Dict[str, Any]:
-    """Serialize final component labels using the existing constrained mesh shape."""
+) -> TriangleMeshArrays:
+    """Pack final component labels as columnar preview mesh arrays."""
 
     components_by_id = _component_lookup(components)
-    sorted_component_ids = sorted(components_by_id)
-    output_region_id_by_component = {
-        component_id: index for index, component_id in enumerate(sorted_component_ids, start=1)
-    }
+    sorted_component_ids = np.array(sorted(components_by_id), dtype=np.int64)
+    component_rho = np.array(
+        [float(components_by_id[component_id].rho) for component_id in sorted_component_ids.tolist()],
+        dtype=np.float64,
+    )
+    output_region_ids = np.arange(1, len(sorted_component_ids) + 1, dtype=np.int64)
 
-    triangle_region_ids = [
-        output_region_id_by_component[component_id]
-        for component_id in component_by_triangle
-    ]
-    triangle_rho_values = [
-        float(components_by_id[component_id].rho)
-        for component_id in component_by_triangle
-    ]
-    region_resistivity = [
-        {
-            "regionId": output_region_id_by_component[component_id],
-            "rho": float(components_by_id[component_id].rho),
-        }
-        for component_id in sorted_component_ids
-    ]
+    component_positions = np.searchsorted(
+        sorted_component_ids, np.asarray(component_by_triangle, dtype=np.int64)
+    )
+    return build_triangle_mesh_arrays(
+        points,
+        triangles,
+        output_region_ids[component_positions],
+        component_rho[component_positions],
+        output_region_ids,
+        component_rho,
+    )
 
-    return {
-        "vertices": [
-            {"id": index, "x": float(point[0]), "y": float(point[1])}
-            for index, point in enumerate(points)
-        ],
-        "triangles": [[int(a), int(b), int(c)] for a, b, c in triangles],
-        "triangleRegionIds": triangle_region_ids,
-        "triangleResistivityValues": triangle_rho_values,
-        "regionResistivity": region_resistivity,
-    }
+
+def serialize_preview_mesh(
+    points: Sequence[Point],
+    triangles: Sequence[Triangle],
+    components: Sequence[Component],
+    component_by_triangle: Sequence[int],
+) -> Dict[str, Any]:
+    """Serialize final component labels using the existing constrained mesh shape."""
+
+    return build_preview_mesh_arrays(
+        points, triangles, components, component_by_triangle
+    ).to_json_mesh()
 
 
 def _serialize_triangulation_vertices(mesh_vertices: Dict[int, Dict[str, float]]) -> List[Point]:
@@ -810,37 +1057,15 @@ def _serialize_triangulation_vertices(mesh_vertices: Dict[int, Dict[str, float]]
     ]
 
 
-def _map_triangle_region_ids(poly_parser: Any, regions: Optional[List[Dict[str, Any]]]) -> List[Optional[int]]:
-    triangle_count = len(poly_parser.tri_output["triangles"])
-    triangle_region_ids: List[Optional[int]] = [None] * triangle_count
-
-    if not regions:
-        return triangle_region_ids
-
-    triangle_region_numbers, region_index = poly_parser.get_triangle_regions(regions)
-    for triangle_index, region_number in enumerate(triangle_region_numbers):
-        region_number = int(region_number)
-        if region_number <= 0 or region_number - 1 >= len(region_index):
-            continue
-        original_region = regions[int(region_index[region_number - 1])]
-        original_region_id = original_region.get("attribute") or original_region["id"]
-        triangle_region_ids[triangle_index] = int(original_region_id)
-
-    return triangle_region_ids
-
-
-def build_resegmentation_result(
+def prepare_resegmentation_source(
     poly_parser: Any,
     vertices: Dict[int, Dict[str, Any]],
     segments: Sequence[Dict[str, Any]],
     holes: Sequence[Dict[str, Any]],
     regions: Optional[List[Dict[str, Any]]],
     parsed_resistivity: Dict[str, Any],
-    parameters: ResegmentationParameters,
-    output_poly_file_name: str,
-    include_export_text: bool,
-) -> Dict[str, Any]:
-    """Build preview/export payloads for a source model and parameters."""
+) -> ResegmentationSource:
+    """Triangulate a source model once and map triangles to source regions."""
 
     if holes:
         raise ResegmentationError(
@@ -850,49 +1075,98 @@ def build_resegmentation_result(
     raw_triangles, mesh_vertices, _ = poly_parser.create_constrained_delaunay(
         vertices, segments
     )
-    points = _serialize_triangulation_vertices(mesh_vertices)
-    triangles = [tuple(int(value) for value in triangle) for triangle in raw_triangles]
-    triangle_region_ids = _map_triangle_region_ids(poly_parser, regions)
-    metadata = build_region_metadata_lookup(
-        parsed_resistivity, require_param=parameters.only_free_parameters
+    return ResegmentationSource(
+        points=_serialize_triangulation_vertices(mesh_vertices),
+        triangles=[tuple(int(value) for value in triangle) for triangle in raw_triangles],
+        edge_table=poly_parser.get_edge_table(),
+        triangle_region_ids=map_triangle_source_region_ids(poly_parser, regions),
+        holes=list(holes),
+        parsed_resistivity=parsed_resistivity,
+    )
+
+
+def _run_resegmentation_stages(
+    source: ResegmentationSource,
+    parameters: ResegmentationParameters,
+) -> Tuple[List[Component], List[int], str, Dict[str, int], List[str]]:
+    """Run classify, component, merge and boundary stages for one parameter set."""
+
+    points = source.points
+    triangles = source.triangles
+    edge_table = source.edge_table
+    metadata = build_region_metadata_columns(
+        source.parsed_resistivity, require_param=parameters.only_free_parameters
     )
 
-    assignments, assignment_stats, assignment_warnings = build_triangle_assignments(
-        points, triangles, triangle_region_ids, metadata, parameters
+    classification, assignment_stats, assignment_warnings = classify_triangles(
+        np.asarray(points, dtype=np.float64),
+        np.asarray(triangles, dtype=np.int64),
+        source.triangle_region_ids,
+        metadata,
+        parameters,
     )
     if assignment_stats["activeTriangleCount"] == 0:
         raise ResegmentationError("No active triangles found in the selected ROI")
 
     components, component_by_triangle = build_connected_components(
-        points, triangles, assignments
+        points, triangles, classification, edge_table
     )
     components, component_by_triangle, merge_warnings, merge_count = merge_small_components(
         points,
         triangles,
         components,
         parameters.minimum_region_area,
+        edge_table,
     )
     poly_text, poly_stats, poly_warnings = build_poly_text(
         points,
         triangles,
         components,
         component_by_triangle,
-        holes,
+        source.holes,
         parameters.boundary_tolerance,
+        edge_table,
     )
 
-    preview_mesh = serialize_preview_mesh(
-        points, triangles, components, component_by_triangle
-    )
     stats = {
         **assignment_stats,
         **poly_stats,
         "mergedComponentCount": merge_count,
     }
     warnings = assignment_warnings + merge_warnings + poly_warnings
+    return components, component_by_triangle, poly_text, stats, warnings
 
+
+def build_resegmentation_result(
+    poly_parser: Any,
+    vertices: Dict[int, Dict[str, Any]],
+    segments: Sequence[Dict[str, Any]],
+    holes: Sequence[Dict[str, Any]],
+    regions: Optional[List[Dict[str, Any]]],
+    parsed_resistivity: Dict[str, Any],
+    parameters: ResegmentationParameters,
+    output_poly_file_name: str,
+    include_export_text: bool,
+    mesh_as_arrays: bool = False,
+) -> Dict[str, Any]:
+    """Build preview/export payloads for a source model and parameters.
+
+    With `mesh_as_arrays`, `previewMesh` is returned as `TriangleMeshArrays`
+    so the caller can choose the transfer encoding.
+    """
+
+    source = prepare_resegmentation_source(
+        poly_parser, vertices, segments, holes, regions, parsed_resistivity
+    )
+    components, component_by_triangle, poly_text, stats, warnings = (
+        _run_resegmentation_stages(source, parameters)
+    )
+
+    preview_mesh = build_preview_mesh_arrays(
+        source.points, source.triangles, components, component_by_triangle
+    )
     result: Dict[str, Any] = {
-        "previewMesh": preview_mesh,
+        "previewMesh": preview_mesh if mesh_as_arrays else preview_mesh.to_json_mesh(),
         "stats": stats,
         "warnings": warnings,
     }
@@ -913,3 +1187,148 @@ def build_resegmentation_result(
         )
 
     return result
+
+
+def parse_resegmentation_parameter_sets(payload: Any) -> List[ResegmentationParameters]:
+    """Parse a non-empty list of resegmentation parameter payloads for a sweep."""
+
+    if not isinstance(payload, list) or not payload:
+        raise ResegmentationError("parameterSets must contain at least one entry")
+    if len(payload) > MAX_SWEEP_PARAMETER_SETS:
+        raise ResegmentationError(
+            f"parameterSets may contain at most {MAX_SWEEP_PARAMETER_SETS} entries"
+        )
+
+    parameter_sets = []
+    for index, item in enumerate(payload):
+        if not isinstance(item, dict):
+            raise ResegmentationError(f"parameterSets[{index}] must be an object")
+        try:
+            parameter_sets.append(parse_resegmentation_parameters(item))
+        except ResegmentationError as exc:
+            raise ResegmentationError(f"parameterSets[{index}]: {exc}") from exc
+    return parameter_sets
+
+
+# Size of the sweep process pool shared by all requests.
+SWEEP_POOL_WORKERS = max(1, min(4, os.cpu_count() or 1))
+_SWEEP_POOL: Optional[ProcessPoolExecutor] = None
+_SWEEP_POOL_LOCK = threading.Lock()
+
+
+def _get_sweep_pool() -> ProcessPoolExecutor:
+    """Return the shared sweep pool, starting it on first use.
+
+    Workers are spawned rather than forked, so they never inherit the threads
+    of the web server; frozen builds need `multiprocessing.freeze_support()`
+    in their entry point.
+    """
+
+    global _SWEEP_POOL
+    with _SWEEP_POOL_LOCK:
+        if _SWEEP_POOL is None:
+            _SWEEP_POOL = ProcessPoolExecutor(
+                max_workers=SWEEP_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _SWEEP_POOL
+
+
+def _discard_sweep_pool(pool: ProcessPoolExecutor) -> None:
+    global _SWEEP_POOL
+    with _SWEEP_POOL_LOCK:
+        if _SWEEP_POOL is pool:
+            _SWEEP_POOL = None
+    pool.shutdown(wait=False)
+
+
+def _sweep_entry(
+    source: ResegmentationSource,
+    index: int,
+    parameters: ResegmentationParameters,
+) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {"index": index, "parameters": parameters.to_dict()}
+    try:
+        _, _, _, stats, warnings = _run_resegmentation_stages(source, parameters)
+    except ResegmentationError as exc:
+        entry.update({"stats": None, "warnings": [], "error": str(exc)})
+    else:
+        entry.update({"stats": stats, "warnings": warnings, "error": None})
+    return entry
+
+
+def _run_sweep_task(
+    task: Tuple[ResegmentationSource, int, ResegmentationParameters],
+) -> Dict[str, Any]:
+    return _sweep_entry(*task)
+
+
+def run_resegmentation_sweep(
+    source: ResegmentationSource,
+    parameter_sets: Sequence[ResegmentationParameters],
+    preview_index: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Evaluate several parameter sets against one triangulated source model.
+
+    Each set runs the classify, component, merge and boundary stages; only its
+    stats and warnings are returned. With `max_workers` other than 1 the sets
+    go to the shared sweep pool (`SWEEP_POOL_WORKERS` processes) in one chunk
+    per worker, so the source model is pickled once per chunk. The preview
+    mesh is built for `preview_index` only, in the calling process.
+
+    Returns:
+        dict: `results` (one entry per set, in input order), `previewIndex`
+            and `previewMesh` (`TriangleMeshArrays` or None).
+    """
+
+    if preview_index is not None and not 0 <= preview_index < len(parameter_sets):
+        raise ResegmentationError("previewIndex is out of range")
+
+    tasks = [
+        (source, index, parameters)
+        for index, parameters in enumerate(parameter_sets)
+        if index != preview_index
+    ]
+    results: Dict[int, Dict[str, Any]] = {}
+    preview_mesh = None
+    pool = None
+    try:
+        if tasks and max_workers != 1 and SWEEP_POOL_WORKERS > 1 and len(parameter_sets) > 1:
+            pool = _get_sweep_pool()
+            chunk_size = -(-len(tasks) // SWEEP_POOL_WORKERS)
+            pending = pool.map(_run_sweep_task, tasks, chunksize=chunk_size)
+        else:
+            pending = (_sweep_entry(*task) for task in tasks)
+
+        if preview_index is not None:
+            parameters = parameter_sets[preview_index]
+            entry: Dict[str, Any] = {
+                "index": preview_index,
+                "parameters": parameters.to_dict(),
+            }
+            try:
+                components, component_by_triangle, _, stats, warnings = (
+                    _run_resegmentation_stages(source, parameters)
+                )
+            except ResegmentationError as exc:
+                entry.update({"stats": None, "warnings": [], "error": str(exc)})
+            else:
+                entry.update({"stats": stats, "warnings": warnings, "error": None})
+                preview_mesh = build_preview_mesh_arrays(
+                    source.points, source.triangles, components, component_by_triangle
+                )
+            results[preview_index] = entry
+
+        for entry in pending:
+            results[entry["index"]] = entry
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next request.
+        _discard_sweep_pool(pool)
+        raise
+
+    return {
+        "results": [results[index] for index in range(len(parameter_sets))],
+        "previewIndex": preview_index,
+        "previewMesh": preview_mesh,
+    }
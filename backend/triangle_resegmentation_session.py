@@ -0,0 +1,348 @@
+import threading
+from dataclasses import replace
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from lru_store import LruStore
+from triangle_mesh_transfer import TriangleMeshArrays, build_triangle_mesh_arrays
+from triangle_model_resegmentation import (
+    Component,
+    RectangularRoi,
+    ResegmentationError,
+    ResegmentationParameters,
+    ResegmentationSource,
+    TriangleClassification,
+    build_connected_components,
+    build_region_metadata_columns,
+    classify_triangles,
+    compute_component_adjacency,
+    compute_triangle_areas,
+    compute_triangle_centroids,
+    merge_queued_components,
+    merge_small_components,
+    triangle_roi_mask,
+)
+
+
+class ResegmentationPreviewSession:
+    """Resegmentation preview state that is updated incrementally as the ROI moves.
+
+    Only triangles whose centroid enters or leaves the ROI can change
+    classification. An ROI update relabels the components that contain or
+    border those triangles, merges the undersized pieces and reports the
+    triangles whose region or rho changed. Region ids are session component
+    ids; the piece of a rebuilt component that keeps the most of its
+    triangles keeps its id, so only genuinely new pieces get fresh ids.
+    """
+
+    def __init__(self, source: ResegmentationSource, parameters: ResegmentationParameters):
+        self.source = source
+        self.parameters = parameters
+        self._lock = threading.Lock()
+
+        points = np.asarray(source.points, dtype=np.float64)
+        triangles = np.asarray(source.triangles, dtype=np.int64)
+        self._points = points
+        self._centroids = compute_triangle_centroids(points, triangles)
+        self._areas = compute_triangle_areas(points, triangles)
+
+        # Neighbor triangle across each local edge, or -1 on the outer boundary.
+        table = source.edge_table
+        self._triangle_edge_indices = table.triangle_edge_indices
+        edge_triangles = table.edge_triangles[self._triangle_edge_indices]
+        self._triangle_neighbors = np.where(
+            edge_triangles[:, :, 0] == np.arange(len(triangles))[:, None],
+            edge_triangles[:, :, 1],
+            edge_triangles[:, :, 0],
+        )
+
+        # Classify every triangle once as if inside and once as if outside the
+        # ROI; any later ROI only picks between the two.
+        metadata = build_region_metadata_columns(
+            source.parsed_resistivity, require_param=parameters.only_free_parameters
+        )
+        inside, _, self.warnings = classify_triangles(
+            points,
+            triangles,
+            source.triangle_region_ids,
+            metadata,
+            parameters,
+            in_roi=np.ones(len(triangles), dtype=bool),
+        )
+        outside, _, _ = classify_triangles(
+            points,
+            triangles,
+            source.triangle_region_ids,
+            metadata,
+            parameters,
+            in_roi=np.zeros(len(triangles), dtype=bool),
+        )
+        self._labels: List[str] = list(dict.fromkeys(inside.labels + outside.labels))
+        self._code_by_label = {label: code for code, label in enumerate(self._labels)}
+        self._eligible = inside.active
+        self._inside_codes = np.array(
+            [self._code_by_label[label] for label in inside.labels], dtype=np.int32
+        )[inside.label_codes]
+        self._outside_codes = np.array(
+            [self._code_by_label[label] for label in outside.labels], dtype=np.int32
+        )[outside.label_codes]
+        self._inside_rho = np.where(np.isnan(inside.rho), 1.0, inside.rho)
+        self._outside_rho = np.where(np.isnan(outside.rho), 1.0, outside.rho)
+        self._source_region_ids = inside.source_region_ids
+
+        self.in_roi = triangle_roi_mask(self._centroids, parameters.roi)
+        self._active_count = int((self._eligible & self.in_roi).sum())
+        if not self._active_count:
+            raise ResegmentationError("No active triangles found in the selected ROI")
+
+        active = self._eligible & self.in_roi
+        classification = TriangleClassification(
+            active=active,
+            label_codes=np.where(active, self._inside_codes, self._outside_codes),
+            labels=self._labels,
+            rho=np.where(active, inside.rho, outside.rho),
+            source_region_ids=self._source_region_ids,
+        )
+        components, component_by_triangle = build_connected_components(
+            source.points, source.triangles, classification, source.edge_table
+        )
+        components, component_by_triangle, merge_warnings, self.merged_component_count = (
+            merge_small_components(
+                source.points,
+                source.triangles,
+                components,
+                parameters.minimum_region_area,
+                source.edge_table,
+            )
+        )
+        self.warnings = self.warnings + merge_warnings
+        self.components: Dict[int, Component] = {
+            component.component_id: component for component in components
+        }
+        self.component_by_triangle = np.asarray(component_by_triangle, dtype=np.int64)
+        self._next_component_id = max(self.components) + 1
+
+    def _component_rho(self, component_ids: np.ndarray) -> np.ndarray:
+        unique_ids, inverse = np.unique(component_ids, return_inverse=True)
+        rho = np.array(
+            [self.components[component_id].rho for component_id in unique_ids.tolist()],
+            dtype=np.float64,
+        )
+        return rho[inverse.reshape(-1)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sourceTriangleCount": int(len(self.component_by_triangle)),
+            "activeTriangleCount": self._active_count,
+            "regionCount": len(self.components),
+        }
+
+    def preview_mesh(self) -> TriangleMeshArrays:
+        """Return the current preview mesh, with session component ids as region ids."""
+
+        with self._lock:
+            region_ids = sorted(self.components)
+            return build_triangle_mesh_arrays(
+                self.source.points,
+                self.source.triangles,
+                self.component_by_triangle,
+                self._component_rho(self.component_by_triangle),
+                region_ids,
+                [self.components[component_id].rho for component_id in region_ids],
+            )
+
+    def _relabel(
+        self,
+        local: np.ndarray,
+        previous_ids: np.ndarray,
+        active: np.ndarray,
+    ) -> Tuple[List[Component], np.ndarray]:
+        """Split the sorted `local` triangles into same-label components.
+
+        Each previous component id is kept by the piece of the same label that
+        holds most of its triangles; the other pieces get fresh ids. Pieces
+        are returned in order of their first triangle, with the id of every
+        local triangle.
+        """
+
+        label_codes = np.where(active, self._inside_codes[local], self._outside_codes[local])
+        neighbors = self._triangle_neighbors[local]
+        positions = np.minimum(np.searchsorted(local, neighbors), len(local) - 1)
+        rows = np.repeat(np.arange(len(local)), 3).reshape(-1, 3)
+        keep = (
+            (neighbors >= 0)
+            & (local[positions] == neighbors)
+            & (label_codes[positions] == label_codes[:, None])
+        )
+        graph = coo_matrix(
+            (np.ones(int(keep.sum()), dtype=np.int8), (rows[keep], positions[keep])),
+            shape=(len(local), len(local)),
+        )
+        _, graph_labels = connected_components(graph, directed=False)
+
+        _, first_positions = np.unique(graph_labels, return_index=True)
+        order = np.argsort(first_positions)
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        pieces = rank[graph_labels]
+        first_positions = first_positions[order]
+        piece_codes = label_codes[first_positions]
+
+        # Hand previous ids to the largest same-label overlap first.
+        stride = int(previous_ids.max()) + 1
+        overlap_keys, overlap_counts = np.unique(
+            pieces * stride + previous_ids, return_counts=True
+        )
+        piece_ids = np.full(len(first_positions), -1, dtype=np.int64)
+        kept_ids = set()
+        for overlap_key in overlap_keys[np.argsort(-overlap_counts, kind="stable")].tolist():
+            piece, previous_id = divmod(overlap_key, stride)
+            if piece_ids[piece] >= 0 or previous_id in kept_ids:
+                continue
+            if self._code_by_label[self.components[previous_id].label] != piece_codes[piece]:
+                continue
+            piece_ids[piece] = previous_id
+            kept_ids.add(previous_id)
+        fresh = np.flatnonzero(piece_ids < 0)
+        piece_ids[fresh] = np.arange(len(fresh)) + self._next_component_id
+        self._next_component_id += len(fresh)
+
+        areas = np.bincount(pieces, weights=self._areas[local])
+        members = np.argsort(pieces, kind="stable")
+        boundaries = np.concatenate(([0], np.cumsum(np.bincount(pieces))))
+        first_triangles = local[first_positions]
+        first_active = active[first_positions]
+        first_rho = np.where(
+            first_active,
+            self._inside_rho[first_triangles],
+            self._outside_rho[first_triangles],
+        )
+        components = [
+            Component(
+                component_id,
+                self._labels[label_code],
+                rho,
+                "resegmented" if is_active else "preserved",
+                local[members[boundaries[piece] : boundaries[piece + 1]]].tolist(),
+                area,
+            )
+            for piece, (component_id, label_code, rho, is_active, area) in enumerate(
+                zip(
+                    piece_ids.tolist(),
+                    piece_codes.tolist(),
+                    first_rho.tolist(),
+                    first_active.tolist(),
+                    areas.tolist(),
+                )
+            )
+        ]
+        return components, piece_ids[pieces]
+
+    def update_roi(self, roi: RectangularRoi) -> Dict[str, Any]:
+        """Move the ROI and return a patch of the triangles that changed.
+
+        Returns:
+            dict: `triangleIndices`, `triangleRegionIds` and
+                `triangleResistivityValues` of changed triangles,
+                `regionResistivity` of the regions those triangles now use,
+                `removedRegionIds`, `stats` and `warnings`.
+        """
+
+        with self._lock:
+            in_roi = triangle_roi_mask(self._centroids, roi)
+            changed = np.flatnonzero((in_roi != self.in_roi) & self._eligible)
+            entered = int(in_roi[changed].sum())
+            active_count = self._active_count + entered - (len(changed) - entered)
+            if not active_count:
+                raise ResegmentationError("No active triangles found in the selected ROI")
+            self.in_roi = in_roi
+            self._active_count = active_count
+            self.parameters = replace(self.parameters, roi=roi)
+
+            removed_ids: List[int] = []
+            warnings: List[str] = []
+            merge_count = 0
+            patch_indices = np.zeros(0, dtype=np.int64)
+            if len(changed):
+                # Components holding or bordering a changed triangle are rebuilt.
+                neighbors = self._triangle_neighbors[changed]
+                touched = np.unique(
+                    np.concatenate(
+                        (
+                            self.component_by_triangle[changed],
+                            self.component_by_triangle[neighbors[neighbors >= 0]],
+                        )
+                    )
+                ).tolist()
+                local = np.sort(
+                    np.concatenate(
+                        [
+                            np.asarray(self.components[component_id].triangle_indices, dtype=np.int64)
+                            for component_id in touched
+                        ]
+                    )
+                )
+                previous_ids = self.component_by_triangle[local].copy()
+                previous_rho = self._component_rho(previous_ids)
+
+                pieces, piece_by_triangle = self._relabel(
+                    local, previous_ids, self._eligible[local] & in_roi[local]
+                )
+                for component_id in touched:
+                    del self.components[component_id]
+                for component in pieces:
+                    self.components[component.component_id] = component
+                self.component_by_triangle[local] = piece_by_triangle
+
+                if self.parameters.minimum_region_area > 0:
+                    adjacency = compute_component_adjacency(
+                        self._points,
+                        self.source.triangles,
+                        self.component_by_triangle,
+                        self.source.edge_table,
+                        edge_indices=np.unique(self._triangle_edge_indices[local]),
+                    )
+                    warnings, merge_count = merge_queued_components(
+                        self.components,
+                        self.component_by_triangle,
+                        adjacency,
+                        [component.component_id for component in pieces],
+                        self.parameters.minimum_region_area,
+                    )
+
+                current_ids = self.component_by_triangle[local]
+                differs = (current_ids != previous_ids) | (
+                    self._component_rho(current_ids) != previous_rho
+                )
+                patch_indices = local[differs]
+                removed_ids = [
+                    component_id for component_id in touched if component_id not in self.components
+                ]
+
+            patch_ids = self.component_by_triangle[patch_indices]
+            return {
+                "triangleIndices": patch_indices.tolist(),
+                "triangleRegionIds": patch_ids.tolist(),
+                "triangleResistivityValues": self._component_rho(patch_ids).tolist(),
+                "regionResistivity": [
+                    {"regionId": component_id, "rho": self.components[component_id].rho}
+                    for component_id in np.unique(patch_ids).tolist()
+                ],
+                "removedRegionIds": removed_ids,
+                "stats": {
+                    **self.stats(),
+                    "changedTriangleCount": int(len(changed)),
+                    "mergedComponentCount": merge_count,
+                },
+                "warnings": warnings,
+            }
+
+
+class ResegmentationSessionCache(LruStore[ResegmentationPreviewSession]):
+    """Small thread-safe LRU store of preview sessions keyed by generated ids."""
+
+    def __init__(self, max_entries: int = 4):
+        super().__init__(max_entries)
\ No newline at end of file
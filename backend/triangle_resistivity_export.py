@@ -1,9 +1,19 @@
+import io
 import json
 import math
+import os
 import re
+import zipfile
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lru_store import LruStore
+
+
+# Upper bound on scenarios exported by one batch request.
+MAX_RESISTIVITY_SCENARIOS = 256
 
 
 class ResistivityExportError(ValueError):
@@ -19,6 +29,8 @@ class _TableLayout:
 _REGION_HEADERS = {"#", "region", "region#", "region-id", "regionid"}
 _RHO_HEADERS = {"rho", "rho-z", "rho_h", "rho-h"}
 _LINE_ENDING_PATTERN = re.compile(r"(\r\n|\n|\r)$")
+_SCENARIO_NAME_PATTERN = re.compile(r"[^A-Za-z0-9_.-]+")
+_TABLE_HEADER_LINE_PATTERN = re.compile(r"^[^\S\r\n]*!#[^\r\n]*", re.MULTILINE)
 
 
 def _normalize_header_token(token: str) -> str:
@@ -180,3 +192,211 @@ def build_exported_resistivity_text(
         raise ResistivityExportError("No matching regions found in resistivity file.")
 
     return "".join(output_lines)
+
+
+@dataclass(frozen=True, eq=False)
+class IndexedResistivitySource:
+    """A .resistivity text with the character span of every region row's Rho token.
+
+    `rho_spans` maps a region id to the `(start, end)` offsets of its Rho
+    token in `text`, one per table row with that id.
+    """
+
+    text: str
+    file_name: str
+    rho_spans: Dict[int, Tuple[Tuple[int, int], ...]]
+
+
+def _row_token_pattern(layout: _TableLayout) -> "re.Pattern[str]":
+    """Match the leading tokens of table rows up to the region and Rho columns.
+
+    Tokens stop at `!`, so a row whose inline comment starts before the
+    needed columns does not match, as with `_replace_row_rho`.
+    """
+    token_count = max(layout.region_column_index, layout.rho_column_index) + 1
+    return re.compile(
+        r"^[^\S\r\n]*" + r"[^\S\r\n]+".join([r"([^\s!]+)"] * token_count),
+        re.MULTILINE,
+    )
+
+
+def index_resistivity_source(
+    source_text: str,
+    file_name: str = "model.resistivity",
+) -> IndexedResistivitySource:
+    """Locate the Rho token of every region row once, for repeated exports."""
+    spans: Dict[int, List[Tuple[int, int]]] = {}
+    sections = []
+    for header in _TABLE_HEADER_LINE_PATTERN.finditer(source_text):
+        layout = _detect_table_layout(header.group(0))
+        if layout is not None:
+            sections.append((header.end(), layout))
+    if not sections:
+        raise ResistivityExportError("Could not find a Rho table header.")
+
+    section_ends = [start for start, _ in sections[1:]] + [len(source_text)]
+    for (section_start, layout), section_end in zip(sections, section_ends):
+        region_group = layout.region_column_index + 1
+        rho_group = layout.rho_column_index + 1
+        rows = _row_token_pattern(layout).finditer(source_text, section_start, section_end)
+        for row in rows:
+            try:
+                region_id = _parse_region_id(row.group(region_group))
+            except (TypeError, ValueError):
+                continue
+            spans.setdefault(region_id, []).append(row.span(rho_group))
+
+    return IndexedResistivitySource(
+        text=source_text,
+        file_name=file_name,
+        rho_spans={region_id: tuple(region_spans) for region_id, region_spans in spans.items()},
+    )
+
+
+def build_indexed_resistivity_text(
+    source: IndexedResistivitySource,
+    region_rho_updates: Mapping[int, float],
+) -> str:
+    """Return the indexed text with only the Rho tokens of updated regions replaced.
+
+    Everything outside the replaced tokens, including the spacing of edited
+    rows and their comments, is copied unchanged.
+    """
+    updates = parse_region_rho_updates(region_rho_updates)
+    splices = sorted(
+        (span, _format_rho(rho))
+        for region_id, rho in updates.items()
+        for span in source.rho_spans.get(region_id, ())
+    )
+    if not splices:
+        raise ResistivityExportError("No matching regions found in resistivity file.")
+
+    pieces = []
+    position = 0
+    for (start, end), replacement in splices:
+        pieces.append(source.text[position:start])
+        pieces.append(replacement)
+        position = end
+    pieces.append(source.text[position:])
+    return "".join(pieces)
+
+
+class ResistivitySourceCache(LruStore[IndexedResistivitySource]):
+    """Small thread-safe LRU store of indexed .resistivity sources keyed by generated ids."""
+
+    def __init__(self, max_entries: int = 8):
+        super().__init__(max_entries)
+
+
+@dataclass(frozen=True)
+class ResistivityScenario:
+    """One named set of region rho updates for a batch export."""
+
+    name: str
+    updates: Dict[int, float]
+
+
+def parse_resistivity_scenarios(raw_scenarios: Any) -> List[ResistivityScenario]:
+    """Parse named region rho update sets from JSON-compatible data.
+
+    Accepts `{name: updates}` or `[{"name", "regionRhoUpdates"}]`, where
+    `updates` has any form accepted by `parse_region_rho_updates`. Names are
+    reduced to file-name-safe characters and must stay unique.
+    """
+    if isinstance(raw_scenarios, str):
+        try:
+            raw_scenarios = json.loads(raw_scenarios)
+        except json.JSONDecodeError as exc:
+            raise ResistivityExportError("scenarios must be valid JSON.") from exc
+
+    if isinstance(raw_scenarios, Mapping):
+        items: Iterable[Tuple[Any, Any]] = raw_scenarios.items()
+    elif isinstance(raw_scenarios, list):
+        items = []
+        for item in raw_scenarios:
+            if not isinstance(item, Mapping):
+                raise ResistivityExportError("scenarios list items must be objects.")
+            items.append((item.get("name"), item.get("regionRhoUpdates")))
+    else:
+        raise ResistivityExportError("scenarios must be an object or list.")
+
+    scenarios: List[ResistivityScenario] = []
+    names = set()
+    for raw_name, raw_updates in items:
+        name = _SCENARIO_NAME_PATTERN.sub("_", str(raw_name or "")).strip("._")
+        if not name:
+            raise ResistivityExportError("Every scenario needs a name.")
+        if name in names:
+            raise ResistivityExportError(f"Duplicate scenario name: {name}")
+        try:
+            updates = parse_region_rho_updates(raw_updates)
+        except ResistivityExportError as exc:
+            raise ResistivityExportError(f"Scenario {name}: {exc}") from exc
+        names.add(name)
+        scenarios.append(ResistivityScenario(name, updates))
+
+    if not scenarios:
+        raise ResistivityExportError("No scenarios provided.")
+    if len(scenarios) > MAX_RESISTIVITY_SCENARIOS:
+        raise ResistivityExportError(
+            f"At most {MAX_RESISTIVITY_SCENARIOS} scenarios can be exported at once."
+        )
+    return scenarios
+
+
+class _ZipChunkSink(io.RawIOBase):
+    """Unseekable write target that hands written bytes back in chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_resistivity_scenario_zip(
+    source: IndexedResistivitySource,
+    scenarios: List[ResistivityScenario],
+    max_workers: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Yield a zip archive with one edited .resistivity file per scenario.
+
+    Every scenario is spliced from the same indexed source. Variants are built
+    by a thread pool a batch ahead of the zip writer, whose deflate calls
+    release the GIL. Scenarios are checked before the first byte is yielded,
+    so an unmatched scenario raises instead of truncating the archive.
+    """
+    for scenario in scenarios:
+        if not any(region_id in source.rho_spans for region_id in scenario.updates):
+            raise ResistivityExportError(
+                f"Scenario {scenario.name}: No matching regions found in resistivity file."
+            )
+
+    stem, _ = os.path.splitext(os.path.basename(source.file_name) or "model.resistivity")
+    workers = max_workers or min(8, os.cpu_count() or 1)
+
+    def build(scenario: ResistivityScenario) -> bytes:
+        return build_indexed_resistivity_text(source, scenario.updates).encode("utf-8")
+
+    sink = _ZipChunkSink()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            pending = [pool.submit(build, scenario) for scenario in scenarios[:workers]]
+            for index, scenario in enumerate(scenarios):
+                data = pending[index].result()
+                if index + workers < len(scenarios):
+                    pending.append(pool.submit(build, scenarios[index + workers]))
+                pending[index] = None
+                archive.writestr(f"{stem}.{scenario.name}.resistivity", data)
+                yield sink.drain()
+        yield sink.drain()
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+
+@dataclass(frozen=True)
+class VertexSnapStats:
+    """Summary of one vertex snapping pass."""
+
+    vertex_count: int
+    close_pairs: int
+    snapped_vertices: int
+    snap_groups: int
+    chained_groups: int
+    max_snap_distance: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "vertexCount": self.vertex_count,
+            "closePairs": self.close_pairs,
+            "snappedVertices": self.snapped_vertices,
+            "snapGroups": self.snap_groups,
+            "chainedGroups": self.chained_groups,
+            "maxSnapDistance": self.max_snap_distance,
+        }
+
+
+def find_close_vertex_pairs(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Return `(k, 2)` index pairs whose coordinates differ by less than `tolerance`.
+
+    The test is per axis, matching `abs(dx) < tolerance and abs(dy) < tolerance`.
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2 or tolerance <= 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    tree = cKDTree(points)
+    pairs = tree.query_pairs(r=tolerance, p=np.inf, output_type="ndarray")
+    if not len(pairs):
+        return np.zeros((0, 2), dtype=np.int64)
+    # query_pairs is inclusive; keep the strict comparison of the merge code.
+    deltas = np.abs(points[pairs[:, 0]] - points[pairs[:, 1]])
+    return pairs[(deltas < tolerance).all(axis=1)].astype(np.int64)
+
+
+def snap_vertices(
+    points: np.ndarray,
+    tolerance: float,
+    fixed_count: int = 0,
+) -> Tuple[np.ndarray, VertexSnapStats]:
+    """Map every vertex to the representative of its group of near-coincident vertices.
+
+    Close pairs are joined transitively, so chains of points that are each
+    within `tolerance` of the next collapse into one group. The first
+    `fixed_count` vertices are never merged with each other; every other
+    vertex maps to the lowest index in its group, which keeps the result
+    independent of query order.
+
+    Returns:
+        tuple: (representatives, stats) where `representatives[i]` is the index
+            vertex `i` is merged into (itself when it is kept).
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    vertex_count = len(points)
+    pairs = find_close_vertex_pairs(points, tolerance)
+    close_pairs = len(pairs)
+    # Fixed vertices are only linked through free vertices.
+    pairs = pairs[(pairs >= fixed_count).any(axis=1)]
+
+    representatives = np.arange(vertex_count, dtype=np.int64)
+    if not len(pairs):
+        return representatives, VertexSnapStats(
+            vertex_count=vertex_count,
+            close_pairs=close_pairs,
+            snapped_vertices=0,
+            snap_groups=0,
+            chained_groups=0,
+            max_snap_distance=0.0,
+        )
+
+    graph = coo_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(vertex_count, vertex_count),
+    )
+    _, labels = connected_components(graph, directed=False)
+    group_first = np.full(labels.max() + 1, vertex_count, dtype=np.int64)
+    np.minimum.at(group_first, labels, np.arange(vertex_count, dtype=np.int64))
+
+    free = np.arange(vertex_count) >= fixed_count
+    representatives[free] = group_first[labels[free]]
+
+    snapped = representatives != np.arange(vertex_count)
+    group_sizes = np.bincount(labels)
+    multi_member_groups = np.flatnonzero(group_sizes > 1)
+    offsets = np.abs(points[snapped] - points[representatives[snapped]])
+    # A group is chained when some member is not directly within tolerance of
+    # the vertex it is merged into.
+    chained_labels = np.unique(labels[snapped][(offsets >= tolerance).any(axis=1)])
+
+    return representatives, VertexSnapStats(
+        vertex_count=vertex_count,
+        close_pairs=close_pairs,
+        snapped_vertices=int(snapped.sum()),
+        snap_groups=int(len(multi_member_groups)),
+        chained_groups=int(len(chained_labels)),
+        max_snap_distance=float(np.hypot(offsets[:, 0], offsets[:, 1]).max())
+        if len(offsets)
+        else 0.0,
+    )
@@ -1,29 +1,97 @@
+import base64
+from typing import Dict, Iterator, Optional
+
 import pandas as pd
 import numpy as np
 
+# Grids with fewer filled cells than this fraction are sent as records instead.
+MIN_GRID_FILL_RATIO = 0.5
+# Response layouts of /api/upload-xyz
+XYZ_FORMATS = ("records", "grid", "tiles")
+
+
+# Columns kept from MARE2DEM .xyz exports (X Y Z rho1 [rho2 rho3])
+XYZ_COLUMNS = ['X', 'Y', 'Z', 'rho1']
+# Rows parsed per chunk when streaming large exports
+XYZ_CHUNK_ROWS = 1_000_000
+
+
+def _read_xyz_csv(file_path, dtype, **options):
+    return pd.read_csv(file_path,
+                       sep=r'\s+',
+                       header=None,
+                       usecols=list(range(len(XYZ_COLUMNS))),
+                       names=XYZ_COLUMNS,
+                       dtype=dtype,
+                       engine='c',
+                       **options)
+
+
+def read_xyz_columns(file_path, dtype=np.float64) -> pd.DataFrame:
+    """Read the X, Y, Z and rho1 columns of an .xyz file.
+
+    Only those columns are tokenized into `dtype` arrays by the pandas C
+    parser; the remaining rho columns are skipped.
+    """
+    return _read_xyz_csv(file_path, dtype)
+
+
+def iter_xyz_chunks(file_path, chunk_rows: int = XYZ_CHUNK_ROWS, dtype=np.float64) -> Iterator[pd.DataFrame]:
+    """Yield the X, Y, Z and rho1 columns of an .xyz file `chunk_rows` rows at a time.
+
+    Chunks keep the file's row numbers as their index, so multi-GB 3D exports
+    can be filtered or reduced without holding the whole file.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be a positive integer")
+    with _read_xyz_csv(file_path, dtype, chunksize=chunk_rows) as chunks:
+        yield from chunks
+
+
+def read_xyz_decimated(file_path, stride: int, chunk_rows: int = XYZ_CHUNK_ROWS, dtype=np.float64) -> pd.DataFrame:
+    """Read every `stride`-th row of an .xyz file, streaming it in chunks."""
+    if stride < 1:
+        raise ValueError("stride must be a positive integer")
+    kept = [chunk[chunk.index % stride == 0] for chunk in iter_xyz_chunks(file_path, chunk_rows, dtype)]
+    if not kept:
+        return pd.DataFrame({name: np.zeros(0, dtype=dtype) for name in XYZ_COLUMNS})
+    return pd.concat(kept, ignore_index=True)
+
+
+def inline_distance(x, y) -> np.ndarray:
+    """Negative distance of every point from the last one (the Y_dist column)."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if not len(x):
+        return np.zeros(0, dtype=np.result_type(x, y))
+    # Same expression as the original pandas column, so values match bit for bit
+    return -np.sqrt((y - y[-1]) ** 2 + (x - x[-1]) ** 2)
+
+
+def grid_axes_payload(grid: Dict[str, np.ndarray]) -> Dict:
+    """JSON-ready `y`, `z`, `x` and `y_dist` axes of a grid from `df_to_grid_arrays`."""
+    return {
+        name: grid[name].tolist() if grid[name] is not None else None
+        for name in ('y', 'z', 'x', 'y_dist')
+    }
+
+
 class XYZDataFileReader():
     """Visualization tool for MARE2DEM inversion results.
     """
-    def __init__(self, file_path):
+    def __init__(self, file_path, dtype=np.float64):
         self.file_path = file_path
+        self.dtype = dtype
         self.data = None
         self.read_file()
 
     def read_file(self):
-        """Read the file and convert it to json format."""
-
-        # Read the file into a DataFrame
-        df = pd.read_csv(self.file_path,
-                         sep=r'\s+',
-                         header=None,
-                         names=['X', 'Y', 'Z', 'rho1', 'rho2', 'rho3'])
-
-        # Extract Y and Z coordinates, and resistivity values (rho1)
-        self.data = df[['X', 'Y', 'Z', 'rho1']]
+        """Read the X, Y, Z and rho1 columns of the file."""
+        self.data = read_xyz_columns(self.file_path, self.dtype)
 
     def add_distance(self):
         """Add distance column to the DataFrame."""
-        self.data['Y_dist'] = -np.sqrt((self.data['Y'] - self.data['Y'].iloc[-1])**2 + (self.data['X'] - self.data['X'].iloc[-1])**2)
+        self.data['Y_dist'] = inline_distance(self.data['X'].to_numpy(), self.data['Y'].to_numpy())
 
     def df_for_echart_heatmap(self, df):
         """Convert DataFrame to a format that can be used by ECharts."""
@@ -48,6 +116,65 @@ class XYZDataFileReader():
 
         return result_df
 
+    def df_to_grid_arrays(self, df) -> Optional[Dict[str, np.ndarray]]:
+        """Place the cells of a DataFrame on a dense Y/Z grid, or return None if they are not on one.
+
+        Returns the sorted unique `y` and `z` axes, the `x` and `y_dist` value of
+        every Y column (None when the column is absent) and `rho` as a float32
+        array of shape `(len(z), len(y))` with NaN for empty cells. Inputs with
+        repeated Y/Z cells, X or Y_dist varying within a Y column or a mostly
+        empty grid return None.
+        """
+        y_axis, y_index = np.unique(df['Y'].to_numpy(dtype=np.float64), return_inverse=True)
+        z_axis, z_index = np.unique(df['Z'].to_numpy(dtype=np.float64), return_inverse=True)
+        cell_count = len(y_axis) * len(z_axis)
+        if not len(df) or len(df) < cell_count * MIN_GRID_FILL_RATIO:
+            return None
+        cells = z_index * len(y_axis) + y_index
+        if np.bincount(cells, minlength=cell_count).max() > 1:
+            return None
+
+        columns = {'X': None, 'Y_dist': None}
+        for name in columns:
+            if name not in df.columns:
+                continue
+            values = df[name].to_numpy(dtype=np.float64)
+            per_column = np.empty(len(y_axis))
+            per_column[y_index] = values
+            if not np.array_equal(per_column[y_index], values):
+                return None
+            columns[name] = per_column
+
+        rho = np.full(cell_count, np.nan, dtype='<f4')
+        rho[cells] = df['rho1'].to_numpy(dtype=np.float64)
+        return {
+            'y': y_axis,
+            'z': z_axis,
+            'x': columns['X'],
+            'y_dist': columns['Y_dist'],
+            'rho': rho.reshape(len(z_axis), len(y_axis)),
+        }
+
+    def df_to_grid(self, df) -> Optional[Dict]:
+        """Convert DataFrame to a dense Y/Z grid payload, or None if the cells are not on one.
+
+        The axes are sent as lists and rho1 as base64 float32 in row-major
+        `(len(z), len(y))` order; see `df_to_grid_arrays`.
+        """
+        grid = self.df_to_grid_arrays(df)
+        if grid is None:
+            return None
+        return {
+            'layout': 'grid',
+            **grid_axes_payload(grid),
+            'rho': {
+                'dtype': 'float32',
+                'shape': list(grid['rho'].shape),
+                'encoding': 'base64',
+                'data': base64.b64encode(grid['rho'].tobytes()).decode('ascii'),
+            },
+        }
+
     def df_to_json(self, df):
         """Convert DataFrame to JSON."""
         result = df.to_json(orient='records')
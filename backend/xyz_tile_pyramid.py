@@ -0,0 +1,207 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lru_store import LruStore
+
+
+# Cells per tile edge at every level.
+TILE_SIZE = 256
+# Per-tile statistics: arithmetic mean of rho or mean of log10(rho).
+TILE_STATISTICS = ("log_mean", "mean")
+
+
+@dataclass(frozen=True, eq=False)
+class XYZTilePyramid:
+    """Successively 2x coarsened copies of a rho grid in one memory-mapped file.
+
+    Level 0 is the original `(len(z), len(y))` grid; every further level
+    halves both dimensions (rounding up) until the grid fits in one tile.
+    A coarse cell holds the mean, or the geometric mean for `log_mean`, of
+    the finite level-0 cells it covers, and NaN when it covers none.
+    """
+
+    path: str
+    statistic: str
+    y: np.ndarray
+    z: np.ndarray
+    level_shapes: List[Tuple[int, int]]
+    level_offsets: List[int]
+    values: np.ndarray
+
+    @property
+    def level_count(self) -> int:
+        return len(self.level_shapes)
+
+    def level(self, level: int) -> np.ndarray:
+        rows, columns = self.level_shapes[level]
+        offset = self.level_offsets[level]
+        return self.values[offset : offset + rows * columns].reshape(rows, columns)
+
+    def tile_counts(self, level: int) -> Tuple[int, int]:
+        rows, columns = self.level_shapes[level]
+        return -(-rows // TILE_SIZE), -(-columns // TILE_SIZE)
+
+    def tile(self, level: int, i: int, j: int) -> Dict:
+        """Return tile row `i`, column `j` of `level` and the axis range it covers.
+
+        Raises:
+            ValueError: If the level or tile index is out of range.
+        """
+
+        if not 0 <= level < self.level_count:
+            raise ValueError(f"level must be between 0 and {self.level_count - 1}")
+        tile_rows, tile_columns = self.tile_counts(level)
+        if not (0 <= i < tile_rows and 0 <= j < tile_columns):
+            raise ValueError(
+                f"Tile ({i}, {j}) is outside the {tile_rows}x{tile_columns} tiles of level {level}"
+            )
+
+        values = np.ascontiguousarray(
+            self.level(level)[i * TILE_SIZE : (i + 1) * TILE_SIZE, j * TILE_SIZE : (j + 1) * TILE_SIZE],
+            dtype="<f4",
+        )
+        # Level-0 rows/columns covered by the tile
+        scale = 1 << level
+        row_start = i * TILE_SIZE * scale
+        row_end = min((i * TILE_SIZE + values.shape[0]) * scale, len(self.z))
+        column_start = j * TILE_SIZE * scale
+        column_end = min((j * TILE_SIZE + values.shape[1]) * scale, len(self.y))
+        return {
+            "values": values,
+            "z_range": (float(self.z[row_start]), float(self.z[row_end - 1])),
+            "y_range": (float(self.y[column_start]), float(self.y[column_end - 1])),
+        }
+
+    def close(self) -> None:
+        """Delete the backing file.
+
+        The mapping itself is released once no tile read holds it any more;
+        where open files cannot be deleted the file is left behind.
+        """
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _coarsen(sums: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum 2x2 blocks of `sums` and `counts`, padding odd edges with empty cells."""
+
+    pad = ((0, sums.shape[0] % 2), (0, sums.shape[1] % 2))
+    if pad[0][1] or pad[1][1]:
+        sums = np.pad(sums, pad)
+        counts = np.pad(counts, pad)
+    rows, columns = sums.shape[0] // 2, sums.shape[1] // 2
+    return (
+        sums.reshape(rows, 2, columns, 2).sum(axis=(1, 3)),
+        counts.reshape(rows, 2, columns, 2).sum(axis=(1, 3)),
+    )
+
+
+def build_xyz_tile_pyramid(
+    rho: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    path: str,
+    statistic: str = "log_mean",
+) -> XYZTilePyramid:
+    """Write the tile pyramid of a `(len(z), len(y))` rho grid to `path`.
+
+    Coarse levels are built from running sums and counts, so every coarse
+    cell is the exact statistic over its level-0 cells, also at odd edges
+    and around empty cells. Non-positive rho is left out of `log_mean`.
+    """
+
+    if statistic not in TILE_STATISTICS:
+        raise ValueError(f"statistic must be one of {', '.join(TILE_STATISTICS)}")
+    rho = np.asarray(rho, dtype=np.float64)
+    if rho.ndim != 2 or rho.shape != (len(z), len(y)) or not rho.size:
+        raise ValueError("rho must be a non-empty (len(z), len(y)) grid")
+
+    level_shapes = [rho.shape]
+    while max(level_shapes[-1]) > TILE_SIZE:
+        rows, columns = level_shapes[-1]
+        level_shapes.append((-(-rows // 2), -(-columns // 2)))
+    level_offsets = np.cumsum([0] + [rows * columns for rows, columns in level_shapes]).tolist()
+
+    values = np.memmap(path, dtype="<f4", mode="w+", shape=(level_offsets[-1],))
+    try:
+        values[: rho.size] = rho.reshape(-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            samples = np.log10(rho) if statistic == "log_mean" else rho
+            finite = np.isfinite(samples)
+            sums = np.where(finite, samples, 0.0)
+            counts = finite.astype(np.int64)
+            for level, (rows, columns) in enumerate(level_shapes[1:], start=1):
+                sums, counts = _coarsen(sums, counts)
+                means = sums / counts
+                if statistic == "log_mean":
+                    means = np.power(10.0, means)
+                values[level_offsets[level] : level_offsets[level + 1]] = means.reshape(-1)
+        values.flush()
+    finally:
+        del values
+
+    return XYZTilePyramid(
+        path=path,
+        statistic=statistic,
+        y=np.asarray(y, dtype=np.float64),
+        z=np.asarray(z, dtype=np.float64),
+        level_shapes=[(int(rows), int(columns)) for rows, columns in level_shapes],
+        level_offsets=[int(offset) for offset in level_offsets[:-1]],
+        values=np.memmap(path, dtype="<f4", mode="r", shape=(level_offsets[-1],)),
+    )
+
+
+class XYZTilePyramidCache(LruStore[XYZTilePyramid]):
+    """Small thread-safe LRU store of tile pyramids; evicted pyramids delete their file.
+
+    Pyramids only live as long as the process, so tile files left in the cache
+    directory by earlier runs are deleted when the cache is created.
+    """
+
+    def __init__(self, max_entries: int = 4, cache_dir: Optional[str] = None):
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), "cseminsight_xyz_tiles")
+        self.cache_dir = cache_dir
+        super().__init__(max_entries, on_evict=XYZTilePyramid.close)
+        self._remove_stale_files()
+
+    def _remove_stale_files(self) -> None:
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".tiles"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def build(
+        self,
+        rho: np.ndarray,
+        y: np.ndarray,
+        z: np.ndarray,
+        statistic: str = "log_mean",
+    ) -> Tuple[str, XYZTilePyramid]:
+        """Build a pyramid in the cache directory and return its id and the pyramid."""
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pyramid_id = self.new_id()
+        path = os.path.join(self.cache_dir, f"{pyramid_id}.tiles")
+        try:
+            pyramid = build_xyz_tile_pyramid(rho, y, z, path, statistic)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+        self.put(pyramid, pyramid_id)
+        return pyramid_id, pyramid
@@ -116,7 +116,8 @@ export function BathymetryUpload() {
                 depth: response.data.depth,
                 num_points: response.data.num_points,
                 distance_range: response.data.distance_range,
-                depth_range: response.data.depth_range
+                depth_range: response.data.depth_range,
+                bathymetry_id: response.data.bathymetry_id
             };
             setBathymetryData(bathymetryData);
             setBathymetryFile(files[0].name);
@@ -21,6 +21,7 @@ const mockViewer = {
   setData: vi.fn(),
   setInteractionMode: vi.fn(),
   setLayerVisibility: vi.fn(),
+  setMeshDetail: vi.fn(),
   setSelectionOverlay: vi.fn(),
   setResistivityColorRange: vi.fn(),
   setTriangleResistivityValues: vi.fn(),
@@ -105,6 +106,34 @@ function buildEditableTriangleModelResponse() {
   };
 }
 
+function buildResegmentationSessionResponse() {
+  return {
+    sessionId: 'session-1',
+    previewMesh: {
+      vertices: [
+        { id: 0, x: 0, y: 0 },
+        { id: 1, x: 1000, y: 0 },
+        { id: 2, x: 0, y: 1000 },
+        { id: 3, x: 1000, y: 1000 },
+      ],
+      triangles: [
+        [0, 1, 2],
+        [1, 3, 2],
+      ],
+      triangleRegionIds: [1, 1],
+      triangleResistivityValues: [10, 10],
+      regionResistivity: [{ regionId: 1, rho: 10 }],
+    },
+    stats: {
+      sourceTriangleCount: 2,
+      activeTriangleCount: 2,
+      regionCount: 1,
+      mergedComponentCount: 0,
+    },
+    warnings: [],
+  };
+}
+
 describe('TriangleModelWindow', () => {
   beforeEach(() => {
     vi.clearAllMocks();
@@ -226,6 +255,69 @@ describe('TriangleModelWindow', () => {
     });
   });
 
+  it('fetches a finer level of detail for the zoomed view without resetting the camera', async () => {
+    const user = userEvent.setup();
+    vi.mocked(axios.post)
+      .mockResolvedValueOnce({
+        data: {
+          ...buildEditableTriangleModelResponse(),
+          meshLod: { id: 'lod-1', level: 1 },
+        },
+      })
+      .mockResolvedValueOnce({
+        data: {
+          meshLod: { id: 'lod-1', level: 0 },
+          constrainedMesh: {
+            vertices: [
+              { id: 0, x: 0, y: 0 },
+              { id: 1, x: 0.5, y: 0 },
+              { id: 2, x: 0, y: 0.5 },
+            ],
+            triangles: [[0, 1, 2]],
+            triangleRegionIds: [20],
+            triangleResistivityValues: [100],
+            regionResistivity: [{ regionId: 20, rho: 100 }],
+          },
+        },
+      });
+
+    render(<TriangleModelWindow />);
+
+    await user.upload(
+      screen.getByLabelText(/poly file/i),
+      new File(['poly'], 'editable.poly', { type: 'text/plain' }),
+    );
+    await user.click(screen.getByRole('button', { name: /load triangle model/i }));
+    await waitFor(() => {
+      expect(mockViewer.setData).toHaveBeenCalled();
+    });
+
+    act(() => {
+      latestViewerOptions?.onViewChange({
+        cameraState: { centerX: 0.25, centerY: 0.25, baseWidth: 2, baseHeight: 1, zoom: 4 },
+        canvasSize: { width: 400, height: 200 },
+      });
+    });
+
+    await waitFor(() => {
+      expect(mockViewer.setMeshDetail).toHaveBeenCalledWith(
+        expect.objectContaining({
+          bounds: expect.objectContaining({ maxX: 1, maxY: 1 }),
+          triangleRegionIds: [20],
+        }),
+      );
+    });
+    const lodCall = vi
+      .mocked(axios.post)
+      .mock.calls.find(([url]) => String(url).endsWith('/api/triangle-mesh-lod'));
+    const lodForm = lodCall?.[1] as FormData;
+    expect(lodForm.get('lod_id')).toBe('lod-1');
+    expect(JSON.parse(String(lodForm.get('viewport')))).toEqual(
+      expect.objectContaining({ yMin: 0, yMax: 0.5, widthPx: 400, heightPx: 200 }),
+    );
+    expect(mockViewer.setData).toHaveBeenCalledTimes(1);
+  });
+
   it('truncates long resistivity metadata values and exposes the full value on hover', async () => {
     const user = userEvent.setup();
     const longDataFileName =
@@ -908,30 +1000,7 @@ describe('TriangleModelWindow', () => {
       if (String(url).includes('/api/upload-triangle-model')) {
         return { data: buildEditableTriangleModelResponse() };
       }
-      return {
-        data: {
-          previewMesh: {
-            vertices: [
-              { id: 0, x: 0, y: 0 },
-              { id: 1, x: 1000, y: 0 },
-              { id: 2, x: 0, y: 1000 },
-            ],
-            triangles: [[0, 1, 2]],
-            triangleRegionIds: [1],
-            triangleResistivityValues: [10],
-            regionResistivity: [{ regionId: 1, rho: 10 }],
-          },
-          stats: {
-            sourceTriangleCount: 2,
-            activeTriangleCount: 1,
-            outputVertexCount: 3,
-            outputSegmentCount: 3,
-            outputRegionCount: 1,
-            mergedComponentCount: 0,
-          },
-          warnings: [],
-        },
-      };
+      return { data: buildResegmentationSessionResponse() };
     });
 
     render(<TriangleModelWindow />);
@@ -949,12 +1018,12 @@ describe('TriangleModelWindow', () => {
 
     await waitFor(() => {
       expect(axios.post).toHaveBeenCalledWith(
-        'http://127.0.0.1:3354/api/preview-triangle-resegmentation',
+        'http://127.0.0.1:3354/api/start-triangle-resegmentation-session',
         expect.any(FormData),
       );
     });
     const previewCall = vi.mocked(axios.post).mock.calls.find(([url]) =>
-      String(url).includes('/api/preview-triangle-resegmentation'),
+      String(url).includes('/api/start-triangle-resegmentation-session'),
     );
     const formData = previewCall?.[1] as FormData;
     expect(formData.get('poly_file')).toBe(polyFile);
@@ -969,7 +1038,7 @@ describe('TriangleModelWindow', () => {
     await waitFor(() => {
       expect(mockViewer.setData).toHaveBeenLastCalledWith({
         mesh: expect.objectContaining({
-          triangleResistivityValues: [10],
+          triangleResistivityValues: [10, 10],
           points: expect.arrayContaining([expect.objectContaining({ x: 1, y: 0 })]),
         }),
         model: expect.any(Object),
@@ -978,6 +1047,80 @@ describe('TriangleModelWindow', () => {
     expect(screen.getByText(/previewed 1 forward-model region/i)).toBeInTheDocument();
   });
 
+  it('patches the session preview when the ROI changes', async () => {
+    const user = userEvent.setup();
+
+    vi.mocked(axios.post).mockImplementation(async (url) => {
+      if (String(url).includes('/api/upload-triangle-model')) {
+        return { data: buildEditableTriangleModelResponse() };
+      }
+      if (String(url).includes('/api/update-triangle-resegmentation-session')) {
+        return {
+          data: {
+            triangleIndices: [1],
+            triangleRegionIds: [2],
+            triangleResistivityValues: [100],
+            regionResistivity: [{ regionId: 2, rho: 100 }],
+            removedRegionIds: [],
+            stats: {
+              sourceTriangleCount: 2,
+              activeTriangleCount: 2,
+              regionCount: 2,
+              changedTriangleCount: 1,
+              mergedComponentCount: 0,
+            },
+            warnings: [],
+          },
+        };
+      }
+      return { data: buildResegmentationSessionResponse() };
+    });
+
+    render(<TriangleModelWindow />);
+
+    await user.upload(
+      screen.getByLabelText(/poly file/i),
+      new File(['poly'], 'editable.poly', { type: 'text/plain' }),
+    );
+    await user.upload(
+      screen.getByLabelText(/resistivity file/i),
+      new File(['rho'], 'editable.resistivity', { type: 'text/plain' }),
+    );
+    await user.click(screen.getByRole('button', { name: /load triangle model/i }));
+    await user.click(await screen.findByRole('button', { name: /segmentation/i }));
+    await user.click(await screen.findByRole('button', { name: /^preview$/i }));
+    await screen.findByText(/previewed 1 forward-model region/i);
+    const setDataCalls = mockViewer.setData.mock.calls.length;
+
+    const yMax = screen.getByLabelText('Y max');
+    await user.clear(yMax);
+    await user.type(yMax, '200');
+
+    await waitFor(() => {
+      expect(mockViewer.setMeshDetail).toHaveBeenLastCalledWith(
+        expect.objectContaining({ triangleResistivityValues: [10, 100] }),
+      );
+    });
+    const updateCalls = vi.mocked(axios.post).mock.calls.filter(([url]) =>
+      String(url).includes('/api/update-triangle-resegmentation-session'),
+    );
+    const formData = updateCalls[updateCalls.length - 1]?.[1] as FormData;
+    expect(formData.get('session_id')).toBe('session-1');
+    expect(JSON.parse(String(formData.get('roi')))).toEqual({
+      yMin: -100,
+      yMax: 200,
+      zMin: 0,
+      zMax: 50,
+    });
+    expect(
+      vi.mocked(axios.post).mock.calls.filter(([url]) =>
+        String(url).includes('/api/start-triangle-resegmentation-session'),
+      ),
+    ).toHaveLength(1);
+    expect(mockViewer.setData).toHaveBeenCalledTimes(setDataCalls);
+    expect(screen.getByText(/updated 1 triangle for the new roi/i)).toBeInTheDocument();
+  });
+
   it('formats hover copy as rho-only when resistivity is available', () => {
     expect(
       formatTriangleHoverSummary(
@@ -56,8 +56,15 @@ import {
   buildTriangleMeshFromModel,
 } from '@/services/triangleModelMesh';
 import {
+  buildInitialTriangleMeshLodViewport,
+  buildTriangleMeshLodViewport,
+  fetchTriangleMeshLod,
+} from '@/services/triangleMeshLod';
+import {
+  applyTriangleResegmentationPatch,
   exportTriangleResegmentation,
-  previewTriangleResegmentation,
+  startTriangleResegmentationSession,
+  updateTriangleResegmentationSession,
 } from '@/services/triangleResegmentation';
 import {
   buildTriangleViewportAxes,
@@ -77,14 +84,66 @@ import type {
   TriangleResegmentationExportResponse,
   TriangleResegmentationParameters,
   TriangleResegmentationPreviewResponse,
+  TriangleResegmentationSessionResponse,
+  TriangleResegmentationStats,
 } from '@/types';
 
+// Pause after the last pan or zoom before asking for another level of detail.
+const MESH_LOD_REQUEST_DELAY_MS = 250;
+
 const DEFAULT_LAYER_VISIBILITY: TriangleLayerVisibility = {
   triangles: true,
   segments: true,
   vertices: false,
 };
 
+interface TriangleResegmentationSessionState {
+  sessionId: string;
+  polyFile: File;
+  resistivityFile: File;
+  settingsKey: string;
+  previewMesh: TriangleConstrainedMesh;
+}
+
+// Everything but the ROI; a session only moves its ROI.
+function buildResegmentationSettingsKey(parameters: TriangleResegmentationParameters) {
+  return JSON.stringify([
+    parameters.rhoLevels,
+    parameters.onlyFreeParameters,
+    parameters.boundaryTolerance,
+    parameters.minimumRegionArea,
+  ]);
+}
+
+// Session previews color the source triangles, so output poly counts are only known after export.
+function buildSessionResegmentationStats(
+  stats: TriangleResegmentationSessionResponse['stats'],
+): TriangleResegmentationStats {
+  return {
+    sourceTriangleCount: stats.sourceTriangleCount,
+    activeTriangleCount: stats.activeTriangleCount,
+    outputVertexCount: null,
+    outputSegmentCount: null,
+    outputRegionCount: stats.regionCount,
+    mergedComponentCount: stats.mergedComponentCount,
+  };
+}
+
+function getErrorStatus(error: unknown): number | null {
+  if (
+    typeof error === 'object' &&
+    error !== null &&
+    'response' in error &&
+    typeof error.response === 'object' &&
+    error.response !== null &&
+    'status' in error.response &&
+    typeof error.response.status === 'number'
+  ) {
+    return error.response.status;
+  }
+  return null;
+}
+
 interface TriangleLassoSelection {
   featherTriangleIndices: number[];
   lassoPath: TriangleModelPoint2D[];
@@ -247,6 +306,13 @@ export function TriangleModelWindow() {
   const viewportRef = useRef<HTMLDivElement | null>(null);
   const viewerRef = useRef<TriangleModelViewer | null>(null);
   const lassoCompleteHandlerRef = useRef<(path: TriangleModelPoint2D[]) => void>(() => {});
+  const regionRhoByIdRef = useRef(regionRhoById);
+  const meshDetailPendingRef = useRef(false);
+  const meshLodRequestRef = useRef(0);
+  const meshLodViewportKeyRef = useRef<string | null>(null);
+  const resegmentationSessionRef = useRef<TriangleResegmentationSessionState | null>(null);
+  // ROI updates patch the session in order, so they run one after another.
+  const resegmentationQueueRef = useRef<Promise<void>>(Promise.resolve());
 
   const hoverSummary = useMemo(
     () =>
@@ -309,6 +375,19 @@ export function TriangleModelWindow() {
     if (resistivityFile) {
       formData.append('resistivity_file', resistivityFile);
     }
+    // Large meshes come back at a level of detail matched to the viewport;
+    // finer levels are fetched as the user zooms in.
+    const viewportWidth =
+      (viewportRef.current?.clientWidth ?? 0) - TRIANGLE_VIEWPORT_AXIS_GUTTERS.left;
+    const viewportHeight =
+      (viewportRef.current?.clientHeight ?? 0) - TRIANGLE_VIEWPORT_AXIS_GUTTERS.bottom;
+    const initialLodViewport =
+      viewportWidth > 0 && viewportHeight > 0
+        ? buildInitialTriangleMeshLodViewport({ width: viewportWidth, height: viewportHeight })
+        : null;
+    if (initialLodViewport) {
+      formData.append('viewport', JSON.stringify(initialLodViewport));
+    }
 
     try {
       const response = await axios.post<TriangleModelResponse>(
@@ -316,6 +395,11 @@ export function TriangleModelWindow() {
         formData,
       );
       const nextMesh = buildTriangleMeshFromModel(response.data);
+      meshLodRequestRef.current += 1;
+      meshDetailPendingRef.current = false;
+      meshLodViewportKeyRef.current = initialLodViewport
+        ? JSON.stringify(initialLodViewport)
+        : null;
       setModel(response.data);
       setMesh(nextMesh);
       setVisibleLayers(getInitialLayerVisibility(nextMesh));
@@ -331,6 +415,7 @@ export function TriangleModelWindow() {
       setRedoStack([]);
       setLassoSelection(null);
       setEditStatus(null);
+      resegmentationSessionRef.current = null;
       setResegmentationPreview(null);
       setResegmentationStatus(null);
       setIsSegmentationOpen(false);
@@ -348,6 +433,7 @@ export function TriangleModelWindow() {
       setRedoStack([]);
       setLassoSelection(null);
       setEditStatus(null);
+      resegmentationSessionRef.current = null;
       setResegmentationPreview(null);
       setResegmentationStatus(null);
       setIsSegmentationOpen(false);
@@ -536,22 +622,43 @@ export function TriangleModelWindow() {
     setIsExportingResistivity(true);
     setEditStatus('Exporting .resistivity...');
 
-    const formData = new FormData();
-    formData.append('resistivity_file', loadedResistivityFile);
-    formData.append(
-      'region_rho_updates',
-      new Blob([JSON.stringify(changedRegionRhoUpdates)], {
-        type: 'application/json',
-      }),
-      'region-rho-updates.json',
-    );
-
-    try {
-      const response = await axios.post<Blob>(
+    // The server keeps an indexed copy of the uploaded file; re-send the file
+    // only when that copy is unknown or has expired.
+    const buildExportFormData = (exportId: string | null) => {
+      const formData = new FormData();
+      if (exportId) {
+        formData.append('export_id', exportId);
+      } else {
+        formData.append('resistivity_file', loadedResistivityFile);
+      }
+      formData.append(
+        'region_rho_updates',
+        new Blob([JSON.stringify(changedRegionRhoUpdates)], {
+          type: 'application/json',
+        }),
+        'region-rho-updates.json',
+      );
+      return formData;
+    };
+    const postExport = (exportId: string | null) =>
+      axios.post<Blob>(
         'http://127.0.0.1:3354/api/export-triangle-resistivity',
-        formData,
+        buildExportFormData(exportId),
         { responseType: 'blob' },
       );
+
+    try {
+      const exportId = model?.resistivityExportId ?? null;
+      const response = await postExport(exportId).catch((indexedExportError) => {
+        if (
+          !exportId ||
+          !axios.isAxiosError(indexedExportError) ||
+          indexedExportError.response?.status !== 404
+        ) {
+          throw indexedExportError;
+        }
+        return postExport(null);
+      });
       const downloadUrl = URL.createObjectURL(response.data);
       const link = document.createElement('a');
       link.href = downloadUrl;
@@ -611,30 +718,93 @@ export function TriangleModelWindow() {
     viewerRef.current?.setSelectionOverlay(null);
   };
 
-  const handlePreviewResegmentation = async (
+  const showSessionPatch = (
+    session: TriangleResegmentationSessionState,
+    stats: TriangleResegmentationStats,
+    warnings: string[],
+  ) => {
+    setResegmentationPreview({ previewMesh: session.previewMesh, stats, warnings });
+    // Same triangles as before, so keep the camera where it is.
+    meshDetailPendingRef.current = true;
+    setMesh(
+      buildTriangleMeshFromConstrainedMesh(scaleConstrainedMeshForDisplay(session.previewMesh)),
+    );
+  };
+
+  const updateResegmentationSession = async (
+    session: TriangleResegmentationSessionState,
     parameters: TriangleResegmentationParameters,
   ) => {
+    try {
+      const patch = await updateTriangleResegmentationSession(session.sessionId, parameters.roi);
+      if (resegmentationSessionRef.current !== session) {
+        return true;
+      }
+      session.previewMesh = applyTriangleResegmentationPatch(session.previewMesh, patch);
+      showSessionPatch(session, buildSessionResegmentationStats(patch.stats), patch.warnings);
+      setResegmentationStatus(
+        `Updated ${patch.stats.changedTriangleCount} triangle${
+          patch.stats.changedTriangleCount === 1 ? '' : 's'
+        } for the new ROI.`,
+      );
+      return true;
+    } catch (updateError) {
+      if (getErrorStatus(updateError) === 404) {
+        // The session expired on the server; start a new one.
+        return false;
+      }
+      // The session keeps its last ROI, so the current preview stays valid.
+      setResegmentationStatus(getUploadErrorMessage(updateError));
+      return true;
+    }
+  };
+
+  const runResegmentationPreview = async (parameters: TriangleResegmentationParameters) => {
     if (!loadedPolyFile || !loadedResistivityFile) {
       setResegmentationStatus('Load a .poly and .resistivity file before previewing.');
       return;
     }
 
     setIsPreviewingResegmentation(true);
-    setResegmentationStatus('Building resegmentation preview...');
+    const settingsKey = buildResegmentationSettingsKey(parameters);
+    const session = resegmentationSessionRef.current;
 
     try {
-      const response = await previewTriangleResegmentation({
+      if (
+        session &&
+        session.polyFile === loadedPolyFile &&
+        session.resistivityFile === loadedResistivityFile &&
+        session.settingsKey === settingsKey &&
+        (await updateResegmentationSession(session, parameters))
+      ) {
+        return;
+      }
+
+      setResegmentationStatus('Building resegmentation preview...');
+      const response = await startTriangleResegmentationSession({
         polyFile: loadedPolyFile,
         resistivityFile: loadedResistivityFile,
         parameters,
       });
-      applyResegmentationPreview(response);
+      resegmentationSessionRef.current = {
+        sessionId: response.sessionId,
+        polyFile: loadedPolyFile,
+        resistivityFile: loadedResistivityFile,
+        settingsKey,
+        previewMesh: response.previewMesh,
+      };
+      applyResegmentationPreview({
+        previewMesh: response.previewMesh,
+        stats: buildSessionResegmentationStats(response.stats),
+        warnings: response.warnings,
+      });
       setResegmentationStatus(
-        `Previewed ${response.stats.outputRegionCount} forward-model region${
-          response.stats.outputRegionCount === 1 ? '' : 's'
+        `Previewed ${response.stats.regionCount} forward-model region${
+          response.stats.regionCount === 1 ? '' : 's'
         }.`,
       );
     } catch (previewError) {
+      resegmentationSessionRef.current = null;
       setResegmentationPreview(null);
       setResegmentationStatus(getUploadErrorMessage(previewError));
     } finally {
@@ -642,6 +812,12 @@ export function TriangleModelWindow() {
     }
   };
 
+  const handlePreviewResegmentation = (parameters: TriangleResegmentationParameters) => {
+    const next = resegmentationQueueRef.current.then(() => runResegmentationPreview(parameters));
+    resegmentationQueueRef.current = next;
+    return next;
+  };
+
   const handleExportResegmentation = async (
     parameters: TriangleResegmentationParameters,
   ) => {
@@ -659,6 +835,8 @@ export function TriangleModelWindow() {
         resistivityFile: loadedResistivityFile,
         parameters,
       });
+      // The exported mesh replaces the session preview; the next preview starts over.
+      resegmentationSessionRef.current = null;
       applyResegmentationPreview(response);
       downloadTextFile(response.polyFileName, response.polyText);
       downloadTextFile(response.resistivityFileName, response.resistivityText);
@@ -676,6 +854,51 @@ export function TriangleModelWindow() {
     lassoCompleteHandlerRef.current = handleLassoComplete;
   }, [handleLassoComplete]);
 
+  useEffect(() => {
+    regionRhoByIdRef.current = regionRhoById;
+  }, [regionRhoById]);
+
+  useEffect(() => {
+    const lodId = model?.meshLod?.id;
+    // Lasso selections and previews index the current triangles, so the level
+    // of detail only changes while neither is active.
+    if (!lodId || !viewportView || resegmentationPreview || lassoSelection) {
+      return;
+    }
+
+    const viewport = buildTriangleMeshLodViewport(viewportView, verticalExaggeration);
+    const viewportKey = JSON.stringify(viewport);
+    if (viewportKey === meshLodViewportKeyRef.current) {
+      return;
+    }
+
+    const timer = window.setTimeout(() => {
+      const requestId = meshLodRequestRef.current + 1;
+      meshLodRequestRef.current = requestId;
+      fetchTriangleMeshLod(lodId, viewport)
+        .then((response) => {
+          if (requestId !== meshLodRequestRef.current) {
+            return;
+          }
+
+          meshLodViewportKeyRef.current = viewportKey;
+          const detailMesh = buildTriangleMeshFromConstrainedMesh(response.constrainedMesh);
+          detailMesh.triangleResistivityValues = deriveTriangleResistivityValues({
+            mesh: detailMesh,
+            rhoByRegion: regionRhoByIdRef.current,
+          });
+          meshDetailPendingRef.current = true;
+          // Cropped levels keep the full model bounds so the camera fit is unchanged.
+          setMesh((current) => (current ? { ...detailMesh, bounds: current.bounds } : current));
+        })
+        .catch(() => {
+          // Keep showing the current level when a finer one is unavailable.
+        });
+    }, MESH_LOD_REQUEST_DELAY_MS);
+
+    return () => window.clearTimeout(timer);
+  }, [lassoSelection, model, resegmentationPreview, verticalExaggeration, viewportView]);
+
   useEffect(() => {
     if (!model || !mesh || !canvasRef.current || !viewportRef.current) {
       return;
@@ -699,6 +922,12 @@ export function TriangleModelWindow() {
       return;
     }
 
+    if (meshDetailPendingRef.current) {
+      meshDetailPendingRef.current = false;
+      viewerRef.current.setMeshDetail(mesh);
+      return;
+    }
+
     viewerRef.current.setData({ mesh, model });
   }, [mesh, model]);
 
@@ -982,6 +1211,7 @@ export function TriangleModelWindow() {
                 status={resegmentationStatus}
                 onExport={handleExportResegmentation}
                 onPreview={handlePreviewResegmentation}
+                onRoiChange={handlePreviewResegmentation}
               />
             </CollapsibleContent>
           </Collapsible>
@@ -1,5 +1,5 @@
 import { Download, Loader2, Wand2 } from 'lucide-react';
-import { useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 
 import { Button } from '@/components/ui/button';
 import type {
@@ -15,8 +15,13 @@ interface TriangleResegmentPanelProps {
   status?: string | null;
   onExport: (parameters: TriangleResegmentationParameters) => void;
   onPreview: (parameters: TriangleResegmentationParameters) => void;
+  // Called after ROI edits settle while a preview is shown.
+  onRoiChange?: (parameters: TriangleResegmentationParameters) => void;
 }
 
+// Pause after the last ROI edit before updating the preview.
+const ROI_UPDATE_DELAY_MS = 250;
+
 function parseNumber(value: string) {
   const parsed = Number(value);
   return Number.isFinite(parsed) ? parsed : null;
@@ -45,6 +50,7 @@ export function TriangleResegmentPanel({
   status = null,
   onExport,
   onPreview,
+  onRoiChange,
 }: TriangleResegmentPanelProps) {
   const [yMin, setYMin] = useState('-100');
   const [yMax, setYMax] = useState('100');
@@ -129,11 +135,34 @@ export function TriangleResegmentPanel({
     zMin,
   ]);
 
+  const roiKey = parsed.parameters ? JSON.stringify(parsed.parameters.roi) : null;
+  const previewedRoiKeyRef = useRef<string | null>(null);
+
+  useEffect(() => {
+    if (
+      !preview ||
+      !onRoiChange ||
+      disabled ||
+      !parsed.parameters ||
+      roiKey === previewedRoiKeyRef.current
+    ) {
+      return;
+    }
+
+    const parameters = parsed.parameters;
+    const timer = window.setTimeout(() => {
+      previewedRoiKeyRef.current = roiKey;
+      onRoiChange(parameters);
+    }, ROI_UPDATE_DELAY_MS);
+    return () => window.clearTimeout(timer);
+  }, [disabled, onRoiChange, parsed.parameters, preview, roiKey]);
+
   const canSubmit = !disabled && parsed.parameters !== null;
   const canExport = canSubmit && !!preview && !isExporting;
 
   const handlePreview = () => {
     if (parsed.parameters) {
+      previewedRoiKeyRef.current = roiKey;
       onPreview(parsed.parameters);
     }
   };
@@ -303,11 +332,11 @@ export function TriangleResegmentPanel({
               </div>
               <div>
                 <p className="text-muted-foreground">Vertices</p>
-                <p className="text-sm font-semibold">{preview.stats.outputVertexCount}</p>
+                <p className="text-sm font-semibold">{preview.stats.outputVertexCount ?? '—'}</p>
               </div>
               <div>
                 <p className="text-muted-foreground">Segments</p>
-                <p className="text-sm font-semibold">{preview.stats.outputSegmentCount}</p>
+                <p className="text-sm font-semibold">{preview.stats.outputSegmentCount ?? '—'}</p>
               </div>
               <div>
                 <p className="text-muted-foreground">Merged</p>
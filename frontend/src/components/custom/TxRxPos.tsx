@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useRef } from 'react';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import uPlot from 'uplot';
 import 'uplot/dist/uPlot.min.css';
 import type { Dataset, RxData, TxData } from "@/types";
@@ -8,6 +8,12 @@ import { getTxRxData } from "@/services/extractTxRxPlotData";
 import { useTheme } from "@/hooks/useTheme";
 import { getTxRxColors, getChartColors, dataVizPalette } from "@/lib/colorPalette";
 import { orderIdsByPrimaryLast } from '@/lib/datasetOrdering';
+import { fetchBathymetryProfile } from '@/services/bathymetryProfile';
+
+// Plot width in pixels, used as the bathymetry downsampling resolution.
+const PLOT_WIDTH = 900;
+// Pause after the last zoom step before fetching the bathymetry for the new range.
+const BATHYMETRY_PROFILE_DELAY_MS = 200;
 
 declare module "uplot" {
     interface Series {
@@ -20,6 +26,14 @@ export function TxRxPosPlot() {
     const { data, txData, rxData, originalTxData, isTxDepthAdjusted, datasets, activeDatasetIds, comparisonMode, primaryDatasetId } = useDataTableStore();
     const { setTxData, setRxData, setOriginalTxData } = useDataTableStore();
     const { bathymetryData } = useBathymetryStore();
+    // Downsampled bathymetry for the visible range; the full survey is only a fallback.
+    const [bathymetryProfile, setBathymetryProfile] = useState<{
+        inline_distance: number[];
+        depth: number[];
+    } | null>(null);
+    const bathymetryRangeRef = useRef<[number, number] | null>(null);
+    const bathymetryTimerRef = useRef<number | null>(null);
+    const plotBathymetry = bathymetryProfile ?? bathymetryData;
     const { theme, systemTheme } = useTheme();
     const resolvedTheme = theme === 'system' ? systemTheme : theme;
     const isDark = resolvedTheme === 'dark';
@@ -41,6 +55,82 @@ export function TxRxPosPlot() {
             .filter((dataset): dataset is Dataset => Boolean(dataset && dataset.visible));
     }, [orderedDatasetIds, datasets]);
 
+    const loadBathymetryProfile = useCallback((xMin: number, xMax: number) => {
+        const bathymetryId = bathymetryData?.bathymetry_id;
+        if (!bathymetryId || !(xMax > xMin)) {
+            return;
+        }
+
+        fetchBathymetryProfile({ bathymetryId, xMin, xMax, width: PLOT_WIDTH })
+            .then((profile) => {
+                bathymetryRangeRef.current = [xMin, xMax];
+                setBathymetryProfile({
+                    inline_distance: profile.inline_distance,
+                    depth: profile.depth,
+                });
+            })
+            .catch(() => {
+                // Keep drawing the current bathymetry when the profile is unavailable.
+            });
+    }, [bathymetryData]);
+
+    useEffect(() => {
+        bathymetryRangeRef.current = null;
+        setBathymetryProfile(null);
+        if (bathymetryData?.bathymetry_id) {
+            loadBathymetryProfile(...bathymetryData.distance_range);
+        }
+
+        return () => {
+            if (bathymetryTimerRef.current !== null) {
+                window.clearTimeout(bathymetryTimerRef.current);
+                bathymetryTimerRef.current = null;
+            }
+        };
+    }, [bathymetryData, loadBathymetryProfile]);
+
+    // Refetch the bathymetry for the zoomed range, and restore that range when
+    // the plots are rebuilt with the new profile.
+    const bathymetryZoomHooks = useMemo((): uPlot.Hooks.Arrays => ({
+        setScale: [
+            (u, scaleKey) => {
+                const xMin = u.scales.x.min;
+                const xMax = u.scales.x.max;
+                if (scaleKey !== 'x' || !bathymetryData?.bathymetry_id || xMin == null || xMax == null) {
+                    return;
+                }
+
+                const range = bathymetryRangeRef.current ?? bathymetryData.distance_range;
+                if (xMin === range[0] && xMax === range[1]) {
+                    return;
+                }
+                if (
+                    bathymetryRangeRef.current === null &&
+                    xMin <= bathymetryData.distance_range[0] &&
+                    xMax >= bathymetryData.distance_range[1]
+                ) {
+                    return;
+                }
+
+                if (bathymetryTimerRef.current !== null) {
+                    window.clearTimeout(bathymetryTimerRef.current);
+                }
+                bathymetryTimerRef.current = window.setTimeout(() => {
+                    bathymetryTimerRef.current = null;
+                    loadBathymetryProfile(xMin, xMax);
+                }, BATHYMETRY_PROFILE_DELAY_MS);
+            },
+        ],
+    }), [bathymetryData, loadBathymetryProfile]);
+
+    const restoreBathymetryRange = useCallback((plots: uPlot[]) => {
+        const range = bathymetryRangeRef.current;
+        if (!range) {
+            return;
+        }
+        plots.forEach((plot) => plot.setScale('x', { min: range[0], max: range[1] }));
+    }, []);
+
     // Data Synchronization Effect
     useEffect(() => {
         if (data.length > 0) {
@@ -141,10 +231,10 @@ export function TxRxPosPlot() {
                 }
             });
 
-            if (bathymetryData) {
+            if (plotBathymetry) {
                 yzSeriesData.push([
-                    new Float64Array(bathymetryData.inline_distance),
-                    new Float64Array(bathymetryData.depth),
+                    new Float64Array(plotBathymetry.inline_distance),
+                    new Float64Array(plotBathymetry.depth),
                 ]);
                 yzSeries.push({
                     label: "Bathymetry",
@@ -156,7 +246,7 @@ export function TxRxPosPlot() {
 
             const options_xy: uPlot.Options = {
                 mode: 1,
-                width: 900,
+                width: PLOT_WIDTH,
                 height: 300,
                 title: 'Tx and Rx positions',
                 series: xySeries,
@@ -201,10 +291,11 @@ export function TxRxPosPlot() {
 
             const options_yz: uPlot.Options = {
                 mode: 1,
-                width: 900,
+                width: PLOT_WIDTH,
                 height: 400,
                 title: 'Depth profile',
                 series: yzSeries,
+                hooks: bathymetryZoomHooks,
                 scales: {
                     x: { time: false },
                     y: { time: false, dir: -1 },
@@ -248,6 +339,7 @@ export function TxRxPosPlot() {
 
             const plotTxRx2Instance = new uPlot(options_yz, uPlot.join(yzSeriesData), XYChartRef.current!);
             const plotTxRx1Instance = new uPlot(options_xy, uPlot.join(xySeriesData), XYChartRef.current!);
+            restoreBathymetryRange([plotTxRx1Instance, plotTxRx2Instance]);
 
             return () => {
                 plotTxRx1Instance.destroy();
@@ -346,11 +438,11 @@ export function TxRxPosPlot() {
 
             // Prepare bathymetry data if available and join with Tx/Rx data
             let uplotTxRxData_yz: uPlot.AlignedData;
-            if (bathymetryData) {
+            if (plotBathymetry) {
                 // Create bathymetry dataset
                 const bathyData: uPlot.AlignedData = [
-                    new Float64Array(bathymetryData.inline_distance), // x-axis for bathymetry
-                    new Float64Array(bathymetryData.depth),           // bathymetry depths
+                    new Float64Array(plotBathymetry.inline_distance), // x-axis for bathymetry
+                    new Float64Array(plotBathymetry.depth),           // bathymetry depths
                 ];
 
                 // Join the Tx/Rx data with bathymetry data using uPlot.join
@@ -555,7 +647,7 @@ export function TxRxPosPlot() {
             }
             const options_xy: uPlot.Options = {
                 mode: 1,
-                width: 900,
+                width: PLOT_WIDTH,
                 height: 300,
                 title: 'Tx and Rx positions (MARE2DEM coordinate system)',
                 series: series_xy,
@@ -615,9 +707,10 @@ export function TxRxPosPlot() {
 
             const options_yz: uPlot.Options = {
                 mode: 1,
-                width: 900,
+                width: PLOT_WIDTH,
                 height: 400,
                 series: series_yz,
+                hooks: bathymetryZoomHooks,
                 scales: {
                     x: {
                         time: false,
@@ -670,6 +763,7 @@ export function TxRxPosPlot() {
             // Initialize uPlot with ref
             const plotTxRx1Instance = new uPlot(options_xy, uplotTxRxData_xy, XYChartRef.current!)
             const plotTxRx2Instance = new uPlot(options_yz, uplotTxRxData_yz, XYChartRef.current!)
+            restoreBathymetryRange([plotTxRx1Instance, plotTxRx2Instance]);
 
             // Cleanup function to destroy plot instances on unmount
             return () => {
@@ -682,6 +776,9 @@ export function TxRxPosPlot() {
         txData,
         rxData,
         bathymetryData,
+        plotBathymetry,
+        bathymetryZoomHooks,
+        restoreBathymetryRange,
         isTxDepthAdjusted,
         originalTxData,
         activeDatasets,
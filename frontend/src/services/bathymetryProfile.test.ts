@@ -0,0 +1,38 @@
+import axios from 'axios';
+import { describe, expect, it, vi } from 'vitest';
+
+import { fetchBathymetryProfile } from './bathymetryProfile';
+
+vi.mock('axios', () => ({
+  default: {
+    post: vi.fn(),
+  },
+}));
+
+describe('bathymetryProfile service', () => {
+  it('posts the visible range and rounded pixel width', async () => {
+    const profile = {
+      inline_distance: [0, 1],
+      depth: [-10, -11],
+      num_points: 2,
+      range_points: 2,
+      downsampled: false,
+    };
+    vi.mocked(axios.post).mockResolvedValue({ data: profile });
+
+    const result = await fetchBathymetryProfile({
+      bathymetryId: 'abc',
+      xMin: 100,
+      xMax: 2500.5,
+      width: 799.6,
+    });
+
+    const [url, formData] = vi.mocked(axios.post).mock.calls[0];
+    expect(url).toBe('http://127.0.0.1:3354/api/bathymetry-profile');
+    expect((formData as FormData).get('bathymetry_id')).toBe('abc');
+    expect((formData as FormData).get('x_min')).toBe('100');
+    expect((formData as FormData).get('x_max')).toBe('2500.5');
+    expect((formData as FormData).get('width')).toBe('800');
+    expect(result).toBe(profile);
+  });
+});
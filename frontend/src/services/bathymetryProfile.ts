@@ -0,0 +1,33 @@
+import axios from 'axios';
+
+const API_BASE_URL = 'http://127.0.0.1:3354';
+
+export interface BathymetryProfileRequest {
+  bathymetryId: string;
+  xMin: number;
+  xMax: number;
+  // Plot width in pixels; the server keeps first/last/min/max per pixel.
+  width: number;
+}
+
+export interface BathymetryProfile {
+  inline_distance: number[];
+  depth: number[];
+  num_points: number;
+  range_points: number;
+  downsampled: boolean;
+}
+
+export async function fetchBathymetryProfile(request: BathymetryProfileRequest) {
+  const formData = new FormData();
+  formData.append('bathymetry_id', request.bathymetryId);
+  formData.append('x_min', String(request.xMin));
+  formData.append('x_max', String(request.xMax));
+  formData.append('width', String(Math.max(1, Math.round(request.width))));
+
+  const response = await axios.post<BathymetryProfile>(
+    `${API_BASE_URL}/api/bathymetry-profile`,
+    formData,
+  );
+  return response.data;
+}
@@ -0,0 +1,44 @@
+import { describe, expect, it } from 'vitest';
+
+import {
+  buildTriangleMeshLodViewport,
+  TRIANGLE_MESH_LOD_MAX_TRIANGLES,
+} from './triangleMeshLod';
+
+describe('triangleMeshLod', () => {
+  it('requests the whole model at the fitted zoom', () => {
+    expect(
+      buildTriangleMeshLodViewport(
+        {
+          cameraState: { centerX: 5, centerY: 10, baseWidth: 44, baseHeight: 22, zoom: 1 },
+          canvasSize: { width: 400.4, height: 200 },
+        },
+        1,
+      ),
+    ).toEqual({
+      widthPx: 400,
+      heightPx: 200,
+      maxTriangles: TRIANGLE_MESH_LOD_MAX_TRIANGLES,
+    });
+  });
+
+  it('converts the zoomed camera window back to model coordinates', () => {
+    expect(
+      buildTriangleMeshLodViewport(
+        {
+          cameraState: { centerX: 5, centerY: 20, baseWidth: 40, baseHeight: 20, zoom: 4 },
+          canvasSize: { width: 400, height: 200 },
+        },
+        2,
+      ),
+    ).toEqual({
+      widthPx: 400,
+      heightPx: 200,
+      maxTriangles: TRIANGLE_MESH_LOD_MAX_TRIANGLES,
+      yMin: 0,
+      yMax: 10,
+      zMin: 8.75,
+      zMax: 11.25,
+    });
+  });
+});
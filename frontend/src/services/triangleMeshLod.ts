@@ -0,0 +1,57 @@
+import axios from 'axios';
+
+import { getTriangleCameraWorldSize } from '@/services/triangleCamera';
+import type { TriangleViewportView } from '@/services/triangleModelViewer';
+import type { TriangleMeshLodResponse, TriangleMeshViewport } from '@/types';
+
+const API_BASE_URL = 'http://127.0.0.1:3354';
+
+// Visible triangle budget; the server steps to coarser levels above it.
+export const TRIANGLE_MESH_LOD_MAX_TRIANGLES = 200_000;
+
+export function buildInitialTriangleMeshLodViewport(size: {
+  width: number;
+  height: number;
+}): TriangleMeshViewport {
+  return {
+    widthPx: Math.max(1, Math.round(size.width)),
+    heightPx: Math.max(1, Math.round(size.height)),
+    maxTriangles: TRIANGLE_MESH_LOD_MAX_TRIANGLES,
+  };
+}
+
+export function buildTriangleMeshLodViewport(
+  view: TriangleViewportView,
+  verticalExaggeration: number,
+): TriangleMeshViewport {
+  const viewport = buildInitialTriangleMeshLodViewport(view.canvasSize);
+  // At the fitted zoom the whole model is in view.
+  if (view.cameraState.zoom <= 1) {
+    return viewport;
+  }
+
+  const worldSize = getTriangleCameraWorldSize(view.cameraState);
+  const exaggeration = verticalExaggeration === 0 ? 1 : verticalExaggeration;
+  const firstZ = (view.cameraState.centerY - worldSize.height / 2) / exaggeration;
+  const secondZ = (view.cameraState.centerY + worldSize.height / 2) / exaggeration;
+
+  return {
+    ...viewport,
+    yMin: view.cameraState.centerX - worldSize.width / 2,
+    yMax: view.cameraState.centerX + worldSize.width / 2,
+    zMin: Math.min(firstZ, secondZ),
+    zMax: Math.max(firstZ, secondZ),
+  };
+}
+
+export async function fetchTriangleMeshLod(lodId: string, viewport: TriangleMeshViewport) {
+  const formData = new FormData();
+  formData.append('lod_id', lodId);
+  formData.append('viewport', JSON.stringify(viewport));
+
+  const response = await axios.post<TriangleMeshLodResponse>(
+    `${API_BASE_URL}/api/triangle-mesh-lod`,
+    formData,
+  );
+  return response.data;
+}
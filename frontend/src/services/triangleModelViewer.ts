@@ -153,6 +153,7 @@ export interface TriangleModelViewer {
   setData(data: { mesh: TriangleMesh; model: TriangleModelResponse }): void;
   setInteractionMode(mode: TriangleViewerInteractionMode): void;
   setLayerVisibility(visibility: TriangleLayerVisibility): void;
+  setMeshDetail(mesh: TriangleMesh): void;
   setResistivityColorRange(range: TriangleResistivityColorRange): void;
   setSelectionOverlay(selection: TriangleSelectionOverlay | null): void;
   setTriangleResistivityValues(values: Array<number | null>): void;
@@ -370,6 +371,36 @@ export function createTriangleModelViewer(options: {
     });
   };
 
+  const applyMeshBuffers = (nextMesh: TriangleMesh) => {
+    mesh = nextMesh;
+    const buffers = buildTriangleSceneBuffers(nextMesh);
+
+    updatePositionGeometry(triangleFillGeometry, buffers.triangleFillPositions);
+    triangleFillGeometry.setAttribute(
+      'color',
+      new THREE.BufferAttribute(
+        buildTriangleFillColors(
+          nextMesh.triangleResistivityValues ??
+            Array.from({ length: nextMesh.triangles.length }, () => null),
+          resistivityColorRange,
+        ),
+        3,
+      ),
+    );
+    triangleFillGeometry.setIndex(null);
+    const hasResistivityColors =
+      nextMesh.source === 'constrained' &&
+      (nextMesh.triangleResistivityValues ?? []).some((value) => value !== null);
+    triangleFillMaterial.opacity =
+      hasResistivityColors ? 1 : nextMesh.source === 'constrained' ? 0.22 : 0.12;
+    triangleEdgeMaterial.opacity =
+      hasResistivityColors ? 0 : nextMesh.source === 'constrained' ? 0.18 : 0.48;
+    segmentMaterial.opacity = hasResistivityColors ? 0.72 : 0.95;
+
+    updatePositionGeometry(triangleEdgeGeometry, buffers.triangleEdgePositions);
+    updatePositionGeometry(pointGeometry, buffers.pointPositions);
+  };
+
   const clearHoverVisuals = () => {
     hoverPoint.visible = false;
     hoverSegment.visible = false;
@@ -827,7 +858,6 @@ export function createTriangleModelViewer(options: {
       renderScene();
     },
     setData(data) {
-      mesh = data.mesh;
       model = data.model;
       sourceVertexById.clear();
       model.vertices.forEach((vertex) => {
@@ -838,44 +868,19 @@ export function createTriangleModelViewer(options: {
         });
       });
 
-      const buffers = buildTriangleSceneBuffers(mesh);
+      applyMeshBuffers(data.mesh);
       const sourcePoints = model.vertices.map((vertex) => ({
         id: vertex.id,
         x: vertex.hCoor,
         y: vertex.vCoor,
       }));
-
-      updatePositionGeometry(triangleFillGeometry, buffers.triangleFillPositions);
-      triangleFillGeometry.setAttribute(
-        'color',
-        new THREE.BufferAttribute(
-          buildTriangleFillColors(
-            mesh.triangleResistivityValues ??
-              Array.from({ length: mesh.triangles.length }, () => null),
-            resistivityColorRange,
-          ),
-          3,
-        ),
-      );
-      triangleFillGeometry.setIndex(null);
-      const hasResistivityColors =
-        mesh.source === 'constrained' &&
-        (mesh.triangleResistivityValues ?? []).some((value) => value !== null);
-      triangleFillMaterial.opacity =
-        hasResistivityColors ? 1 : mesh.source === 'constrained' ? 0.22 : 0.12;
-      triangleEdgeMaterial.opacity =
-        hasResistivityColors ? 0 : mesh.source === 'constrained' ? 0.18 : 0.48;
-      segmentMaterial.opacity = hasResistivityColors ? 0.72 : 0.95;
-
-      updatePositionGeometry(triangleEdgeGeometry, buffers.triangleEdgePositions);
       updatePositionGeometry(
         segmentGeometry,
         buildTriangleSegmentPositions(sourcePoints, model.segments),
       );
-      updatePositionGeometry(pointGeometry, buffers.pointPositions);
 
       rootGroup.scale.y = verticalExaggeration;
-      const scaledBounds = getScaledBounds(mesh.bounds, verticalExaggeration);
+      const scaledBounds = getScaledBounds(data.mesh.bounds, verticalExaggeration);
       cameraState = createTriangleCameraState(scaledBounds, canvasSize);
       initialCameraState = { ...cameraState };
       applyTriangleCamera(camera, cameraState);
@@ -908,6 +913,14 @@ export function createTriangleModelViewer(options: {
       points.visible = visibility.vertices;
       renderScene();
     },
+    setMeshDetail(nextMesh) {
+      // Swap in another level of detail of the same model; the camera stays put.
+      applyMeshBuffers(nextMesh);
+      clearHoverVisuals();
+      selectionOverlay.visible = false;
+      featherOverlay.visible = false;
+      renderScene();
+    },
     setResistivityColorRange(range) {
       if (
         !Number.isFinite(range.min) ||
@@ -2,6 +2,7 @@ import axios from 'axios';
 import { describe, expect, it, vi } from 'vitest';
 
 import {
+  applyTriangleResegmentationPatch,
   buildResegmentedFileNames,
   exportTriangleResegmentation,
   previewTriangleResegmentation,
@@ -59,4 +60,41 @@ describe('triangleResegmentation service', () => {
       expect.any(FormData),
     );
   });
+
+  it('applies ROI session patches to the preview mesh', () => {
+    const mesh = {
+      vertices: [],
+      triangles: [],
+      triangleRegionIds: [1, 1, 2],
+      triangleResistivityValues: [10, 10, 20],
+      regionResistivity: [
+        { regionId: 1, rho: 10 },
+        { regionId: 2, rho: 20 },
+      ],
+    };
+
+    const patched = applyTriangleResegmentationPatch(mesh, {
+      triangleIndices: [1, 2],
+      triangleRegionIds: [3, 3],
+      triangleResistivityValues: [100, 100],
+      regionResistivity: [{ regionId: 3, rho: 100 }],
+      removedRegionIds: [2],
+      stats: {
+        sourceTriangleCount: 3,
+        activeTriangleCount: 3,
+        regionCount: 2,
+        changedTriangleCount: 1,
+        mergedComponentCount: 0,
+      },
+      warnings: [],
+    });
+
+    expect(patched.triangleRegionIds).toEqual([1, 3, 3]);
+    expect(patched.triangleResistivityValues).toEqual([10, 100, 100]);
+    expect(patched.regionResistivity).toEqual([
+      { regionId: 1, rho: 10 },
+      { regionId: 3, rho: 100 },
+    ]);
+    expect(mesh.triangleRegionIds).toEqual([1, 1, 2]);
+  });
 });
@@ -1,9 +1,14 @@
 import axios from 'axios';
 
 import type {
+  TriangleConstrainedMesh,
   TriangleResegmentationExportResponse,
   TriangleResegmentationParameters,
+  TriangleResegmentationPatch,
   TriangleResegmentationPreviewResponse,
+  TriangleResegmentationRoi,
+  TriangleResegmentationSessionResponse,
+  TriangleResegmentationSweepResponse,
 } from '@/types';
 
 const API_BASE_URL = 'http://127.0.0.1:3354';
@@ -52,3 +57,80 @@ export async function exportTriangleResegmentation(
   );
   return response.data;
 }
+
+export interface TriangleResegmentationSweepRequest {
+  polyFile: File;
+  resistivityFile: File;
+  parameterSets: TriangleResegmentationParameters[];
+  previewIndex?: number | null;
+}
+
+export async function sweepTriangleResegmentation(
+  request: TriangleResegmentationSweepRequest,
+) {
+  const formData = new FormData();
+  formData.append('poly_file', request.polyFile);
+  formData.append('resistivity_file', request.resistivityFile);
+  formData.append('parameter_sets', JSON.stringify(request.parameterSets));
+  formData.append(
+    'preview_index',
+    request.previewIndex === null ? '' : String(request.previewIndex ?? 0),
+  );
+
+  const response = await axios.post<TriangleResegmentationSweepResponse>(
+    `${API_BASE_URL}/api/sweep-triangle-resegmentation`,
+    formData,
+  );
+  return response.data;
+}
+
+export async function startTriangleResegmentationSession(
+  request: TriangleResegmentationRequest,
+) {
+  const response = await axios.post<TriangleResegmentationSessionResponse>(
+    `${API_BASE_URL}/api/start-triangle-resegmentation-session`,
+    buildFormData(request),
+  );
+  return response.data;
+}
+
+export async function updateTriangleResegmentationSession(
+  sessionId: string,
+  roi: TriangleResegmentationRoi,
+) {
+  const formData = new FormData();
+  formData.append('session_id', sessionId);
+  formData.append('roi', JSON.stringify(roi));
+
+  const response = await axios.post<TriangleResegmentationPatch>(
+    `${API_BASE_URL}/api/update-triangle-resegmentation-session`,
+    formData,
+  );
+  return response.data;
+}
+
+export function applyTriangleResegmentationPatch(
+  mesh: TriangleConstrainedMesh,
+  patch: TriangleResegmentationPatch,
+): TriangleConstrainedMesh {
+  const triangleRegionIds = mesh.triangleRegionIds.slice();
+  const triangleResistivityValues = mesh.triangleResistivityValues.slice();
+  patch.triangleIndices.forEach((triangleIndex, index) => {
+    triangleRegionIds[triangleIndex] = patch.triangleRegionIds[index];
+    triangleResistivityValues[triangleIndex] = patch.triangleResistivityValues[index];
+  });
+
+  const replacedRegionIds = new Set([
+    ...patch.removedRegionIds,
+    ...patch.regionResistivity.map((region) => region.regionId),
+  ]);
+  return {
+    ...mesh,
+    triangleRegionIds,
+    triangleResistivityValues,
+    regionResistivity: mesh.regionResistivity
+      .filter((region) => !replacedRegionIds.has(region.regionId))
+      .concat(patch.regionResistivity)
+      .sort((first, second) => first.regionId - second.regionId),
+  };
+}
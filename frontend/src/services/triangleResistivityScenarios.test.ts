@@ -0,0 +1,49 @@
+import axios from 'axios';
+import { describe, expect, it, vi } from 'vitest';
+
+import {
+  buildScenarioArchiveFileName,
+  exportTriangleResistivityScenarios,
+} from './triangleResistivityScenarios';
+
+vi.mock('axios', () => ({
+  default: {
+    post: vi.fn(),
+  },
+}));
+
+function readBlobText(blob: Blob) {
+  return new Promise<string>((resolve, reject) => {
+    const reader = new FileReader();
+    reader.onerror = () => reject(reader.error);
+    reader.onload = () => resolve(String(reader.result));
+    reader.readAsText(blob);
+  });
+}
+
+describe('triangleResistivityScenarios service', () => {
+  it('derives the archive name from the resistivity file name', () => {
+    expect(buildScenarioArchiveFileName('line3.resistivity')).toBe('line3.scenarios.zip');
+  });
+
+  it('posts scenarios against an indexed upload as a blob request', async () => {
+    const archive = new Blob(['zip']);
+    vi.mocked(axios.post).mockResolvedValue({ data: archive });
+    const scenarios = [{ name: 'low', regionRhoUpdates: { '3': 0.5 } }];
+
+    const result = await exportTriangleResistivityScenarios({
+      exportId: 'abc',
+      resistivityFile: new File(['rho'], 'source.resistivity'),
+      scenarios,
+    });
+
+    const [url, formData, config] = vi.mocked(axios.post).mock.calls[0];
+    expect(url).toBe('http://127.0.0.1:3354/api/export-triangle-resistivity-scenarios');
+    expect(config).toEqual({ responseType: 'blob' });
+    expect((formData as FormData).get('export_id')).toBe('abc');
+    expect((formData as FormData).get('resistivity_file')).toBeNull();
+    const scenariosPart = (formData as FormData).get('scenarios') as Blob;
+    expect(JSON.parse(await readBlobText(scenariosPart))).toEqual(scenarios);
+    expect(result).toBe(archive);
+  });
+});
@@ -0,0 +1,45 @@
+import axios from 'axios';
+
+const API_BASE_URL = 'http://127.0.0.1:3354';
+
+export interface TriangleResistivityScenario {
+  name: string;
+  regionRhoUpdates: Record<string, number>;
+}
+
+export interface TriangleResistivityScenarioRequest {
+  // Id from the triangle model upload; takes precedence over the file.
+  exportId?: string | null;
+  resistivityFile?: File | null;
+  scenarios: TriangleResistivityScenario[];
+}
+
+export function buildScenarioArchiveFileName(resistivityFileName: string) {
+  const stem = resistivityFileName.endsWith('.resistivity')
+    ? resistivityFileName.slice(0, -'.resistivity'.length)
+    : resistivityFileName;
+  return `${stem}.scenarios.zip`;
+}
+
+export async function exportTriangleResistivityScenarios(
+  request: TriangleResistivityScenarioRequest,
+) {
+  const formData = new FormData();
+  if (request.exportId) {
+    formData.append('export_id', request.exportId);
+  } else if (request.resistivityFile) {
+    formData.append('resistivity_file', request.resistivityFile);
+  }
+  formData.append(
+    'scenarios',
+    new Blob([JSON.stringify(request.scenarios)], { type: 'application/json' }),
+    'scenarios.json',
+  );
+
+  const response = await axios.post<Blob>(
+    `${API_BASE_URL}/api/export-triangle-resistivity-scenarios`,
+    formData,
+    { responseType: 'blob' },
+  );
+  return response.data;
+}
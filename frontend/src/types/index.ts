@@ -97,6 +97,8 @@ export interface BathymetryData {
   num_points: number;
   distance_range: [number, number];
   depth_range: [number, number];
+  // Id for zoomed profile requests against the uploaded survey.
+  bathymetry_id?: string;
 }
 
 export interface GeometryData {
@@ -144,14 +146,22 @@ export type {
   TriangleLayerVisibility,
   TriangleMesh,
   TriangleMeshBounds,
+  TriangleMeshLod,
+  TriangleMeshLodLevel,
+  TriangleMeshLodResponse,
+  TriangleMeshViewport,
   TriangleMeshPoint,
   TriangleModelHole,
   TriangleRegionResistivity,
   TriangleResegmentationExportResponse,
   TriangleResegmentationParameters,
+  TriangleResegmentationPatch,
   TriangleResegmentationPreviewResponse,
   TriangleResegmentationRoi,
+  TriangleResegmentationSessionResponse,
   TriangleResegmentationStats,
+  TriangleResegmentationSweepResponse,
+  TriangleResegmentationSweepResult,
   TriangleModelRegion,
   TriangleModelResponse,
   TriangleModelResistivity,
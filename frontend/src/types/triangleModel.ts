@@ -51,6 +51,37 @@ export interface TriangleConstrainedMesh {
   regionResistivity: TriangleRegionResistivity[];
 }
 
+export interface TriangleMeshViewport {
+  yMin?: number;
+  yMax?: number;
+  zMin?: number;
+  zMax?: number;
+  widthPx: number;
+  heightPx: number;
+  maxTriangles?: number | null;
+}
+
+export interface TriangleMeshLodLevel {
+  level: number;
+  cellSize: number;
+  vertexCount: number;
+  triangleCount: number;
+}
+
+export interface TriangleMeshLod {
+  id: string;
+  level: number;
+  cellSize: number;
+  viewport: TriangleMeshViewport;
+  bounds: TriangleResegmentationRoi;
+  levels: TriangleMeshLodLevel[];
+}
+
+export interface TriangleMeshLodResponse {
+  meshLod: TriangleMeshLod;
+  constrainedMesh: TriangleConstrainedMesh;
+}
+
 export interface TriangleModelResponse {
   polyFileName: string;
   resistivityFileName: string | null;
@@ -59,7 +90,9 @@ export interface TriangleModelResponse {
   holes: TriangleModelHole[];
   regions: TriangleModelRegion[];
   resistivity: TriangleModelResistivity | null;
+  resistivityExportId?: string | null;
   constrainedMesh: TriangleConstrainedMesh | null;
+  meshLod?: TriangleMeshLod | null;
 }
 
 export interface TriangleResegmentationRoi {
@@ -80,8 +113,9 @@ export interface TriangleResegmentationParameters {
 export interface TriangleResegmentationStats {
   sourceTriangleCount: number;
   activeTriangleCount: number;
-  outputVertexCount: number;
-  outputSegmentCount: number;
+  // Null for session previews, which keep the source triangles.
+  outputVertexCount: number | null;
+  outputSegmentCount: number | null;
   outputRegionCount: number;
   mergedComponentCount: number;
 }
@@ -92,6 +126,46 @@ export interface TriangleResegmentationPreviewResponse {
   warnings: string[];
 }
 
+export interface TriangleResegmentationSweepResult {
+  index: number;
+  parameters: TriangleResegmentationParameters;
+  stats: TriangleResegmentationStats | null;
+  warnings: string[];
+  error: string | null;
+}
+
+export interface TriangleResegmentationSweepResponse {
+  results: TriangleResegmentationSweepResult[];
+  previewIndex: number | null;
+  previewMesh: TriangleConstrainedMesh | null;
+}
+
+export interface TriangleResegmentationSessionResponse {
+  sessionId: string;
+  previewMesh: TriangleConstrainedMesh;
+  stats: Pick<TriangleResegmentationStats, 'sourceTriangleCount' | 'activeTriangleCount'> & {
+    regionCount: number;
+    mergedComponentCount: number;
+  };
+  warnings: string[];
+}
+
+export interface TriangleResegmentationPatch {
+  triangleIndices: number[];
+  triangleRegionIds: number[];
+  triangleResistivityValues: number[];
+  regionResistivity: TriangleRegionResistivity[];
+  removedRegionIds: number[];
+  stats: {
+    sourceTriangleCount: number;
+    activeTriangleCount: number;
+    regionCount: number;
+    changedTriangleCount: number;
+    mergedComponentCount: number;
+  };
+  warnings: string[];
+}
+
 export interface TriangleResegmentationExportResponse
   extends TriangleResegmentationPreviewResponse {
   polyFileName: string;